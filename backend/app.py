@@ -147,6 +147,8 @@ def _patch_pre_alembic_columns(engine, inspect_fn) -> None:
             patches.append(
                 "ALTER TABLE subtitle_downloads ADD COLUMN source TEXT DEFAULT 'provider'"
             )
+        if "series_title" not in existing:
+            patches.append("ALTER TABLE subtitle_downloads ADD COLUMN series_title TEXT DEFAULT ''")
 
     if not patches:
         return
@@ -274,15 +276,35 @@ def create_app(testing=False):
                 conn.execute(text("PRAGMA busy_timeout=5000"))
                 conn.commit()
 
-        # Initialize FTS5 search tables (virtual tables for global search)
-        from db.search import init_search_tables, rebuild_search_index
+        # Initialize FTS5 search tables (virtual tables for global search).
+        # Triggers keep the index in sync; a full rebuild only runs after a
+        # search index schema version change.
+        from db.search import ensure_search_index, init_search_tables
 
-        init_search_tables()
         try:
-            rebuild_search_index()
-            logger.info("FTS5 search index rebuilt on startup")
+            init_search_tables()
+            if ensure_search_index():
+                logger.info("FTS5 search index rebuilt (schema version changed)")
         except Exception as _e:
-            logger.warning("FTS5 search index rebuild failed (non-fatal): %s", _e)
+            logger.warning("FTS5 search index setup failed (non-fatal): %s", _e)
+
+        # Backfill statistics rollups once for history recorded before they existed
+        try:
+            from db.providers import ensure_download_rollups
+
+            if ensure_download_rollups():
+                logger.info("Statistics download rollups backfilled")
+        except Exception as _e:
+            logger.warning("Statistics rollup backfill failed (non-fatal): %s", _e)
+
+        # In-process count caches may hold numbers from a previous app/DB
+        from db.repositories.base import count_cache
+        from db.repositories.cleanup import bump_hash_generation
+        from db.repositories.wanted import reset_wanted_count_caches
+
+        count_cache.invalidate()
+        reset_wanted_count_caches()
+        bump_hash_generation()
 
         # Initialize cache and queue backends
         from cache import create_cache_backend
@@ -321,6 +343,7 @@ def create_app(testing=False):
                 )
                 _conn.commit()
                 if _dedup_result.rowcount:
+                    reset_wanted_count_caches()
                     logger.warning(
                         "wanted_items dedup: removed %d duplicate row(s) on startup",
                         _dedup_result.rowcount,
@@ -587,6 +610,15 @@ def _start_schedulers(settings, app=None):
         except Exception as e:
             logging.getLogger(__name__).warning("Upgrade scheduler start failed: %s", e)
 
+    # Resume Whisper jobs that were queued or running before the restart
+    if app is not None:
+        try:
+            from routes.whisper import _get_queue
+
+            _get_queue().resume_pending(socketio=socketio)
+        except Exception as e:
+            logging.getLogger(__name__).warning("Whisper queue resume failed: %s", e)
+
     # Start AniDB absolute episode sync scheduler (weekly)
     if app is not None:
         try:
@@ -3,13 +3,19 @@
 All language-specific logic is parameterized via config.py settings.
 """
 
+import hashlib
 import json
 import logging
 import os
 import re
+import shutil
 import subprocess
+import tempfile
+import threading
 
+from cache_eviction import evict_lru
 from config import get_settings
+from media_scheduler import DEMUX, PROBE, run_media
 
 logger = logging.getLogger(__name__)
 
@@ -376,7 +382,7 @@ def select_best_subtitle_stream(ffprobe_data, format_filter=None):
 
 
 def run_ffprobe(file_path, use_cache=True):
-    """Run ffprobe and return parsed JSON data for audio and subtitle streams.
+    """Run ffprobe and return parsed JSON data for streams, chapters and format.
 
     Uses cache if available and file hasn't changed (mtime check).
 
@@ -386,25 +392,18 @@ def run_ffprobe(file_path, use_cache=True):
 
     Returns:
         dict: Parsed ffprobe JSON data with {"streams": [...]} containing both
-              audio and subtitle streams (codec_type "audio" / "subtitle").
+              audio and subtitle streams (codec_type "audio" / "subtitle"),
+              plus "chapters" and "format" from the same invocation.
 
     Raises:
         RuntimeError: If ffprobe fails, times out, or returns invalid JSON
     """
-    import os
-
-    from db.cache import get_ffprobe_cache, set_ffprobe_cache
-
     # Check cache if enabled
     if use_cache:
-        try:
-            mtime = os.path.getmtime(file_path)
-            cached = get_ffprobe_cache(file_path, mtime)
-            if cached:
-                logger.debug("Using cached ffprobe data for %s", file_path)
-                return cached
-        except (OSError, Exception) as e:
-            logger.debug("Cache check failed for %s: %s", file_path, e)
+        cached = _get_cached_probe(file_path)
+        if cached:
+            logger.debug("Using cached ffprobe data for %s", file_path)
+            return cached
 
     # Run ffprobe — no -select_streams filter so both audio and subtitle streams
     # are returned. Consumers filter by codec_type themselves. Previously this used
@@ -417,10 +416,12 @@ def run_ffprobe(file_path, use_cache=True):
         "-print_format",
         "json",
         "-show_streams",
+        "-show_chapters",
+        "-show_format",
         file_path,
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = run_media(PROBE, cmd, capture_output=True, text=True, timeout=30)
     except subprocess.TimeoutExpired:
         raise RuntimeError(f"ffprobe timed out after 30s: {file_path}")
     if result.returncode != 0:
@@ -432,11 +433,7 @@ def run_ffprobe(file_path, use_cache=True):
 
     # Cache the result
     if use_cache:
-        try:
-            mtime = os.path.getmtime(file_path)
-            set_ffprobe_cache(file_path, mtime, probe_data)
-        except (OSError, Exception) as e:
-            logger.debug("Cache store failed for %s: %s", file_path, e)
+        _store_cached_probe(file_path, probe_data)
 
     return probe_data
 
@@ -444,7 +441,8 @@ def run_ffprobe(file_path, use_cache=True):
 def get_media_streams(file_path, use_cache=True):
     """Unified entry point for media stream metadata — engine-agnostic.
 
-    Reads scan_metadata_engine from config and routes to ffprobe or mediainfo.
+    Reads scan_metadata_engine from config and routes to ffprobe, mediainfo or the
+    native container-header reader (native_probe.py, no subprocess).
     Both engines return the same normalized {"streams": [...]} format, so the
     cache is engine-agnostic: an entry written by one engine is valid for another.
 
@@ -459,37 +457,94 @@ def get_media_streams(file_path, use_cache=True):
         RuntimeError: On probe failure (engine-specific errors propagate).
         FileNotFoundError: If engine=mediainfo and mediainfo is not installed.
     """
-    import os
-
-    from config import get_settings
-    from db.cache import get_ffprobe_cache, set_ffprobe_cache
-
     settings = get_settings()
     engine = getattr(settings, "scan_metadata_engine", "auto")
 
     # Cache check — shared across all engines (same format, engine-agnostic)
     if use_cache:
-        try:
-            mtime = os.path.getmtime(file_path)
-            cached = get_ffprobe_cache(file_path, mtime)
-            if cached:
-                logger.debug("Cache hit for %s (engine=%s)", file_path, engine)
-                return cached
-        except (OSError, Exception) as e:
-            logger.debug("Cache check failed for %s: %s", file_path, e)
+        cached = _get_cached_probe(file_path)
+        if cached:
+            logger.debug("Cache hit for %s (engine=%s)", file_path, engine)
+            return cached
 
     probe_data = _run_engine(file_path, engine)
 
     if use_cache:
-        try:
-            mtime = os.path.getmtime(file_path)
-            set_ffprobe_cache(file_path, mtime, probe_data)
-        except (OSError, Exception) as e:
-            logger.debug("Cache store failed for %s: %s", file_path, e)
+        _store_cached_probe(file_path, probe_data)
 
     return probe_data
 
 
+def get_media_metadata(file_path, use_cache=True):
+    """Streams, chapters and format duration from one unified cache record.
+
+    Records written by the ffprobe or native engines already carry all three.
+    Older records and MediaInfo results only hold streams; for those a single
+    combined ffprobe run fills in chapters and format and the record is updated,
+    so chapter and duration lookups never probe the file separately.
+
+    Returns:
+        dict: {"streams": [...], "chapters": [...], "format": {...}}
+    """
+    probe_data = get_media_streams(file_path, use_cache)
+    if "chapters" in probe_data and "format" in probe_data:
+        return probe_data
+
+    try:
+        full = run_ffprobe(file_path, use_cache=False)
+    except Exception as e:
+        # Not cached: an empty chapters/format pair would otherwise stick until
+        # the file changes, so the next lookup retries the probe instead.
+        logger.debug("Chapter/format probe failed for %s: %s", file_path, e)
+        return {**probe_data, "chapters": [], "format": {}}
+    probe_data = {
+        **probe_data,
+        "chapters": full.get("chapters", []),
+        "format": full.get("format", {}),
+    }
+    if use_cache:
+        _store_cached_probe(file_path, probe_data)
+    return probe_data
+
+
+def _get_cached_probe(file_path):
+    """Cached probe data by (path, mtime), falling back to the content fingerprint.
+
+    A fingerprint hit (renamed, moved or hard-linked file) is re-cached under the
+    new path so the next lookup is a plain path hit.
+    """
+    from db.cache import get_ffprobe_cache, get_ffprobe_cache_by_fingerprint, set_ffprobe_cache
+    from media_fingerprint import get_fingerprint
+
+    try:
+        mtime = os.path.getmtime(file_path)
+        cached = get_ffprobe_cache(file_path, mtime)
+        if cached:
+            return cached
+        fingerprint = get_fingerprint(file_path)
+        if not fingerprint:
+            return None
+        cached = get_ffprobe_cache_by_fingerprint(fingerprint)
+        if cached:
+            logger.debug("Probe cache hit by content fingerprint for %s", file_path)
+            set_ffprobe_cache(file_path, mtime, cached, fingerprint)
+        return cached
+    except Exception as e:
+        logger.debug("Cache check failed for %s: %s", file_path, e)
+        return None
+
+
+def _store_cached_probe(file_path, probe_data):
+    from db.cache import set_ffprobe_cache
+    from media_fingerprint import get_fingerprint
+
+    try:
+        mtime = os.path.getmtime(file_path)
+        set_ffprobe_cache(file_path, mtime, probe_data, get_fingerprint(file_path))
+    except Exception as e:
+        logger.debug("Cache store failed for %s: %s", file_path, e)
+
+
 def _run_engine(file_path, engine):
     """Dispatch to the configured metadata engine with fallback logic for 'auto'."""
     from mediainfo_utils import _is_mediainfo_available, run_mediainfo
@@ -497,6 +552,17 @@ def _run_engine(file_path, engine):
     if engine == "mediainfo":
         return run_mediainfo(file_path)
 
+    if engine == "native":
+        from native_probe import UnsupportedContainerError, run_native_probe
+
+        try:
+            return run_native_probe(file_path)
+        except UnsupportedContainerError as e:
+            logger.debug("Native probe unsupported for %s, using ffprobe: %s", file_path, e)
+        except Exception as e:
+            logger.warning("Native probe failed for %s, falling back to ffprobe: %s", file_path, e)
+        return run_ffprobe(file_path, use_cache=False)
+
     if engine == "auto":
         if _is_mediainfo_available():
             try:
@@ -520,40 +586,173 @@ def get_subtitle_stream_output_path(media_path: str, stream_info: dict) -> str:
     return f"{base}.{lang}.{fmt}"
 
 
-def extract_subtitle_stream(mkv_path, stream_info, output_path):
-    """Extract a subtitle stream (ASS or SRT) from an MKV file.
+# ffmpeg subtitle encoder by output extension (anything else is stream-copied)
+_SUBTITLE_ENCODERS = {"srt": "srt", "ass": "ass", "ssa": "ass", "vtt": "webvtt"}
+
+# Text subtitle codecs pre-extracted into the extraction cache → cached file format
+_CACHEABLE_SUB_FORMATS = {
+    "ass": "ass",
+    "ssa": "ass",
+    "subrip": "srt",
+    "srt": "srt",
+    "mov_text": "srt",
+    "webvtt": "srt",
+    "text": "srt",
+}
+
+# Striped locks so two threads never fill the same extraction cache entry twice
+_extract_locks = [threading.Lock() for _ in range(16)]
+
+
+def extract_subtitle_streams(mkv_path, targets):
+    """Extract several subtitle streams in a single ffmpeg pass (one demux).
 
     Args:
-        mkv_path: Path to the MKV file
-        stream_info: dict from select_best_subtitle_stream() (needs sub_index, format)
-        output_path: Path to write the extracted file
+        mkv_path: Path to the video file
+        targets: list of (stream_info, output_path) tuples; stream_info needs
+                 sub_index, the encoder follows each output's extension
 
     Raises:
         RuntimeError: If ffmpeg fails
     """
-    ext = os.path.splitext(output_path)[1].lower().lstrip(".")
-    _encoder_map = {"srt": "srt", "ass": "ass", "ssa": "ass", "vtt": "webvtt"}
-    encoder = _encoder_map.get(ext, "copy")
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        mkv_path,
-        "-map",
-        f"0:s:{stream_info['sub_index']}",
-        "-c:s",
-        encoder,
-        output_path,
-    ]
-    from config import get_settings
+    if not targets:
+        return
+    cmd = ["ffmpeg", "-y", "-i", mkv_path]
+    for stream_info, output_path in targets:
+        ext = os.path.splitext(output_path)[1].lower().lstrip(".")
+        cmd += [
+            "-map",
+            f"0:s:{stream_info['sub_index']}",
+            "-c:s",
+            _SUBTITLE_ENCODERS.get(ext, "copy"),
+            output_path,
+        ]
 
     _timeout = getattr(get_settings(), "ffmpeg_timeout", 120)
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=_timeout)
+    result = run_media(DEMUX, cmd, capture_output=True, text=True, timeout=_timeout)
     if result.returncode != 0:
         raise RuntimeError(f"ffmpeg extraction failed: {result.stderr}")
     logger.info(
-        "Extracted %s stream %d to %s",
-        stream_info.get("format", "?"),
-        stream_info["sub_index"],
-        output_path,
+        "Extracted subtitle stream(s) %s from %s",
+        ", ".join(str(info["sub_index"]) for info, _ in targets),
+        mkv_path,
     )
+
+
+def extract_subtitle_stream(mkv_path, stream_info, output_path, prefill_cache=True):
+    """Extract a subtitle stream (ASS or SRT) from an MKV file.
+
+    Served from the extraction cache (keyed by path, mtime and stream index)
+    when possible. On a miss every text subtitle stream of the file is
+    extracted into the cache in the same ffmpeg pass, so a later request for
+    another track of the same file needs no further demux.
+
+    Args:
+        mkv_path: Path to the MKV file
+        stream_info: dict from select_best_subtitle_stream() (needs sub_index, format)
+        output_path: Path to write the extracted file
+        prefill_cache: Also cache the file's other text streams on a miss. Callers
+            retrying track by track after a failed multi-stream pass pass False,
+            so each retry demuxes only its own track.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    ext = os.path.splitext(output_path)[1].lower().lstrip(".")
+    cache_dir = _extraction_cache_dir(mkv_path)
+    if cache_dir is None:
+        extract_subtitle_streams(mkv_path, [(stream_info, output_path)])
+        return
+
+    cached = os.path.join(cache_dir, f"{stream_info['sub_index']}.{ext}")
+    with _extract_locks[hash(cache_dir) % len(_extract_locks)]:
+        if os.path.exists(cached):
+            logger.debug(
+                "Extraction cache hit for %s stream %d", mkv_path, stream_info["sub_index"]
+            )
+            os.utime(cache_dir)
+        else:
+            try:
+                _fill_extraction_cache(
+                    mkv_path, cache_dir, stream_info["sub_index"], ext, prefill_cache
+                )
+            except OSError as e:
+                logger.debug("Extraction cache unavailable (%s), extracting directly", e)
+                extract_subtitle_streams(mkv_path, [(stream_info, output_path)])
+                return
+        shutil.copyfile(cached, output_path)
+    _evict_extraction_cache(os.path.dirname(cache_dir), keep=cache_dir)
+
+
+def _extraction_cache_dir(mkv_path):
+    """Cache directory for one file's content, or None if caching is off.
+
+    Keyed by the content fingerprint so renamed or hard-linked files share
+    their extracted tracks; falls back to (path, mtime) if it is unavailable.
+    """
+    from media_fingerprint import get_fingerprint
+
+    max_mb = getattr(get_settings(), "extract_cache_max_mb", 0)
+    if max_mb <= 0:
+        return None
+    try:
+        mtime = os.path.getmtime(mkv_path)
+    except OSError:
+        return None
+    identity = get_fingerprint(mkv_path) or f"{mkv_path}|{mtime}"
+    key = hashlib.sha1(identity.encode()).hexdigest()[:24]
+    root = os.path.join(getattr(get_settings(), "config_dir", "/config"), "cache", "extract")
+    return os.path.join(root, key)
+
+
+def _fill_extraction_cache(mkv_path, cache_dir, sub_index, ext, prefill=True):
+    """Extract the requested stream plus (if prefill) all other text subtitle streams."""
+    wanted = {(sub_index, ext)}
+    try:
+        streams = get_media_streams(mkv_path).get("streams", []) if prefill else []
+        text_index = 0
+        for stream in streams:
+            if stream.get("codec_type") != "subtitle":
+                continue
+            fmt = _CACHEABLE_SUB_FORMATS.get((stream.get("codec_name") or "").lower())
+            if fmt:
+                wanted.add((text_index, fmt))
+            text_index += 1
+    except Exception as e:
+        logger.debug("Probe for extraction cache failed on %s: %s", mkv_path, e)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    missing = [
+        (idx, fmt)
+        for idx, fmt in sorted(wanted)
+        if not os.path.exists(os.path.join(cache_dir, f"{idx}.{fmt}"))
+    ]
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        targets = [
+            ({"sub_index": idx, "format": fmt}, os.path.join(tmp_dir, f"{idx}.{fmt}"))
+            for idx, fmt in missing
+        ]
+        try:
+            extract_subtitle_streams(mkv_path, targets)
+        except RuntimeError:
+            if len(targets) == 1:
+                raise
+            # One odd stream must not block the one that was asked for
+            targets = [
+                (
+                    {"sub_index": sub_index, "format": ext},
+                    os.path.join(tmp_dir, f"{sub_index}.{ext}"),
+                )
+            ]
+            extract_subtitle_streams(mkv_path, targets)
+        for _, path in targets:
+            os.replace(path, os.path.join(cache_dir, os.path.basename(path)))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _evict_extraction_cache(root, keep=None):
+    """Drop least recently used cache entries until the cache fits extract_cache_max_mb."""
+    max_bytes = getattr(get_settings(), "extract_cache_max_mb", 0) * 1024 * 1024
+    evict_lru(root, max_bytes, pinned={keep})
@@ -0,0 +1,297 @@
+"""Shared, content-addressed cache of decoded audio tracks.
+
+Waveform rendering, Whisper transcription and subtitle sync all need the
+same thing: one audio track of a video as 16 kHz mono PCM. Each of them used
+to run its own ffmpeg decode into a private temp WAV. They now ask this
+module, which decodes a track once and keeps it as a WAV file under
+``<config_dir>/cache/audio``, keyed by
+
+    (media content fingerprint, audio track index, sample rate, channels)
+
+so renames and moves keep the cache warm. Consumers read the PCM payload
+directly (:func:`iter_pcm`, :func:`load_pcm`) instead of running the file
+through another decoder. Concurrent requests for the same
+key wait on a per-key lock instead of decoding twice. The cache is evicted
+LRU-first beyond ``audio_cache_max_mb``; files handed out through
+:func:`cached_audio` are pinned and never evicted while in use.
+
+Usage::
+
+    from audio_cache import cached_audio
+
+    with cached_audio(video_path, track_index=1) as wav_path:
+        run_whisper(wav_path)
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import struct
+import subprocess
+import threading
+from collections import ChainMap
+
+from cache_eviction import evict_lru
+from media_scheduler import DEMUX, run_media
+
+logger = logging.getLogger(__name__)
+
+#: Defaults suited to speech models and sync engines.
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_CHANNELS = 1
+
+_locks_guard = threading.Lock()
+_key_locks: dict[str, list] = {}  # key -> [lock, users]
+_pinned: dict[str, int] = {}  # path -> active users
+
+
+@contextlib.contextmanager
+def _key_lock(key: str):
+    """Per-key lock; entries are dropped once no thread uses them."""
+    with _locks_guard:
+        entry = _key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _key_locks.pop(key, None)
+
+
+def audio_cache_key(
+    file_path: str,
+    track_index: int = 0,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    channels: int = DEFAULT_CHANNELS,
+) -> str:
+    from media_fingerprint import get_fingerprint
+
+    identity = get_fingerprint(file_path) or f"{file_path}|{os.path.getmtime(file_path)}"
+    raw = f"{identity}|{track_index}|{sample_rate}|{channels}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:24]
+
+
+def cached_wav_key(wav_path: str) -> str | None:
+    """Cache key of a WAV handed out by this module; None for any other file."""
+    directory, name = os.path.split(os.path.abspath(wav_path))
+    if directory != os.path.abspath(_audio_cache_dir()) or not name.endswith(".wav"):
+        return None
+    return name[: -len(".wav")]
+
+
+def get_cached_audio(
+    file_path: str,
+    track_index: int | None = 0,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    channels: int = DEFAULT_CHANNELS,
+    priority: int | None = None,
+) -> str:
+    """Return the path of a WAV (s16le) for one audio track, decoding it on a miss.
+
+    Args:
+        file_path: Path to the media file
+        track_index: 0-based audio stream index (None = first audio track)
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+        priority: Media scheduler priority for the decode (default: caller's scope)
+
+    Raises:
+        RuntimeError: If the file is missing or ffmpeg fails
+    """
+    return _ensure(file_path, track_index, sample_rate, channels, priority, pin=False)
+
+
+@contextlib.contextmanager
+def cached_audio(
+    file_path: str,
+    track_index: int | None = 0,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    channels: int = DEFAULT_CHANNELS,
+    priority: int | None = None,
+):
+    """Like :func:`get_cached_audio`, keeping the file pinned inside the block."""
+    path = _ensure(file_path, track_index, sample_rate, channels, priority, pin=True)
+    try:
+        yield path
+    finally:
+        with _locks_guard:
+            _pinned[path] -= 1
+            if not _pinned[path]:
+                del _pinned[path]
+
+
+def _ensure(file_path, track_index, sample_rate, channels, priority, pin: bool) -> str:
+    if not os.path.exists(file_path):
+        raise RuntimeError(f"File not found: {file_path}")
+
+    track_index = track_index or 0
+    key = audio_cache_key(file_path, track_index, sample_rate, channels)
+    cache_dir = _audio_cache_dir()
+    path = os.path.join(cache_dir, f"{key}.wav")
+
+    with _key_lock(key):
+        # Check and pin atomically with respect to eviction
+        with _locks_guard:
+            hit = os.path.exists(path)
+            if hit and pin:
+                _pinned[path] = _pinned.get(path, 0) + 1
+        if hit:
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            return path
+        os.makedirs(cache_dir, exist_ok=True)
+        _decode(file_path, track_index, sample_rate, channels, path, priority)
+        if pin:
+            with _locks_guard:
+                _pinned[path] = _pinned.get(path, 0) + 1
+
+    _evict_audio_cache(cache_dir, keep=path)
+    return path
+
+
+def _read_wav_layout(f, wav_path: str) -> tuple[int, int, int, int]:
+    """Parse a WAV header up to the data chunk.
+
+    Returns:
+        (sample_rate, channels, bits_per_sample, data_size); *f* is left at
+        the first PCM byte
+    """
+    riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+    if riff != b"RIFF" or wave_id != b"WAVE":
+        raise RuntimeError(f"Not a WAV file: {wav_path}")
+    sample_rate = channels = bits = 0
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise RuntimeError(f"WAV file has no data chunk: {wav_path}")
+        chunk_id, size = struct.unpack("<4sI", header)
+        if chunk_id == b"data":
+            return sample_rate, channels, bits, size
+        if chunk_id == b"fmt ":
+            fmt = f.read(size + (size & 1))
+            _, channels, sample_rate = struct.unpack("<HHI", fmt[:8])
+            bits = struct.unpack("<H", fmt[14:16])[0]
+        else:
+            f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def iter_pcm(wav_path: str, chunk_bytes: int = 1024 * 1024):
+    """Yield the raw PCM payload of a cached WAV in chunks (header skipped)."""
+    with open(wav_path, "rb") as f:
+        _, _, _, size = _read_wav_layout(f, wav_path)
+        remaining = size
+        while remaining > 0:
+            data = f.read(min(chunk_bytes, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def load_pcm(wav_path: str, sample_rate: int = DEFAULT_SAMPLE_RATE):
+    """Return a cached mono s16le WAV as a float32 NumPy array in [-1, 1).
+
+    The payload is memory-mapped and converted in one pass, which is the
+    array speech models (faster-whisper) take directly, without the
+    container decode + resample they would otherwise run on the file.
+
+    Raises:
+        RuntimeError: If the file is not mono 16-bit PCM at *sample_rate*
+    """
+    import numpy as np
+
+    with open(wav_path, "rb") as f:
+        rate, channels, bits, size = _read_wav_layout(f, wav_path)
+        offset = f.tell()
+    if (rate, channels, bits) != (sample_rate, 1, 16):
+        raise RuntimeError(
+            f"Expected mono 16-bit PCM at {sample_rate} Hz, got {channels} ch / "
+            f"{bits} bit / {rate} Hz: {wav_path}"
+        )
+    samples = size // 2
+    if samples == 0:
+        return np.zeros(0, dtype=np.float32)
+    pcm = np.memmap(wav_path, dtype="<i2", mode="r", offset=offset, shape=(samples,))
+    try:
+        return np.multiply(pcm, 1 / 32768, dtype=np.float32)
+    finally:
+        del pcm
+
+
+def _decode(
+    file_path: str,
+    track_index: int,
+    sample_rate: int,
+    channels: int,
+    output_path: str,
+    priority: int | None,
+):
+    tmp_path = f"{output_path}.{threading.get_ident()}.tmp"
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-y",
+        "-i",
+        file_path,
+        "-map",
+        f"0:a:{track_index}",
+        "-vn",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "-ac",
+        str(channels),
+        "-f",
+        "wav",
+        tmp_path,
+    ]
+
+    logger.info(
+        "Decoding audio track %d of %s (%d Hz, %d ch)",
+        track_index,
+        os.path.basename(file_path),
+        sample_rate,
+        channels,
+    )
+    try:
+        proc = run_media(DEMUX, cmd, priority=priority, capture_output=True, timeout=300)
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found. Install ffmpeg to enable audio extraction.")
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise RuntimeError(f"ffmpeg audio extraction timed out (300s): {file_path}")
+
+    if proc.returncode != 0 or not os.path.exists(tmp_path):
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        stderr = (proc.stderr or b"").decode("utf-8", errors="replace")[:500]
+        raise RuntimeError(f"ffmpeg failed (code {proc.returncode}): {stderr}")
+    os.replace(tmp_path, output_path)
+    logger.info(
+        "Cached audio: %s (%.1f MB)",
+        os.path.basename(output_path),
+        os.path.getsize(output_path) / (1024 * 1024),
+    )
+
+
+def _audio_cache_dir() -> str:
+    from config import get_settings
+
+    return os.path.join(getattr(get_settings(), "config_dir", "/config"), "cache", "audio")
+
+
+def _evict_audio_cache(cache_dir: str, keep: str | None = None):
+    """Drop least recently used, unpinned tracks until audio_cache_max_mb fits."""
+    from config import get_settings
+
+    max_bytes = getattr(get_settings(), "audio_cache_max_mb", 0) * 1024 * 1024
+    # ChainMap is a live view, so pins taken during the scan are still honoured
+    pinned = ChainMap(_pinned, {keep: 1} if keep else {})
+    evict_lru(cache_dir, max_bytes, pinned=pinned, suffix=".wav", lock=_locks_guard)
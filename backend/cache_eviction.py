@@ -0,0 +1,81 @@
+"""Size-capped LRU eviction shared by the on-disk media caches.
+
+The audio, waveform, extraction and video segment caches all live under
+``<config_dir>/cache`` and use the same policy: an entry's mtime is touched
+on every hit, and once the cache exceeds its size cap the least recently
+used entries are removed until it fits again. Entries are either single
+files (audio WAVs, waveform pyramids) or per-media directories (extracted
+tracks, video segments); a directory's size is the sum of the files in it.
+"""
+
+import contextlib
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+
+def evict_lru(
+    root: str,
+    max_bytes: int,
+    pinned=(),
+    suffix: str | None = None,
+    lock=None,
+) -> int:
+    """Remove least recently used entries of *root* until it fits *max_bytes*.
+
+    Args:
+        root: Cache directory whose direct children are the entries.
+        max_bytes: Size cap; 0 or less disables eviction.
+        pinned: Container of entry paths that must not be removed (the entry
+            just served, entries in use by other threads).
+        suffix: Evict files ending with *suffix*; None evicts subdirectories.
+        lock: Optional lock held while checking *pinned* and removing an
+            entry, for caches that pin entries under that lock.
+
+    Returns:
+        Number of entries removed.
+    """
+    if max_bytes <= 0:
+        return 0
+    try:
+        entries = _scan(root, suffix)
+    except OSError as e:
+        logger.debug("Cache eviction in %s failed: %s", root, e)
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        with lock if lock is not None else contextlib.nullcontext():
+            if path in pinned:
+                continue
+            if suffix is None:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def _scan(root: str, suffix: str | None) -> list[tuple[float, int, str]]:
+    """(mtime, size, path) of every entry directly below *root*."""
+    entries = []
+    for entry in os.scandir(root):
+        if suffix is None:
+            if not entry.is_dir():
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+        elif entry.is_file() and entry.name.endswith(suffix):
+            size = entry.stat().st_size
+        else:
+            continue
+        entries.append((entry.stat().st_mtime, size, entry.path))
+    return entries
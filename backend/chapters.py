@@ -1,13 +1,11 @@
-"""Chapter extraction and caching for MKV/MP4 video files.
+"""Chapter extraction for MKV/MP4 video files.
 
 Provides get_chapters(video_path) -> list of chapter dicts with millisecond timestamps.
-Results are cached in chapter_cache DB table (invalidated by file mtime).
+Chapters come from the unified media metadata record (ass_utils.get_media_metadata),
+so the streams, chapters and duration of a file are probed and cached together.
 """
 
-import json
 import logging
-import subprocess
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -15,44 +13,27 @@ logger = logging.getLogger(__name__)
 def get_chapters(video_path: str) -> list[dict]:
     """Return chapter list for a video file.
 
-    Checks chapter_cache first (mtime-validated). On miss, runs ffprobe and caches.
-    Returns [] if the file has no chapters or ffprobe is unavailable.
+    Served from the cached media metadata record; probes only on a cache miss.
+    Returns [] if the file has no chapters or cannot be probed.
     """
-    import os
+    from ass_utils import get_media_metadata
 
     try:
-        mtime = os.path.getmtime(video_path)
-    except OSError:
-        return []
-
-    cached = _get_cached(video_path, mtime)
-    if cached is not None:
-        return cached
-
-    chapters = _probe_chapters(video_path)
-    _set_cached(video_path, mtime, chapters)
-    return chapters
-
-
-def _probe_chapters(video_path: str) -> list[dict]:
-    """Run ffprobe -show_chapters and return normalized chapter list."""
-    try:
-        result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_chapters", video_path],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        data = json.loads(result.stdout or "{}")
-        return [_normalize_chapter(c) for c in data.get("chapters", [])]
+        probe_data = get_media_metadata(video_path)
     except Exception as exc:
-        logger.debug("Chapter probe failed for %s: %s", video_path, exc)
+        logger.debug("Chapter lookup failed for %s: %s", video_path, exc)
         return []
+    raw = sorted(probe_data.get("chapters") or [], key=lambda c: float(c.get("start_time", 0)))
+    return [_normalize_chapter(c, position) for position, c in enumerate(raw)]
+
 
+def _normalize_chapter(raw: dict, position: int | None = None) -> dict:
+    """Convert raw ffprobe chapter dict to {id, title, start_ms, end_ms}.
 
-def _normalize_chapter(raw: dict) -> dict:
-    """Convert raw ffprobe chapter dict to {id, title, start_ms, end_ms}."""
-    idx = raw["id"]
+    Native probe results carry Matroska ChapterUIDs as ids, so the fallback
+    title uses the chapter's position when given.
+    """
+    idx = raw["id"] if position is None else position
     title = raw.get("tags", {}).get("title") or f"Chapter {idx + 1}"
     return {
         "id": idx,
@@ -60,37 +41,3 @@ def _normalize_chapter(raw: dict) -> dict:
         "start_ms": int(float(raw["start_time"]) * 1000),
         "end_ms": int(float(raw["end_time"]) * 1000),
     }
-
-
-def _get_cached(file_path: str, mtime: float) -> list[dict] | None:
-    """Return cached chapters if mtime matches, else None."""
-    from db.models.core import ChapterCache
-    from extensions import db
-
-    row = db.session.get(ChapterCache, file_path)
-    if row is None or row.mtime != mtime:
-        return None
-    return json.loads(row.chapters_json)
-
-
-def _set_cached(file_path: str, mtime: float, chapters: list[dict]) -> None:
-    """Write chapters to chapter_cache (upsert)."""
-    from db.models.core import ChapterCache
-    from extensions import db
-
-    now = datetime.utcnow().isoformat()
-    existing = db.session.get(ChapterCache, file_path)
-    if existing:
-        existing.mtime = mtime
-        existing.chapters_json = json.dumps(chapters)
-        existing.cached_at = now
-    else:
-        db.session.add(
-            ChapterCache(
-                file_path=file_path,
-                mtime=mtime,
-                chapters_json=json.dumps(chapters),
-                cached_at=now,
-            )
-        )
-    db.session.commit()
@@ -217,9 +217,10 @@ class CleanupScheduler:
                             rule_id=rule_id,
                         )
                         logger.info(
-                            "Scheduled dedup scan: %d files, %d duplicates",
+                            "Scheduled dedup scan: %d files, %d duplicates in %d groups",
                             result.get("total_scanned", 0),
                             result.get("duplicates_found", 0),
+                            result.get("duplicate_groups", 0),
                         )
 
                     elif rule_type == "orphaned":
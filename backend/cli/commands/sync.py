@@ -23,14 +23,14 @@ from cli.client import SublarrAPIError
 )
 @click.option(
     "--engine",
-    default="ffsubsync",
-    type=click.Choice(["ffsubsync", "alass"]),
+    default="native",
+    type=click.Choice(["native", "ffsubsync", "alass"]),
     show_default=True,
     help="Sync engine.",
 )
 @click.pass_context
 def sync(ctx: click.Context, subtitle: str, video: str, engine: str) -> None:
-    """Sync SUBTITLE timing against VIDEO using ffsubsync or alass."""
+    """Sync SUBTITLE timing against VIDEO using the native engine, ffsubsync or alass."""
     sub_path = os.path.abspath(subtitle)
     vid_path = os.path.abspath(video)
     client = ctx.obj["client"]
@@ -115,8 +115,28 @@ class Settings(BaseSettings):
         120  # Seconds before ffmpeg subtitle-extraction is killed (SUBLARR_FFMPEG_TIMEOUT)
     )
 
+    # Subtitle extraction cache: all text tracks of a file are extracted in one
+    # ffmpeg pass and kept by (path, mtime, stream index). 0 = disabled.
+    extract_cache_max_mb: int = 256
+
+    # On-demand HLS segment cache for the video player, LRU-evicted. 0 = unlimited.
+    video_cache_max_mb: int = 2048
+
+    # Decoded audio tracks (16 kHz mono WAV) shared by waveform, Whisper and sync,
+    # LRU-evicted. 0 = unlimited.
+    audio_cache_max_mb: int = 2048
+
+    # Waveform peak pyramids (one small file per audio track), LRU-evicted. 0 = unlimited.
+    waveform_cache_max_mb: int = 512
+
+    # Media process scheduler: caps concurrent ffmpeg/ffprobe/mediainfo/tesseract
+    # processes across all subsystems. 0 = auto (CPU count).
+    media_process_budget: int = 0
+    # Per-class overrides, e.g. "probe=8,demux=2,transcode=2,ocr=4" (empty = auto)
+    media_process_limits: str = ""
+
     # Scan Metadata Engine
-    scan_metadata_engine: str = "auto"  # "ffprobe" | "mediainfo" | "auto"
+    scan_metadata_engine: str = "auto"  # "ffprobe" | "mediainfo" | "native" | "auto"
     scan_metadata_max_workers: int = 4  # Parallel workers for batch metadata scans
 
     # Translation Workers
@@ -179,7 +199,9 @@ class Settings(BaseSettings):
 
     # Video Sync (ffsubsync / alass)
     auto_sync_after_download: bool = False  # Auto-sync subtitle against video after download
-    auto_sync_engine: str = "ffsubsync"  # Engine for auto-sync: "ffsubsync" | "alass"
+    # Engine for auto-sync: "native" (cached speech profile, falls back to
+    # ffsubsync/alass) | "ffsubsync" | "alass"
+    auto_sync_engine: str = "native"
 
     # Post-download subtitle processing pipeline
     auto_process_common_fixes: bool = False
@@ -206,6 +228,12 @@ class Settings(BaseSettings):
     wanted_search_interval_hours: int = 24  # 0 = disabled
     wanted_search_on_startup: bool = False
     wanted_search_max_items_per_run: int = 50
+    # "paced": continuous scheduler spreading searches over the interval;
+    # "burst": run search_all() once per interval
+    wanted_search_mode: str = "paced"
+    # Comma-separated priority tiers: recent, upgrades, never_searched
+    wanted_search_priority: str = "recent,upgrades,never_searched"
+    wanted_search_recent_days: int = 14  # "recent" tier window (by added_at)
 
     # Upgrade Scheduler
     upgrade_scan_interval_hours: int = 0  # 0 = disabled; user must opt in
@@ -591,6 +619,12 @@ class MediaServerSettings(_SettingsView):
             "path_mapping",
             "streaming_enabled",
             "ffmpeg_timeout",
+            "extract_cache_max_mb",
+            "video_cache_max_mb",
+            "audio_cache_max_mb",
+            "waveform_cache_max_mb",
+            "media_process_budget",
+            "media_process_limits",
             "scan_metadata_engine",
             "scan_metadata_max_workers",
         )
@@ -614,6 +648,9 @@ class ScanningSettings(_SettingsView):
             "wanted_search_interval_hours",
             "wanted_search_on_startup",
             "wanted_search_max_items_per_run",
+            "wanted_search_mode",
+            "wanted_search_priority",
+            "wanted_search_recent_days",
             "wanted_adaptive_backoff_enabled",
             "wanted_backoff_base_hours",
             "wanted_backoff_cap_hours",
@@ -41,9 +41,9 @@ def is_blacklisted(provider_name: str, subtitle_id: str) -> bool:
     return _get_repo().is_blacklisted(provider_name, subtitle_id)
 
 
-def get_blacklist_entries(page: int = 1, per_page: int = 50) -> dict:
-    """Get paginated blacklist entries."""
-    return _get_repo().get_blacklist_entries(page, per_page)
+def get_blacklist_entries(page: int = 1, per_page: int = 50, cursor: str = None) -> dict:
+    """Get paginated blacklist entries (offset by page, or keyset by cursor)."""
+    return _get_repo().get_blacklist_entries(page, per_page, cursor=cursor)
 
 
 def get_blacklist_count() -> int:
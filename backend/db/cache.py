@@ -17,9 +17,21 @@ def get_ffprobe_cache(file_path: str, mtime: float) -> dict | None:
     return _get_repo().get_ffprobe_cache(file_path, mtime)
 
 
-def set_ffprobe_cache(file_path: str, mtime: float, probe_data: dict):
+def prefetch_ffprobe_cache(file_paths) -> int:
+    """Bulk-load cached probe data for many files into the in-process LRU."""
+    return _get_repo().prefetch_ffprobe_cache(file_paths)
+
+
+def get_ffprobe_cache_by_fingerprint(fingerprint: str) -> dict | None:
+    """Get probe data cached under any path with the same content fingerprint."""
+    return _get_repo().get_ffprobe_cache_by_fingerprint(fingerprint)
+
+
+def set_ffprobe_cache(
+    file_path: str, mtime: float, probe_data: dict, fingerprint: str | None = None
+):
     """Cache ffprobe data for a file."""
-    return _get_repo().set_ffprobe_cache(file_path, mtime, probe_data)
+    return _get_repo().set_ffprobe_cache(file_path, mtime, probe_data, fingerprint)
 
 
 def clear_ffprobe_cache(file_path: str = None):
@@ -37,6 +49,16 @@ def get_ffprobe_cache_stats() -> dict:
     return _get_repo().get_ffprobe_cache_stats()
 
 
+def get_media_fingerprint(file_path: str, mtime: float, size: int) -> str | None:
+    """Get the remembered content fingerprint of an unchanged file."""
+    return _get_repo().get_media_fingerprint(file_path, mtime, size)
+
+
+def set_media_fingerprint(file_path: str, mtime: float, size: int, fingerprint: str):
+    """Remember the content fingerprint of a file."""
+    return _get_repo().set_media_fingerprint(file_path, mtime, size, fingerprint)
+
+
 def get_episode_history(file_path: str) -> list:
     """Get combined download + job history for a file path."""
     return _get_repo().get_episode_history(file_path)
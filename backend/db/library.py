@@ -23,6 +23,7 @@ def get_download_history(
     search: str = None,
     sort_by: str = "downloaded_at",
     sort_dir: str = "desc",
+    cursor: str = None,
 ) -> dict:
     """Get paginated download history with optional filters, sorting, and text search."""
     return _get_repo().get_download_history(
@@ -36,6 +37,7 @@ def get_download_history(
         search=search,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        cursor=cursor,
     )
 
 
@@ -0,0 +1,32 @@
+"""Add priority column to whisper_jobs for the prioritised worker pool.
+
+Revision ID: a1c2e3f4b5d6
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-18
+
+Queued jobs are picked lowest priority value first (0 = user request,
+20 = background backlog) and are resumed from this table after a restart.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "a1c2e3f4b5d6"
+down_revision = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("whisper_jobs") as batch_op:
+        batch_op.add_column(
+            sa.Column("priority", sa.Integer(), nullable=False, server_default="10")
+        )
+    op.create_index("idx_whisper_jobs_queue", "whisper_jobs", ["status", "priority", "created_at"])
+
+
+def downgrade():
+    op.drop_index("idx_whisper_jobs_queue", table_name="whisper_jobs")
+    with op.batch_alter_table("whisper_jobs") as batch_op:
+        batch_op.drop_column("priority")
@@ -0,0 +1,35 @@
+"""Add parsed_file_cache for standalone scans.
+
+Revision ID: b2d3e4f5a6c7
+Revises: a1c2e3f4b5d6
+Create Date: 2026-10-18
+
+Caches the guessit parse of each media file keyed by (path, size, mtime), so
+a standalone rescan only parses new or changed files.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b2d3e4f5a6c7"
+down_revision = "a1c2e3f4b5d6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "parsed_file_cache",
+        sa.Column("file_path", sa.Text(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("mtime", sa.Float(), nullable=False),
+        sa.Column("parser_version", sa.Integer(), nullable=False),
+        sa.Column("parsed_json", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("file_path"),
+    )
+
+
+def downgrade():
+    op.drop_table("parsed_file_cache")
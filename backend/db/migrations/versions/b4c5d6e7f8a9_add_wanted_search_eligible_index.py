@@ -0,0 +1,30 @@
+"""add_wanted_search_eligible_index
+
+Revision ID: b4c5d6e7f8a9
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-18
+
+Add composite index (status, retry_after, search_count) on wanted_items so the
+scheduled search can select only eligible rows in SQL instead of loading a page
+ordered by added_at and filtering backoff/attempt limits in Python.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4c5d6e7f8a9"
+down_revision = "a2b3c4d5e6f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "idx_wanted_search_eligible",
+        "wanted_items",
+        ["status", "retry_after", "search_count"],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_wanted_search_eligible", table_name="wanted_items")
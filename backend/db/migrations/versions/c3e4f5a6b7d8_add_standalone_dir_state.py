@@ -0,0 +1,37 @@
+"""Add standalone_dir_state for incremental standalone scans.
+
+Revision ID: c3e4f5a6b7d8
+Revises: b2d3e4f5a6c7
+Create Date: 2026-10-18
+
+One row per directory under a watched folder with its mtime fingerprint and
+listing, so a rescan only lists and reprocesses directories that changed.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3e4f5a6b7d8"
+down_revision = "b2d3e4f5a6c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "standalone_dir_state",
+        sa.Column("dir_path", sa.Text(), nullable=False),
+        sa.Column("folder_path", sa.Text(), nullable=False),
+        sa.Column("fingerprint", sa.Text(), nullable=False),
+        sa.Column("scan_key", sa.Text(), nullable=False),
+        sa.Column("listing_json", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("dir_path"),
+    )
+    op.create_index("idx_standalone_dir_state_folder", "standalone_dir_state", ["folder_path"])
+
+
+def downgrade():
+    op.drop_index("idx_standalone_dir_state_folder", table_name="standalone_dir_state")
+    op.drop_table("standalone_dir_state")
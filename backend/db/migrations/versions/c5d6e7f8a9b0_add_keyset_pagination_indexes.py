@@ -0,0 +1,32 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-18
+
+Add (sort column, id) indexes backing keyset pagination of the wanted,
+download history and blacklist lists, so deep pages seek instead of
+scanning and discarding OFFSET rows.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5d6e7f8a9b0"
+down_revision = "b4c5d6e7f8a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("idx_wanted_added_at", "wanted_items", ["added_at", "id"])
+    op.create_index(
+        "idx_subtitle_downloads_downloaded_at", "subtitle_downloads", ["downloaded_at", "id"]
+    )
+    op.create_index("idx_blacklist_added_at", "blacklist_entries", ["added_at", "id"])
+
+
+def downgrade():
+    op.drop_index("idx_blacklist_added_at", table_name="blacklist_entries")
+    op.drop_index("idx_subtitle_downloads_downloaded_at", table_name="subtitle_downloads")
+    op.drop_index("idx_wanted_added_at", table_name="wanted_items")
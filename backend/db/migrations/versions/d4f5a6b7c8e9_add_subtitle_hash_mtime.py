@@ -0,0 +1,29 @@
+"""Add mtime to subtitle_hashes for incremental dedup scans.
+
+Revision ID: d4f5a6b7c8e9
+Revises: c3e4f5a6b7d8
+Create Date: 2026-10-18
+
+A dedup scan skips files whose size and mtime still match their stored row
+and only re-hashes new or modified files. Existing rows have no mtime and
+are hashed once more on the next scan.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "d4f5a6b7c8e9"
+down_revision = "c3e4f5a6b7d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("subtitle_hashes") as batch_op:
+        batch_op.add_column(sa.Column("mtime", sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("subtitle_hashes") as batch_op:
+        batch_op.drop_column("mtime")
@@ -0,0 +1,44 @@
+"""add_subtitle_download_daily
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-18
+
+Daily download rollup per provider, format and series backing the
+/statistics endpoint. Existing history is backfilled on the next startup
+(see ProviderRepository.backfill_download_rollups).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "subtitle_download_daily",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("date", sa.Text(), nullable=False),
+        sa.Column("provider_name", sa.Text(), nullable=False),
+        sa.Column("format", sa.Text(), nullable=False, server_default=""),
+        sa.Column("series_title", sa.Text(), nullable=False, server_default=""),
+        sa.Column("download_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("low_score_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_download_at", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("date", "provider_name", "format", "series_title"),
+    )
+    op.create_index(
+        "idx_subtitle_download_daily_series", "subtitle_download_daily", ["series_title"]
+    )
+
+
+def downgrade():
+    op.drop_index("idx_subtitle_download_daily_series", table_name="subtitle_download_daily")
+    op.drop_table("subtitle_download_daily")
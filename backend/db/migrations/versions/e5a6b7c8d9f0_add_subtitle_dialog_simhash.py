@@ -0,0 +1,30 @@
+"""Add dialog_simhash to subtitle_hashes for near-duplicate detection.
+
+Revision ID: e5a6b7c8d9f0
+Revises: d4f5a6b7c8e9
+Create Date: 2026-10-18
+
+Stores a 64-bit SimHash of each subtitle's dialog text (timestamps and
+styling removed). Stored mtimes are cleared so the next dedup scan re-reads
+every file once and fills in the new column.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "e5a6b7c8d9f0"
+down_revision = "d4f5a6b7c8e9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("subtitle_hashes") as batch_op:
+        batch_op.add_column(sa.Column("dialog_simhash", sa.String(16), nullable=True))
+    op.execute("UPDATE subtitle_hashes SET mtime = NULL")
+
+
+def downgrade():
+    with op.batch_alter_table("subtitle_hashes") as batch_op:
+        batch_op.drop_column("dialog_simhash")
@@ -0,0 +1,53 @@
+"""add_media_fingerprints
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-18
+
+Content fingerprints for media files: a path -> fingerprint alias table plus
+a fingerprint column on ffprobe_cache and chapter_cache, so cached metadata
+survives renames, moves and hard links.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7f8a9b0c1d2"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "media_fingerprints",
+        sa.Column("file_path", sa.Text(), nullable=False),
+        sa.Column("mtime", sa.Float(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("fingerprint", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("file_path"),
+    )
+    op.create_index("idx_media_fingerprints_fingerprint", "media_fingerprints", ["fingerprint"])
+
+    with op.batch_alter_table("ffprobe_cache") as batch_op:
+        batch_op.add_column(sa.Column("fingerprint", sa.Text(), nullable=True))
+    op.create_index("idx_ffprobe_cache_fingerprint", "ffprobe_cache", ["fingerprint"])
+
+    with op.batch_alter_table("chapter_cache") as batch_op:
+        batch_op.add_column(sa.Column("fingerprint", sa.Text(), nullable=True))
+    op.create_index("idx_chapter_cache_fingerprint", "chapter_cache", ["fingerprint"])
+
+
+def downgrade():
+    op.drop_index("idx_chapter_cache_fingerprint", table_name="chapter_cache")
+    with op.batch_alter_table("chapter_cache") as batch_op:
+        batch_op.drop_column("fingerprint")
+
+    op.drop_index("idx_ffprobe_cache_fingerprint", table_name="ffprobe_cache")
+    with op.batch_alter_table("ffprobe_cache") as batch_op:
+        batch_op.drop_column("fingerprint")
+
+    op.drop_index("idx_media_fingerprints_fingerprint", table_name="media_fingerprints")
+    op.drop_table("media_fingerprints")
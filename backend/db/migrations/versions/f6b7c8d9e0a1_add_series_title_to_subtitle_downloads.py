@@ -0,0 +1,37 @@
+"""Add series_title to subtitle_downloads.
+
+Revision ID: f6b7c8d9e0a1
+Revises: e5a6b7c8d9f0
+Create Date: 2026-10-19
+
+Stores the series title a download was rolled up under, so deleting its
+history later finds the same subtitle_download_daily row even after the
+wanted item was renamed or removed. Existing rows take the title the
+rollup backfill used; the rollups are cleared so startup rebuilds them
+from the new column.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "f6b7c8d9e0a1"
+down_revision = "e5a6b7c8d9f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("subtitle_downloads") as batch_op:
+        batch_op.add_column(sa.Column("series_title", sa.Text(), server_default=""))
+    op.execute(
+        "UPDATE subtitle_downloads SET series_title = COALESCE("
+        "(SELECT MIN(w.title) FROM wanted_items w"
+        " WHERE w.file_path = subtitle_downloads.file_path AND w.title != ''), '')"
+    )
+    op.execute("DELETE FROM subtitle_download_daily")
+
+
+def downgrade():
+    with op.batch_alter_table("subtitle_downloads") as batch_op:
+        batch_op.drop_column("series_title")
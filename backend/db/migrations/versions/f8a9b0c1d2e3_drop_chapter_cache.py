@@ -0,0 +1,37 @@
+"""drop_chapter_cache
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-18
+
+Chapters are now part of the unified media metadata record in ffprobe_cache
+(streams, chapters and format are probed together), so the separate
+chapter_cache table is no longer used.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("idx_chapter_cache_fingerprint", table_name="chapter_cache")
+    op.drop_table("chapter_cache")
+
+
+def downgrade():
+    op.create_table(
+        "chapter_cache",
+        sa.Column("file_path", sa.Text(), nullable=False),
+        sa.Column("mtime", sa.Float(), nullable=False),
+        sa.Column("chapters_json", sa.Text(), nullable=False, server_default="[]"),
+        sa.Column("cached_at", sa.Text(), nullable=False),
+        sa.Column("fingerprint", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("file_path"),
+    )
+    op.create_index("idx_chapter_cache_fingerprint", "chapter_cache", ["fingerprint"])
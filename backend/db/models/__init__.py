@@ -17,6 +17,7 @@ from db.models.core import (
     FilterPreset,
     Job,
     LanguageProfile,
+    MediaFingerprint,
     MovieLanguageProfile,
     SeriesLanguageProfile,
     UpgradeHistory,
@@ -42,11 +43,14 @@ from db.models.providers import (
     ProviderStats,
     ScoringWeights,
     SubtitleDownload,
+    SubtitleDownloadDaily,
 )
 from db.models.quality import SubtitleHealthResult
 from db.models.standalone import (
     AnidbMapping,
     MetadataCache,
+    ParsedFileCache,
+    StandaloneDirState,
     StandaloneMovie,
     StandaloneSeries,
     WatchedFolder,
@@ -70,10 +74,12 @@ __all__ = [
     "SeriesLanguageProfile",
     "MovieLanguageProfile",
     "FfprobeCache",
+    "MediaFingerprint",
     "BlacklistEntry",
     # providers
     "ProviderCache",
     "SubtitleDownload",
+    "SubtitleDownloadDaily",
     "ProviderStats",
     "ProviderScoreModifier",
     "ScoringWeights",
@@ -92,6 +98,8 @@ __all__ = [
     "StandaloneSeries",
     "StandaloneMovie",
     "MetadataCache",
+    "ParsedFileCache",
+    "StandaloneDirState",
     "AnidbMapping",
     # quality
     "SubtitleHealthResult",
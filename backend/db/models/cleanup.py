@@ -4,7 +4,7 @@ Stores content hashes for duplicate detection, configurable cleanup rules,
 and execution history for tracking space reclamation over time.
 """
 
-from sqlalchemy import Index, Integer, String, Text
+from sqlalchemy import Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from extensions import db
@@ -22,6 +22,8 @@ class SubtitleHash(db.Model):
     format: Mapped[str] = mapped_column(String(10), nullable=False)
     language: Mapped[str] = mapped_column(String(10), nullable=True)
     line_count: Mapped[int] = mapped_column(Integer, nullable=True)
+    mtime: Mapped[float] = mapped_column(Float, nullable=True)
+    dialog_simhash: Mapped[str] = mapped_column(String(16), nullable=True)
     last_scanned: Mapped[str] = mapped_column(Text, nullable=False)
 
     __table_args__ = (
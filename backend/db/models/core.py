@@ -4,7 +4,7 @@ All column types and defaults match the existing SCHEMA DDL in db/__init__.py ex
 Timestamp columns use Text (not DateTime) to preserve backward compatibility.
 """
 
-from sqlalchemy import Float, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import BigInteger, Float, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from extensions import db
@@ -99,6 +99,11 @@ class WantedItem(db.Model):
         # Avoids SQLite merging two single-column index scans.
         Index("idx_wanted_composite", "status", "item_type"),
         Index("idx_wanted_retry_after", "retry_after"),
+        # Serves get_search_eligible_items(): equality on status, range on
+        # retry_after and search_count without touching backed-off rows.
+        Index("idx_wanted_search_eligible", "status", "retry_after", "search_count"),
+        # Keyset pagination seeks on (added_at, id) for the default list order.
+        Index("idx_wanted_added_at", "added_at", "id"),
         # Prevent duplicate entries for the same file + language + subtitle type.
         # The upsert logic relies on this for race-condition safety.
         UniqueConstraint(
@@ -181,23 +186,31 @@ class FfprobeCache(db.Model):
     mtime: Mapped[float] = mapped_column(Float, nullable=False)
     probe_data_json: Mapped[str] = mapped_column(Text, nullable=False)
     cached_at: Mapped[str] = mapped_column(Text, nullable=False)
+    fingerprint: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    __table_args__ = (Index("idx_ffprobe_cache_mtime", "mtime"),)
+    __table_args__ = (
+        Index("idx_ffprobe_cache_mtime", "mtime"),
+        Index("idx_ffprobe_cache_fingerprint", "fingerprint"),
+    )
 
 
-class ChapterCache(db.Model):
-    """Per-video chapter list cache, invalidated by file mtime.
+class MediaFingerprint(db.Model):
+    """Path -> content fingerprint alias, valid while (mtime, size) match.
 
-    chapters_json: JSON-encoded list of {"id", "title", "start_ms", "end_ms"} dicts.
-    Populated lazily when a video is opened in the sync UI.
+    The fingerprint (size + hash of the first and last MiB + Matroska segment
+    UID) identifies the media content, so probe and extraction cache entries
+    survive renames, moves and hard links. See media_fingerprint.py.
     """
 
-    __tablename__ = "chapter_cache"
+    __tablename__ = "media_fingerprints"
 
     file_path: Mapped[str] = mapped_column(Text, primary_key=True)
     mtime: Mapped[float] = mapped_column(Float, nullable=False)
-    chapters_json: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
-    cached_at: Mapped[str] = mapped_column(Text, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (Index("idx_media_fingerprints_fingerprint", "fingerprint"),)
 
 
 class BlacklistEntry(db.Model):
@@ -217,6 +230,7 @@ class BlacklistEntry(db.Model):
     __table_args__ = (
         UniqueConstraint("provider_name", "subtitle_id"),
         Index("idx_blacklist_provider", "provider_name", "subtitle_id"),
+        Index("idx_blacklist_added_at", "added_at", "id"),
     )
 
 
@@ -307,7 +321,7 @@ __all__ = [
     "SeriesLanguageProfile",
     "MovieLanguageProfile",
     "FfprobeCache",
-    "ChapterCache",
+    "MediaFingerprint",
     "BlacklistEntry",
     "FilterPreset",
     "AnidbAbsoluteMapping",
@@ -40,10 +40,39 @@ class SubtitleDownload(db.Model):
     file_path: Mapped[str] = mapped_column(Text, nullable=False)
     score: Mapped[int | None] = mapped_column(Integer, default=0)
     subtitle_type: Mapped[str | None] = mapped_column(Text, default="full")
+    series_title: Mapped[str | None] = mapped_column(Text, default="")
     source: Mapped[str | None] = mapped_column(Text, default="provider")  # "provider" | "whisper"
     downloaded_at: Mapped[str] = mapped_column(Text, nullable=False)
 
-    __table_args__ = (Index("idx_subtitle_downloads_path", "file_path"),)
+    __table_args__ = (
+        Index("idx_subtitle_downloads_path", "file_path"),
+        Index("idx_subtitle_downloads_downloaded_at", "downloaded_at", "id"),
+    )
+
+
+class SubtitleDownloadDaily(db.Model):
+    """Daily download rollup per provider, format and series.
+
+    Maintained incrementally by record_subtitle_download() so the statistics
+    page never aggregates the full subtitle_downloads history.
+    """
+
+    __tablename__ = "subtitle_download_daily"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    date: Mapped[str] = mapped_column(Text, nullable=False)  # YYYY-MM-DD (UTC)
+    provider_name: Mapped[str] = mapped_column(Text, nullable=False)
+    format: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    series_title: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    download_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    low_score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_download_at: Mapped[str | None] = mapped_column(Text)
+
+    __table_args__ = (
+        UniqueConstraint("date", "provider_name", "format", "series_title"),
+        Index("idx_subtitle_download_daily_series", "series_title"),
+    )
 
 
 class ProviderStats(db.Model):
@@ -95,6 +124,7 @@ class ScoringWeights(db.Model):
 __all__ = [
     "ProviderCache",
     "SubtitleDownload",
+    "SubtitleDownloadDaily",
     "ProviderStats",
     "ProviderScoreModifier",
     "ScoringWeights",
@@ -1,9 +1,10 @@
-"""Standalone mode ORM models: watched folders, series, movies, metadata cache, AniDB mappings.
+"""Standalone mode ORM models: watched folders, series, movies, metadata cache, AniDB mappings,
+parsed filename cache, directory scan state.
 
 All column types and defaults match the existing SCHEMA DDL in db/__init__.py exactly.
 """
 
-from sqlalchemy import Index, Integer, Text
+from sqlalchemy import BigInteger, Float, Index, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from extensions import db
@@ -98,10 +99,49 @@ class AnidbMapping(db.Model):
     __table_args__ = (Index("idx_anidb_mappings_anidb_id", "anidb_id"),)
 
 
+class ParsedFileCache(db.Model):
+    """guessit parse result of a media file, valid while (size, mtime) match.
+
+    parser_version is bumped with standalone.parser.PARSER_VERSION whenever
+    the parse output changes, which invalidates all rows at once.
+    """
+
+    __tablename__ = "parsed_file_cache"
+
+    file_path: Mapped[str] = mapped_column(Text, primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime: Mapped[float] = mapped_column(Float, nullable=False)
+    parser_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    parsed_json: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class StandaloneDirState(db.Model):
+    """Last seen listing of a directory under a watched folder (incremental scans).
+
+    fingerprint is the directory mtime; listing_json holds its subdirectories
+    and video files. scan_key captures the settings the listing was processed
+    with (target languages, extras filter), so changing them forces a rescan.
+    """
+
+    __tablename__ = "standalone_dir_state"
+
+    dir_path: Mapped[str] = mapped_column(Text, primary_key=True)
+    folder_path: Mapped[str] = mapped_column(Text, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(Text, nullable=False)
+    scan_key: Mapped[str] = mapped_column(Text, nullable=False)
+    listing_json: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (Index("idx_standalone_dir_state_folder", "folder_path"),)
+
+
 __all__ = [
     "WatchedFolder",
     "StandaloneSeries",
     "StandaloneMovie",
     "MetadataCache",
     "AnidbMapping",
+    "ParsedFileCache",
+    "StandaloneDirState",
 ]
@@ -103,6 +103,7 @@ class WhisperJob(db.Model):
     duration_seconds: Mapped[float | None] = mapped_column(Float, default=0.0)
     processing_time_ms: Mapped[float | None] = mapped_column(Float, default=0.0)
     audio_track_index: Mapped[int | None] = mapped_column(Integer, nullable=True, default=None)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=10, server_default="10")
     error: Mapped[str | None] = mapped_column(Text, default="")
     created_at: Mapped[str] = mapped_column(Text, nullable=False)
     started_at: Mapped[str | None] = mapped_column(Text, default="")
@@ -111,6 +112,7 @@ class WhisperJob(db.Model):
     __table_args__ = (
         Index("idx_whisper_jobs_status", "status"),
         Index("idx_whisper_jobs_created", "created_at"),
+        Index("idx_whisper_jobs_queue", "status", "priority", "created_at"),
     )
 
 
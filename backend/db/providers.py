@@ -98,6 +98,39 @@ def record_subtitle_download(
     return result
 
 
+def delete_subtitle_downloads(file_path: str) -> int:
+    """Delete the download history of a subtitle file (rollups are adjusted)."""
+    return _get_repo().delete_subtitle_downloads(file_path)
+
+
+# ---- Download Rollups ----
+
+
+def backfill_download_rollups() -> int:
+    """Rebuild the daily download rollups from the full download history."""
+    return _get_repo().backfill_download_rollups()
+
+
+def ensure_download_rollups() -> bool:
+    """Backfill download rollups once if history predates them."""
+    return _get_repo().ensure_download_rollups()
+
+
+def get_downloads_by_provider() -> list:
+    """All-time download count and average score per provider (from rollups)."""
+    return _get_repo().get_downloads_by_provider()
+
+
+def get_daily_download_quality(days: int) -> list:
+    """Per-day download quality for the last N days (from rollups)."""
+    return _get_repo().get_daily_download_quality(days)
+
+
+def get_series_download_quality(limit: int = 20) -> list:
+    """Top series by download count with score and formats (from rollups)."""
+    return _get_repo().get_series_download_quality(limit)
+
+
 # ---- Provider Statistics ----
 
 
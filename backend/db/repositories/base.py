@@ -4,12 +4,58 @@ All repository classes inherit from BaseRepository to get access to
 the Flask-SQLAlchemy request-scoped session and common CRUD helpers.
 """
 
+import base64
+import json
 import threading
+import time
 from contextlib import contextmanager
 from datetime import UTC, datetime
 
+from sqlalchemy import and_, func, or_
+
 from extensions import db
 
+#: Lifetime of cached COUNT(*) results for paginated list endpoints.
+COUNT_CACHE_TTL_SECONDS = 15
+
+
+class CountCache:
+    """Short-TTL cache for filtered COUNT(*) results.
+
+    List endpoints are polled by the UI; recounting 100k+ rows for every
+    page is the dominant cost. Entries are keyed by (table, filter key) and
+    expire after ``ttl`` seconds or when the table is invalidated by a write
+    that changes row membership (insert, delete, status change).
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL_SECONDS):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict = {}
+
+    def get_or_compute(self, table: str, key, compute) -> int:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get((table, key))
+            if hit is not None and hit[1] > now:
+                return hit[0]
+        value = compute()
+        with self._lock:
+            self._entries[(table, key)] = (value, now + self._ttl)
+        return value
+
+    def invalidate(self, table: str = None) -> None:
+        """Drop cached counts for *table* (or everything when None)."""
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+            else:
+                for k in [k for k in self._entries if k[0] == table]:
+                    del self._entries[k]
+
+
+count_cache = CountCache()
+
 
 class BaseRepository:
     """Base class for all repository classes.
@@ -83,3 +129,68 @@ class BaseRepository:
     def _now(self) -> str:
         """Return current UTC time as ISO format string."""
         return datetime.now(UTC).isoformat()
+
+    # ---- Keyset pagination ----
+
+    @staticmethod
+    def _encode_cursor(sort_value, row_id: int) -> str:
+        """Encode a (sort value, id) seek position as an opaque URL-safe token."""
+        raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """Decode a cursor from _encode_cursor(). Raises ValueError if malformed."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if sort_value is not None and not isinstance(sort_value, (str, int, float)):
+                raise ValueError("cursor sort value must be a scalar")
+            return sort_value, int(row_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    @staticmethod
+    def _keyset_sort_expr(column):
+        """Sort expression for keyset seeks; nullable columns are coalesced.
+
+        NULLs would break the (value, id) tuple comparison, so they sort as
+        0 / "" depending on the column type.
+        """
+        col = column.expression
+        if not col.nullable:
+            return column
+        try:
+            default = 0 if col.type.python_type in (int, float) else ""
+        except NotImplementedError:
+            default = ""
+        return func.coalesce(column, default)
+
+    def _keyset_order_and_seek(self, sort_expr, id_col, sort_dir: str, cursor: str | None):
+        """Return (order_by clauses, seek condition or None) for keyset pagination.
+
+        Rows are ordered by (sort_expr, id) in *sort_dir*; the seek condition
+        selects rows strictly after the cursor position.
+        """
+        if sort_dir == "asc":
+            order = [sort_expr.asc(), id_col.asc()]
+        else:
+            order = [sort_expr.desc(), id_col.desc()]
+        if not cursor:
+            return order, None
+        value, last_id = self._decode_cursor(cursor)
+        if sort_dir == "asc":
+            seek = or_(sort_expr > value, and_(sort_expr == value, id_col > last_id))
+        else:
+            seek = or_(sort_expr < value, and_(sort_expr == value, id_col < last_id))
+        return order, seek
+
+    def _next_cursor(self, rows: list, column, per_page: int) -> str | None:
+        """Cursor for the page after *rows* (fetched with limit per_page + 1)."""
+        if len(rows) <= per_page:
+            return None
+        last = rows[per_page - 1]
+        value = getattr(last, column.key)
+        if value is None:
+            value = 0 if column.expression.type.python_type in (int, float) else ""
+        return self._encode_cursor(value, last.id)
@@ -9,7 +9,7 @@ import logging
 from sqlalchemy import func, select
 
 from db.models.core import BlacklistEntry
-from db.repositories.base import BaseRepository
+from db.repositories.base import BaseRepository, count_cache
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,7 @@ class BlacklistRepository(BaseRepository):
         )
         self.session.add(entry)
         self._commit()
+        count_cache.invalidate("blacklist_entries")
         return entry.id or 0
 
     def remove_blacklist_entry(self, entry_id: int) -> bool:
@@ -63,6 +64,7 @@ class BlacklistRepository(BaseRepository):
             return False
         self.session.delete(entry)
         self._commit()
+        count_cache.invalidate("blacklist_entries")
         return True
 
     def clear_blacklist(self) -> int:
@@ -70,6 +72,7 @@ class BlacklistRepository(BaseRepository):
         count = self.session.execute(select(func.count()).select_from(BlacklistEntry)).scalar()
         self.session.query(BlacklistEntry).delete()
         self._commit()
+        count_cache.invalidate("blacklist_entries")
         return count or 0
 
     def is_blacklisted(self, provider_name: str, subtitle_id: str) -> bool:
@@ -82,31 +85,39 @@ class BlacklistRepository(BaseRepository):
         ).scalar_one_or_none()
         return result is not None
 
-    def get_blacklist_entries(self, page: int = 1, per_page: int = 50) -> dict:
-        """Get paginated blacklist entries.
+    def get_blacklist_entries(self, page: int = 1, per_page: int = 50, cursor: str = None) -> dict:
+        """Get paginated blacklist entries (newest first).
+
+        Uses OFFSET pagination by page unless *cursor* is given (use "" for the
+        first page), in which case rows are seeked by (added_at, id).
 
         Returns:
-            Dict with 'data', 'page', 'per_page', 'total', 'total_pages' keys.
-        """
-        offset = (page - 1) * per_page
+            Dict with 'data', 'page', 'per_page', 'total', 'total_pages',
+            'next_cursor' keys.
 
-        count = self.session.execute(select(func.count()).select_from(BlacklistEntry)).scalar() or 0
+        Raises:
+            ValueError: If *cursor* is malformed.
+        """
+        count = count_cache.get_or_compute("blacklist_entries", None, self.get_blacklist_count)
 
-        stmt = (
-            select(BlacklistEntry)
-            .order_by(BlacklistEntry.added_at.desc())
-            .limit(per_page)
-            .offset(offset)
+        order, seek = self._keyset_order_and_seek(
+            BlacklistEntry.added_at, BlacklistEntry.id, "desc", cursor
         )
+        stmt = select(BlacklistEntry).order_by(*order).limit(per_page + 1)
+        if cursor is None:
+            stmt = stmt.offset((page - 1) * per_page)
+        if seek is not None:
+            stmt = stmt.where(seek)
         entries = self.session.execute(stmt).scalars().all()
 
         total_pages = max(1, (count + per_page - 1) // per_page)
         return {
-            "data": [self._to_dict(e) for e in entries],
+            "data": [self._to_dict(e) for e in entries[:per_page]],
             "page": page,
             "per_page": per_page,
             "total": count,
             "total_pages": total_pages,
+            "next_cursor": self._next_cursor(entries, BlacklistEntry.added_at, per_page),
         }
 
     def get_blacklist_count(self) -> int:
@@ -5,19 +5,85 @@ operations. Covers ffprobe_cache, episode_history (cross-table), and
 anidb_mappings operations. Return types match the existing functions exactly.
 """
 
+import copy
 import json
 import logging
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 from sqlalchemy import delete, func, select
 
-from db.models.core import FfprobeCache, Job
+from db.models.core import FfprobeCache, Job, MediaFingerprint
 from db.models.providers import SubtitleDownload
 from db.models.standalone import AnidbMapping
 from db.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+#: Max probe results kept in the in-process LRU in front of ffprobe_cache.
+FFPROBE_LRU_SIZE = 4096
+
+#: Paths per IN (...) query when bulk-loading probe rows.
+_PREFETCH_CHUNK = 500
+
+
+class ProbeLRU:
+    """Thread-safe in-process LRU of probe results keyed by (file_path, mtime).
+
+    Sits in front of the ffprobe_cache table so repeated lookups of the same
+    files (scanner, series view, tracks, translator) skip the DB and JSON
+    decoding. Works outside an app context, so executor threads hit it too.
+    """
+
+    def __init__(self, maxsize: int = FFPROBE_LRU_SIZE):
+        self._maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path: str, mtime: float) -> dict | None:
+        with self._lock:
+            entry = self._data.get(file_path)
+            if entry is None or entry[0] != mtime:
+                self.misses += 1
+                return None
+            self._data.move_to_end(file_path)
+            self.hits += 1
+            probe_data = entry[1]
+        # Callers may mutate the result; never hand out the cached object
+        return copy.deepcopy(probe_data)
+
+    def put(self, file_path: str, mtime: float, probe_data: dict):
+        with self._lock:
+            self._data[file_path] = (mtime, copy.deepcopy(probe_data))
+            self._data.move_to_end(file_path)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, file_paths=None):
+        """Drop the given paths, or everything when file_paths is None."""
+        with self._lock:
+            if file_paths is None:
+                self._data.clear()
+            else:
+                for path in file_paths:
+                    self._data.pop(path, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self._maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+probe_lru = ProbeLRU()
+
 
 class CacheRepository(BaseRepository):
     """Repository for ffprobe_cache, episode history, and anidb_mappings operations."""
@@ -55,6 +121,10 @@ class CacheRepository(BaseRepository):
 
     def get_ffprobe_cache(self, file_path: str, mtime: float) -> dict | None:
         """Get cached ffprobe data if file hasn't changed (mtime matches)."""
+        cached = probe_lru.get(file_path, mtime)
+        if cached is not None:
+            return cached
+
         entry = self.session.execute(
             select(FfprobeCache.probe_data_json).where(
                 FfprobeCache.file_path == file_path,
@@ -62,6 +132,58 @@ class CacheRepository(BaseRepository):
             )
         ).scalar_one_or_none()
 
+        if entry:
+            try:
+                probe_data = json.loads(entry)
+            except json.JSONDecodeError:
+                return None
+            probe_lru.put(file_path, mtime, probe_data)
+            return probe_data
+        return None
+
+    def prefetch_ffprobe_cache(self, file_paths) -> int:
+        """Load cached probe rows for many files into the LRU with one query per chunk.
+
+        Rows whose mtime no longer matches the file on disk are skipped, so
+        only real misses are left for the probe engines.
+
+        Returns:
+            Number of files now served from the LRU.
+        """
+        mtimes = {}
+        for path in file_paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                continue
+        paths = [p for p in mtimes if probe_lru.get(p, mtimes[p]) is None]
+
+        loaded = len(mtimes) - len(paths)
+        for i in range(0, len(paths), _PREFETCH_CHUNK):
+            chunk = paths[i : i + _PREFETCH_CHUNK]
+            rows = self.session.execute(
+                select(
+                    FfprobeCache.file_path, FfprobeCache.mtime, FfprobeCache.probe_data_json
+                ).where(FfprobeCache.file_path.in_(chunk))
+            ).all()
+            for path, mtime, probe_json in rows:
+                if mtime != mtimes[path]:
+                    continue
+                try:
+                    probe_lru.put(path, mtime, json.loads(probe_json))
+                except json.JSONDecodeError:
+                    continue
+                loaded += 1
+        return loaded
+
+    def get_ffprobe_cache_by_fingerprint(self, fingerprint: str) -> dict | None:
+        """Return probe data cached under any path with the same content fingerprint."""
+        entry = self.session.execute(
+            select(FfprobeCache.probe_data_json)
+            .where(FfprobeCache.fingerprint == fingerprint)
+            .order_by(FfprobeCache.cached_at.desc())
+            .limit(1)
+        ).scalar_one_or_none()
         if entry:
             try:
                 return json.loads(entry)
@@ -69,8 +191,11 @@ class CacheRepository(BaseRepository):
                 return None
         return None
 
-    def set_ffprobe_cache(self, file_path: str, mtime: float, probe_data: dict):
-        """Cache ffprobe data for a file."""
+    def set_ffprobe_cache(
+        self, file_path: str, mtime: float, probe_data: dict, fingerprint: str | None = None
+    ):
+        """Cache ffprobe data for a file, optionally tagged with its content fingerprint."""
+        probe_lru.put(file_path, mtime, probe_data)
         now = self._now()
         probe_json = json.dumps(probe_data)
         entry = FfprobeCache(
@@ -78,6 +203,7 @@ class CacheRepository(BaseRepository):
             mtime=mtime,
             probe_data_json=probe_json,
             cached_at=now,
+            fingerprint=fingerprint,
         )
         self.session.merge(entry)
         self._commit()
@@ -85,10 +211,12 @@ class CacheRepository(BaseRepository):
     def clear_ffprobe_cache(self, file_path: str = None):
         """Clear ffprobe cache. If file_path is given, only clear that entry."""
         if file_path:
+            probe_lru.invalidate([file_path])
             entry = self.session.get(FfprobeCache, file_path)
             if entry:
                 self.session.delete(entry)
         else:
+            probe_lru.invalidate()
             self.session.execute(delete(FfprobeCache))
         self._commit()
 
@@ -98,18 +226,48 @@ class CacheRepository(BaseRepository):
         Returns:
             Dict with ``removed`` (int) and ``paths`` (list of removed paths).
         """
-        import os
-
         all_paths = self.session.execute(select(FfprobeCache.file_path)).scalars().all()
         stale = [p for p in all_paths if not os.path.exists(p)]
 
+        if not dry_run:
+            aliases = self.session.execute(select(MediaFingerprint.file_path)).scalars().all()
+            stale_aliases = [p for p in aliases if not os.path.exists(p)]
+            if stale_aliases:
+                self.session.execute(
+                    delete(MediaFingerprint).where(MediaFingerprint.file_path.in_(stale_aliases))
+                )
+                self._commit()
+
         if not dry_run and stale:
+            probe_lru.invalidate(stale)
             self.session.execute(delete(FfprobeCache).where(FfprobeCache.file_path.in_(stale)))
             self._commit()
             logger.info("Removed %d stale ffprobe cache entries", len(stale))
 
         return {"removed": len(stale), "paths": stale, "dry_run": dry_run}
 
+    # ---- Media fingerprints ----
+
+    def get_media_fingerprint(self, file_path: str, mtime: float, size: int) -> str | None:
+        """Return the remembered fingerprint if the file is unchanged (mtime and size match)."""
+        row = self.session.get(MediaFingerprint, file_path)
+        if row is None or row.mtime != mtime or row.size != size:
+            return None
+        return row.fingerprint
+
+    def set_media_fingerprint(self, file_path: str, mtime: float, size: int, fingerprint: str):
+        """Remember the content fingerprint of a file (path alias upsert)."""
+        self.session.merge(
+            MediaFingerprint(
+                file_path=file_path,
+                mtime=mtime,
+                size=size,
+                fingerprint=fingerprint,
+                updated_at=self._now(),
+            )
+        )
+        self._commit()
+
     def get_ffprobe_cache_stats(self) -> dict:
         """Return statistics about the ffprobe cache table."""
         total = self.session.execute(select(func.count()).select_from(FfprobeCache)).scalar() or 0
@@ -119,7 +277,12 @@ class CacheRepository(BaseRepository):
         newest = self.session.execute(
             select(FfprobeCache.cached_at).order_by(FfprobeCache.cached_at.desc()).limit(1)
         ).scalar_one_or_none()
-        return {"total_entries": total, "oldest_entry": oldest, "newest_entry": newest}
+        return {
+            "total_entries": total,
+            "oldest_entry": oldest,
+            "newest_entry": newest,
+            "memory": probe_lru.stats(),
+        }
 
     def get_cache_stats(self) -> dict:
         """Return combined cache statistics (provider cache + ffprobe cache)."""
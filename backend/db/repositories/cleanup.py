@@ -5,6 +5,8 @@ and disk space analysis aggregations.
 """
 
 import logging
+import os
+import threading
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import delete, func, select
@@ -14,6 +16,26 @@ from db.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Max bound parameters per IN (...) clause
+_IN_CHUNK = 500
+
+# Bumped on every subtitle_hashes write, so results derived from the whole
+# hash table (near-duplicate clusters) can be cached until it changes.
+_generation_lock = threading.Lock()
+_hash_generation = 0
+
+
+def hash_generation() -> int:
+    """Current generation of the subtitle_hashes table in this process."""
+    return _hash_generation
+
+
+def bump_hash_generation() -> None:
+    """Mark the subtitle_hashes table as changed (e.g. on app init)."""
+    global _hash_generation
+    with _generation_lock:
+        _hash_generation += 1
+
 
 class CleanupRepository(BaseRepository):
     """Repository for cleanup-related table operations."""
@@ -47,6 +69,7 @@ class CleanupRepository(BaseRepository):
             existing.line_count = line_count
             existing.last_scanned = now
             self._commit()
+            bump_hash_generation()
             return self._to_dict(existing)
 
         entry = SubtitleHash(
@@ -60,6 +83,7 @@ class CleanupRepository(BaseRepository):
         )
         self.session.add(entry)
         self._commit()
+        bump_hash_generation()
         return self._to_dict(entry)
 
     def get_hash_by_path(self, file_path: str) -> dict | None:
@@ -72,54 +96,158 @@ class CleanupRepository(BaseRepository):
         result = self.session.execute(stmt).scalar_one_or_none()
         return self._to_dict(result)
 
-    def get_duplicate_groups(self) -> list[dict]:
+    def get_hash_states(self, root: str) -> dict[str, dict]:
+        """Get the stored size, mtime and hash of every file below *root*.
+
+        Returns:
+            Dict keyed by file_path: {size, mtime, content_hash}.
+        """
+        prefix = root.rstrip("/\\") + os.sep
+        stmt = select(
+            SubtitleHash.file_path,
+            SubtitleHash.file_size,
+            SubtitleHash.mtime,
+            SubtitleHash.content_hash,
+        ).where(SubtitleHash.file_path.startswith(prefix, autoescape=True))
+        return {
+            row[0]: {"size": row[1], "mtime": row[2], "content_hash": row[3]}
+            for row in self.session.execute(stmt).all()
+        }
+
+    def upsert_hashes(self, entries: list[dict]) -> int:
+        """Insert or update many subtitle hash records with a single commit.
+
+        Args:
+            entries: Dicts with file_path, content_hash, file_size, format,
+                language, line_count, mtime and dialog_simhash.
+
+        Returns:
+            Number of records written.
+        """
+        if not entries:
+            return 0
+
+        paths = [e["file_path"] for e in entries]
+        existing = {}
+        for i in range(0, len(paths), _IN_CHUNK):
+            stmt = select(SubtitleHash).where(SubtitleHash.file_path.in_(paths[i : i + _IN_CHUNK]))
+            for row in self.session.execute(stmt).scalars():
+                existing[row.file_path] = row
+
+        now = self._now()
+        for e in entries:
+            row = existing.get(e["file_path"])
+            if row is None:
+                row = SubtitleHash(file_path=e["file_path"])
+                self.session.add(row)
+                existing[e["file_path"]] = row
+            row.content_hash = e["content_hash"]
+            row.file_size = e["file_size"]
+            row.format = e["format"]
+            row.language = e.get("language")
+            row.line_count = e.get("line_count")
+            row.mtime = e.get("mtime")
+            row.dialog_simhash = e.get("dialog_simhash")
+            row.last_scanned = now
+        self._commit()
+        bump_hash_generation()
+        return len(entries)
+
+    def get_duplicate_groups(self, content_hashes: list[str] | None = None) -> list[dict]:
         """Get groups of files sharing the same content hash.
 
         Only returns groups with 2+ files (actual duplicates).
 
+        Args:
+            content_hashes: Restrict the search to these hashes (e.g. the ones
+                touched by an incremental scan). None checks every hash.
+
         Returns:
             List of dicts: [{hash, count, files: [{path, size, format, language}]}]
         """
         # Find content hashes with multiple files
         dup_hashes_stmt = (
-            select(
-                SubtitleHash.content_hash,
-                func.count().label("cnt"),
-            )
+            select(SubtitleHash.content_hash)
             .group_by(SubtitleHash.content_hash)
             .having(func.count() > 1)
         )
-        dup_rows = self.session.execute(dup_hashes_stmt).all()
-
-        groups = []
-        for row in dup_rows:
-            content_hash = row[0]
-            count = row[1]
-
+        if content_hashes is None:
+            dup_hashes = self.session.execute(dup_hashes_stmt).scalars().all()
+        else:
+            wanted = sorted(set(content_hashes))
+            dup_hashes = []
+            for i in range(0, len(wanted), _IN_CHUNK):
+                stmt = dup_hashes_stmt.where(
+                    SubtitleHash.content_hash.in_(wanted[i : i + _IN_CHUNK])
+                )
+                dup_hashes.extend(self.session.execute(stmt).scalars().all())
+
+        files_by_hash: dict[str, list[dict]] = {}
+        for i in range(0, len(dup_hashes), _IN_CHUNK):
             files_stmt = (
                 select(SubtitleHash)
-                .where(SubtitleHash.content_hash == content_hash)
+                .where(SubtitleHash.content_hash.in_(dup_hashes[i : i + _IN_CHUNK]))
                 .order_by(SubtitleHash.file_path)
             )
-            files = self.session.execute(files_stmt).scalars().all()
-
-            groups.append(
-                {
-                    "hash": content_hash,
-                    "count": count,
-                    "files": [
-                        {
-                            "path": f.file_path,
-                            "size": f.file_size,
-                            "format": f.format,
-                            "language": f.language,
-                        }
-                        for f in files
-                    ],
-                }
-            )
+            for f in self.session.execute(files_stmt).scalars():
+                files_by_hash.setdefault(f.content_hash, []).append(
+                    {
+                        "path": f.file_path,
+                        "size": f.file_size,
+                        "format": f.format,
+                        "language": f.language,
+                    }
+                )
 
-        return groups
+        return [
+            {"hash": content_hash, "count": len(files), "files": files}
+            for content_hash in dup_hashes
+            if (files := files_by_hash.get(content_hash))
+        ]
+
+    def get_duplicate_totals(self) -> dict:
+        """Library-wide duplicate counts from the stored hashes.
+
+        Returns:
+            Dict with groups (hashes shared by 2+ files) and files (files in them).
+        """
+        per_hash = (
+            select(func.count().label("n"))
+            .select_from(SubtitleHash)
+            .group_by(SubtitleHash.content_hash)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        groups, files = self.session.execute(
+            select(func.count(), func.coalesce(func.sum(per_hash.c.n), 0))
+        ).one()
+        return {"groups": groups, "files": files}
+
+    def get_dialog_signatures(self) -> list[dict]:
+        """Get every file that has a dialog SimHash, for near-duplicate search.
+
+        Returns:
+            List of dicts: [{path, size, format, language, content_hash, simhash}]
+        """
+        stmt = select(
+            SubtitleHash.file_path,
+            SubtitleHash.file_size,
+            SubtitleHash.format,
+            SubtitleHash.language,
+            SubtitleHash.content_hash,
+            SubtitleHash.dialog_simhash,
+        ).where(SubtitleHash.dialog_simhash.is_not(None))
+        return [
+            {
+                "path": row[0],
+                "size": row[1],
+                "format": row[2],
+                "language": row[3],
+                "content_hash": row[4],
+                "simhash": row[5],
+            }
+            for row in self.session.execute(stmt).all()
+        ]
 
     def find_by_content_hash(self, content_hash: str) -> list[dict]:
         """Find all subtitle hash records matching the given SHA-256 hash.
@@ -145,10 +273,15 @@ class CleanupRepository(BaseRepository):
         if not file_paths:
             return 0
 
-        stmt = delete(SubtitleHash).where(SubtitleHash.file_path.in_(file_paths))
-        result = self.session.execute(stmt)
+        paths = list(file_paths)
+        deleted = 0
+        for i in range(0, len(paths), _IN_CHUNK):
+            stmt = delete(SubtitleHash).where(SubtitleHash.file_path.in_(paths[i : i + _IN_CHUNK]))
+            deleted += self.session.execute(stmt).rowcount
         self._commit()
-        return result.rowcount
+        if deleted:
+            bump_hash_generation()
+        return deleted
 
     def get_hash_stats(self) -> dict:
         """Get aggregate statistics about stored hashes.
@@ -7,11 +7,11 @@ operations. Return types match the existing functions exactly.
 import logging
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import asc, desc, func, or_, select
+from sqlalchemy import func, or_, select
 
 from db.models.core import UpgradeHistory
 from db.models.providers import SubtitleDownload
-from db.repositories.base import BaseRepository
+from db.repositories.base import BaseRepository, count_cache
 
 logger = logging.getLogger(__name__)
 
@@ -41,14 +41,20 @@ class LibraryRepository(BaseRepository):
         search: str = None,
         sort_by: str = "downloaded_at",
         sort_dir: str = "desc",
+        cursor: str = None,
     ) -> dict:
         """Get paginated download history with optional filters.
 
+        Uses OFFSET pagination by page unless *cursor* is given (use "" for the
+        first page), in which case rows are seeked by (sort column, id).
+
         Returns:
-            Dict with 'data', 'page', 'per_page', 'total', 'total_pages' keys.
-        """
-        offset = (page - 1) * per_page
+            Dict with 'data', 'page', 'per_page', 'total', 'total_pages',
+            'next_cursor' keys.
 
+        Raises:
+            ValueError: If *cursor* is malformed.
+        """
         # Build filter conditions
         conditions = []
         if provider:
@@ -72,29 +78,40 @@ class LibraryRepository(BaseRepository):
                 )
             )
 
-        # Count query
-        count_stmt = select(func.count()).select_from(SubtitleDownload)
-        for cond in conditions:
-            count_stmt = count_stmt.where(cond)
-        count = self.session.execute(count_stmt).scalar() or 0
+        # Count query (cached briefly; invalidated when downloads are recorded)
+        def _count():
+            count_stmt = select(func.count()).select_from(SubtitleDownload)
+            for cond in conditions:
+                count_stmt = count_stmt.where(cond)
+            return self.session.execute(count_stmt).scalar() or 0
+
+        count_key = (provider, language, format, score_min, score_max, search)
+        count = count_cache.get_or_compute("subtitle_downloads", count_key, _count)
 
-        # Determine sort column and direction
+        # Determine sort column and direction (id breaks ties deterministically)
         sort_col = self._HISTORY_SORT_FIELDS.get(sort_by, SubtitleDownload.downloaded_at)
-        order = asc(sort_col) if sort_dir == "asc" else desc(sort_col)
+        order, seek = self._keyset_order_and_seek(
+            self._keyset_sort_expr(sort_col), SubtitleDownload.id, sort_dir, cursor
+        )
 
         # Data query
-        data_stmt = select(SubtitleDownload).order_by(order).limit(per_page).offset(offset)
+        data_stmt = select(SubtitleDownload).order_by(*order).limit(per_page + 1)
+        if cursor is None:
+            data_stmt = data_stmt.offset((page - 1) * per_page)
+        if seek is not None:
+            data_stmt = data_stmt.where(seek)
         for cond in conditions:
             data_stmt = data_stmt.where(cond)
         entries = self.session.execute(data_stmt).scalars().all()
 
         total_pages = max(1, (count + per_page - 1) // per_page)
         return {
-            "data": [self._to_dict(e) for e in entries],
+            "data": [self._to_dict(e) for e in entries[:per_page]],
             "page": page,
             "per_page": per_page,
             "total": count,
             "total_pages": total_pages,
+            "next_cursor": self._next_cursor(entries, sort_col, per_page),
         }
 
     def get_download_stats(self) -> dict:
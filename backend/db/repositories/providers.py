@@ -10,13 +10,24 @@ existing formula: (old_avg * (total_searches - 1) + new_time) / total_searches.
 import logging
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import delete, func, select
-
-from db.models.providers import ProviderCache, ProviderStats, SubtitleDownload
-from db.repositories.base import BaseRepository
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db.models.core import WantedItem
+from db.models.providers import (
+    ProviderCache,
+    ProviderStats,
+    SubtitleDownload,
+    SubtitleDownloadDaily,
+)
+from db.repositories.base import BaseRepository, count_cache
 
 logger = logging.getLogger(__name__)
 
+# Downloads scoring below this count as quality issues in the statistics trend
+LOW_SCORE_THRESHOLD = 100
+
 
 class ProviderRepository(BaseRepository):
     """Repository for provider_cache, subtitle_downloads, and provider_stats tables."""
@@ -151,6 +162,7 @@ class ProviderRepository(BaseRepository):
             source: Source type -- "provider" (default) or "whisper".
         """
         now = self._now()
+        series_title = self._rollup_series_title(file_path)
         entry = SubtitleDownload(
             provider_name=provider_name,
             subtitle_id=subtitle_id,
@@ -158,11 +170,263 @@ class ProviderRepository(BaseRepository):
             format=fmt,
             file_path=file_path,
             score=score,
+            series_title=series_title,
             source=source,
             downloaded_at=now,
         )
         self.session.add(entry)
+        self._rollup_download(provider_name, fmt, series_title, score, now)
+        self._commit()
+        count_cache.invalidate("subtitle_downloads")
+
+    def delete_subtitle_downloads(self, file_path: str) -> int:
+        """Delete the download history of a subtitle file, keeping the rollups in step.
+
+        Returns:
+            Number of history rows deleted.
+        """
+        rows = (
+            self.session.execute(
+                select(SubtitleDownload).where(SubtitleDownload.file_path == file_path)
+            )
+            .scalars()
+            .all()
+        )
+        if not rows:
+            return 0
+        in_step = True
+        for row in rows:
+            in_step = self._unroll_download(row) and in_step
+            self.session.delete(row)
         self._commit()
+        count_cache.invalidate("subtitle_downloads")
+        if not in_step:
+            logger.warning(
+                "Download rollups out of step with history for %s, rebuilding", file_path
+            )
+            self.backfill_download_rollups()
+        return len(rows)
+
+    # ---- Download Rollups --------------------------------------------------------
+
+    def _rollup_series_title(self, file_path: str) -> str:
+        """Series title a download of *file_path* is rolled up under ("" if unknown)."""
+        return (
+            self.session.execute(
+                select(WantedItem.title)
+                .where(WantedItem.file_path == file_path, WantedItem.title != "")
+                .limit(1)
+            ).scalar()
+            or ""
+        )
+
+    @staticmethod
+    def _rollup_key(provider_name: str, fmt: str, series_title: str, downloaded_at: str) -> dict:
+        return {
+            "date": downloaded_at[:10],
+            "provider_name": provider_name,
+            "format": fmt or "",
+            "series_title": series_title,
+        }
+
+    def _rollup_download(
+        self, provider_name: str, fmt: str, series_title: str, score: int, downloaded_at: str
+    ):
+        """Add one download to its (day, provider, format, series) rollup row.
+
+        A single INSERT ... ON CONFLICT DO UPDATE, so concurrent downloads for
+        the same key neither collide on the unique key nor lose increments.
+        """
+        key = self._rollup_key(provider_name, fmt, series_title, downloaded_at)
+        score = score or 0
+        low = 1 if score < LOW_SCORE_THRESHOLD else 0
+        dialect = self.session.get_bind().dialect.name
+        upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = upsert(SubtitleDownloadDaily).values(
+            **key,
+            download_count=1,
+            score_sum=score,
+            low_score_count=low,
+            last_download_at=downloaded_at,
+        )
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["date", "provider_name", "format", "series_title"],
+                set_={
+                    "download_count": SubtitleDownloadDaily.download_count + 1,
+                    "score_sum": SubtitleDownloadDaily.score_sum + score,
+                    "low_score_count": SubtitleDownloadDaily.low_score_count + low,
+                    "last_download_at": stmt.excluded.last_download_at,
+                },
+            )
+        )
+
+    def _unroll_download(self, download: SubtitleDownload) -> bool:
+        """Take one deleted download back out of its rollup row.
+
+        Returns False when the rollup row it was counted in does not exist.
+        """
+        key = self._rollup_key(
+            download.provider_name,
+            download.format,
+            download.series_title or "",
+            download.downloaded_at,
+        )
+        score = download.score or 0
+        found = self.session.execute(
+            update(SubtitleDownloadDaily)
+            .filter_by(**key)
+            .values(
+                download_count=SubtitleDownloadDaily.download_count - 1,
+                score_sum=SubtitleDownloadDaily.score_sum - score,
+                low_score_count=SubtitleDownloadDaily.low_score_count
+                - (1 if score < LOW_SCORE_THRESHOLD else 0),
+            )
+        ).rowcount
+        self.session.execute(
+            delete(SubtitleDownloadDaily)
+            .filter_by(**key)
+            .where(SubtitleDownloadDaily.download_count <= 0)
+        )
+        return found > 0
+
+    def backfill_download_rollups(self) -> int:
+        """Rebuild subtitle_download_daily from the full subtitle_downloads history.
+
+        Returns the number of rollup rows written.
+        """
+        day = func.substr(SubtitleDownload.downloaded_at, 1, 10)
+        fmt = func.coalesce(SubtitleDownload.format, "")
+        series_title = func.coalesce(SubtitleDownload.series_title, "")
+        score = func.coalesce(SubtitleDownload.score, 0)
+        source = select(
+            day,
+            SubtitleDownload.provider_name,
+            fmt,
+            series_title,
+            func.count(),
+            func.sum(score),
+            func.sum(case((score < LOW_SCORE_THRESHOLD, 1), else_=0)),
+            func.max(SubtitleDownload.downloaded_at),
+        ).group_by(day, SubtitleDownload.provider_name, fmt, series_title)
+
+        self.session.execute(delete(SubtitleDownloadDaily))
+        self.session.execute(
+            insert(SubtitleDownloadDaily).from_select(
+                [
+                    "date",
+                    "provider_name",
+                    "format",
+                    "series_title",
+                    "download_count",
+                    "score_sum",
+                    "low_score_count",
+                    "last_download_at",
+                ],
+                source,
+            )
+        )
+        self._commit()
+        return self.session.execute(
+            select(func.count()).select_from(SubtitleDownloadDaily)
+        ).scalar()
+
+    def ensure_download_rollups(self) -> bool:
+        """Backfill rollups once for history recorded before they existed.
+
+        Returns True if a backfill ran.
+        """
+        has_rollups = self.session.execute(select(SubtitleDownloadDaily.id).limit(1)).first()
+        if has_rollups:
+            return False
+        has_downloads = self.session.execute(select(SubtitleDownload.id).limit(1)).first()
+        if not has_downloads:
+            return False
+        self.backfill_download_rollups()
+        return True
+
+    def get_downloads_by_provider(self) -> list:
+        """All-time download count and average score per provider."""
+        rows = self.session.execute(
+            select(
+                SubtitleDownloadDaily.provider_name,
+                func.sum(SubtitleDownloadDaily.download_count),
+                func.sum(SubtitleDownloadDaily.score_sum),
+            ).group_by(SubtitleDownloadDaily.provider_name)
+        ).all()
+        return [
+            {
+                "provider_name": name,
+                "count": count or 0,
+                "avg_score": round(score_sum / count, 1) if count else 0,
+            }
+            for name, count, score_sum in rows
+        ]
+
+    def get_daily_download_quality(self, days: int) -> list:
+        """Per-day download count, average score and low-score count for the last N days."""
+        cutoff = (datetime.now(UTC) - timedelta(days=days)).strftime("%Y-%m-%d")
+        rows = self.session.execute(
+            select(
+                SubtitleDownloadDaily.date,
+                func.sum(SubtitleDownloadDaily.download_count),
+                func.sum(SubtitleDownloadDaily.score_sum),
+                func.sum(SubtitleDownloadDaily.low_score_count),
+            )
+            .where(SubtitleDownloadDaily.date >= cutoff)
+            .group_by(SubtitleDownloadDaily.date)
+            .order_by(SubtitleDownloadDaily.date.asc())
+        ).all()
+        return [
+            {
+                "date": date,
+                "avg_score": score_sum / count if count else 0,
+                "download_count": count or 0,
+                "low_score_count": low or 0,
+            }
+            for date, count, score_sum, low in rows
+        ]
+
+    def get_series_download_quality(self, limit: int = 20) -> list:
+        """Series with the most downloads, with average score and formats seen."""
+        total = func.sum(SubtitleDownloadDaily.download_count)
+        rows = self.session.execute(
+            select(
+                SubtitleDownloadDaily.series_title,
+                total,
+                func.sum(SubtitleDownloadDaily.score_sum),
+                func.max(SubtitleDownloadDaily.last_download_at),
+            )
+            .where(SubtitleDownloadDaily.series_title != "")
+            .group_by(SubtitleDownloadDaily.series_title)
+            .order_by(total.desc())
+            .limit(limit)
+        ).all()
+        if not rows:
+            return []
+
+        formats: dict = {}
+        fmt_rows = self.session.execute(
+            select(SubtitleDownloadDaily.series_title, SubtitleDownloadDaily.format)
+            .where(
+                SubtitleDownloadDaily.series_title.in_([r[0] for r in rows]),
+                SubtitleDownloadDaily.format != "",
+            )
+            .distinct()
+        ).all()
+        for title, fmt in fmt_rows:
+            formats.setdefault(title, []).append(fmt)
+
+        return [
+            {
+                "title": title,
+                "avg_score": score_sum / count if count else 0,
+                "download_count": count or 0,
+                "last_download": last,
+                "formats": sorted(formats.get(title, [])),
+            }
+            for title, count, score_sum, last in rows
+        ]
 
     def get_provider_download_stats(self) -> dict:
         """Get download counts per provider, broken down by format."""
@@ -3,6 +3,11 @@
 SQLite backend:  FTS5 virtual tables with trigram tokenizer.
 PostgreSQL backend: regular tables with pg_trgm GIN indexes.
 The LIKE-based search_all() queries are compatible with both.
+
+The search tables are kept in sync incrementally by database triggers on
+subtitle_downloads and wanted_items, so writes show up in search right away
+and startup no longer rebuilds the whole index. A full rebuild is only run
+when SEARCH_INDEX_VERSION changes (or on demand as a maintenance action).
 """
 
 import logging
@@ -13,6 +18,13 @@ from db.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+#: Bump when the search table layout or trigger logic changes; the next
+#: startup then runs one full rebuild to bring existing rows in line.
+SEARCH_INDEX_VERSION = 2
+
+_META_SCHEMA = """CREATE TABLE IF NOT EXISTS search_index_meta (
+   key TEXT PRIMARY KEY, value TEXT)"""
+
 # SQLite FTS5 virtual table schema
 _SQLITE_SEARCH_SCHEMA = [
     """CREATE VIRTUAL TABLE IF NOT EXISTS search_series
@@ -21,22 +33,141 @@ _SQLITE_SEARCH_SCHEMA = [
        USING fts5(id UNINDEXED, series_id UNINDEXED, title, season_episode, tokenize="trigram")""",
     """CREATE VIRTUAL TABLE IF NOT EXISTS search_subtitles
        USING fts5(id UNINDEXED, file_path, provider_name, language, tokenize="trigram")""",
+    _META_SCHEMA,
 ]
 
+# SQLite triggers. FTS rows use rowid = source id so a row can be replaced
+# or removed by rowid lookup instead of scanning the UNINDEXED id column.
+# search_series holds MIN(title) per series, so it is recomputed for the
+# affected series ids rather than patched.
+_SQLITE_SERIES_REFRESH = """
+  DELETE FROM search_series WHERE rowid = {ref}.sonarr_series_id;
+  INSERT INTO search_series(rowid, id, title)
+  SELECT sonarr_series_id, sonarr_series_id, MIN(title) FROM wanted_items
+  WHERE sonarr_series_id = {ref}.sonarr_series_id AND title IS NOT NULL
+  GROUP BY sonarr_series_id;"""
+
+_SQLITE_EPISODE_INSERT = """
+  INSERT INTO search_episodes(rowid, id, series_id, title, season_episode)
+  SELECT NEW.id, NEW.id, COALESCE(NEW.sonarr_series_id, NEW.radarr_movie_id, 0),
+         NEW.title, NEW.season_episode
+  WHERE NEW.title IS NOT NULL AND NEW.title != '';"""
+
+_SQLITE_SUBTITLE_INSERT = """
+  INSERT INTO search_subtitles(rowid, id, file_path, provider_name, language)
+  VALUES (NEW.id, NEW.id, NEW.file_path, NEW.provider_name, NEW.language);"""
+
+_SQLITE_SEARCH_TRIGGERS = {
+    "trg_search_subtitles_insert": (
+        "AFTER INSERT ON subtitle_downloads BEGIN" + _SQLITE_SUBTITLE_INSERT + "\nEND"
+    ),
+    "trg_search_subtitles_update": (
+        "AFTER UPDATE OF file_path, provider_name, language ON subtitle_downloads BEGIN"
+        "\n  DELETE FROM search_subtitles WHERE rowid = OLD.id;" + _SQLITE_SUBTITLE_INSERT + "\nEND"
+    ),
+    "trg_search_subtitles_delete": (
+        "AFTER DELETE ON subtitle_downloads BEGIN"
+        "\n  DELETE FROM search_subtitles WHERE rowid = OLD.id;\nEND"
+    ),
+    "trg_search_wanted_insert": (
+        "AFTER INSERT ON wanted_items BEGIN"
+        + _SQLITE_EPISODE_INSERT
+        + _SQLITE_SERIES_REFRESH.format(ref="NEW")
+        + "\nEND"
+    ),
+    "trg_search_wanted_update": (
+        "AFTER UPDATE OF title, season_episode, sonarr_series_id, radarr_movie_id"
+        " ON wanted_items BEGIN"
+        "\n  DELETE FROM search_episodes WHERE rowid = OLD.id;"
+        + _SQLITE_EPISODE_INSERT
+        + _SQLITE_SERIES_REFRESH.format(ref="OLD")
+        + _SQLITE_SERIES_REFRESH.format(ref="NEW")
+        + "\nEND"
+    ),
+    "trg_search_wanted_delete": (
+        "AFTER DELETE ON wanted_items BEGIN"
+        "\n  DELETE FROM search_episodes WHERE rowid = OLD.id;"
+        + _SQLITE_SERIES_REFRESH.format(ref="OLD")
+        + "\nEND"
+    ),
+}
+
 # PostgreSQL schema: regular tables + pg_trgm GIN indexes for LIKE performance
 _POSTGRESQL_SEARCH_SCHEMA = [
     "CREATE EXTENSION IF NOT EXISTS pg_trgm",
     """CREATE TABLE IF NOT EXISTS search_series (
        id INTEGER NOT NULL, title TEXT)""",
     "CREATE INDEX IF NOT EXISTS idx_ss_title ON search_series USING gin(title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_ss_id ON search_series (id)",
     """CREATE TABLE IF NOT EXISTS search_episodes (
        id INTEGER NOT NULL, series_id INTEGER, title TEXT, season_episode TEXT)""",
     "CREATE INDEX IF NOT EXISTS idx_se_title ON search_episodes USING gin(title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_se_id ON search_episodes (id)",
     """CREATE TABLE IF NOT EXISTS search_subtitles (
        id INTEGER NOT NULL, file_path TEXT, provider_name TEXT, language TEXT)""",
     "CREATE INDEX IF NOT EXISTS idx_st_path ON search_subtitles USING gin(file_path gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_st_id ON search_subtitles (id)",
+    _META_SCHEMA,
 ]
 
+# PostgreSQL trigger functions (same semantics as the SQLite triggers)
+_POSTGRESQL_SEARCH_FUNCTIONS = [
+    """CREATE OR REPLACE FUNCTION search_refresh_series(sid INTEGER) RETURNS void AS $$
+    BEGIN
+        IF sid IS NULL THEN
+            RETURN;
+        END IF;
+        DELETE FROM search_series WHERE id = sid;
+        INSERT INTO search_series(id, title)
+        SELECT sonarr_series_id, MIN(title) FROM wanted_items
+        WHERE sonarr_series_id = sid AND title IS NOT NULL
+        GROUP BY sonarr_series_id;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION search_sync_subtitles() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' OR TG_OP = 'DELETE' THEN
+            DELETE FROM search_subtitles WHERE id = OLD.id;
+        END IF;
+        IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+            INSERT INTO search_subtitles(id, file_path, provider_name, language)
+            VALUES (NEW.id, NEW.file_path, NEW.provider_name, NEW.language);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION search_sync_wanted() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' OR TG_OP = 'DELETE' THEN
+            DELETE FROM search_episodes WHERE id = OLD.id;
+            PERFORM search_refresh_series(OLD.sonarr_series_id);
+        END IF;
+        IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+            IF NEW.title IS NOT NULL AND NEW.title != '' THEN
+                INSERT INTO search_episodes(id, series_id, title, season_episode)
+                VALUES (NEW.id, COALESCE(NEW.sonarr_series_id, NEW.radarr_movie_id, 0),
+                        NEW.title, NEW.season_episode);
+            END IF;
+            PERFORM search_refresh_series(NEW.sonarr_series_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+]
+
+_POSTGRESQL_SEARCH_TRIGGERS = {
+    "trg_search_subtitles": (
+        "subtitle_downloads",
+        "AFTER INSERT OR DELETE OR UPDATE OF file_path, provider_name, language"
+        " ON subtitle_downloads FOR EACH ROW EXECUTE FUNCTION search_sync_subtitles()",
+    ),
+    "trg_search_wanted": (
+        "wanted_items",
+        "AFTER INSERT OR DELETE OR UPDATE OF title, season_episode, sonarr_series_id,"
+        " radarr_movie_id ON wanted_items FOR EACH ROW EXECUTE FUNCTION search_sync_wanted()",
+    ),
+}
+
 
 def _get_engine():
     """Get the SQLAlchemy engine from Flask-SQLAlchemy extension."""
@@ -53,30 +184,72 @@ class SearchRepository(BaseRepository):
     """Full-text search across series, episodes, and subtitles."""
 
     def init_search_tables(self) -> None:
-        """Create search tables. Call from app.py after db.create_all()."""
+        """Create search tables and sync triggers. Call from app.py after db.create_all().
+
+        Triggers are dropped and recreated every time so that changed trigger
+        logic takes effect without a manual migration.
+        """
         engine = _get_engine()
-        stmts = _POSTGRESQL_SEARCH_SCHEMA if _is_postgresql(engine) else _SQLITE_SEARCH_SCHEMA
         with engine.connect() as conn:
-            for stmt in stmts:
-                conn.execute(text(stmt))
+            if _is_postgresql(engine):
+                for stmt in _POSTGRESQL_SEARCH_SCHEMA + _POSTGRESQL_SEARCH_FUNCTIONS:
+                    conn.execute(text(stmt))
+                for name, (table, body) in _POSTGRESQL_SEARCH_TRIGGERS.items():
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+                    conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+            else:
+                for stmt in _SQLITE_SEARCH_SCHEMA:
+                    conn.execute(text(stmt))
+                for name, body in _SQLITE_SEARCH_TRIGGERS.items():
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+                    conn.execute(text(f"CREATE TRIGGER {name} {body}"))
             conn.commit()
 
-    def rebuild_index(self) -> None:
-        """Rebuild search tables from subtitle_downloads. Call after library sync."""
+    def get_index_version(self) -> int:
+        """Return the search index version stored by the last full rebuild (0 if none)."""
         with _get_engine().connect() as conn:
+            value = conn.execute(
+                text("SELECT value FROM search_index_meta WHERE key = 'version'")
+            ).scalar()
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+
+    def ensure_index(self) -> bool:
+        """Rebuild the index only if it was built for another SEARCH_INDEX_VERSION.
+
+        Returns True if a rebuild ran.
+        """
+        if self.get_index_version() == SEARCH_INDEX_VERSION:
+            return False
+        self.rebuild_index()
+        return True
+
+    def rebuild_index(self) -> None:
+        """Rebuild search tables from scratch.
+
+        Maintenance action only: the triggers keep the index current, so this
+        is needed after a SEARCH_INDEX_VERSION bump or to repair drift.
+        """
+        engine = _get_engine()
+        # FTS5 rows are keyed by rowid = source id (see the SQLite triggers)
+        rowid_col, rowid_val = ("", "") if _is_postgresql(engine) else ("rowid, ", "id, ")
+        series_rowid_val = "" if _is_postgresql(engine) else "sonarr_series_id, "
+        with engine.connect() as conn:
             conn.execute(text("DELETE FROM search_subtitles"))
             conn.execute(
-                text("""
-                INSERT INTO search_subtitles(id, file_path, provider_name, language)
-                SELECT id, file_path, provider_name, language
+                text(f"""
+                INSERT INTO search_subtitles({rowid_col}id, file_path, provider_name, language)
+                SELECT {rowid_val}id, file_path, provider_name, language
                 FROM subtitle_downloads
             """)
             )
             conn.execute(text("DELETE FROM search_episodes"))
             conn.execute(
-                text("""
-                INSERT INTO search_episodes(id, series_id, title, season_episode)
-                SELECT id, COALESCE(sonarr_series_id, radarr_movie_id, 0),
+                text(f"""
+                INSERT INTO search_episodes({rowid_col}id, series_id, title, season_episode)
+                SELECT {rowid_val}id, COALESCE(sonarr_series_id, radarr_movie_id, 0),
                        title, season_episode
                 FROM wanted_items
                 WHERE title IS NOT NULL AND title != ''
@@ -84,14 +257,19 @@ class SearchRepository(BaseRepository):
             )
             conn.execute(text("DELETE FROM search_series"))
             conn.execute(
-                text("""
-                INSERT INTO search_series(id, title)
-                SELECT sonarr_series_id, MIN(title)
+                text(f"""
+                INSERT INTO search_series({rowid_col}id, title)
+                SELECT {series_rowid_val}sonarr_series_id, MIN(title)
                 FROM wanted_items
                 WHERE sonarr_series_id IS NOT NULL AND title IS NOT NULL
                 GROUP BY sonarr_series_id
             """)
             )
+            conn.execute(text("DELETE FROM search_index_meta WHERE key = 'version'"))
+            conn.execute(
+                text("INSERT INTO search_index_meta(key, value) VALUES ('version', :v)"),
+                {"v": str(SEARCH_INDEX_VERSION)},
+            )
             conn.commit()
 
     def search_all(self, query: str, limit: int = 20) -> dict:
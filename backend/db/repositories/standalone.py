@@ -2,10 +2,11 @@
 
 Replaces the raw sqlite3 queries in db/standalone.py with SQLAlchemy ORM operations.
 CRUD for watched_folders, standalone_series, standalone_movies, metadata_cache,
-and anidb_mappings tables. Return types match the existing functions exactly.
+anidb_mappings, parsed_file_cache and standalone_dir_state tables. Return types match the existing functions exactly.
 """
 
 import logging
+import os
 from datetime import datetime, timedelta
 
 from sqlalchemy import delete, select
@@ -13,6 +14,8 @@ from sqlalchemy import delete, select
 from db.models.standalone import (
     AnidbMapping,
     MetadataCache,
+    ParsedFileCache,
+    StandaloneDirState,
     StandaloneMovie,
     StandaloneSeries,
     WatchedFolder,
@@ -21,6 +24,9 @@ from db.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
 
 class StandaloneRepository(BaseRepository):
     """Repository for standalone mode table operations."""
@@ -353,6 +359,184 @@ class StandaloneRepository(BaseRepository):
         self._commit()
         return result.rowcount
 
+    # ---- Parsed File Cache -------------------------------------------------------
+
+    def get_parsed_files(self, file_paths: list[str], parser_version: int) -> dict[str, dict]:
+        """Cached parse rows for *file_paths* written by *parser_version*.
+
+        Returns:
+            Dict mapping file_path to {"size", "mtime", "parsed_json"}; the
+            caller compares size and mtime against the file on disk.
+        """
+        rows: dict[str, dict] = {}
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            chunk = file_paths[i : i + _IN_CHUNK]
+            for entry in self.session.execute(
+                select(ParsedFileCache).where(
+                    ParsedFileCache.file_path.in_(chunk),
+                    ParsedFileCache.parser_version == parser_version,
+                )
+            ).scalars():
+                rows[entry.file_path] = {
+                    "size": entry.size,
+                    "mtime": entry.mtime,
+                    "parsed_json": entry.parsed_json,
+                }
+        return rows
+
+    def save_parsed_files(self, entries: list[dict], parser_version: int) -> int:
+        """Upsert parse results in one transaction.
+
+        Args:
+            entries: Dicts with file_path, size, mtime and parsed_json
+            parser_version: Version of the parser that produced them
+
+        Returns:
+            Number of rows written.
+        """
+        if not entries:
+            return 0
+        now = self._now()
+        by_path = {e["file_path"]: e for e in entries}
+        paths = list(by_path)
+        existing = {}
+        for i in range(0, len(paths), _IN_CHUNK):
+            chunk = paths[i : i + _IN_CHUNK]
+            for row in self.session.execute(
+                select(ParsedFileCache).where(ParsedFileCache.file_path.in_(chunk))
+            ).scalars():
+                existing[row.file_path] = row
+
+        for path, entry in by_path.items():
+            row = existing.get(path)
+            if row is None:
+                self.session.add(
+                    ParsedFileCache(
+                        file_path=path,
+                        size=entry["size"],
+                        mtime=entry["mtime"],
+                        parser_version=parser_version,
+                        parsed_json=entry["parsed_json"],
+                        updated_at=now,
+                    )
+                )
+            else:
+                row.size = entry["size"]
+                row.mtime = entry["mtime"]
+                row.parser_version = parser_version
+                row.parsed_json = entry["parsed_json"]
+                row.updated_at = now
+        self._commit()
+        return len(by_path)
+
+    def prune_parsed_files(self, folder_path: str, present: set[str]) -> int:
+        """Delete cached parse rows below *folder_path* whose file is gone.
+
+        Args:
+            folder_path: Watched folder that was just walked
+            present: Every video file still found under the folder
+
+        Returns:
+            Number of rows deleted.
+        """
+        prefix = os.path.join(folder_path, "")
+        stale = [
+            path
+            for path in self.session.execute(
+                select(ParsedFileCache.file_path).where(
+                    ParsedFileCache.file_path.startswith(prefix, autoescape=True)
+                )
+            ).scalars()
+            if path not in present
+        ]
+        for i in range(0, len(stale), _IN_CHUNK):
+            self.session.execute(
+                delete(ParsedFileCache).where(
+                    ParsedFileCache.file_path.in_(stale[i : i + _IN_CHUNK])
+                )
+            )
+        if stale:
+            self._commit()
+        return len(stale)
+
+    # ---- Directory Scan State ----------------------------------------------------
+
+    def get_dir_states(self, folder_path: str, scan_key: str) -> dict[str, dict]:
+        """Stored directory listings of a watched folder made with *scan_key*.
+
+        Returns:
+            Dict mapping dir_path to {"fingerprint", "listing_json"}.
+        """
+        rows = self.session.execute(
+            select(StandaloneDirState).where(
+                StandaloneDirState.folder_path == folder_path,
+                StandaloneDirState.scan_key == scan_key,
+            )
+        ).scalars()
+        return {
+            row.dir_path: {"fingerprint": row.fingerprint, "listing_json": row.listing_json}
+            for row in rows
+        }
+
+    def save_dir_states(
+        self, folder_path: str, scan_key: str, states: dict[str, dict], present: set[str]
+    ) -> int:
+        """Upsert changed directory listings and drop directories that are gone.
+
+        Args:
+            folder_path: Watched folder the directories belong to
+            scan_key: Settings key the listings were processed with
+            states: {dir_path: {"fingerprint", "listing_json"}} to write
+            present: Every directory still found under the folder; rows of
+                this folder not in it are deleted
+
+        Returns:
+            Number of rows written.
+        """
+        now = self._now()
+        paths = list(states)
+        existing = {}
+        for i in range(0, len(paths), _IN_CHUNK):
+            for row in self.session.execute(
+                select(StandaloneDirState).where(
+                    StandaloneDirState.dir_path.in_(paths[i : i + _IN_CHUNK])
+                )
+            ).scalars():
+                existing[row.dir_path] = row
+
+        for path, state in states.items():
+            row = existing.get(path)
+            if row is None:
+                self.session.add(
+                    StandaloneDirState(
+                        dir_path=path,
+                        folder_path=folder_path,
+                        fingerprint=state["fingerprint"],
+                        scan_key=scan_key,
+                        listing_json=state["listing_json"],
+                        updated_at=now,
+                    )
+                )
+            else:
+                row.folder_path = folder_path
+                row.fingerprint = state["fingerprint"]
+                row.scan_key = scan_key
+                row.listing_json = state["listing_json"]
+                row.updated_at = now
+
+        stored = self.session.execute(
+            select(StandaloneDirState.dir_path).where(StandaloneDirState.folder_path == folder_path)
+        ).scalars()
+        gone = [path for path in stored if path not in present]
+        for i in range(0, len(gone), _IN_CHUNK):
+            self.session.execute(
+                delete(StandaloneDirState).where(
+                    StandaloneDirState.dir_path.in_(gone[i : i + _IN_CHUNK])
+                )
+            )
+        self._commit()
+        return len(states)
+
     # ---- Helpers -----------------------------------------------------------------
 
     def _row_to_folder(self, entry: WatchedFolder) -> dict:
@@ -7,17 +7,36 @@ CRITICAL: The upsert logic matches on file_path + target_language + subtitle_typ
 with conditional handling for empty/null target_language.
 """
 
+import copy
 import json
 import logging
+import threading
+import time
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import asc, delete, desc, func, or_, select
+from sqlalchemy import asc, case, delete, desc, func, or_, select
 from sqlalchemy.exc import IntegrityError
 
 from db.models.core import WantedItem
-from db.repositories.base import BaseRepository
+from db.repositories.base import BaseRepository, count_cache
 
 logger = logging.getLogger(__name__)
 
+# Incrementally maintained get_wanted_summary() snapshot. Status transitions
+# made through this repository adjust the counters in place; a full
+# aggregation runs on first use, after bulk deletes, and at least every
+# _SUMMARY_MAX_AGE seconds as a safety net against drift.
+_SUMMARY_MAX_AGE = 300
+_summary_lock = threading.Lock()
+_summary_state = {"data": None, "computed_at": 0.0}
+
+
+def reset_wanted_count_caches() -> None:
+    """Drop the wanted summary snapshot and cached list counts (e.g. on app init)."""
+    count_cache.invalidate("wanted_items")
+    with _summary_lock:
+        _summary_state["data"] = None
+
 
 class WantedRepository(BaseRepository):
     """Repository for wanted_items table operations."""
@@ -75,6 +94,7 @@ class WantedRepository(BaseRepository):
 
         if existing:
             row_id = existing.id
+            old_key = self._summary_key(existing)
             # Don't overwrite 'ignored' status — but update all other fields
             if existing.status == "ignored":
                 existing.item_type = item_type
@@ -112,6 +132,7 @@ class WantedRepository(BaseRepository):
                 existing.subtitle_type = subtitle_type
                 existing.updated_at = now
             self._commit()
+            self._summary_apply(old_key, self._summary_key(existing))
             return row_id, True
 
         item = WantedItem(
@@ -138,6 +159,7 @@ class WantedRepository(BaseRepository):
         try:
             self.session.add(item)
             self._commit()
+            self._summary_apply(None, self._summary_key(item))
             return item.id, False
         except IntegrityError:
             # Concurrent insert won the race — roll back and fetch the winner
@@ -173,10 +195,18 @@ class WantedRepository(BaseRepository):
         sort_dir: str = "desc",
         search: str = None,
         preset_conditions: dict = None,
+        cursor: str = None,
     ) -> dict:
-        """Get paginated wanted items with optional filters, sorting, and text search."""
-        offset = (page - 1) * per_page
+        """Get paginated wanted items with optional filters, sorting, and text search.
+
+        Uses OFFSET pagination by page unless *cursor* is given (use "" for the
+        first page), in which case rows are seeked by (sort column, id) so deep
+        pages cost the same as the first one. ``next_cursor`` is returned in both
+        modes. The total comes from the short-TTL count cache.
 
+        Raises:
+            ValueError: If *cursor* is malformed.
+        """
         conditions = []
         if item_type:
             conditions.append(WantedItem.item_type == item_type)
@@ -212,31 +242,131 @@ class WantedRepository(BaseRepository):
             clause = FilterPresetsRepository().build_clause(preset_conditions, wanted_field_map)
             conditions.append(clause)
 
-        # Count query
-        count_stmt = select(func.count()).select_from(WantedItem)
-        if conditions:
-            count_stmt = count_stmt.where(*conditions)
-        count = self.session.execute(count_stmt).scalar()
+        # Count query (cached briefly; invalidated on membership changes)
+        def _count():
+            count_stmt = select(func.count()).select_from(WantedItem)
+            if conditions:
+                count_stmt = count_stmt.where(*conditions)
+            return self.session.execute(count_stmt).scalar()
+
+        count_key = (
+            item_type,
+            status,
+            series_id,
+            subtitle_type,
+            search,
+            json.dumps(preset_conditions, sort_keys=True) if preset_conditions else None,
+        )
+        count = count_cache.get_or_compute("wanted_items", count_key, _count)
 
-        # Determine sort column and direction
+        # Determine sort column and direction (id breaks ties deterministically)
         sort_col = self._SORT_FIELDS.get(sort_by, WantedItem.added_at)
-        order = asc(sort_col) if sort_dir == "asc" else desc(sort_col)
+        order, seek = self._keyset_order_and_seek(
+            self._keyset_sort_expr(sort_col), WantedItem.id, sort_dir, cursor
+        )
 
         # Data query
-        data_stmt = select(WantedItem).order_by(order).limit(per_page).offset(offset)
+        data_stmt = select(WantedItem).order_by(*order).limit(per_page + 1)
+        if cursor is None:
+            data_stmt = data_stmt.offset((page - 1) * per_page)
+        if seek is not None:
+            data_stmt = data_stmt.where(seek)
         if conditions:
             data_stmt = data_stmt.where(*conditions)
         rows = self.session.execute(data_stmt).scalars().all()
 
         total_pages = max(1, (count + per_page - 1) // per_page)
         return {
-            "data": [self._row_to_wanted(r) for r in rows],
+            "data": [self._row_to_wanted(r) for r in rows[:per_page]],
             "page": page,
             "per_page": per_page,
             "total": count,
             "total_pages": total_pages,
+            "next_cursor": self._next_cursor(rows, sort_col, per_page),
         }
 
+    # Priority tiers for get_search_eligible_items. Each entry maps a name to a
+    # factory returning an ORDER BY expression (lower sorts first). The tier
+    # order is configurable via wanted_search_priority.
+    _SEARCH_PRIORITIES = {
+        "recent": lambda recent_cutoff: case((WantedItem.added_at >= recent_cutoff, 0), else_=1),
+        "upgrades": lambda recent_cutoff: case((WantedItem.upgrade_candidate == 1, 0), else_=1),
+        "never_searched": lambda recent_cutoff: case(
+            (func.coalesce(WantedItem.search_count, 0) == 0, 0), else_=1
+        ),
+    }
+
+    def get_search_eligible_items(
+        self,
+        limit: int,
+        max_attempts: int,
+        adaptive_backoff: bool = True,
+        cooldown_seconds: int = 3600,
+        priority: list = None,
+        recent_days: int = 14,
+    ) -> list:
+        """Get wanted items that are due for a provider search, in priority order.
+
+        Eligibility is evaluated in SQL (served by idx_wanted_search_eligible) so
+        that items still in backoff never consume the per-run budget:
+
+        - status is 'wanted' and search_count is below max_attempts
+        - adaptive_backoff: retry_after is unset or already in the past
+        - otherwise: last_search_at is unset or older than cooldown_seconds
+
+        Args:
+            limit: Maximum number of items to return.
+            max_attempts: Items with search_count >= this are excluded.
+            adaptive_backoff: Use retry_after instead of the fixed cooldown.
+            cooldown_seconds: Fixed cooldown when adaptive backoff is disabled.
+            priority: Ordered list of tier names from _SEARCH_PRIORITIES.
+                Unknown names are ignored. Defaults to all tiers.
+            recent_days: Window (by added_at) for the "recent" tier.
+
+        Returns:
+            List of wanted item dicts (same shape as get_wanted_items data).
+        """
+        now = datetime.now(UTC)
+        conditions = [
+            WantedItem.status == "wanted",
+            func.coalesce(WantedItem.search_count, 0) < max_attempts,
+        ]
+        if adaptive_backoff:
+            conditions.append(
+                or_(
+                    WantedItem.retry_after.is_(None),
+                    WantedItem.retry_after == "",
+                    WantedItem.retry_after <= now.isoformat(),
+                )
+            )
+        else:
+            cooldown_cutoff = (now - timedelta(seconds=cooldown_seconds)).isoformat()
+            conditions.append(
+                or_(
+                    WantedItem.last_search_at.is_(None),
+                    WantedItem.last_search_at == "",
+                    WantedItem.last_search_at <= cooldown_cutoff,
+                )
+            )
+
+        recent_cutoff = (now - timedelta(days=recent_days)).isoformat()
+        tiers = priority if priority is not None else list(self._SEARCH_PRIORITIES)
+        order = [
+            self._SEARCH_PRIORITIES[name](recent_cutoff)
+            for name in tiers
+            if name in self._SEARCH_PRIORITIES
+        ]
+        # Tie-breakers: least recently searched, then newest, then stable by id
+        order += [
+            asc(func.coalesce(WantedItem.last_search_at, "")),
+            desc(WantedItem.added_at),
+            asc(WantedItem.id),
+        ]
+
+        stmt = select(WantedItem).where(*conditions).order_by(*order).limit(limit)
+        rows = self.session.execute(stmt).scalars().all()
+        return [self._row_to_wanted(r) for r in rows]
+
     def get_wanted_item(self, item_id: int) -> dict | None:
         """Get a single wanted item by ID."""
         item = self.session.get(WantedItem, item_id)
@@ -263,10 +393,12 @@ class WantedRepository(BaseRepository):
         item = self.session.get(WantedItem, item_id)
         if not item:
             return False
+        old_key = self._summary_key(item)
         item.status = status
         item.error = error
         item.updated_at = self._now()
         self._commit()
+        self._summary_apply(old_key, self._summary_key(item))
         return True
 
     def mark_search_attempted(self, item_id: int) -> bool:
@@ -296,13 +428,47 @@ class WantedRepository(BaseRepository):
         item = self.session.get(WantedItem, item_id)
         if not item:
             return False
+        old_key = self._summary_key(item)
         item.existing_sub = value
         item.updated_at = self._now()
         self._commit()
+        self._summary_apply(old_key, self._summary_key(item))
+        return True
+
+    def mark_upgrade_candidate(self, item_id: int, current_score: int) -> bool:
+        """Re-queue a wanted item to search for a better subtitle than its current one."""
+        item = self.session.get(WantedItem, item_id)
+        if not item:
+            return False
+        old_key = self._summary_key(item)
+        item.status = "wanted"
+        item.upgrade_candidate = 1
+        item.current_score = current_score
+        item.updated_at = self._now()
+        self._commit()
+        self._summary_apply(old_key, self._summary_key(item))
         return True
 
     def get_wanted_summary(self) -> dict:
-        """Get aggregated wanted counts by type, status, and existing_sub."""
+        """Get aggregated wanted counts by type, status, and existing_sub.
+
+        Served from the incrementally maintained snapshot; recomputed with a
+        full aggregation only when missing or older than _SUMMARY_MAX_AGE.
+        """
+        with _summary_lock:
+            data = _summary_state["data"]
+            fresh = time.monotonic() - _summary_state["computed_at"] < _SUMMARY_MAX_AGE
+            if data is not None and fresh:
+                return copy.deepcopy(data)
+
+        data = self._compute_wanted_summary()
+        with _summary_lock:
+            _summary_state["data"] = data
+            _summary_state["computed_at"] = time.monotonic()
+            return copy.deepcopy(data)
+
+    def _compute_wanted_summary(self) -> dict:
+        """Full aggregation of wanted counts (used to seed the summary snapshot)."""
         total_stmt = select(func.count()).select_from(WantedItem)
         total = self.session.execute(total_stmt).scalar()
 
@@ -321,7 +487,7 @@ class WantedRepository(BaseRepository):
         by_existing = {}
         for row in self.session.execute(by_existing_stmt).all():
             key = row[0] if row[0] else "none"
-            by_existing[key] = row[1]
+            by_existing[key] = by_existing.get(key, 0) + row[1]
 
         # Upgradeable
         upgradeable_stmt = (
@@ -354,8 +520,10 @@ class WantedRepository(BaseRepository):
         item = self.session.get(WantedItem, item_id)
         if not item:
             return False
+        old_key = self._summary_key(item)
         self.session.delete(item)
         self._commit()
+        self._summary_apply(old_key, None)
         return True
 
     def delete_wanted_by_file_path(self, file_path: str) -> int:
@@ -363,6 +531,8 @@ class WantedRepository(BaseRepository):
         stmt = delete(WantedItem).where(WantedItem.file_path == file_path)
         result = self.session.execute(stmt)
         self._commit()
+        if result.rowcount:
+            self._summary_invalidate()
         return result.rowcount
 
     def delete_wanted_items_by_ids(self, item_ids: list) -> int:
@@ -372,6 +542,22 @@ class WantedRepository(BaseRepository):
         stmt = delete(WantedItem).where(WantedItem.id.in_(item_ids))
         result = self.session.execute(stmt)
         self._commit()
+        if result.rowcount:
+            self._summary_invalidate()
+        return result.rowcount
+
+    def delete_wanted_for_standalone(self, series_id: int = None, movie_id: int = None) -> int:
+        """Delete the wanted items of a standalone series or movie. Returns count deleted."""
+        if series_id is not None:
+            stmt = delete(WantedItem).where(WantedItem.standalone_series_id == series_id)
+        elif movie_id is not None:
+            stmt = delete(WantedItem).where(WantedItem.standalone_movie_id == movie_id)
+        else:
+            return 0
+        result = self.session.execute(stmt)
+        self._commit()
+        if result.rowcount:
+            self._summary_invalidate()
         return result.rowcount
 
     def cleanup_wanted_items(self, instance_name: str = None) -> list:
@@ -461,6 +647,65 @@ class WantedRepository(BaseRepository):
 
     # ---- Helpers ----
 
+    @staticmethod
+    def _summary_key(item: WantedItem) -> tuple:
+        """(dimensions get_wanted_summary() counts by, other list filter columns).
+
+        Changes to the second part only invalidate the cached list counts.
+        """
+        return (
+            (
+                item.item_type,
+                item.status,
+                item.existing_sub or "none",
+                item.upgrade_candidate == 1,
+            ),
+            (
+                item.sonarr_series_id,
+                item.standalone_series_id,
+                item.standalone_movie_id,
+                item.subtitle_type,
+                item.target_language,
+                item.title,
+            ),
+        )
+
+    @staticmethod
+    def _summary_apply(old_key: tuple | None, new_key: tuple | None) -> None:
+        """Move one item between summary buckets and drop stale list counts."""
+        if old_key == new_key:
+            return
+        count_cache.invalidate("wanted_items")
+        old_dims = old_key[0] if old_key else None
+        new_dims = new_key[0] if new_key else None
+        if old_dims == new_dims:
+            return
+        with _summary_lock:
+            data = _summary_state["data"]
+            if data is None:
+                return
+            for dims, delta in ((old_dims, -1), (new_dims, 1)):
+                if dims is None:
+                    continue
+                item_type, status, existing, upgradeable = dims
+                data["total"] += delta
+                for bucket, value in (
+                    ("by_type", item_type),
+                    ("by_status", status),
+                    ("by_existing", existing),
+                ):
+                    counts = data[bucket]
+                    counts[value] = counts.get(value, 0) + delta
+                    if counts[value] <= 0:
+                        del counts[value]
+                if upgradeable:
+                    data["upgradeable"] += delta
+
+    @staticmethod
+    def _summary_invalidate() -> None:
+        """Force the next get_wanted_summary() to re-aggregate (bulk changes)."""
+        reset_wanted_count_caches()
+
     def _row_to_wanted(self, item: WantedItem) -> dict:
         """Convert a WantedItem model to a dict. Parse missing_languages JSON."""
         d = self._to_dict(item)
@@ -6,7 +6,7 @@ operations. Return types match the existing functions exactly.
 
 import logging
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 
 from db.models.translation import WhisperJob
 from db.repositories.base import BaseRepository
@@ -23,6 +23,7 @@ class WhisperRepository(BaseRepository):
         file_path: str,
         language: str = "",
         audio_track_index: int | None = None,
+        priority: int = 10,
     ) -> dict:
         """Create a new whisper job in the database.
 
@@ -35,6 +36,7 @@ class WhisperRepository(BaseRepository):
             file_path=file_path,
             language=language,
             audio_track_index=audio_track_index,
+            priority=priority,
             status="queued",
             progress=0.0,
             created_at=now,
@@ -47,6 +49,7 @@ class WhisperRepository(BaseRepository):
             "file_path": file_path,
             "language": language,
             "audio_track_index": audio_track_index,
+            "priority": priority,
             "status": "queued",
             "progress": 0.0,
             "created_at": now,
@@ -91,6 +94,25 @@ class WhisperRepository(BaseRepository):
         entries = self.session.execute(stmt).scalars().all()
         return [self._to_dict(e) for e in entries]
 
+    def requeue_unfinished_whisper_jobs(self) -> list[dict]:
+        """Reset jobs interrupted by a restart to queued and return all queued jobs.
+
+        Returns:
+            List of job dicts in pick order (priority, then created_at).
+        """
+        self.session.execute(
+            update(WhisperJob)
+            .where(WhisperJob.status.in_(("extracting", "loading", "transcribing", "saving")))
+            .values(status="queued", progress=0.0, phase="")
+        )
+        self._commit()
+        stmt = (
+            select(WhisperJob)
+            .where(WhisperJob.status == "queued")
+            .order_by(WhisperJob.priority, WhisperJob.created_at)
+        )
+        return [self._to_dict(e) for e in self.session.execute(stmt).scalars().all()]
+
     def delete_whisper_job(self, job_id: str) -> bool:
         """Delete a whisper job.
 
@@ -17,15 +17,20 @@ def _get_repo():
 
 
 def init_search_tables() -> None:
-    """Create FTS5 virtual tables. Call from app.py after db.create_all()."""
+    """Create FTS5 virtual tables and sync triggers. Call from app.py after db.create_all()."""
     _get_repo().init_search_tables()
 
 
 def rebuild_search_index() -> None:
-    """Rebuild FTS5 tables from current DB state."""
+    """Rebuild FTS5 tables from current DB state (maintenance action)."""
     _get_repo().rebuild_index()
 
 
+def ensure_search_index() -> bool:
+    """Rebuild the search index only after a schema version change."""
+    return _get_repo().ensure_index()
+
+
 def search_all(query: str, limit: int = 20) -> dict:
     """FTS5 trigram search across series, episodes, and subtitles."""
     return _get_repo().search_all(query, limit=limit)
@@ -158,6 +158,39 @@ def cleanup_expired_cache() -> int:
     return _get_repo().clear_expired_metadata_cache()
 
 
+# ---- Parsed File Cache ----
+
+
+def get_parsed_files(file_paths: list[str], parser_version: int) -> dict[str, dict]:
+    """Cached parse rows (size, mtime, parsed_json) for the given paths."""
+    return _get_repo().get_parsed_files(file_paths, parser_version)
+
+
+def save_parsed_files(entries: list[dict], parser_version: int) -> int:
+    """Bulk upsert parse results. Returns the number of rows written."""
+    return _get_repo().save_parsed_files(entries, parser_version)
+
+
+def prune_parsed_files(folder_path: str, present: set[str]) -> int:
+    """Drop cached parse rows below a watched folder for files no longer there."""
+    return _get_repo().prune_parsed_files(folder_path, present)
+
+
+# ---- Directory Scan State ----
+
+
+def get_dir_states(folder_path: str, scan_key: str) -> dict[str, dict]:
+    """Stored directory listings (fingerprint, listing_json) of a watched folder."""
+    return _get_repo().get_dir_states(folder_path, scan_key)
+
+
+def save_dir_states(
+    folder_path: str, scan_key: str, states: dict[str, dict], present: set[str]
+) -> int:
+    """Upsert changed directory listings and drop rows for vanished directories."""
+    return _get_repo().save_dir_states(folder_path, scan_key, states, present)
+
+
 # ---- AniDB Mappings (via standalone repository) ----
 
 
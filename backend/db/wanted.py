@@ -78,6 +78,7 @@ def get_wanted_items(
     sort_by: str = "added_at",
     sort_dir: str = "desc",
     search: str = None,
+    cursor: str = None,
 ) -> dict:
     """Get paginated wanted items with optional filters, sorting, and text search."""
     return _get_repo().get_wanted_items(
@@ -90,6 +91,26 @@ def get_wanted_items(
         sort_by=sort_by,
         sort_dir=sort_dir,
         search=search,
+        cursor=cursor,
+    )
+
+
+def get_search_eligible_items(
+    limit: int,
+    max_attempts: int,
+    adaptive_backoff: bool = True,
+    cooldown_seconds: int = 3600,
+    priority: list = None,
+    recent_days: int = 14,
+) -> list:
+    """Get wanted items due for a provider search, ordered by search priority."""
+    return _get_repo().get_search_eligible_items(
+        limit,
+        max_attempts,
+        adaptive_backoff=adaptive_backoff,
+        cooldown_seconds=cooldown_seconds,
+        priority=priority,
+        recent_days=recent_days,
     )
 
 
@@ -139,6 +160,11 @@ def delete_wanted_items_by_ids(item_ids: list):
     return _get_repo().delete_wanted_items_by_ids(item_ids)
 
 
+def delete_wanted_for_standalone(series_id: int = None, movie_id: int = None) -> int:
+    """Delete the wanted items of a standalone series or movie."""
+    return _get_repo().delete_wanted_for_standalone(series_id=series_id, movie_id=movie_id)
+
+
 def get_wanted_count(status: str = None) -> int:
     """Get count of wanted items with optional status filter."""
     return _get_repo().get_wanted_count(status)
@@ -17,9 +17,10 @@ def create_whisper_job(
     file_path: str,
     language: str = "",
     audio_track_index: int | None = None,
+    priority: int = 10,
 ) -> dict:
     """Create a new whisper job in the database."""
-    return _get_repo().create_whisper_job(job_id, file_path, language, audio_track_index)
+    return _get_repo().create_whisper_job(job_id, file_path, language, audio_track_index, priority)
 
 
 def update_whisper_job(job_id: str, **kwargs) -> None:
@@ -37,6 +38,11 @@ def get_whisper_jobs(status: str = None, limit: int = 50) -> list:
     return _get_repo().get_whisper_jobs(status, limit)
 
 
+def requeue_unfinished_whisper_jobs() -> list:
+    """Reset jobs interrupted by a restart and return all queued jobs in pick order."""
+    return _get_repo().requeue_unfinished_whisper_jobs()
+
+
 def delete_whisper_job(job_id: str) -> bool:
     """Delete a whisper job."""
     return _get_repo().delete_whisper_job(job_id)
@@ -1,6 +1,7 @@
 """Content-hash based subtitle deduplication engine.
 
 Provides SHA-256 hashing of subtitle files, duplicate group detection,
+near-duplicate clustering of the dialog text (SimHash + LSH),
 safe batch deletion with keep-at-least-one guard, orphan detection,
 and disk space analysis.
 
@@ -13,7 +14,12 @@ import json
 import logging
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pysubs2
 
 from security_utils import is_safe_path
 
@@ -25,6 +31,22 @@ SUBTITLE_EXTENSIONS = {".srt", ".ass", ".ssa"}
 # Language pattern in subtitle filenames: .en.srt, .de.ass, .ja.ssa
 _LANG_PATTERN = re.compile(r"\.([a-z]{2,3})\.[a-z]{2,3}$", re.IGNORECASE)
 
+# Files hashed per batch; each batch is stored with one bulk upsert
+HASH_BATCH_SIZE = 500
+
+# Near-duplicate detection: 64-bit SimHash over word 3-grams of the dialog
+# text, bucketed by LSH on SIMHASH_BANDS equal bands of the signature. Two
+# signatures within SIMHASH_BANDS - 1 bits of each other always share a band.
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+NEAR_DUPLICATE_THRESHOLD = 0.95
+_SHINGLE_SIZE = 3
+
+# Near-duplicate clusters per threshold, valid for one hash table generation
+_near_cache_lock = threading.Lock()
+_near_cache: dict = {"generation": None, "groups": {}}
+_WORD_PATTERN = re.compile(r"\w+")
+
 # Common media file extensions
 MEDIA_EXTENSIONS = {".mkv", ".mp4", ".avi", ".m4v", ".wmv", ".flv", ".webm", ".ts"}
 
@@ -78,6 +100,7 @@ def compute_subtitle_hash(file_path: str) -> dict:
         "format": format_name,
         "language": language,
         "line_count": line_count,
+        "dialog_simhash": compute_dialog_simhash(content),
     }
 
 
@@ -98,18 +121,213 @@ def compute_content_hash_from_bytes(content: bytes) -> str:
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
+def _dialog_tokens(content: str) -> list[str]:
+    """Lowercased words of all dialog lines, without timing, tags or styles."""
+    try:
+        subs = pysubs2.SSAFile.from_string(content)
+    except Exception:
+        return []
+    tokens = []
+    for event in subs:
+        if event.is_comment or event.is_drawing:
+            continue
+        tokens.extend(_WORD_PATTERN.findall(event.plaintext.lower()))
+    return tokens
+
+
+def compute_dialog_simhash(content: str) -> str | None:
+    """Compute a 64-bit SimHash of a subtitle's dialog text.
+
+    Only the spoken text is used, so re-timed copies, format conversions and
+    restyled releases of the same subtitle get the same signature, and small
+    text edits flip only a few bits.
+
+    Args:
+        content: Subtitle file content (any format pysubs2 can read).
+
+    Returns:
+        16-char hex signature, or None if the file has no dialog.
+    """
+    tokens = _dialog_tokens(content)
+    if not tokens:
+        return None
+    n = min(_SHINGLE_SIZE, len(tokens))
+    shingles = {" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)}
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=SIMHASH_BITS // 8).digest()
+        for shingle in shingles
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, SIMHASH_BITS)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return np.packbits(majority).tobytes().hex()
+
+
+def _lsh_candidates(values: np.ndarray, max_distance: int):
+    """Yield (i, j, distance) for signatures sharing an LSH band and within max_distance bits.
+
+    Per band the signatures are sorted by band value; each one is then
+    compared to the next ones in its bucket, one offset at a time, so the
+    work is proportional to the bucket pairs, not to the whole library.
+    """
+    band_bits = SIMHASH_BITS // SIMHASH_BANDS
+    band_mask = np.uint64((1 << band_bits) - 1)
+    for band in range(SIMHASH_BANDS):
+        keys = (values >> np.uint64(band * band_bits)) & band_mask
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        idx = np.arange(len(keys) - 1)
+        step = 1
+        while idx.size:
+            idx = idx[idx + step < len(keys)]
+            idx = idx[keys[idx] == keys[idx + step]]
+            left, right = order[idx], order[idx + step]
+            xor = values[left] ^ values[right]
+            distance = np.unpackbits(xor.view(np.uint8)).reshape(-1, SIMHASH_BITS).sum(axis=1)
+            close = distance <= max_distance
+            yield from zip(
+                left[close].tolist(), right[close].tolist(), distance[close].tolist(), strict=True
+            )
+            step += 1
+
+
+def find_near_duplicate_groups(threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list[dict]:
+    """Cluster subtitles whose dialog SimHashes are at least *threshold* similar.
+
+    Similarity is 1 - hamming_distance / 64. Candidates are only compared
+    within LSH buckets (one per band value), never pairwise across the whole
+    library. Matches within SIMHASH_BANDS - 1 bits (similarity >= 0.953) are
+    always found; with lower thresholds, more distant pairs are only found
+    when they still share one band.
+    Clusters made only of byte-identical files are left out, they are
+    already reported as exact duplicates.
+    Results are cached until the hash table next changes, so paging through
+    the near-duplicate list clusters the library only once.
+
+    Args:
+        threshold: Minimum similarity (0.0-1.0) for two files to be linked.
+
+    Returns:
+        List of dicts: [{hash, count, similarity, files: [{path, size, format, language}]}]
+        where hash is the cluster's lowest signature and similarity the
+        lowest similarity of any link within the cluster.
+    """
+    from db.repositories.cleanup import hash_generation
+
+    generation = hash_generation()
+    with _near_cache_lock:
+        if _near_cache["generation"] == generation and threshold in _near_cache["groups"]:
+            return _near_cache["groups"][threshold]
+
+    groups = _cluster_near_duplicates(threshold)
+    with _near_cache_lock:
+        if generation == hash_generation():  # no hash writes while clustering
+            if _near_cache["generation"] != generation:
+                _near_cache["generation"] = generation
+                _near_cache["groups"] = {}
+            _near_cache["groups"][threshold] = groups
+    return groups
+
+
+def _cluster_near_duplicates(threshold: float) -> list[dict]:
+    """Union-find over the LSH candidates of all stored dialog signatures."""
+    from db.repositories.cleanup import CleanupRepository
+
+    max_distance = int((1.0 - threshold) * SIMHASH_BITS)
+
+    # Files with the same dialog share a signature and are linked up front
+    files_by_signature = defaultdict(list)
+    for entry in CleanupRepository().get_dialog_signatures():
+        files_by_signature[entry["simhash"]].append(entry)
+    signatures = sorted(files_by_signature)
+    values = np.frombuffer(bytes.fromhex("".join(signatures)), dtype=">u8").astype(np.uint64)
+
+    parent = list(range(len(signatures)))
+    similarity = [1.0] * len(signatures)
+
+    def _find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Signatures that can be part of a cluster: shared by several files or linked
+    grouped = {idx for idx, sig in enumerate(signatures) if len(files_by_signature[sig]) > 1}
+    for left, right, distance in _lsh_candidates(values, max_distance):
+        root_a, root_b = _find(left), _find(right)
+        if root_a == root_b:
+            continue
+        parent[root_b] = root_a
+        similarity[root_a] = min(
+            similarity[root_a], similarity[root_b], 1.0 - distance / SIMHASH_BITS
+        )
+        grouped.update((left, right))
+
+    clusters = defaultdict(list)
+    for idx in sorted(grouped):
+        clusters[_find(idx)].append(idx)
+
+    groups = []
+    for root, members in clusters.items():
+        files = [f for idx in members for f in files_by_signature[signatures[idx]]]
+        if len(files) < 2 or len({f["content_hash"] for f in files}) < 2:
+            continue
+        files.sort(key=lambda f: f["path"])
+        groups.append(
+            {
+                "hash": signatures[members[0]],
+                "count": len(files),
+                "similarity": round(similarity[root], 3),
+                "files": [
+                    {
+                        "path": f["path"],
+                        "size": f["size"],
+                        "format": f["format"],
+                        "language": f["language"],
+                    }
+                    for f in files
+                ],
+            }
+        )
+    groups.sort(key=lambda g: (-g["count"], g["files"][0]["path"]))
+    return groups
+
+
+def _collect_subtitle_files(media_path: str) -> dict[str, tuple[int, float]]:
+    """Walk *media_path* and stat every subtitle file: {path: (size, mtime)}."""
+    found = {}
+    for root, _dirs, files in os.walk(media_path):
+        for filename in files:
+            ext = os.path.splitext(filename)[1].lower()
+            if ext not in SUBTITLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, filename)
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                logger.debug("Cannot stat %s: %s", path, e)
+                continue
+            found[path] = (st.st_size, st.st_mtime)
+    return found
+
+
 def scan_for_duplicates(media_path: str, socketio=None) -> dict:
     """Scan a media path recursively for duplicate subtitles.
 
-    Walks the directory tree, hashes all subtitle files, stores hashes
-    in the database, and identifies duplicate groups.
+    The scan is incremental: files whose size and mtime still match their
+    stored hash row are not read again. New and modified files are hashed in
+    batches of HASH_BATCH_SIZE, each batch stored with one bulk upsert, and
+    rows of files that disappeared are removed. Duplicate groups are only
+    looked up for hashes touched by this scan (the full list stays available
+    via CleanupRepository.get_duplicate_groups()).
 
     Args:
         media_path: Root directory to scan.
         socketio: Optional SocketIO instance for progress events.
 
     Returns:
-        Dict with total_scanned, duplicates_found, groups.
+        Dict with total_scanned, hashed, removed, duplicates_found and
+        duplicate_groups (library totals from the stored hashes),
+        changed_groups (the groups this scan touched) and errors.
     """
     from db.repositories.cleanup import CleanupRepository
 
@@ -118,102 +336,97 @@ def scan_for_duplicates(media_path: str, socketio=None) -> dict:
             "error": f"Path not found or not a directory: {media_path}",
             "total_scanned": 0,
             "duplicates_found": 0,
-            "groups": [],
+            "duplicate_groups": 0,
+            "changed_groups": [],
         }
 
-    # Collect all subtitle file paths
-    subtitle_files = []
-    for root, _dirs, files in os.walk(media_path):
-        for filename in files:
-            ext = os.path.splitext(filename)[1].lower()
-            if ext in SUBTITLE_EXTENSIONS:
-                subtitle_files.append(os.path.join(root, filename))
-
+    subtitle_files = _collect_subtitle_files(media_path)
     total = len(subtitle_files)
     logger.info("Dedup scan: found %d subtitle files in %s", total, media_path)
 
-    if total == 0:
-        return {"total_scanned": 0, "duplicates_found": 0, "groups": []}
-
-    # Process files in parallel
-    processed = 0
+    repo = CleanupRepository()
+    stored = repo.get_hash_states(media_path)
+
+    # Only new or modified files are read; unchanged ones keep their hash
+    to_hash = [
+        path
+        for path, (size, mtime) in subtitle_files.items()
+        if (row := stored.get(path)) is None or row["size"] != size or row["mtime"] != mtime
+    ]
+    removed = [path for path in stored if path not in subtitle_files]
+    # Hashes whose groups may have changed: old and new hash of every touched file
+    touched_hashes = {stored[p]["content_hash"] for p in [*to_hash, *removed] if p in stored}
+
+    if removed:
+        repo.delete_hashes_by_paths(removed)
+
+    processed = total - len(to_hash)
     errors = []
-    hash_results = []
 
     def _process_file(fp):
         """Hash a single file (runs in thread pool)."""
         try:
-            return compute_subtitle_hash(fp)
+            result = compute_subtitle_hash(fp)
         except Exception as e:
             logger.warning("Failed to hash %s: %s", fp, e)
             return {"error": str(e), "file_path": fp}
+        # Keep the walk's stat so a file modified meanwhile is re-hashed next time
+        result["file_size"], result["mtime"] = subtitle_files[fp]
+        return result
+
+    def _emit_progress(current):
+        if socketio:
+            socketio.emit(
+                "scan_progress",
+                {
+                    "current": current,
+                    "total": total,
+                    "percent": round(current / total * 100, 1) if total else 100.0,
+                },
+            )
 
     with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {executor.submit(_process_file, fp): fp for fp in subtitle_files}
-
-        for future in as_completed(futures):
-            result = future.result()
-            processed += 1
-
-            if "error" in result:
-                errors.append(result)
-            else:
-                hash_results.append(result)
-
-            # Emit progress via WebSocket
-            if socketio and processed % 10 == 0:
-                socketio.emit(
-                    "scan_progress",
-                    {
-                        "current": processed,
-                        "total": total,
-                        "percent": round(processed / total * 100, 1),
-                    },
-                )
+        for start in range(0, len(to_hash), HASH_BATCH_SIZE):
+            batch = []
+            for result in executor.map(_process_file, to_hash[start : start + HASH_BATCH_SIZE]):
+                if "error" in result:
+                    errors.append(result)
+                else:
+                    batch.append(result)
+                    touched_hashes.add(result["content_hash"])
+            try:
+                repo.upsert_hashes(batch)
+            except Exception as e:
+                logger.warning("Failed to store %d hashes: %s", len(batch), e)
+            processed += min(HASH_BATCH_SIZE, len(to_hash) - start)
+            _emit_progress(processed)
 
     # Final progress emit
-    if socketio:
-        socketio.emit(
-            "scan_progress",
-            {
-                "current": total,
-                "total": total,
-                "percent": 100.0,
-            },
-        )
-
-    # Store hashes in database
-    repo = CleanupRepository()
-    for hr in hash_results:
-        try:
-            repo.upsert_hash(
-                file_path=hr["file_path"],
-                content_hash=hr["content_hash"],
-                file_size=hr["file_size"],
-                format=hr["format"],
-                language=hr["language"],
-                line_count=hr["line_count"],
-            )
-        except Exception as e:
-            logger.warning("Failed to store hash for %s: %s", hr["file_path"], e)
-
-    # Query duplicate groups
-    groups = repo.get_duplicate_groups()
+    _emit_progress(total)
 
-    duplicates_found = sum(g["count"] for g in groups)
+    # Full groups are only loaded for hashes this scan touched; totals are counted
+    changed_groups = repo.get_duplicate_groups(sorted(touched_hashes)) if touched_hashes else []
+    totals = repo.get_duplicate_totals()
 
     logger.info(
-        "Dedup scan complete: %d files scanned, %d duplicates in %d groups, %d errors",
-        processed,
-        duplicates_found,
-        len(groups),
+        "Dedup scan complete: %d files scanned (%d hashed, %d removed), "
+        "%d duplicates in %d groups (%d changed), %d errors",
+        total,
+        len(to_hash),
+        len(removed),
+        totals["files"],
+        totals["groups"],
+        len(changed_groups),
         len(errors),
     )
 
     return {
-        "total_scanned": processed,
-        "duplicates_found": duplicates_found,
-        "groups": groups,
+        "total_scanned": total,
+        "hashed": len(to_hash),
+        "removed": len(removed),
+        "duplicates_found": totals["files"],
+        "duplicate_groups": totals["groups"],
+        "changed_groups": changed_groups,
         "errors": errors if errors else [],
     }
 
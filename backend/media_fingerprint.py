@@ -0,0 +1,76 @@
+"""Cheap content fingerprints for media files.
+
+Probe, chapter and extraction caches used to be keyed by (file_path, mtime),
+so every rename or move by Sonarr/Radarr (or a user reorganizing folders)
+threw the cached metadata away. A fingerprint identifies the content instead:
+
+    <size hex>-<sha1 of first + last MiB>[-<Matroska SegmentUID hex>]
+
+Computing one costs two 1 MiB reads. The result is remembered per path in
+the media_fingerprints alias table and reused while (mtime, size) match, so a
+file is hashed at most once per change.
+"""
+
+import hashlib
+import logging
+import os
+
+from native_probe import read_segment_uid
+
+logger = logging.getLogger(__name__)
+
+#: Bytes hashed from each end of the file.
+FINGERPRINT_CHUNK = 1024 * 1024
+
+
+def compute_fingerprint(file_path: str) -> str | None:
+    """Hash size, head and tail of *file_path*; None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(FINGERPRINT_CHUNK)
+            digest = hashlib.sha1(head)
+            if size > FINGERPRINT_CHUNK:
+                f.seek(max(FINGERPRINT_CHUNK, size - FINGERPRINT_CHUNK))
+                digest.update(f.read(FINGERPRINT_CHUNK))
+    except OSError as e:
+        logger.debug("Fingerprint failed for %s: %s", file_path, e)
+        return None
+
+    fingerprint = f"{size:x}-{digest.hexdigest()}"
+    segment_uid = read_segment_uid(head)
+    if segment_uid:
+        fingerprint += f"-{segment_uid.hex()}"
+    return fingerprint
+
+
+def get_fingerprint(file_path: str) -> str | None:
+    """Return the content fingerprint for *file_path*, reusing the alias table.
+
+    Outside an app context (or if the DB is unavailable) the fingerprint is
+    computed but not remembered.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    try:
+        from db.cache import get_media_fingerprint
+
+        known = get_media_fingerprint(file_path, stat.st_mtime, stat.st_size)
+        if known:
+            return known
+    except Exception as e:
+        logger.debug("Fingerprint alias lookup failed for %s: %s", file_path, e)
+
+    fingerprint = compute_fingerprint(file_path)
+    if fingerprint is None:
+        return None
+    try:
+        from db.cache import set_media_fingerprint
+
+        set_media_fingerprint(file_path, stat.st_mtime, stat.st_size, fingerprint)
+    except Exception as e:
+        logger.debug("Fingerprint alias store failed for %s: %s", file_path, e)
+    return fingerprint
@@ -0,0 +1,241 @@
+"""Global process budget for external media tools.
+
+Scans, OCR batches, remuxes, waveform renders and Whisper audio extraction
+each bring their own thread pool. Without a shared cap, overlapping jobs
+start 20+ ffmpeg/ffprobe/mediainfo/tesseract processes at once and the disk
+thrashes. Every media subprocess is started through this module instead:
+
+- Work is grouped into slot classes with their own concurrency limit:
+  ``probe`` (metadata reads), ``demux`` (stream copy / extraction, disk-bound),
+  ``transcode`` (full decode or encode, CPU-bound) and ``ocr`` (tesseract).
+- A global budget caps the sum across classes.
+- Waiters are granted in priority order (interactive before normal before
+  background); a full class never blocks waiters of another class.
+
+Defaults are derived from the CPU count and can be overridden with
+``media_process_budget`` and ``media_process_limits``
+(e.g. ``"probe=8,demux=2,transcode=2,ocr=4"``).
+
+Usage::
+
+    from media_scheduler import DEMUX, run_media
+
+    result = run_media(DEMUX, cmd, capture_output=True, text=True, timeout=600)
+"""
+
+import contextlib
+import itertools
+import logging
+import os
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Slot classes
+PROBE = "probe"
+DEMUX = "demux"
+TRANSCODE = "transcode"
+OCR = "ocr"
+
+SLOT_CLASSES = (PROBE, DEMUX, TRANSCODE, OCR)
+
+# Priorities (lower runs first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BACKGROUND = 20
+
+_local = threading.local()
+
+
+def default_limits(cpu_count: int | None = None) -> tuple[int, dict]:
+    """Return (budget, per-class limits) derived from the CPU count.
+
+    Demux work is bounded by disk throughput rather than cores, so it gets a
+    small fixed limit; probes are short and mostly wait on I/O.
+    """
+    cpus = max(1, cpu_count or os.cpu_count() or 2)
+    limits = {
+        PROBE: max(2, cpus),
+        DEMUX: 2,
+        TRANSCODE: max(1, cpus // 2),
+        OCR: max(1, cpus // 2),
+    }
+    return max(2, cpus), limits
+
+
+def parse_limits(spec: str) -> dict:
+    """Parse ``"probe=8,demux=2"`` into a dict; unknown or invalid entries are ignored."""
+    limits = {}
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in SLOT_CLASSES:
+            continue
+        try:
+            limits[name] = max(1, int(value.strip()))
+        except ValueError:
+            logger.warning("Ignoring invalid media process limit: %r", part)
+    return limits
+
+
+@contextlib.contextmanager
+def priority_scope(priority: int):
+    """Run media processes started by this thread at *priority*.
+
+    Lets callers mark whole code paths (e.g. a library scan worker) as
+    background work without threading a priority through every helper.
+    """
+    previous = getattr(_local, "priority", None)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority() -> int:
+    priority = getattr(_local, "priority", None)
+    return PRIORITY_NORMAL if priority is None else priority
+
+
+class MediaProcessScheduler:
+    """Priority slot allocator shared by all media subprocess call sites."""
+
+    def __init__(self, budget: int | None = None, limits: dict | None = None):
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: list = []  # [(priority, seq, slot_class)]
+        self._running = dict.fromkeys(SLOT_CLASSES, 0)
+        self._started = dict.fromkeys(SLOT_CLASSES, 0)
+        self._wait_seconds = dict.fromkeys(SLOT_CLASSES, 0.0)
+        self._max_waiting = dict.fromkeys(SLOT_CLASSES, 0)
+        self._budget = 0
+        self._limits: dict = {}
+        self.configure(budget, limits)
+
+    def configure(self, budget: int | None = None, limits: dict | None = None):
+        """(Re)load limits; without arguments they are read from settings.
+
+        Running processes are never interrupted; a lower limit only delays
+        new grants until enough slots have been released.
+        """
+        auto_budget, auto_limits = default_limits()
+        if budget is None and limits is None:
+            try:
+                from config import get_settings
+
+                settings = get_settings()
+                budget = getattr(settings, "media_process_budget", 0) or None
+                limits = parse_limits(getattr(settings, "media_process_limits", ""))
+            except Exception as e:
+                logger.debug("Media scheduler: settings unavailable, using defaults: %s", e)
+        with self._cond:
+            self._budget = max(1, budget or auto_budget)
+            self._limits = {**auto_limits, **(limits or {})}
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, slot_class: str, priority: int | None = None):
+        """Hold one slot of *slot_class* for the duration of the block."""
+        self.acquire(slot_class, priority)
+        try:
+            yield
+        finally:
+            self.release(slot_class)
+
+    def acquire(self, slot_class: str, priority: int | None = None):
+        if slot_class not in self._running:
+            raise ValueError(f"Unknown media slot class: {slot_class}")
+        if priority is None:
+            priority = current_priority()
+        waiter = (priority, next(self._seq), slot_class)
+        started = time.monotonic()
+        with self._cond:
+            self._waiting.append(waiter)
+            self._max_waiting[slot_class] = max(
+                self._max_waiting[slot_class],
+                sum(1 for w in self._waiting if w[2] == slot_class),
+            )
+            try:
+                while waiter not in self._grantable_locked():
+                    self._cond.wait()
+            finally:
+                self._waiting.remove(waiter)
+                self._cond.notify_all()
+            self._running[slot_class] += 1
+            self._started[slot_class] += 1
+            self._wait_seconds[slot_class] += time.monotonic() - started
+
+    def release(self, slot_class: str):
+        with self._cond:
+            self._running[slot_class] -= 1
+            self._cond.notify_all()
+
+    def run(self, slot_class: str, cmd, priority: int | None = None, **kwargs):
+        """``subprocess.run(cmd, **kwargs)`` inside a slot of *slot_class*."""
+        with self.slot(slot_class, priority):
+            return subprocess.run(cmd, **kwargs)
+
+    def stats(self) -> dict:
+        """Snapshot of limits, running and queued processes per class."""
+        with self._cond:
+            classes = {}
+            for name in SLOT_CLASSES:
+                started = self._started[name]
+                classes[name] = {
+                    "limit": self._limits[name],
+                    "running": self._running[name],
+                    "waiting": sum(1 for w in self._waiting if w[2] == name),
+                    "max_waiting": self._max_waiting[name],
+                    "started": started,
+                    "avg_wait_ms": round(self._wait_seconds[name] / started * 1000, 1)
+                    if started
+                    else 0.0,
+                }
+            return {
+                "budget": self._budget,
+                "running": sum(self._running.values()),
+                "waiting": len(self._waiting),
+                "classes": classes,
+            }
+
+    def _grantable_locked(self) -> set:
+        """Waiters that may start now, filled greedily in priority order."""
+        free_total = self._budget - sum(self._running.values())
+        free = {name: self._limits[name] - self._running[name] for name in SLOT_CLASSES}
+        granted = set()
+        for waiter in sorted(self._waiting):
+            if free_total <= 0:
+                break
+            if free[waiter[2]] <= 0:
+                continue
+            free[waiter[2]] -= 1
+            free_total -= 1
+            granted.add(waiter)
+        return granted
+
+
+_scheduler: MediaProcessScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_media_scheduler() -> MediaProcessScheduler:
+    """Return the process-wide scheduler, creating it from settings on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = MediaProcessScheduler()
+    return _scheduler
+
+
+def run_media(slot_class: str, cmd, priority: int | None = None, **kwargs):
+    """Run a media tool through the global scheduler (drop-in for subprocess.run)."""
+    return get_media_scheduler().run(slot_class, cmd, priority=priority, **kwargs)
+
+
+def media_slot(slot_class: str, priority: int | None = None):
+    """Context manager holding a slot for library calls that spawn tools themselves."""
+    return get_media_scheduler().slot(slot_class, priority)
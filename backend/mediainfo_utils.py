@@ -10,6 +10,8 @@ import logging
 import shutil
 import subprocess
 
+from media_scheduler import PROBE, run_media
+
 logger = logging.getLogger(__name__)
 
 # MediaInfo Format field → ffprobe codec_name
@@ -71,7 +73,7 @@ def run_mediainfo(file_path: str) -> dict:
 
     cmd = ["mediainfo", "--Output=JSON", file_path]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = run_media(PROBE, cmd, capture_output=True, text=True, timeout=30)
     except subprocess.TimeoutExpired:
         raise RuntimeError(f"mediainfo timed out after 30s: {file_path}")
 
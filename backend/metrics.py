@@ -167,6 +167,35 @@ if METRICS_AVAILABLE:
         ["backend"],
     )
 
+    # ── Media Process Scheduler ──────────────────────────────────────────────
+    MEDIA_PROCESSES_RUNNING = Gauge(
+        "sublarr_media_processes_running",
+        "Running ffmpeg/ffprobe/mediainfo/tesseract processes",
+        ["slot_class"],
+    )
+    MEDIA_PROCESSES_WAITING = Gauge(
+        "sublarr_media_processes_waiting",
+        "Media processes queued for a scheduler slot",
+        ["slot_class"],
+    )
+
+    # ── Whisper Model Residency ──────────────────────────────────────────────
+    WHISPER_MODEL_EVENTS_TOTAL = Counter(
+        "sublarr_whisper_model_events_total",
+        "Whisper model load/unload/prewarm events",
+        ["event", "model"],
+    )
+    WHISPER_MODEL_LOADED = Gauge(
+        "sublarr_whisper_model_loaded",
+        "Whether a Whisper model is resident (1) or not (0)",
+        ["model"],
+    )
+    WHISPER_MODEL_LOAD_DURATION = Histogram(
+        "sublarr_whisper_model_load_duration_seconds",
+        "Time to load a Whisper model",
+        buckets=(1, 5, 10, 30, 60, 120, 300),
+    )
+
 
 # -- Collection helpers --------------------------------------------------------
 
@@ -306,6 +335,20 @@ def collect_queue_job_metrics() -> None:
         pass
 
 
+def collect_media_scheduler_metrics() -> None:
+    """Update running/waiting gauges per media process slot class."""
+    if not METRICS_AVAILABLE:
+        return
+    try:
+        from media_scheduler import get_media_scheduler
+
+        for name, cls in get_media_scheduler().stats()["classes"].items():
+            MEDIA_PROCESSES_RUNNING.labels(slot_class=name).set(cls["running"])
+            MEDIA_PROCESSES_WAITING.labels(slot_class=name).set(cls["waiting"])
+    except Exception as exc:
+        logger.debug("Failed to collect media scheduler metrics: %s", exc)
+
+
 # -- Recording helpers ---------------------------------------------------------
 
 
@@ -347,6 +390,19 @@ def record_db_query(operation: str, duration: float) -> None:
     DB_QUERY_TOTAL.labels(operation=operation).inc()
 
 
+def record_whisper_model_event(event: str, model: str, duration: float | None = None) -> None:
+    """Record a Whisper model residency event (load, unload, prewarm)."""
+    if not METRICS_AVAILABLE:
+        return
+    WHISPER_MODEL_EVENTS_TOTAL.labels(event=event, model=model).inc()
+    if event == "load":
+        WHISPER_MODEL_LOADED.labels(model=model).set(1)
+        if duration is not None:
+            WHISPER_MODEL_LOAD_DURATION.observe(duration)
+    elif event == "unload":
+        WHISPER_MODEL_LOADED.labels(model=model).set(0)
+
+
 # -- Endpoint helper -----------------------------------------------------------
 
 
@@ -367,5 +423,6 @@ def generate_metrics(db_path: str) -> tuple[bytes, str]:
     collect_cache_metrics()
     collect_redis_metrics()
     collect_queue_job_metrics()
+    collect_media_scheduler_metrics()
 
     return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,704 @@
+"""Native (pure-Python) Matroska/MP4 track-header reader.
+
+Provides run_native_probe() which returns the same normalized format as run_ffprobe()
+in ass_utils.py — {"streams": [...]} with ffprobe-compatible field names — without
+spawning a process. Only container headers are read (EBML Info/Tracks/Chapters for
+MKV/WebM, moov/trak boxes for MP4/MOV) using bounded, seek-based reads; no frame
+data is ever decoded.
+
+Besides "streams", the result carries "chapters" (ffprobe -show_chapters shape)
+and "format": {"duration": ...} when the container provides them.
+
+Containers or layouts the reader cannot handle raise UnsupportedContainerError so
+the caller can fall back to ffprobe.
+"""
+
+import logging
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+#: Upper bound for any single header element/box read into memory.
+MAX_HEADER_BYTES = 16 * 1024 * 1024
+
+
+class UnsupportedContainerError(RuntimeError):
+    """The file is not a container (or layout) the native reader can parse."""
+
+
+def run_native_probe(file_path: str) -> dict:
+    """Read stream (and chapter/duration) metadata straight from the container headers.
+
+    Args:
+        file_path: Path to the video file.
+
+    Returns:
+        dict: {"streams": [...], "chapters": [...], "format": {...}} normalized to
+              the ffprobe contract used by ass_utils consumers.
+
+    Raises:
+        UnsupportedContainerError: Not MKV/WebM/MP4/MOV, or headers out of reach.
+        OSError: The file cannot be read.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(12)
+        f.seek(0)
+        if head[:4] == b"\x1a\x45\xdf\xa3":
+            return _MatroskaReader(f).probe()
+        if head[4:8] in (b"ftyp", b"moov", b"free", b"skip", b"wide", b"mdat"):
+            return _Mp4Reader(f, os.fstat(f.fileno()).st_size).probe()
+    raise UnsupportedContainerError(f"Unsupported container: {file_path}")
+
+
+def read_segment_uid(head: bytes) -> bytes | None:
+    """Return the Matroska SegmentUID from the first bytes of a file, if present.
+
+    Only the in-memory *head* is inspected (the Info element normally sits in
+    the first few KiB); anything unparseable yields None.
+    """
+    if head[:4] != b"\x1a\x45\xdf\xa3":
+        return None
+    try:
+        elements = _iter_elements(head)
+        _ebml_id, _start, ebml_end = next(elements)
+        segment_id, segment_start, _stop = next(_iter_elements(head, ebml_end))
+        if segment_id != _SEGMENT:
+            return None
+        for elem_id, start, stop in _iter_elements(head, segment_start):
+            if elem_id == _CLUSTER:
+                break
+            if elem_id != _INFO:
+                continue
+            for child_id, c_start, c_stop in _iter_elements(head, start, stop):
+                if child_id == _SEGMENT_UID and c_stop - c_start == 16:
+                    return head[c_start:c_stop]
+            break
+    except (UnsupportedContainerError, StopIteration):
+        pass
+    return None
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format seconds the way ffprobe prints times ("1420.064000")."""
+    return f"{seconds:.6f}"
+
+
+def _fill_chapter_ends(chapters: list, duration: float | None) -> list:
+    """Set missing chapter end times to the next chapter start (or the duration)."""
+    chapters.sort(key=lambda c: c["_start"])
+    for i, ch in enumerate(chapters):
+        if ch["_end"] is None:
+            if i + 1 < len(chapters):
+                ch["_end"] = chapters[i + 1]["_start"]
+            else:
+                ch["_end"] = duration if duration is not None else ch["_start"]
+    return [
+        {
+            "id": ch["id"],
+            "start_time": _format_seconds(ch["_start"]),
+            "end_time": _format_seconds(ch["_end"]),
+            "tags": {"title": ch["title"]} if ch["title"] else {},
+        }
+        for ch in chapters
+    ]
+
+
+# ---- Matroska / WebM -------------------------------------------------------------
+
+# Element IDs (with their length-marker bits, as written in the file)
+_EBML_DOCTYPE = 0x4282
+_SEGMENT = 0x18538067
+_SEEK_HEAD = 0x114D9B74
+_SEEK = 0x4DBB
+_SEEK_ID = 0x53AB
+_SEEK_POSITION = 0x53AC
+_INFO = 0x1549A966
+_SEGMENT_UID = 0x73A4
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_TRACKS = 0x1654AE6B
+_CHAPTERS = 0x1043A770
+_CLUSTER = 0x1F43B675
+_TRACK_ENTRY = 0xAE
+_TRACK_TYPE = 0x83
+_CODEC_ID = 0x86
+_NAME = 0x536E
+_LANGUAGE = 0x22B59C
+_LANGUAGE_BCP47 = 0x22B59D
+_FLAG_DEFAULT = 0x88
+_FLAG_FORCED = 0x55AA
+_FLAG_HEARING_IMPAIRED = 0x55AB
+_FLAG_VISUAL_IMPAIRED = 0x55AC
+_FLAG_ORIGINAL = 0x55AE
+_FLAG_COMMENTARY = 0x55AF
+_VIDEO = 0xE0
+_PIXEL_WIDTH = 0xB0
+_PIXEL_HEIGHT = 0xBA
+_AUDIO = 0xE1
+_SAMPLING_FREQUENCY = 0xB5
+_CHANNELS = 0x9F
+_EDITION_ENTRY = 0x45B9
+_EDITION_FLAG_DEFAULT = 0x45DB
+_CHAPTER_ATOM = 0xB6
+_CHAPTER_UID = 0x73C4
+_CHAPTER_TIME_START = 0x91
+_CHAPTER_TIME_END = 0x92
+_CHAPTER_DISPLAY = 0x80
+_CHAP_STRING = 0x85
+
+_MKV_TRACK_TYPES = {1: "video", 2: "audio", 17: "subtitle"}
+
+# Matroska CodecID (prefix) → ffprobe codec_name
+_MKV_CODEC_MAP = {
+    "V_MPEG4/ISO/AVC": "h264",
+    "V_MPEGH/ISO/HEVC": "hevc",
+    "V_AV1": "av1",
+    "V_VP9": "vp9",
+    "V_VP8": "vp8",
+    "V_MPEG2": "mpeg2video",
+    "V_MPEG4/ISO/ASP": "mpeg4",
+    "V_MPEG4/ISO/SP": "mpeg4",
+    "V_THEORA": "theora",
+    "A_AAC": "aac",
+    "A_AC3": "ac3",
+    "A_EAC3": "eac3",
+    "A_DTS": "dts",
+    "A_TRUEHD": "truehd",
+    "A_MLP": "mlp",
+    "A_FLAC": "flac",
+    "A_OPUS": "opus",
+    "A_VORBIS": "vorbis",
+    "A_MPEG/L3": "mp3",
+    "A_MPEG/L2": "mp2",
+    "A_ALAC": "alac",
+    "A_PCM/INT/LIT": "pcm_s16le",
+    "A_PCM/INT/BIG": "pcm_s16be",
+    "A_PCM/FLOAT/IEEE": "pcm_f32le",
+    "S_TEXT/ASS": "ass",
+    "S_TEXT/SSA": "ass",
+    "S_ASS": "ass",
+    "S_SSA": "ass",
+    "S_TEXT/UTF8": "subrip",
+    "S_TEXT/ASCII": "text",
+    "S_TEXT/WEBVTT": "webvtt",
+    "S_HDMV/PGS": "hdmv_pgs_subtitle",
+    "S_HDMV/TEXTST": "hdmv_text_subtitle",
+    "S_VOBSUB": "dvd_subtitle",
+    "S_DVBSUB": "dvb_subtitle",
+    "S_ARIBSUB": "arib_caption",
+}
+
+
+def _mkv_codec_name(codec_id: str) -> str:
+    if codec_id in _MKV_CODEC_MAP:
+        return _MKV_CODEC_MAP[codec_id]
+    for prefix, name in _MKV_CODEC_MAP.items():
+        if codec_id.startswith(prefix):
+            return name  # e.g. A_AAC/MPEG4/LC, A_DTS/EXPRESS
+    return codec_id.lower()
+
+
+def _read_vint(data: bytes, pos: int, keep_marker: bool) -> tuple[int, int]:
+    """Decode an EBML variable-length integer; returns (value, length).
+
+    value is -1 for the reserved "unknown size" encoding.
+    """
+    if pos >= len(data):
+        raise UnsupportedContainerError("Truncated EBML data")
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise UnsupportedContainerError("Invalid EBML variable-length integer")
+    value = first if keep_marker else first & (mask - 1)
+    for b in data[pos + 1 : pos + length]:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return -1, length
+    return value, length
+
+
+def _iter_elements(data: bytes, pos: int = 0, end: int | None = None):
+    """Yield (element_id, data_start, data_end) for children in data[pos:end]."""
+    end = len(data) if end is None else end
+    while pos < end:
+        elem_id, id_len = _read_vint(data, pos, keep_marker=True)
+        size, size_len = _read_vint(data, pos + id_len, keep_marker=False)
+        start = pos + id_len + size_len
+        stop = end if size < 0 else min(start + size, end)
+        yield elem_id, start, stop
+        pos = stop
+
+
+def _uint(data: bytes) -> int:
+    return int.from_bytes(data, "big") if data else 0
+
+
+def _float(data: bytes) -> float:
+    if len(data) == 4:
+        return struct.unpack(">f", data)[0]
+    if len(data) == 8:
+        return struct.unpack(">d", data)[0]
+    return 0.0
+
+
+def _string(data: bytes) -> str:
+    return data.split(b"\x00", 1)[0].decode("utf-8", errors="replace")
+
+
+class _MatroskaReader:
+    """Seek-based reader for the Segment Info, Tracks and Chapters elements."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def _read_header(self) -> tuple[int, int, int] | None:
+        """Read an element header at the current offset: (id, size, header_len)."""
+        raw = self._f.read(12)
+        if len(raw) < 2:
+            return None
+        elem_id, id_len = _read_vint(raw, 0, keep_marker=True)
+        size, size_len = _read_vint(raw, id_len, keep_marker=False)
+        return elem_id, size, id_len + size_len
+
+    def _read_body(self, offset: int, size: int) -> bytes:
+        if size < 0 or size > MAX_HEADER_BYTES:
+            raise UnsupportedContainerError("Header element too large or of unknown size")
+        self._f.seek(offset)
+        data = self._f.read(size)
+        if len(data) < size:
+            raise UnsupportedContainerError("Truncated header element")
+        return data
+
+    def probe(self) -> dict:
+        header = self._read_header()
+        if header is None or header[1] < 0:
+            raise UnsupportedContainerError("Invalid EBML header")
+        ebml_id, ebml_size, ebml_header_len = header
+        ebml = self._read_body(ebml_header_len, ebml_size)
+        doctype = ""
+        for elem_id, start, stop in _iter_elements(ebml):
+            if elem_id == _EBML_DOCTYPE:
+                doctype = _string(ebml[start:stop])
+        if doctype not in ("matroska", "webm"):
+            raise UnsupportedContainerError(f"Unsupported EBML doctype: {doctype!r}")
+
+        self._f.seek(ebml_header_len + ebml_size)
+        header = self._read_header()
+        if header is None or header[0] != _SEGMENT:
+            raise UnsupportedContainerError("Matroska segment not found")
+        segment_start = ebml_header_len + ebml_size + header[2]
+
+        bodies = self._collect_top_level(segment_start)
+        if _TRACKS not in bodies:
+            raise UnsupportedContainerError("Matroska Tracks element not found")
+
+        scale, duration = 1_000_000, None
+        if _INFO in bodies:
+            info = bodies[_INFO]
+            for elem_id, start, stop in _iter_elements(info):
+                if elem_id == _TIMECODE_SCALE:
+                    scale = _uint(info[start:stop]) or scale
+                elif elem_id == _DURATION:
+                    duration = _float(info[start:stop])
+            if duration is not None:
+                duration = duration * scale / 1e9
+
+        result = {"streams": self._parse_tracks(bodies[_TRACKS])}
+        result["chapters"] = (
+            self._parse_chapters(bodies[_CHAPTERS], duration) if _CHAPTERS in bodies else []
+        )
+        result["format"] = {"duration": _format_seconds(duration)} if duration is not None else {}
+        return result
+
+    def _collect_top_level(self, segment_start: int) -> dict:
+        """Read Info/Tracks/Chapters bodies, walking top-level elements up to the
+        first Cluster and following the SeekHead for anything placed after it.
+        """
+        wanted = (_INFO, _TRACKS, _CHAPTERS)
+        bodies: dict = {}
+        seek_positions: dict = {}
+        offset = segment_start
+        while True:
+            self._f.seek(offset)
+            header = self._read_header()
+            if header is None:
+                break
+            elem_id, size, header_len = header
+            if elem_id == _CLUSTER or size < 0:
+                break
+            if elem_id in wanted and elem_id not in bodies:
+                bodies[elem_id] = self._read_body(offset + header_len, size)
+            elif elem_id == _SEEK_HEAD and not seek_positions:
+                seek_positions = self._parse_seek_head(self._read_body(offset + header_len, size))
+            if all(w in bodies for w in wanted):
+                break
+            offset += header_len + size
+
+        for elem_id in wanted:
+            if elem_id in bodies or elem_id not in seek_positions:
+                continue
+            position = segment_start + seek_positions[elem_id]
+            self._f.seek(position)
+            header = self._read_header()
+            if header is not None and header[0] == elem_id:
+                bodies[elem_id] = self._read_body(position + header[2], header[1])
+        return bodies
+
+    @staticmethod
+    def _parse_seek_head(data: bytes) -> dict:
+        positions = {}
+        for elem_id, start, stop in _iter_elements(data):
+            if elem_id != _SEEK:
+                continue
+            target, position = None, None
+            for child_id, c_start, c_stop in _iter_elements(data, start, stop):
+                if child_id == _SEEK_ID:
+                    target = _uint(data[c_start:c_stop])
+                elif child_id == _SEEK_POSITION:
+                    position = _uint(data[c_start:c_stop])
+            if target is not None and position is not None:
+                positions.setdefault(target, position)
+        return positions
+
+    @staticmethod
+    def _parse_tracks(data: bytes) -> list:
+        streams = []
+        for elem_id, start, stop in _iter_elements(data):
+            if elem_id != _TRACK_ENTRY:
+                continue
+            fields = {
+                _FLAG_DEFAULT: 1,
+                _FLAG_FORCED: 0,
+                _FLAG_HEARING_IMPAIRED: 0,
+                _FLAG_VISUAL_IMPAIRED: 0,
+                _FLAG_ORIGINAL: 0,
+                _FLAG_COMMENTARY: 0,
+            }
+            extra = {}
+            for child_id, c_start, c_stop in _iter_elements(data, start, stop):
+                value = data[c_start:c_stop]
+                if child_id in (_TRACK_TYPE, *fields):
+                    fields[child_id] = _uint(value)
+                elif child_id in (_CODEC_ID, _NAME, _LANGUAGE, _LANGUAGE_BCP47):
+                    fields[child_id] = _string(value)
+                elif child_id == _VIDEO:
+                    for v_id, v_start, v_stop in _iter_elements(data, c_start, c_stop):
+                        if v_id == _PIXEL_WIDTH:
+                            extra["width"] = _uint(data[v_start:v_stop])
+                        elif v_id == _PIXEL_HEIGHT:
+                            extra["height"] = _uint(data[v_start:v_stop])
+                elif child_id == _AUDIO:
+                    for a_id, a_start, a_stop in _iter_elements(data, c_start, c_stop):
+                        if a_id == _SAMPLING_FREQUENCY:
+                            extra["sample_rate"] = str(int(_float(data[a_start:a_stop])))
+                        elif a_id == _CHANNELS:
+                            extra["channels"] = _uint(data[a_start:a_stop])
+
+            tags = {
+                # LanguageBCP47 overrides Language when present (Matroska spec);
+                # the default track language is English and ffprobe reports it as such
+                "language": fields.get(_LANGUAGE_BCP47) or fields.get(_LANGUAGE) or "eng",
+            }
+            if fields.get(_NAME):
+                tags["title"] = fields[_NAME]
+            streams.append(
+                {
+                    "index": len(streams),
+                    "codec_name": _mkv_codec_name(fields.get(_CODEC_ID, "")),
+                    "codec_type": _MKV_TRACK_TYPES.get(fields.get(_TRACK_TYPE), "data"),
+                    **extra,
+                    "disposition": {
+                        "default": fields[_FLAG_DEFAULT],
+                        "forced": fields[_FLAG_FORCED],
+                        "hearing_impaired": fields[_FLAG_HEARING_IMPAIRED],
+                        "visual_impaired": fields[_FLAG_VISUAL_IMPAIRED],
+                        "original": fields[_FLAG_ORIGINAL],
+                        "comment": fields[_FLAG_COMMENTARY],
+                    },
+                    "tags": tags,
+                }
+            )
+        return streams
+
+    @staticmethod
+    def _parse_chapters(data: bytes, duration: float | None) -> list:
+        editions = []
+        for elem_id, start, stop in _iter_elements(data):
+            if elem_id != _EDITION_ENTRY:
+                continue
+            is_default, atoms = False, []
+            for child_id, c_start, c_stop in _iter_elements(data, start, stop):
+                if child_id == _EDITION_FLAG_DEFAULT:
+                    is_default = bool(_uint(data[c_start:c_stop]))
+                elif child_id == _CHAPTER_ATOM:
+                    atoms.append((c_start, c_stop))
+            editions.append((is_default, atoms))
+        if not editions:
+            return []
+        _, atoms = next((e for e in editions if e[0]), editions[0])
+
+        chapters = []
+        for start, stop in atoms:
+            uid, begin, end, title = 0, None, None, ""
+            for child_id, c_start, c_stop in _iter_elements(data, start, stop):
+                value = data[c_start:c_stop]
+                if child_id == _CHAPTER_UID:
+                    uid = _uint(value)
+                elif child_id == _CHAPTER_TIME_START:
+                    begin = _uint(value) / 1e9
+                elif child_id == _CHAPTER_TIME_END:
+                    end = _uint(value) / 1e9
+                elif child_id == _CHAPTER_DISPLAY and not title:
+                    for d_id, d_start, d_stop in _iter_elements(data, c_start, c_stop):
+                        if d_id == _CHAP_STRING:
+                            title = _string(data[d_start:d_stop])
+            if begin is None or not uid:
+                continue
+            chapters.append({"id": uid, "_start": begin, "_end": end, "title": title})
+        return _fill_chapter_ends(chapters, duration)
+
+
+# ---- MP4 / MOV -------------------------------------------------------------------
+
+_MP4_HANDLER_TYPES = {
+    b"vide": "video",
+    b"soun": "audio",
+    b"sbtl": "subtitle",
+    b"subt": "subtitle",
+    b"text": "subtitle",
+    b"clcp": "subtitle",
+}
+
+# Sample entry fourcc → ffprobe codec_name
+_MP4_CODEC_MAP = {
+    b"avc1": "h264",
+    b"avc3": "h264",
+    b"hvc1": "hevc",
+    b"hev1": "hevc",
+    b"av01": "av1",
+    b"vp09": "vp9",
+    b"mp4v": "mpeg4",
+    b"mp4a": "aac",
+    b"ac-3": "ac3",
+    b"ec-3": "eac3",
+    b"Opus": "opus",
+    b"fLaC": "flac",
+    b"alac": "alac",
+    b"dtsc": "dts",
+    b"dtsh": "dts",
+    b"dtsl": "dts",
+    b"mlpa": "truehd",
+    b".mp3": "mp3",
+    b"tx3g": "mov_text",
+    b"text": "mov_text",
+    b"wvtt": "webvtt",
+    b"stpp": "ttml",
+    b"c608": "eia_608",
+}
+
+# Boxes whose children are boxes (the only ones we descend into)
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"udta", b"tref"}
+
+
+class _Mp4Reader:
+    """Seek-based reader for moov/trak headers (sample tables are skipped)."""
+
+    def __init__(self, f, file_size: int):
+        self._f = f
+        self._size = file_size
+
+    def _iter_boxes(self, start: int, end: int):
+        """Yield (type, payload_start, payload_end) for boxes in [start, end)."""
+        pos = start
+        while pos + 8 <= end:
+            self._f.seek(pos)
+            header = self._f.read(16)
+            if len(header) < 8:
+                return
+            size, box_type = struct.unpack(">I4s", header[:8])
+            header_len = 8
+            if size == 1:
+                if len(header) < 16:
+                    return
+                size = struct.unpack(">Q", header[8:16])[0]
+                header_len = 16
+            elif size == 0:
+                size = end - pos
+            if size < header_len:
+                raise UnsupportedContainerError("Invalid MP4 box size")
+            yield box_type, pos + header_len, min(pos + size, end)
+            pos += size
+
+    def _read(self, start: int, end: int, limit: int = MAX_HEADER_BYTES) -> bytes:
+        if end - start > limit:
+            raise UnsupportedContainerError("MP4 header box too large")
+        self._f.seek(start)
+        return self._f.read(end - start)
+
+    def probe(self) -> dict:
+        moov = next(
+            ((s, e) for box, s, e in self._iter_boxes(0, self._size) if box == b"moov"), None
+        )
+        if moov is None:
+            raise UnsupportedContainerError("MP4 moov box not found")
+
+        streams, chapters, duration = [], [], None
+        for box, start, end in self._iter_boxes(*moov):
+            if box == b"mvhd":
+                duration = self._parse_mvhd(self._read(start, end))
+            elif box == b"trak":
+                stream = self._parse_trak(start, end)
+                stream["index"] = len(streams)
+                streams.append(stream)
+            elif box == b"udta":
+                for child, c_start, c_end in self._iter_boxes(start, end):
+                    if child == b"chpl":
+                        chapters = self._parse_chpl(self._read(c_start, c_end))
+
+        return {
+            "streams": streams,
+            "chapters": _fill_chapter_ends(chapters, duration),
+            "format": {"duration": _format_seconds(duration)} if duration is not None else {},
+        }
+
+    @staticmethod
+    def _parse_mvhd(data: bytes) -> float | None:
+        if not data:
+            return None
+        if data[0] == 1:
+            timescale, duration = struct.unpack(">IQ", data[20:32])
+        else:
+            timescale, duration = struct.unpack(">II", data[12:20])
+        return duration / timescale if timescale else None
+
+    def _parse_trak(self, start: int, end: int) -> dict:
+        info = {"enabled": True, "language": "und", "handler": b"", "handler_name": ""}
+        self._walk_trak(start, end, info)
+        if info.get("chapter_ref"):
+            # QuickTime chapter tracks store titles in sample data, not headers
+            raise UnsupportedContainerError("MP4 chapter track needs a full demux")
+        codec_type = _MP4_HANDLER_TYPES.get(info["handler"], "data")
+        fourcc = info.get("fourcc", b"")
+        codec_name = _MP4_CODEC_MAP.get(fourcc, fourcc.decode("latin-1").strip().lower())
+        if fourcc == b"mp4a" and info.get("object_type") in (0x69, 0x6B):
+            codec_name = "mp3"
+
+        tags = {"language": info["language"]}
+        if info["handler_name"]:
+            tags["handler_name"] = info["handler_name"]
+        if info.get("title"):
+            tags["title"] = info["title"]
+        stream = {"codec_name": codec_name, "codec_type": codec_type}
+        stream.update(
+            {k: info[k] for k in ("width", "height", "channels", "sample_rate") if k in info}
+        )
+        stream["disposition"] = {"default": 1 if info["enabled"] else 0, "forced": 0}
+        stream["tags"] = tags
+        return stream
+
+    def _walk_trak(self, start: int, end: int, info: dict):
+        for box, b_start, b_end in self._iter_boxes(start, end):
+            if box in _MP4_CONTAINERS:
+                if box == b"tref":
+                    for ref, _, _ in self._iter_boxes(b_start, b_end):
+                        if ref == b"chap":
+                            info["chapter_ref"] = True
+                    continue
+                self._walk_trak(b_start, b_end, info)
+            elif box == b"tkhd":
+                data = self._read(b_start, min(b_end, b_start + 4))
+                info["enabled"] = bool(len(data) == 4 and data[3] & 0x1)
+            elif box == b"mdhd":
+                info["language"] = self._parse_mdhd_language(self._read(b_start, b_end, 64))
+            elif box == b"hdlr":
+                data = self._read(b_start, b_end, 4096)
+                info["handler"] = data[8:12]
+                info["handler_name"] = _string(data[24:]).strip()
+            elif box == b"stsd":
+                self._parse_stsd(self._read(b_start, min(b_end, b_start + 4096)), info)
+            elif box == b"name":
+                info["title"] = _string(self._read(b_start, b_end, 4096))
+
+    @staticmethod
+    def _parse_mdhd_language(data: bytes) -> str:
+        offset = 32 if data and data[0] == 1 else 20
+        if len(data) < offset + 2:
+            return "und"
+        packed = struct.unpack(">H", data[offset : offset + 2])[0]
+        if packed in (0, 0x7FFF):
+            return "und"
+        return "".join(chr(((packed >> shift) & 0x1F) + 0x60) for shift in (10, 5, 0))
+
+    @staticmethod
+    def _parse_stsd(data: bytes, info: dict):
+        # full box header (4) + entry_count (4), then the first sample entry
+        if len(data) < 16:
+            return
+        entry = data[8:]
+        fourcc = entry[4:8]
+        info["fourcc"] = fourcc
+        body = entry[8:]  # after size + fourcc
+        handler = info["handler"]
+        if handler == b"vide" and len(body) >= 28:
+            info["width"], info["height"] = struct.unpack(">HH", body[24:28])
+        elif handler == b"soun" and len(body) >= 28:
+            info["channels"] = struct.unpack(">H", body[16:18])[0]
+            info["sample_rate"] = str(struct.unpack(">I", body[24:28])[0] >> 16)
+            esds = entry.find(b"esds")
+            if esds >= 0:
+                object_type = _Mp4Reader._esds_object_type(entry[esds + 8 :])
+                if object_type is not None:
+                    info["object_type"] = object_type
+
+    @staticmethod
+    def _esds_object_type(data: bytes) -> int | None:
+        """objectTypeIndication from an esds payload (ES_Descriptor → DecoderConfig)."""
+
+        def skip_length(pos):
+            while pos < len(data) and data[pos] & 0x80:
+                pos += 1
+            return pos + 1
+
+        if len(data) < 2 or data[0] != 0x03:
+            return None
+        pos = skip_length(1) + 2  # ES_ID
+        if pos >= len(data):
+            return None
+        flags = data[pos]
+        pos += 1
+        if flags & 0x80:
+            pos += 2  # dependsOn_ES_ID
+        if flags & 0x40 and pos < len(data):
+            pos += 1 + data[pos]  # URL
+        if flags & 0x20:
+            pos += 2  # OCR_ES_Id
+        if pos >= len(data) or data[pos] != 0x04:
+            return None
+        pos = skip_length(pos + 1)
+        return data[pos] if pos < len(data) else None
+
+    @staticmethod
+    def _parse_chpl(data: bytes) -> list:
+        """Nero chapter list: start times in 100 ns units plus a title per entry."""
+        if len(data) < 5:
+            return []
+        pos = 4 + (4 if data[0] else 0)  # version/flags (+ reserved on v1)
+        if pos >= len(data):
+            return []
+        count = data[pos]
+        pos += 1
+        chapters = []
+        for idx in range(count):
+            if pos + 9 > len(data):
+                break
+            start = struct.unpack(">Q", data[pos : pos + 8])[0] / 1e7
+            title_len = data[pos + 8]
+            title = data[pos + 9 : pos + 9 + title_len].decode("utf-8", errors="replace")
+            pos += 9 + title_len
+            chapters.append({"id": idx, "_start": start, "_end": None, "title": title})
+        return chapters
@@ -519,6 +519,22 @@ class ProviderManager:
                 return class_limit
         return PROVIDER_METADATA.get(provider_name, {}).get("rate_limit", (0, 0))
 
+    def get_min_search_spacing(self) -> float:
+        """Seconds between item searches that keeps every enabled provider in budget.
+
+        One wanted-item search queries each enabled provider, so the slowest
+        token bucket (window / max_requests) bounds the sustainable rate.
+        Returns 0.0 when rate limiting is disabled or no provider has a limit.
+        """
+        if not getattr(self.settings, "provider_rate_limit_enabled", True):
+            return 0.0
+        spacing = 0.0
+        for name in self._providers:
+            max_requests, window_seconds = self._get_rate_limit(name)
+            if max_requests > 0 and window_seconds > 0:
+                spacing = max(spacing, window_seconds / max_requests)
+        return spacing
+
     def _compute_dynamic_timeout(self, provider_name: str, stats: dict) -> int | None:
         """Compute a dynamic timeout from provider stats (avg response time × multiplier + buffer).
 
@@ -19,6 +19,8 @@ import shutil
 import subprocess
 import tempfile
 
+from media_scheduler import DEMUX, PROBE, run_media
+
 logger = logging.getLogger(__name__)
 
 
@@ -138,7 +140,7 @@ def _remux_mkvmerge(video_path: str, stream_index: int, output_path: str) -> Non
         video_path,
     ]
     logger.debug("Remux mkvmerge: %s", " ".join(cmd))
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    result = run_media(DEMUX, cmd, capture_output=True, text=True, timeout=600)
     if result.returncode not in (0, 1):  # mkvmerge exit 1 = warnings, still OK
         raise RemuxError(f"mkvmerge failed (exit {result.returncode}): {result.stderr[:500]}")
 
@@ -168,7 +170,7 @@ def _remux_ffmpeg(video_path: str, stream_index: int, output_path: str) -> None:
         output_path,
     ]
     logger.debug("Remux ffmpeg: %s", " ".join(cmd))
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    result = run_media(DEMUX, cmd, capture_output=True, text=True, timeout=600)
     if result.returncode != 0:
         raise RemuxError(f"ffmpeg failed (exit {result.returncode}): {result.stderr[-500:]}")
 
@@ -192,7 +194,7 @@ def _probe(path: str) -> dict:
         "-show_format",
         path,
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    result = run_media(PROBE, cmd, capture_output=True, text=True, timeout=60)
     if result.returncode != 0:
         raise RemuxError(f"ffprobe failed: {result.stderr[:300]}")
     import json
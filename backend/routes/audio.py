@@ -25,7 +25,10 @@ def get_waveform():
       tags:
         - Audio
       summary: Get waveform data
-      description: Generates waveform visualization data from video file audio track.
+      description: |
+        Returns min/max/RMS peaks of a time range at a zoom level. The audio track
+        is decoded once into a cached multi-resolution pyramid; later requests
+        (any range, any zoom) are served from the cache.
       security:
         - apiKeyAuth: []
       parameters:
@@ -46,16 +49,26 @@ def get_waveform():
           schema:
             type: integer
             default: 2000
-          description: Waveform width in pixels (affects resolution)
+          description: Maximum number of buckets to return (picks the zoom level)
         - in: query
-          name: sample_rate
+          name: start
+          schema:
+            type: number
+            default: 0
+          description: Range start in seconds
+        - in: query
+          name: end
+          schema:
+            type: number
+          description: Range end in seconds (defaults to the end of the file)
+        - in: query
+          name: level
           schema:
             type: integer
-            default: 100
-          description: Samples per second
+          description: Explicit pyramid level (0 = 100 buckets/s; each level is 4x coarser)
       responses:
         200:
-          description: Waveform data
+          description: Waveform peaks
           content:
             application/json:
               schema:
@@ -63,19 +76,39 @@ def get_waveform():
                 properties:
                   duration:
                     type: number
-                  sample_rate:
+                  level:
                     type: integer
-                  samples:
-                    type: integer
-                  data:
+                  levels:
                     type: array
                     items:
                       type: object
                       properties:
-                        time:
-                          type: number
-                        amplitude:
+                        level:
+                          type: integer
+                        bucket_seconds:
                           type: number
+                        samples:
+                          type: integer
+                  start:
+                    type: number
+                  end:
+                    type: number
+                  bucket_seconds:
+                    type: number
+                  samples:
+                    type: integer
+                  min:
+                    type: array
+                    items:
+                      type: number
+                  max:
+                    type: array
+                    items:
+                      type: number
+                  rms:
+                    type: array
+                    items:
+                      type: number
         400:
           description: Invalid request
         404:
@@ -110,13 +143,17 @@ def get_waveform():
     try:
         audio_track_index = request.args.get("audio_track_index", type=int)
         width = request.args.get("width", 2000, type=int)
-        sample_rate = request.args.get("sample_rate", 100, type=int)
+        start = request.args.get("start", 0.0, type=float)
+        end = request.args.get("end", type=float)
+        level = request.args.get("level", type=int)
 
         waveform_data = generate_waveform_json(
             mapped_path,
             audio_track_index=audio_track_index,
             width=width,
-            sample_rate=sample_rate,
+            start=start,
+            end=end,
+            level=level,
         )
 
         return jsonify(waveform_data), 200
@@ -29,6 +29,11 @@ def list_blacklist():
             type: integer
             default: 50
             maximum: 200
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: Keyset cursor (next_cursor from the previous page; empty for the first page). Overrides page.
       responses:
         200:
           description: Paginated blacklist
@@ -49,12 +54,21 @@ def list_blacklist():
                     type: integer
                   total_pages:
                     type: integer
+                  next_cursor:
+                    type: string
+                    nullable: true
+        400:
+          description: Invalid cursor
     """
     from db.blacklist import get_blacklist_entries
 
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 50, type=int), 200)
-    result = get_blacklist_entries(page=page, per_page=per_page)
+    cursor = request.args.get("cursor")
+    try:
+        result = get_blacklist_entries(page=page, per_page=per_page, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(result)
 
 
@@ -299,6 +313,11 @@ def list_history():
             default: desc
             enum: [asc, desc]
           description: Sort direction
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: Keyset cursor (next_cursor from the previous page; empty for the first page). Overrides page.
       responses:
         200:
           description: Paginated history
@@ -319,6 +338,11 @@ def list_history():
                     type: integer
                   total_pages:
                     type: integer
+                  next_cursor:
+                    type: string
+                    nullable: true
+        400:
+          description: Invalid cursor
     """
     from db.library import get_download_history
 
@@ -332,19 +356,24 @@ def list_history():
     search = request.args.get("search") or None
     sort_by = request.args.get("sort_by", "downloaded_at")
     sort_dir = request.args.get("sort_dir", "desc")
+    cursor = request.args.get("cursor")
 
-    result = get_download_history(
-        page=page,
-        per_page=per_page,
-        provider=provider,
-        language=language,
-        format=format_filter,
-        score_min=score_min,
-        score_max=score_max,
-        search=search,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-    )
+    try:
+        result = get_download_history(
+            page=page,
+            per_page=per_page,
+            provider=provider,
+            language=language,
+            format=format_filter,
+            score_min=score_min,
+            score_max=score_max,
+            search=search,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(result)
 
 
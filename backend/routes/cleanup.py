@@ -150,8 +150,23 @@ def get_duplicates():
       tags:
         - Cleanup
       summary: List duplicate groups
-      description: Returns groups of subtitle files sharing identical content hashes. Each group contains 2+ files.
+      description: >
+        Returns groups of subtitle files sharing identical content hashes. Each group contains 2+ files.
+        With mode=near, returns clusters of files whose dialog text is near-identical (re-timed,
+        restyled or slightly edited copies), each with the lowest similarity within the cluster.
       parameters:
+        - in: query
+          name: mode
+          schema:
+            type: string
+            enum: [exact, near]
+            default: exact
+        - in: query
+          name: threshold
+          description: Minimum dialog similarity for mode=near (0.5-1.0)
+          schema:
+            type: number
+            default: 0.95
         - in: query
           name: page
           schema:
@@ -176,12 +191,22 @@ def get_duplicates():
                     type: integer
     """
     from db.repositories.cleanup import CleanupRepository
+    from dedup_engine import NEAR_DUPLICATE_THRESHOLD, find_near_duplicate_groups
 
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 50, type=int), 200)
-
-    repo = CleanupRepository()
-    all_groups = repo.get_duplicate_groups()
+    mode = request.args.get("mode", "exact")
+
+    if mode == "near":
+        threshold = request.args.get("threshold", NEAR_DUPLICATE_THRESHOLD, type=float)
+        if not 0.5 <= threshold <= 1.0:
+            return jsonify({"error": "threshold must be between 0.5 and 1.0"}), 400
+        all_groups = find_near_duplicate_groups(threshold)
+    elif mode == "exact":
+        repo = CleanupRepository()
+        all_groups = repo.get_duplicate_groups()
+    else:
+        return jsonify({"error": "mode must be 'exact' or 'near'"}), 400
 
     total = len(all_groups)
     start = (page - 1) * per_page
@@ -194,6 +219,7 @@ def get_duplicates():
             "total": total,
             "page": page,
             "per_page": per_page,
+            "mode": mode,
         }
     )
 
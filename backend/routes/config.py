@@ -163,7 +163,7 @@ def update_config():
 
     _ENUM_FIELDS = {
         "log_level": {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"},
-        "auto_sync_engine": {"ffsubsync", "alass"},
+        "auto_sync_engine": {"native", "ffsubsync", "alass"},
         "log_format": {"text", "json"},
     }
     # Config keys that hold outbound service URLs — validated to block dangerous schemes
@@ -267,6 +267,10 @@ def update_config():
         for k in saved_keys
     ):
         _inv_notifier()
+    if any(k.startswith("media_process_") for k in saved_keys):
+        from media_scheduler import get_media_scheduler
+
+        get_media_scheduler().configure()
     invalidate_scanner()
     invalidate_response_cache()
 
@@ -13,6 +13,7 @@ from security_utils import is_safe_path
 from services.ocr_extractor import (
     TESSERACT_AVAILABLE,
     batch_ocr_track,
+    cues_to_srt,
     ocr_subtitle_stream,
     preview_frame,
 )
@@ -307,7 +308,7 @@ def batch_extract():
         try:
             cues = batch_ocr_track(vp, si, lang)
             with _ocr_lock:
-                _ocr_jobs[jid] = {"status": "completed", "cues": cues}
+                _ocr_jobs[jid] = {"status": "completed", "cues": cues, "srt": cues_to_srt(cues)}
         except Exception as e:
             logger.error("Batch OCR job %s failed: %s", jid, e)
             with _ocr_lock:
@@ -320,6 +321,9 @@ def batch_extract():
 @bp.route("/ocr/batch-extract/<job_id>", methods=["GET"])
 def batch_extract_status(job_id: str):
     """Get status of a batch OCR job.
+
+    Completed jobs carry ``cues`` and, for timed (PGS) tracks, the same cues
+    rendered as ``srt`` text.
     ---
     get:
       summary: Batch OCR job status
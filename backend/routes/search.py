@@ -68,7 +68,9 @@ def rebuild_index():
       tags:
         - Search
       summary: Rebuild search index
-      description: Rebuilds the FTS5 search index from current database contents.
+      description: >
+        Rebuilds the FTS5 search index from current database contents. Maintenance
+        action only -- database triggers keep the index in sync on every write.
       responses:
         200:
           description: Index rebuilt
@@ -415,8 +415,8 @@ def delete_series(series_id):
         500:
           description: Server error
     """
-    from db import get_db
     from db.standalone import delete_standalone_series, get_standalone_series
+    from db.wanted import delete_wanted_for_standalone
 
     series = get_standalone_series(series_id)
     if not series:
@@ -424,12 +424,7 @@ def delete_series(series_id):
 
     try:
         # Delete associated wanted items first
-        db = get_db()
-        db.execute(
-            text("DELETE FROM wanted_items WHERE standalone_series_id=:sid"),
-            {"sid": series_id},
-        )
-        db.commit()
+        delete_wanted_for_standalone(series_id=series_id)
 
         delete_standalone_series(series_id)
         return jsonify({"success": True})
@@ -547,8 +542,8 @@ def delete_movie(movie_id):
         500:
           description: Server error
     """
-    from db import get_db
     from db.standalone import delete_standalone_movie, get_standalone_movies
+    from db.wanted import delete_wanted_for_standalone
 
     movie = get_standalone_movies(movie_id)
     if not movie:
@@ -556,12 +551,7 @@ def delete_movie(movie_id):
 
     try:
         # Delete associated wanted items first
-        db = get_db()
-        db.execute(
-            text("DELETE FROM wanted_items WHERE standalone_movie_id=:mid"),
-            {"mid": movie_id},
-        )
-        db.commit()
+        delete_wanted_for_standalone(movie_id=movie_id)
 
         delete_standalone_movie(movie_id)
         return jsonify({"success": True})
@@ -606,7 +596,7 @@ def scan_all():
                 from standalone.scanner import StandaloneScanner
 
                 scanner = StandaloneScanner()
-                scanner.scan_all_folders()
+                scanner.scan_all_folders(full=True)
             except Exception as e:
                 logger.error("Standalone scan failed: %s", e)
 
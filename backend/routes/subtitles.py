@@ -181,14 +181,11 @@ def _trash_sidecar(path: str, media_path: str, batch_dir: str) -> tuple[str, str
         except OSError:
             pass
 
-    # Remove subtitle_downloads DB entry (best-effort)
+    # Remove subtitle_downloads DB entry (best-effort; keeps the daily rollups in step)
     try:
-        from extensions import db as sa_db  # noqa: I001
-        from sqlalchemy import text as _text  # noqa: I001
+        from db.providers import delete_subtitle_downloads
 
-        with sa_db.engine.connect() as conn:
-            conn.execute(_text("DELETE FROM subtitle_downloads WHERE file_path = :p"), {"p": path})
-            conn.commit()
+        delete_subtitle_downloads(path)
     except Exception as exc:
         logger.debug("Could not remove subtitle_downloads entry for %s: %s", path, exc)
 
@@ -85,7 +85,9 @@ def get_statistics():
       tags:
         - System
       summary: Get comprehensive statistics
-      description: Returns daily stats, provider stats, download counts, backend stats, upgrades, and format breakdown.
+      description: >
+        Returns daily stats, provider stats, download counts, backend stats, upgrades, and
+        format breakdown. Download aggregates are read from the daily rollup table.
       security:
         - apiKeyAuth: []
       parameters:
@@ -131,7 +133,12 @@ def get_statistics():
                     type: string
     """
     from db import get_db
-    from db.providers import get_provider_stats
+    from db.providers import (
+        get_daily_download_quality,
+        get_downloads_by_provider,
+        get_provider_stats,
+        get_series_download_quality,
+    )
 
     range_param = request.args.get("range", "30d")
     range_map = {"7d": 7, "30d": 30, "90d": 90, "365d": 365}
@@ -167,15 +174,8 @@ def get_statistics():
     # Provider stats (all providers)
     providers = get_provider_stats()
 
-    # Downloads by provider
-    dl_rows = db.execute(
-        text("""SELECT provider_name, COUNT(*) as count, AVG(score) as avg_score
-           FROM subtitle_downloads GROUP BY provider_name""")
-    ).fetchall()
-    downloads_by_provider = [
-        {"provider_name": row[0], "count": row[1], "avg_score": round(row[2] or 0, 1)}
-        for row in dl_rows
-    ]
+    # Downloads by provider (from the daily rollups, not subtitle_downloads)
+    downloads_by_provider = get_downloads_by_provider()
 
     # Translation backend stats
     backend_rows = db.execute(text("SELECT * FROM translation_backend_stats")).fetchall()
@@ -188,57 +188,29 @@ def get_statistics():
     ).fetchall()
     upgrades = [{"type": row[0], "count": row[1]} for row in upgrade_rows]
 
-    # Quality trend: daily avg score from subtitle_downloads (normalized 0-100)
+    # Quality trend: daily avg score (normalized 0-100)
     _SCORE_MAX = 900.0
-    qt_rows = db.execute(
-        text("""
-            SELECT substr(downloaded_at, 1, 10) as date,
-                   AVG(COALESCE(score, 0)) as avg_score,
-                   COUNT(*) as files_checked,
-                   SUM(CASE WHEN COALESCE(score, 0) < 100 THEN 1 ELSE 0 END) as issues_count
-            FROM subtitle_downloads
-            WHERE downloaded_at >= date('now', :offset)
-            GROUP BY substr(downloaded_at, 1, 10)
-            ORDER BY date ASC
-        """),
-        {"offset": f"-{days} days"},
-    ).fetchall()
     quality_trend = [
         {
-            "date": row[0],
-            "avg_score": round(min(100.0, (row[1] or 0) / _SCORE_MAX * 100), 1),
-            "files_checked": row[2] or 0,
-            "issues_count": row[3] or 0,
+            "date": row["date"],
+            "avg_score": round(min(100.0, row["avg_score"] / _SCORE_MAX * 100), 1),
+            "files_checked": row["download_count"],
+            "issues_count": row["low_score_count"],
         }
-        for row in qt_rows
+        for row in get_daily_download_quality(days)
     ]
 
-    # Series quality: per-series avg score and format breakdown from subtitle_downloads
-    sq_rows = db.execute(
-        text("""
-            SELECT wi.title,
-                   AVG(COALESCE(sd.score, 0)) as avg_score,
-                   COUNT(*) as download_count,
-                   MAX(sd.downloaded_at) as last_download,
-                   GROUP_CONCAT(DISTINCT sd.format) as formats
-            FROM subtitle_downloads sd
-            JOIN wanted_items wi ON sd.file_path = wi.file_path
-            WHERE wi.title != ''
-            GROUP BY wi.title
-            ORDER BY download_count DESC
-            LIMIT 20
-        """)
-    ).fetchall()
+    # Series quality: per-series avg score and format breakdown
     series_quality = [
         {
-            "title": row[0],
-            "avg_score": round(row[1] or 0, 1),
-            "avg_score_pct": round(min(100.0, (row[1] or 0) / _SCORE_MAX * 100), 1),
-            "download_count": row[2] or 0,
-            "last_download": row[3],
-            "formats": [f for f in (row[4] or "").split(",") if f],
+            "title": row["title"],
+            "avg_score": round(row["avg_score"], 1),
+            "avg_score_pct": round(min(100.0, row["avg_score"] / _SCORE_MAX * 100), 1),
+            "download_count": row["download_count"],
+            "last_download": row["last_download"],
+            "formats": row["formats"],
         }
-        for row in sq_rows
+        for row in get_series_download_quality(limit=20)
     ]
 
     return jsonify(
@@ -296,7 +268,7 @@ def export_statistics():
                 format: binary
     """
     from db import get_db
-    from db.providers import get_provider_stats
+    from db.providers import get_downloads_by_provider, get_provider_stats
 
     range_param = request.args.get("range", "30d")
     export_format = request.args.get("format", "json")
@@ -341,13 +313,9 @@ def export_statistics():
     else:
         # JSON export with full data
         providers = get_provider_stats()
-        dl_rows = db.execute(
-            text("""SELECT provider_name, COUNT(*) as count, AVG(score) as avg_score
-               FROM subtitle_downloads GROUP BY provider_name""")
-        ).fetchall()
         downloads_by_provider = [
-            {"provider": row[0], "count": row[1], "avg_score": round(row[2] or 0, 1)}
-            for row in dl_rows
+            {"provider": row["provider_name"], "count": row["count"], "avg_score": row["avg_score"]}
+            for row in get_downloads_by_provider()
         ]
 
         stats_data = {
@@ -366,3 +334,35 @@ def export_statistics():
             as_attachment=True,
             download_name=f"sublarr_stats_{today}.json",
         )
+
+
+@bp.route("/statistics/rollups/rebuild", methods=["POST"])
+def rebuild_statistics_rollups():
+    """Rebuild the daily download rollups from the full download history.
+    ---
+    post:
+      tags:
+        - System
+      summary: Rebuild statistics rollups
+      description: >
+        Maintenance action. Rollups are kept current on every recorded download;
+        this recomputes them from subtitle_downloads (e.g. after importing history).
+      security:
+        - apiKeyAuth: []
+      responses:
+        200:
+          description: Rollups rebuilt
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  success:
+                    type: boolean
+                  rows:
+                    type: integer
+    """
+    from db.providers import backfill_download_rollups
+
+    rows = backfill_download_rollups()
+    return jsonify({"success": True, "rows": rows})
@@ -322,6 +322,26 @@ def list_tasks():
     return jsonify({"tasks": tasks})
 
 
+@bp.route("/tasks/media-processes", methods=["GET"])
+def media_process_stats():
+    """Return the global media process budget and per-class queue depth.
+    ---
+    get:
+      tags:
+        - System
+      summary: Media process scheduler stats
+      description: Running and waiting ffmpeg/ffprobe/mediainfo/tesseract processes per slot class.
+      security:
+        - apiKeyAuth: []
+      responses:
+        200:
+          description: Scheduler snapshot
+    """
+    from media_scheduler import get_media_scheduler
+
+    return jsonify(get_media_scheduler().stats())
+
+
 @bp.route("/tasks/<name>/cancel", methods=["POST"])
 def cancel_task(name):
     """Cancel a running background task by name.
@@ -10,6 +10,7 @@ from collections import OrderedDict
 
 from flask import jsonify, request
 
+from media_scheduler import PRIORITY_INTERACTIVE, TRANSCODE, run_media
 from routes.tools import bp
 from routes.tools._helpers import PYSUBS2_EXT, SUPPORTED_FORMATS, _validate_file_path
 
@@ -20,14 +21,11 @@ WAVEFORM_CACHE: OrderedDict = OrderedDict()  # (video_path, mtime) -> temp_opus_
 
 
 def _get_waveform_duration(video_path: str) -> float:
-    """Get video duration in seconds via ffprobe."""
-    import json as _json
+    """Get video duration in seconds from the cached media metadata record."""
+    from ass_utils import get_media_metadata
 
-    cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", video_path]
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        data = _json.loads(r.stdout)
-        return float(data.get("format", {}).get("duration", 0))
+        return float(get_media_metadata(video_path).get("format", {}).get("duration") or 0)
     except Exception:
         return 0.0
 
@@ -282,7 +280,9 @@ def waveform_extract():
             tmp.name,
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=120)
+            result = run_media(
+                TRANSCODE, cmd, priority=PRIORITY_INTERACTIVE, capture_output=True, timeout=120
+            )
         except subprocess.TimeoutExpired:
             return jsonify({"error": "Audio extraction timed out"}), 500
 
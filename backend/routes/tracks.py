@@ -7,7 +7,7 @@ import threading
 
 from flask import Blueprint, current_app, jsonify, request
 
-from ass_utils import extract_subtitle_stream, get_media_streams
+from ass_utils import extract_subtitle_stream, extract_subtitle_streams, get_media_streams
 from config import map_path
 from events import emit_event
 
@@ -346,35 +346,63 @@ def batch_extract_series_tracks(series_id):
                 tracks = _build_track_list(probe.get("streams", []))
                 subtitle_tracks = [t for t in tracks if t["codec_type"] == "subtitle"]
 
-                file_extracted = 0
+                # Collect every missing sidecar, then extract them in one ffmpeg pass
+                pending = {}
                 for track in subtitle_tracks:
                     lang = track["language"] or "und"
                     ext = _CODEC_EXT.get(track["codec"], "ass")
                     base, _ = os.path.splitext(video_path)
                     output_path = f"{base}.{lang}.{ext}"
 
-                    if os.path.exists(output_path):
+                    if output_path in pending or os.path.exists(output_path):
                         skipped += 1
                         continue
+                    pending[output_path] = track
 
-                    stream_info = {"sub_index": track["sub_index"], "format": ext}
+                file_extracted = 0
+                if pending:
+                    targets = [
+                        (
+                            {
+                                "sub_index": track["sub_index"],
+                                "format": os.path.splitext(out)[1][1:],
+                            },
+                            out,
+                        )
+                        for out, track in pending.items()
+                    ]
                     try:
-                        extract_subtitle_stream(video_path, stream_info, output_path)
+                        extract_subtitle_streams(video_path, targets)
                         logger.debug(
-                            "[batch-extract-tracks] extracted %s (track %d)",
-                            output_path,
-                            track["index"],
+                            "[batch-extract-tracks] extracted %d track(s) from %s",
+                            len(targets),
+                            video_path,
                         )
-                        succeeded += 1
-                        file_extracted += 1
+                        succeeded += len(targets)
+                        file_extracted += len(targets)
                     except Exception as exc:
-                        logger.warning(
-                            "[batch-extract-tracks] extract failed (%s track %d): %s",
+                        # Retry one by one so a single bad track only fails itself
+                        logger.debug(
+                            "[batch-extract-tracks] one-pass extract failed for %s: %s",
                             video_path,
-                            track["index"],
                             exc,
                         )
-                        failed += 1
+                        for stream_info, output_path in targets:
+                            track = pending[output_path]
+                            try:
+                                extract_subtitle_stream(
+                                    video_path, stream_info, output_path, prefill_cache=False
+                                )
+                                succeeded += 1
+                                file_extracted += 1
+                            except Exception as track_exc:
+                                logger.warning(
+                                    "[batch-extract-tracks] extract failed (%s track %d): %s",
+                                    video_path,
+                                    track["index"],
+                                    track_exc,
+                                )
+                                failed += 1
 
                 emit_event(
                     "batch_extract_progress",
@@ -2,8 +2,9 @@
 
 import logging
 import os
+from urllib.parse import urlencode
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, send_file
 
 from config import get_settings
 from security_utils import is_safe_path
@@ -11,12 +12,38 @@ from services.video_player import (
     convert_subtitle_to_webvtt,
     generate_hls_playlist,
     generate_screenshot,
+    get_hls_segment,
 )
 
 bp = Blueprint("video", __name__, url_prefix="/api/v1")
 logger = logging.getLogger(__name__)
 
 
+def _resolve_media_path(file_path: str):
+    """Apply media path mapping and access checks.
+
+    Returns (mapped_path, None) or (None, error response tuple).
+    """
+    settings = get_settings()
+    mapped_path = file_path
+    if hasattr(settings, "media_path_mapping") and settings.media_path_mapping:
+        for mapping in settings.media_path_mapping:
+            if file_path.startswith(mapping.get("from", "")):
+                mapped_path = file_path.replace(
+                    mapping["from"],
+                    mapping.get("to", file_path),
+                    1,
+                )
+                break
+
+    if not is_safe_path(mapped_path, settings.media_path):
+        return None, (jsonify({"error": "Access denied"}), 403)
+
+    if not os.path.exists(mapped_path):
+        return None, (jsonify({"error": "File not found"}), 404)
+    return mapped_path, None
+
+
 @bp.route("/video/stream", methods=["GET"])
 def get_video_stream():
     """Generate HLS playlist for video streaming.
@@ -25,7 +52,10 @@ def get_video_stream():
       tags:
         - Video
       summary: Get HLS stream
-      description: Generates HLS playlist and segments for browser-based video playback.
+      description: |
+        Returns an HLS VOD playlist for browser-based playback. The playlist is
+        built from cached duration/keyframes without touching the video; segments
+        are produced on demand by /video/segment.
       security:
         - apiKeyAuth: []
       parameters:
@@ -43,6 +73,7 @@ def get_video_stream():
           name: quality
           schema:
             type: string
+            enum: [low, medium, high, original]
             default: medium
       responses:
         200:
@@ -62,41 +93,19 @@ def get_video_stream():
     if not file_path:
         return jsonify({"error": "file_path parameter is required"}), 400
 
-    # Path mapping
-    settings = get_settings()
-    mapped_path = file_path
-    if hasattr(settings, "media_path_mapping") and settings.media_path_mapping:
-        for mapping in settings.media_path_mapping:
-            if file_path.startswith(mapping.get("from", "")):
-                mapped_path = file_path.replace(
-                    mapping["from"],
-                    mapping.get("to", file_path),
-                    1,
-                )
-                break
-
-    if not is_safe_path(mapped_path, settings.media_path):
-        return jsonify({"error": "Access denied"}), 403
-
-    if not os.path.exists(mapped_path):
-        return jsonify({"error": "File not found"}), 404
+    mapped_path, error = _resolve_media_path(file_path)
+    if error:
+        return error
 
     try:
         quality = request.args.get("quality", "medium")
-        cache_dir = os.path.join(getattr(settings, "config_dir", "/config"), "cache", "video")
-        os.makedirs(cache_dir, exist_ok=True)
-
-        # Generate HLS playlist
-        result = generate_hls_playlist(mapped_path, cache_dir, quality=quality)
-
-        # Return playlist file
-        if os.path.exists(result["playlist_path"]):
-            return send_file(
-                result["playlist_path"],
-                mimetype="application/vnd.apple.mpegurl",
-            )
-
-        return jsonify({"error": "Playlist generation failed"}), 500
+        query = urlencode({"file_path": file_path, "quality": quality})
+        result = generate_hls_playlist(
+            mapped_path,
+            quality=quality,
+            segment_url=f"segment?{query}&index={{index}}",
+        )
+        return Response(result["playlist"], mimetype="application/vnd.apple.mpegurl")
     except RuntimeError as e:
         logger.error("HLS generation failed: %s", e)
         return jsonify({"error": str(e)}), 500
@@ -107,13 +116,16 @@ def get_video_stream():
 
 @bp.route("/video/segment", methods=["GET"])
 def get_video_segment():
-    """Get HLS segment file.
+    """Get HLS segment, transcoding or remuxing it on first request.
     ---
     get:
       tags:
         - Video
       summary: Get HLS segment
-      description: Returns a specific HLS segment file.
+      description: |
+        Returns one MPEG-TS segment of the playlist from /video/stream. Segments are
+        generated lazily (stream copy for browser-compatible sources, otherwise
+        transcoded) and cached per file content and quality.
       security:
         - apiKeyAuth: []
       parameters:
@@ -123,10 +135,15 @@ def get_video_segment():
           schema:
             type: string
         - in: query
-          name: segment
+          name: index
           required: true
+          schema:
+            type: integer
+        - in: query
+          name: quality
           schema:
             type: string
+            default: medium
       responses:
         200:
           description: Segment file
@@ -137,25 +154,29 @@ def get_video_segment():
         400:
           description: Invalid request
         404:
-          description: Segment not found
+          description: File or segment not found
+        500:
+          description: Processing error
     """
     file_path = request.args.get("file_path")
-    segment = request.args.get("segment")
-
-    if not file_path or not segment:
-        return jsonify({"error": "file_path and segment are required"}), 400
+    index = request.args.get("index", type=int)
 
-    try:
-        settings = get_settings()
-        cache_dir = os.path.join(getattr(settings, "config_dir", "/config"), "cache", "video")
-        segment_path = os.path.join(cache_dir, segment)
+    if not file_path or index is None:
+        return jsonify({"error": "file_path and index are required"}), 400
 
-        if not is_safe_path(segment_path, cache_dir):
-            return jsonify({"error": "Invalid segment path"}), 400
+    mapped_path, error = _resolve_media_path(file_path)
+    if error:
+        return error
 
-        if os.path.exists(segment_path):
-            return send_file(segment_path, mimetype="video/mp2t")
-        return jsonify({"error": "Segment not found"}), 404
+    try:
+        quality = request.args.get("quality", "medium")
+        segment_path = get_hls_segment(mapped_path, index, quality=quality)
+        return send_file(segment_path, mimetype="video/mp2t")
+    except RuntimeError as e:
+        logger.error("HLS segment %d failed for %s: %s", index, mapped_path, e)
+        if "out of range" in str(e):
+            return jsonify({"error": "Segment not found"}), 404
+        return jsonify({"error": str(e)}), 500
     except Exception:
         logger.exception("Error serving segment")
         return jsonify({"error": "Internal server error"}), 500
@@ -207,24 +228,9 @@ def create_screenshot():
     if not file_path:
         return jsonify({"error": "file_path is required"}), 400
 
-    # Path mapping
-    settings = get_settings()
-    mapped_path = file_path
-    if hasattr(settings, "media_path_mapping") and settings.media_path_mapping:
-        for mapping in settings.media_path_mapping:
-            if file_path.startswith(mapping.get("from", "")):
-                mapped_path = file_path.replace(
-                    mapping["from"],
-                    mapping.get("to", file_path),
-                    1,
-                )
-                break
-
-    if not is_safe_path(mapped_path, settings.media_path):
-        return jsonify({"error": "Access denied"}), 403
-
-    if not os.path.exists(mapped_path):
-        return jsonify({"error": "File not found"}), 404
+    mapped_path, error = _resolve_media_path(file_path)
+    if error:
+        return error
 
     try:
         screenshot_path = generate_screenshot(mapped_path, timestamp, width=width)
@@ -285,24 +291,9 @@ def get_subtitle_webvtt():
     if not file_path:
         return jsonify({"error": "file_path parameter is required"}), 400
 
-    # Path mapping
-    settings = get_settings()
-    mapped_path = file_path
-    if hasattr(settings, "media_path_mapping") and settings.media_path_mapping:
-        for mapping in settings.media_path_mapping:
-            if file_path.startswith(mapping.get("from", "")):
-                mapped_path = file_path.replace(
-                    mapping["from"],
-                    mapping.get("to", file_path),
-                    1,
-                )
-                break
-
-    if not is_safe_path(mapped_path, settings.media_path):
-        return jsonify({"error": "Access denied"}), 403
-
-    if not os.path.exists(mapped_path):
-        return jsonify({"error": "File not found"}), 404
+    mapped_path, error = _resolve_media_path(file_path)
+    if error:
+        return error
 
     try:
         vtt_path = convert_subtitle_to_webvtt(mapped_path)
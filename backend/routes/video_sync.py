@@ -1,7 +1,7 @@
 """Video sync routes — async subtitle synchronization against video or reference subtitle.
 
 POST /api/v1/tools/video-sync          → start sync job, returns { job_id }
-GET  /api/v1/tools/video-sync/engines  → available engines { ffsubsync, alass }
+GET  /api/v1/tools/video-sync/engines  → available engines { native, ffsubsync, alass }
 GET  /api/v1/tools/video-sync/<job_id> → job status
 """
 
@@ -51,12 +51,14 @@ def _run_sync(
 ) -> None:
     _update_job(job_id, "running")
     try:
-        from services.video_sync import sync_with_alass, sync_with_ffsubsync
+        from services.video_sync import auto_sync, sync_with_alass, sync_with_ffsubsync
 
-        if engine == "ffsubsync":
+        if engine == "native":
+            result = auto_sync(subtitle_path, video_path, engine)
+        elif engine == "ffsubsync":
             result = sync_with_ffsubsync(subtitle_path, video_path)
         elif engine == "alass":
-            result = sync_with_alass(subtitle_path, reference_path)
+            result = sync_with_alass(subtitle_path, reference_path or video_path)
         else:
             raise ValueError(f"Unknown engine: {engine!r}")
         _update_job(job_id, "completed", result=result)
@@ -83,15 +85,15 @@ def start_sync():
 
     Body:
         file_path (str): subtitle file to sync — required
-        engine (str): "ffsubsync" | "alass" — default "ffsubsync"
-        video_path (str): required for ffsubsync
+        engine (str): "native" | "ffsubsync" | "alass" — default "native"
+        video_path (str): required for native and ffsubsync
         reference_path (str): pre-extracted reference subtitle for alass
         reference_track_index (int): stream index to auto-extract as alass reference
     """
     data = request.get_json(force=True, silent=True) or {}
     subtitle_path = data.get("file_path", "").strip()
     video_path = data.get("video_path", "").strip()
-    engine = data.get("engine", "ffsubsync")
+    engine = data.get("engine", "native")
     reference_track_index = data.get("reference_track_index")
     reference_path = data.get("reference_path", "").strip()
 
@@ -111,9 +113,9 @@ def start_sync():
     if video_path and not os.path.abspath(video_path).startswith(_media_prefix):
         return jsonify({"error": "video_path must be under the configured media_path"}), 403
 
-    if engine == "ffsubsync":
+    if engine in ("native", "ffsubsync"):
         if not video_path:
-            return jsonify({"error": "video_path is required for ffsubsync"}), 400
+            return jsonify({"error": f"video_path is required for {engine}"}), 400
     elif engine == "alass":
         if not reference_path and reference_track_index is None:
             return jsonify(
@@ -168,17 +170,17 @@ def start_sync():
 
 @bp.route("/auto-sync", methods=["POST"])
 def auto_sync():
-    """Quick one-click auto-sync using ffsubsync (fire-and-forget, no job polling needed).
+    """Quick one-click auto-sync (fire-and-forget, no job polling needed).
 
     Body:
         file_path (str): subtitle file to sync — required
         video_path (str): video file for reference — required
-        engine (str): "ffsubsync" (default) | "alass"
+        engine (str): "native" (default, falls back to ffsubsync/alass) | "ffsubsync" | "alass"
     """
     data = request.get_json(force=True, silent=True) or {}
     subtitle_path = data.get("file_path", "").strip()
     video_path = data.get("video_path", "").strip()
-    engine = data.get("engine", "ffsubsync")
+    engine = data.get("engine", "native")
 
     if not subtitle_path:
         return jsonify({"error": "file_path is required"}), 400
@@ -208,13 +210,17 @@ def auto_sync():
 
 @bp.route("/auto-sync/bulk", methods=["POST"])
 def auto_sync_bulk():
-    """Bulk auto-sync: queue ffsubsync jobs for all episodes in a series or the full library."""
+    """Bulk auto-sync: queue sync jobs for all episodes in a series or the full library.
+
+    The default "native" engine computes each episode's speech profile once and
+    aligns in-process; later syncs against the same episode take milliseconds.
+    """
     data = request.get_json(force=True, silent=True) or {}
     scope = data.get("scope", "series")
     series_id = data.get("series_id")
-    engine = data.get("engine", "ffsubsync")
+    engine = data.get("engine", "native")
 
-    if engine not in ("ffsubsync", "alass"):
+    if engine not in ("native", "ffsubsync", "alass"):
         return jsonify({"error": f"Unknown engine: {engine!r}"}), 400
 
     from config import map_path
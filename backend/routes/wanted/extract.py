@@ -149,10 +149,21 @@ def _run_batch_extract(item_ids, auto_translate, app):
         emit_event("batch_extract_completed", snapshot)
 
 
+def _prefetch_probe_cache(paths):
+    """Warm the in-process probe LRU so executor threads skip the DB."""
+    try:
+        from db.cache import prefetch_ffprobe_cache
+
+        prefetch_ffprobe_cache(paths)
+    except Exception as e:
+        logger.debug("Batch probe: cache prefetch failed: %s", e)
+
+
 def _run_batch_probe(items, app):
     """Background thread: ffprobe all items, extract all embedded sub streams, update DB."""
     from ass_utils import (
         extract_subtitle_stream,
+        extract_subtitle_streams,
         get_media_streams,
         get_subtitle_stream_output_path,
         has_target_language_audio,
@@ -179,6 +190,7 @@ def _run_batch_probe(items, app):
     start_time = time.time()
     try:
         with app.app_context(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _prefetch_probe_cache([item["file_path"] for item in items])
             future_to_item = {
                 executor.submit(get_media_streams, item["file_path"], True): item for item in items
             }
@@ -232,27 +244,44 @@ def _run_batch_probe(items, app):
                                 _batch_probe_state["skipped"] += 1
                         else:
                             any_extracted = False
+                            pending = {}
                             for stream_info in sub_streams:
                                 out = get_subtitle_stream_output_path(file_path, stream_info)
                                 if os.path.exists(out):
                                     any_extracted = True
                                     continue  # already on disk
-                                try:
-                                    extract_subtitle_stream(file_path, stream_info, out)
-                                    logger.info(
-                                        "[batch-probe] item %d: extracted %s → %s",
-                                        item_id,
-                                        stream_info["language"],
-                                        out,
-                                    )
+                                pending.setdefault(out, stream_info)
+
+                            # All missing streams in one ffmpeg pass; per-stream on failure
+                            targets = [(info, out) for out, info in pending.items()]
+                            try:
+                                extract_subtitle_streams(file_path, targets)
+                                if targets:
                                     any_extracted = True
-                                except Exception as sub_exc:
-                                    logger.warning(
-                                        "[batch-probe] item %d stream %d: %s",
+                                    logger.info(
+                                        "[batch-probe] item %d: extracted %s",
                                         item_id,
-                                        stream_info["sub_index"],
-                                        sub_exc,
+                                        ", ".join(out for _, out in targets),
                                     )
+                            except Exception as batch_exc:
+                                logger.debug(
+                                    "[batch-probe] item %d one-pass extract failed: %s",
+                                    item_id,
+                                    batch_exc,
+                                )
+                                for stream_info, out in targets:
+                                    try:
+                                        extract_subtitle_stream(
+                                            file_path, stream_info, out, prefill_cache=False
+                                        )
+                                        any_extracted = True
+                                    except Exception as sub_exc:
+                                        logger.warning(
+                                            "[batch-probe] item %d stream %d: %s",
+                                            item_id,
+                                            stream_info["sub_index"],
+                                            sub_exc,
+                                        )
 
                             if any_extracted:
                                 # Check if target-lang file landed on disk
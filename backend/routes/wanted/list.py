@@ -78,6 +78,11 @@ def list_wanted():
           schema:
             type: string
           description: Text search in title and file_path
+        - in: query
+          name: cursor
+          schema:
+            type: string
+          description: Keyset cursor (next_cursor from the previous page; empty for the first page). Overrides page.
       responses:
         200:
           description: Paginated wanted items
@@ -96,6 +101,11 @@ def list_wanted():
                     type: integer
                   per_page:
                     type: integer
+                  next_cursor:
+                    type: string
+                    nullable: true
+        400:
+          description: Invalid sort parameter or cursor
     """
     from db.wanted import get_wanted_items
 
@@ -108,6 +118,7 @@ def list_wanted():
     sort_by = request.args.get("sort_by", "added_at")
     sort_dir = request.args.get("sort_dir", "desc")
     search = request.args.get("search") or None
+    cursor = request.args.get("cursor")
 
     VALID_SORT_BY = {"added_at", "title", "last_search_at", "current_score", "search_count"}
     VALID_SORT_DIR = {"asc", "desc"}
@@ -116,17 +127,21 @@ def list_wanted():
     if sort_dir and sort_dir not in VALID_SORT_DIR:
         return jsonify({"error": f"Invalid sort_dir value: {sort_dir}"}), 400
 
-    result = get_wanted_items(
-        page=page,
-        per_page=per_page,
-        item_type=item_type,
-        status=status_filter,
-        series_id=series_id,
-        subtitle_type=subtitle_type,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-        search=search,
-    )
+    try:
+        result = get_wanted_items(
+            page=page,
+            per_page=per_page,
+            item_type=item_type,
+            status=status_filter,
+            series_id=series_id,
+            subtitle_type=subtitle_type,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            search=search,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(result)
 
 
@@ -48,6 +48,7 @@ def scanner_status():
             "last_scan_at": scanner.last_scan_at,
             "last_search_at": scanner.last_search_at,
             "last_summary": scanner.last_summary,
+            "search_pacer": scanner.search_pacer_status,
         }
     )
 
@@ -44,6 +44,7 @@ def _webhook_auto_pipeline(file_path: str, title: str, series_id: int = None, mo
         time.sleep(delay)
 
     result_info = {"file_path": file_path, "title": title, "steps": []}
+    queued = False
 
     # Step 2: Auto-scan
     if s.webhook_auto_scan and series_id:
@@ -72,7 +73,18 @@ def _webhook_auto_pipeline(file_path: str, title: str, series_id: int = None, mo
 
             wanted_item = get_wanted_item_by_path(file_path)
 
-            if wanted_item and s.webhook_auto_translate:
+            if (
+                wanted_item
+                and s.webhook_auto_translate
+                and get_scanner().enqueue_search(wanted_item["id"])
+            ):
+                # Paced scheduler picks the item up right away, within provider budgets
+                queued = True
+                result_info["steps"].append({"process": "queued"})
+                logger.info(
+                    "Webhook pipeline: wanted %d queued for paced search", wanted_item["id"]
+                )
+            elif wanted_item and s.webhook_auto_translate:
                 from wanted_search import process_wanted_item
 
                 process_result = process_wanted_item(wanted_item["id"])
@@ -95,6 +107,11 @@ def _webhook_auto_pipeline(file_path: str, title: str, series_id: int = None, mo
         _run_job(job)
         result_info["steps"].append({"translate": "direct"})
 
+    if queued:
+        # Nothing has run yet: the pacer reports the outcome when it processes the item
+        logger.info("Webhook pipeline handed %s to the paced search", file_path)
+        return
+
     socketio.emit("webhook_completed", result_info)
     logger.info("Webhook pipeline completed for: %s", file_path)
 
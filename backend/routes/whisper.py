@@ -19,13 +19,20 @@ _queue = None
 
 
 def _get_queue():
-    """Get or create the WhisperQueue singleton."""
+    """Get or create the WhisperQueue singleton.
+
+    The first call inside an app context binds the queue's workers to that
+    app so they can reach the database.
+    """
     global _queue
     if _queue is None:
+        from flask import current_app, has_app_context
+
         from whisper.queue import WhisperQueue
 
         max_concurrent = int(_get_config("max_concurrent_whisper", "1"))
-        _queue = WhisperQueue(max_concurrent=max_concurrent)
+        app = current_app._get_current_object() if has_app_context() else None
+        _queue = WhisperQueue(max_concurrent=max_concurrent, app=app)
     return _queue
 
 
@@ -89,6 +96,7 @@ def transcribe():
           description: File not found
     """
     from config import get_settings, map_path
+    from media_scheduler import PRIORITY_INTERACTIVE
     from whisper import get_whisper_manager
 
     data = request.get_json() or {}
@@ -126,6 +134,7 @@ def transcribe():
         whisper_manager=manager,
         socketio=socketio,
         audio_track_index=audio_track_index,
+        priority=PRIORITY_INTERACTIVE,
     )
 
     return jsonify(
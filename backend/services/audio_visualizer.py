@@ -1,6 +1,6 @@
 """Audio waveform visualization service using FFmpeg.
 
-Generates waveform data points from video/audio files for frontend visualization.
+Generates waveform peaks from video/audio files for frontend visualization.
 Inspired by SubtitleEdit's waveform feature.
 """
 
@@ -8,7 +8,9 @@ import json
 import logging
 import os
 import subprocess
-import tempfile
+
+from audio_cache import get_cached_audio
+from media_scheduler import PRIORITY_INTERACTIVE, PROBE, run_media
 
 logger = logging.getLogger(__name__)
 
@@ -16,235 +18,34 @@ logger = logging.getLogger(__name__)
 def extract_audio_track(
     video_path: str,
     audio_track_index: int | None = None,
-    output_path: str | None = None,
 ) -> str:
-    """Extract audio track from video file using FFmpeg.
+    """Return an audio track of a video as 16 kHz mono WAV.
+
+    The file lives in the shared audio cache (see audio_cache) and is reused
+    by waveform, Whisper and sync; callers must not delete it.
 
     Args:
         video_path: Path to video file
         audio_track_index: Optional audio stream index (0-based). If None, selects first audio track.
-        output_path: Optional output path. If None, creates temporary file.
 
     Returns:
-        Path to extracted audio file (WAV format)
+        Path to the cached audio file (WAV format)
 
     Raises:
         RuntimeError: If FFmpeg fails or file not found
     """
     if not os.path.exists(video_path):
         raise RuntimeError(f"Video file not found: {video_path}")
-
-    if output_path is None:
-        # Create temporary WAV file
-        temp_fd, output_path = tempfile.mkstemp(suffix=".wav")
-        os.close(temp_fd)
-
-    # Build FFmpeg command
-    cmd = [
-        "ffmpeg",
-        "-y",  # Overwrite output file
-        "-i",
-        video_path,
-        "-vn",  # No video
-        "-acodec",
-        "pcm_s16le",  # 16-bit PCM
-        "-ar",
-        "44100",  # Sample rate
-        "-ac",
-        "1",  # Mono
-    ]
-
-    # Select specific audio track if specified
-    if audio_track_index is not None:
-        cmd.extend(["-map", f"0:a:{audio_track_index}"])
-
-    cmd.append(output_path)
-
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minutes max
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg audio extraction failed: {result.stderr}")
-        if not os.path.exists(output_path):
-            raise RuntimeError(f"FFmpeg did not produce output file: {output_path}")
-        return output_path
-    except subprocess.TimeoutExpired:
-        raise RuntimeError(f"FFmpeg audio extraction timed out (300s): {video_path}")
-    except FileNotFoundError:
-        raise RuntimeError("ffmpeg not found. Install ffmpeg to enable audio extraction.")
-
-
-def _generate_waveform_data(
-    audio_path: str,
-    width: int = 2000,
-    height: int = 200,
-    method: str = "rms",
-) -> list[dict[str, float]]:
-    """Generate waveform data points from audio file using FFmpeg.
-
-    Uses FFmpeg's showwavespic filter to generate waveform visualization data.
-
-    Args:
-        audio_path: Path to audio file (WAV format recommended)
-        width: Width of waveform in pixels (affects data point count)
-        height: Height of waveform in pixels (not used for data, but affects scaling)
-        method: Waveform method - "rms" (root mean square) or "peak"
-
-    Returns:
-        List of dicts with "time" (seconds) and "amplitude" (0.0-1.0) keys
-
-    Raises:
-        RuntimeError: If FFmpeg fails or file not found
-    """
-    if not os.path.exists(audio_path):
-        raise RuntimeError(f"Audio file not found: {audio_path}")
-
-    # Get audio duration first
-    duration = get_audio_duration(audio_path)
-    if duration <= 0:
-        raise RuntimeError(f"Invalid audio duration: {duration}")
-
-    # Use FFmpeg's showwaves filter to generate waveform
-    # We'll extract amplitude values at regular intervals
-    # Method: Use showwavespic to generate image, then parse it (simpler approach)
-    # Alternative: Use FFmpeg's volumedetect or astats for more precise data
-
-    # For now, use a simpler approach: extract samples at regular intervals
-    # This gives us time-amplitude pairs
-    sample_rate = 100  # Samples per second (adjustable for resolution)
-    num_samples = int(duration * sample_rate)
-
-    # Use FFmpeg's astats filter to get RMS values
-    cmd = [
-        "ffmpeg",
-        "-i",
-        audio_path,
-        "-af",
-        "astats=metadata=1:reset=1",
-        "-f",
-        "null",
-        "-",
-    ]
-
-    try:
-        subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
-        # Parse astats output (complex, requires regex parsing)
-        # Simpler approach: Use showwavespic and extract pixel data
-    except subprocess.TimeoutExpired:
-        raise RuntimeError(f"FFmpeg waveform generation timed out: {audio_path}")
-    except FileNotFoundError:
-        raise RuntimeError("ffmpeg not found. Install ffmpeg to enable waveform generation.")
-
-    # Alternative simpler implementation: Generate waveform image and extract data
-    # For MVP, we'll use a simplified approach with regular sampling
-    return _generate_waveform_simple(audio_path, duration, num_samples)
+    return get_cached_audio(video_path, audio_track_index, priority=PRIORITY_INTERACTIVE)
 
 
-def _generate_waveform_simple(
-    audio_path: str,
-    duration: float,
-    num_samples: int,
-) -> list[dict[str, float]]:
-    """Generate waveform using FFmpeg's astats filter with reset interval.
-
-    This uses a single FFmpeg call with astats filter that resets at regular
-    intervals, giving us RMS values for each time segment.
-    """
-    if num_samples <= 0:
-        return []
-
-    # Calculate reset interval (how often astats resets)
-    reset_interval = duration / num_samples
-
-    # Use FFmpeg's astats filter with reset interval
-    # This gives us RMS values for each segment in a single pass
-    cmd = [
-        "ffmpeg",
-        "-i",
-        audio_path,
-        "-af",
-        f"astats=metadata=1:reset={reset_interval}",
-        "-f",
-        "null",
-        "-",
-    ]
-
-    waveform_data = []
-    interval = duration / num_samples
-
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
-
-        # Parse astats output from stderr
-        # Format: "RMS level dB: -XX.X" appears for each reset interval
-        lines = result.stderr.split("\n")
-        sample_index = 0
-
-        for line in lines:
-            # Look for RMS level in the output
-            if "RMS level dB:" in line:
-                try:
-                    # Extract dB value
-                    # Format: "RMS level dB: -XX.X"
-                    db_str = line.split("RMS level dB:")[1].strip()
-                    db_value = float(db_str.split()[0])
-
-                    # Convert dB to amplitude (0.0-1.0)
-                    # Typical range: -60 dB (silence) to 0 dB (peak)
-                    # Normalize to 0-1 range
-                    amplitude = max(0.0, min(1.0, (db_value + 60) / 60))
-
-                    time_pos = sample_index * interval
-                    if time_pos < duration:
-                        waveform_data.append({"time": time_pos, "amplitude": amplitude})
-                        sample_index += 1
-                except (ValueError, IndexError):
-                    # Skip malformed lines
-                    continue
-
-        # If we didn't get enough samples, fill with interpolated values
-        while len(waveform_data) < num_samples:
-            time_pos = len(waveform_data) * interval
-            if time_pos >= duration:
-                break
-            # Use average of previous samples or default
-            if len(waveform_data) > 0:
-                avg_amplitude = sum(d["amplitude"] for d in waveform_data) / len(waveform_data)
-            else:
-                avg_amplitude = 0.5
-            waveform_data.append({"time": time_pos, "amplitude": avg_amplitude})
-
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
-        logger.warning("FFmpeg astats failed, using fallback: %s", e)
-        # Fallback: generate evenly distributed samples with default amplitude
-        for i in range(num_samples):
-            time_pos = i * interval
-            if time_pos >= duration:
-                break
-            waveform_data.append({"time": time_pos, "amplitude": 0.5})
-
-    return waveform_data
-
-
-def get_audio_duration(audio_path: str) -> float:
+def get_audio_duration(audio_path: str, use_cache: bool = False) -> float:
     """Get audio file duration in seconds using FFprobe.
 
     Args:
         audio_path: Path to audio file
+        use_cache: Serve the duration from the cached media metadata record
+            (for library media; temporary extracted audio is probed directly)
 
     Returns:
         Duration in seconds
@@ -252,6 +53,15 @@ def get_audio_duration(audio_path: str) -> float:
     Raises:
         RuntimeError: If FFprobe fails
     """
+    if use_cache:
+        from ass_utils import get_media_metadata
+
+        try:
+            duration = get_media_metadata(audio_path).get("format", {}).get("duration", 0)
+            return float(duration or 0)
+        except (RuntimeError, FileNotFoundError, ValueError) as e:
+            raise RuntimeError(f"Failed to get audio duration: {e}")
+
     cmd = [
         "ffprobe",
         "-v",
@@ -264,7 +74,14 @@ def get_audio_duration(audio_path: str) -> float:
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = run_media(
+            PROBE,
+            cmd,
+            priority=PRIORITY_INTERACTIVE,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
         if result.returncode != 0:
             raise RuntimeError(f"FFprobe failed: {result.stderr}")
         data = json.loads(result.stdout)
@@ -278,44 +95,38 @@ def generate_waveform_json(
     video_path: str,
     audio_track_index: int | None = None,
     width: int = 2000,
-    sample_rate: int = 100,
+    start: float = 0.0,
+    end: float | None = None,
+    level: int | None = None,
 ) -> dict:
-    """Generate complete waveform JSON data for frontend.
+    """Generate waveform peaks for the frontend.
 
-    This is the main entry point that extracts audio and generates waveform.
+    Serves a slice of the cached peak pyramid (see services.waveform_peaks);
+    the audio track is decoded only the first time it is requested.
 
     Args:
         video_path: Path to video file
         audio_track_index: Optional audio track index
-        width: Waveform width in pixels (affects resolution)
-        sample_rate: Samples per second
+        width: Waveform width in pixels; picks the zoom level with at most
+            this many buckets in the requested range
+        start: Range start in seconds
+        end: Range end in seconds (None = end of file)
+        level: Explicit pyramid level (overrides width)
 
     Returns:
-        Dict with "duration", "samples", and "data" keys
+        Dict with "duration", "level", "levels", "start", "end",
+        "bucket_seconds", "samples" and "min"/"max"/"rms" arrays
 
     Raises:
         RuntimeError: If processing fails
     """
-    # Extract audio track
-    temp_audio = None
-    try:
-        temp_audio = extract_audio_track(video_path, audio_track_index)
-        duration = get_audio_duration(temp_audio)
-        num_samples = int(duration * sample_rate)
+    from services.waveform_peaks import waveform_slice
 
-        # Generate waveform data
-        waveform_data = _generate_waveform_simple(temp_audio, duration, num_samples)
-
-        return {
-            "duration": duration,
-            "sample_rate": sample_rate,
-            "samples": len(waveform_data),
-            "data": waveform_data,
-        }
-    finally:
-        # Clean up temporary audio file
-        if temp_audio and os.path.exists(temp_audio):
-            try:
-                os.unlink(temp_audio)
-            except OSError:
-                logger.warning("Failed to delete temporary audio file: %s", temp_audio)
+    return waveform_slice(
+        video_path,
+        audio_track_index,
+        start=start,
+        end=end,
+        points=width,
+        level=level,
+    )
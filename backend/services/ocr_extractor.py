@@ -10,6 +10,8 @@ import os
 import subprocess
 import tempfile
 
+from media_scheduler import DEMUX, OCR, TRANSCODE, media_slot, run_media
+
 logger = logging.getLogger(__name__)
 
 # Try to import pytesseract, but make it optional
@@ -25,6 +27,7 @@ except ImportError:
 # Export TESSERACT_AVAILABLE for use in routes
 __all__ = [
     "batch_ocr_track",
+    "cues_to_srt",
     "extract_frame",
     "extract_frames_sequence",
     "ocr_image",
@@ -76,7 +79,8 @@ def extract_frame(
     ]
 
     try:
-        result = subprocess.run(
+        result = run_media(
+            TRANSCODE,
             cmd,
             capture_output=True,
             text=True,
@@ -168,12 +172,13 @@ def ocr_image(
         if image.mode != "L":
             image = image.convert("L")
 
-        # Run OCR
-        text = pytesseract.image_to_string(
-            image,
-            lang=language,
-            config=f"--psm {psm}",
-        )
+        # Run OCR (Tesseract is a child process, so it takes an OCR slot)
+        with media_slot(OCR):
+            text = pytesseract.image_to_string(
+                image,
+                lang=language,
+                config=f"--psm {psm}",
+            )
 
         return text.strip()
     except Exception as e:
@@ -211,13 +216,9 @@ def ocr_subtitle_stream(
     from services.audio_visualizer import get_audio_duration
 
     try:
-        duration = get_audio_duration(video_path)
+        duration = get_audio_duration(video_path, use_cache=True)
     except Exception:
-        # Fallback: use ffprobe
-        from ass_utils import run_ffprobe
-
-        probe_data = run_ffprobe(video_path)
-        duration = float(probe_data.get("format", {}).get("duration", 0))
+        duration = 0.0
 
     if duration <= 0:
         raise RuntimeError("Invalid video duration")
@@ -263,29 +264,111 @@ def ocr_subtitle_stream(
     }
 
 
-def batch_ocr_track(
-    video_path: str,
-    stream_index: int,
-    language: str = "eng",
-) -> list[dict]:
-    """Extract and OCR an entire image subtitle track from an MKV in one pass.
+def _stream_codec(video_path: str, stream_index: int) -> str:
+    """Codec name of stream *stream_index* from the cached probe record."""
+    from ass_utils import get_media_metadata
 
-    Args:
-        video_path: Path to video file
-        stream_index: Subtitle stream index (from ffprobe)
-        language: Tesseract language code (eng, deu, jpn)
+    try:
+        streams = get_media_metadata(video_path).get("streams", [])
+    except Exception as e:
+        logger.debug("Probe failed for %s: %s", video_path, e)
+        return ""
+    for stream in streams:
+        if stream.get("index") == stream_index:
+            return (stream.get("codec_name") or "").lower()
+    return ""
 
-    Returns:
-        List of dicts: [{"text": str}, ...] — deduplicated consecutive lines.
 
-    Raises:
-        RuntimeError: If pytesseract is unavailable, ffmpeg fails, or no frames found.
+def _ocr_pool_size() -> int:
+    from media_scheduler import get_media_scheduler
+
+    try:
+        return max(1, get_media_scheduler().stats()["classes"][OCR]["limit"])
+    except Exception:
+        return 2
+
+
+def _ocr_unique(images: list, language: str) -> list[str]:
+    """OCR each distinct bitmap once; returns one text per input image.
+
+    Images are grayscale NumPy arrays. Identical bitmaps (the same line shown
+    again, or a display set re-sent unchanged) are hashed together so
+    Tesseract only sees each one once. Tesseract runs as a child process per
+    call, so a thread pool sized to the OCR slot limit keeps that many
+    processes busy.
     """
-    if not TESSERACT_AVAILABLE:
-        raise RuntimeError("pytesseract is not available")
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    keys = []
+    unique: dict[str, object] = {}
+    for image in images:
+        key = hashlib.sha1(image.tobytes() + repr(image.shape).encode()).hexdigest()
+        keys.append(key)
+        unique.setdefault(key, image)
+
+    def _ocr(image) -> str:
+        img = Image.fromarray(image, mode="L")
+        with media_slot(OCR):
+            return pytesseract.image_to_string(img, lang=language).strip()  # type: ignore[union-attr]
+
+    with ThreadPoolExecutor(max_workers=_ocr_pool_size(), thread_name_prefix="ocr") as pool:
+        texts = dict(zip(unique, pool.map(_ocr, unique.values()), strict=True))
+
+    logger.debug("OCR: %d images, %d unique bitmaps", len(images), len(unique))
+    return [texts[key] for key in keys]
+
+
+def _timed_cues(subtitle_images: list, texts: list[str]) -> list[dict]:
+    """Build {"start", "end", "text"} cues, merging adjacent repeats of one line."""
+    cues: list[dict] = []
+    for item, text in zip(subtitle_images, texts, strict=True):
+        if not text:
+            continue
+        end = item.end if item.end is not None else item.start + 5.0
+        prev = cues[-1] if cues else None
+        if prev and prev["text"] == text and item.start - prev["end"] < 0.1:
+            prev["end"] = end
+            continue
+        cues.append({"start": item.start, "end": end, "text": text})
+    return cues
+
+
+def _ocr_pgs_track(video_path: str, stream_index: int, language: str) -> list[dict]:
+    """Copy a PGS stream out as .sup bytes, decode it in memory and OCR it."""
+    from services.pgs_parser import parse_pgs
+
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        video_path,
+        "-map",
+        f"0:{stream_index}",
+        "-c:s",
+        "copy",
+        "-f",
+        "sup",
+        "-",
+    ]
+    r = run_media(DEMUX, cmd, capture_output=True, timeout=300)
+    if r.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg subtitle extraction failed: {r.stderr.decode(errors='replace')[:500]}"
+        )
+    subtitle_images = parse_pgs(r.stdout)
+    if not subtitle_images:
+        return []
+    texts = _ocr_unique([item.image for item in subtitle_images], language)
+    return _timed_cues(subtitle_images, texts)
 
+
+def _ocr_rendered_track(video_path: str, stream_index: int, language: str) -> list[dict]:
+    """Render any other image track (VobSub, DVB) to PNG frames and OCR them."""
     import glob as _glob
-    from concurrent.futures import ThreadPoolExecutor as TPE
+
+    import numpy as np
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         out_pattern = os.path.join(tmp_dir, "frame%08d.png")
@@ -300,22 +383,16 @@ def batch_ocr_track(
             "vfr",
             out_pattern,
         ]
-        r = subprocess.run(cmd, capture_output=True, timeout=300)
+        r = run_media(DEMUX, cmd, capture_output=True, timeout=300)
         if r.returncode != 0:
             raise RuntimeError(
                 f"ffmpeg subtitle extraction failed: {r.stderr.decode(errors='replace')[:500]}"
             )
 
         frames = sorted(_glob.glob(os.path.join(tmp_dir, "frame*.png")))
-        if not frames:
-            return []
+        images = [np.asarray(Image.open(frame).convert("L")) for frame in frames]
 
-        def _ocr_frame(frame_path: str) -> str:
-            img = Image.open(frame_path).convert("L")  # grayscale for better OCR
-            return pytesseract.image_to_string(img, lang=language).strip()  # type: ignore[union-attr]
-
-        with TPE(max_workers=4) as pool:
-            texts = list(pool.map(_ocr_frame, frames))
+    texts = _ocr_unique(images, language) if images else []
 
     # Deduplicate consecutive identical lines
     cues: list[dict] = []
@@ -324,6 +401,39 @@ def batch_ocr_track(
         if text and text != prev:
             cues.append({"text": text})
         prev = text
+    return cues
+
+
+def batch_ocr_track(
+    video_path: str,
+    stream_index: int,
+    language: str = "eng",
+) -> list[dict]:
+    """Extract and OCR an entire image subtitle track from an MKV in one pass.
+
+    PGS tracks are decoded natively (services.pgs_parser) and keep their
+    display timing; other image formats are rendered to frames by ffmpeg and
+    come back without timing. Identical bitmaps are OCR'd only once.
+
+    Args:
+        video_path: Path to video file
+        stream_index: Subtitle stream index (from ffprobe)
+        language: Tesseract language code (eng, deu, jpn)
+
+    Returns:
+        List of dicts: [{"start": float, "end": float, "text": str}, ...] for
+        PGS, [{"text": str}, ...] otherwise — consecutive repeats merged.
+
+    Raises:
+        RuntimeError: If pytesseract is unavailable or ffmpeg fails.
+    """
+    if not TESSERACT_AVAILABLE:
+        raise RuntimeError("pytesseract is not available")
+
+    if _stream_codec(video_path, stream_index) == "hdmv_pgs_subtitle":
+        cues = _ocr_pgs_track(video_path, stream_index, language)
+    else:
+        cues = _ocr_rendered_track(video_path, stream_index, language)
 
     logger.info(
         "batch_ocr_track: extracted %d cues from stream %d of %s",
@@ -334,6 +444,24 @@ def batch_ocr_track(
     return cues
 
 
+def cues_to_srt(cues: list[dict]) -> str:
+    """Serialize timed OCR cues as SRT text (untimed cues are skipped)."""
+    import pysubs2
+
+    subs = pysubs2.SSAFile()
+    for cue in cues:
+        if "start" not in cue:
+            continue
+        subs.append(
+            pysubs2.SSAEvent(
+                start=int(round(cue["start"] * 1000)),
+                end=int(round(cue["end"] * 1000)),
+                text=cue["text"].replace("\n", "\\N"),
+            )
+        )
+    return subs.to_string("srt")
+
+
 def preview_frame(
     video_path: str,
     timestamp: float,
@@ -0,0 +1,275 @@
+"""In-process subtitle alignment against a cached speech-activity profile.
+
+ffsubsync decodes the video's audio and runs voice activity detection on
+every call, so syncing several subtitles against one episode repeats the
+expensive part each time. Here the audio side is computed once per audio
+track and persisted as a bit vector (one bit per 10 ms frame, ~19 KB for a
+25-minute episode) under ``<config_dir>/cache/speech``, keyed by the same
+content fingerprint as the shared audio cache.
+
+Alignment cross-correlates that vector with the subtitle's own activity
+timeline via FFT and shifts the subtitle by the best offset. Results below
+MIN_CONFIDENCE are reported as such so callers can fall back to
+ffsubsync/alass.
+
+Speech detection is energy based: per-frame energy in the 300-3400 Hz band,
+thresholded between the track's noise floor and its loud frames, with a
+short hangover to bridge gaps between words.
+"""
+
+import contextlib
+import logging
+import os
+import shutil
+import struct
+import threading
+
+import numpy as np
+
+from audio_cache import (
+    DEFAULT_SAMPLE_RATE,
+    audio_cache_key,
+    cached_audio,
+    cached_wav_key,
+    iter_pcm,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Profile resolution (10 ms frames).
+FRAME_SAMPLES = DEFAULT_SAMPLE_RATE // 100
+FRAME_SECONDS = FRAME_SAMPLES / DEFAULT_SAMPLE_RATE
+#: Offsets searched on either side of the current timing.
+MAX_OFFSET_SECONDS = 60.0
+#: Peak z-score below which an alignment is not trusted.
+MIN_CONFIDENCE = 4.0
+
+_SPEECH_BAND = (300, 3400)
+_HANGOVER_FRAMES = 20
+
+_MAGIC = b"SLVA"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+
+_profile_locks = [threading.Lock() for _ in range(8)]
+
+
+class AlignmentError(Exception):
+    """Raised when no confident alignment could be found."""
+
+
+# ─── Speech profile ──────────────────────────────────────────────────────────
+
+
+def frame_energies(pcm_chunks) -> np.ndarray:
+    """Speech-band energy (dB) per 10 ms frame of s16le mono 16 kHz PCM chunks."""
+    freqs = np.fft.rfftfreq(FRAME_SAMPLES, 1 / DEFAULT_SAMPLE_RATE)
+    band = (freqs >= _SPEECH_BAND[0]) & (freqs <= _SPEECH_BAND[1])
+    frame_bytes = FRAME_SAMPLES * 2
+    pending = b""
+    energies = []
+    for chunk in pcm_chunks:
+        pending += chunk
+        usable = len(pending) - len(pending) % frame_bytes
+        if not usable:
+            continue
+        frames = np.frombuffer(pending[:usable], dtype="<i2").reshape(-1, FRAME_SAMPLES)
+        pending = pending[usable:]
+        spectrum = np.abs(np.fft.rfft(frames.astype(np.float32), axis=1)[:, band]) ** 2
+        energies.append(10 * np.log10(spectrum.sum(axis=1) + 1e-9))
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float64)
+
+
+def detect_speech(energies: np.ndarray) -> np.ndarray:
+    """Threshold frame energies into a boolean speech-activity vector."""
+    if energies.size == 0:
+        return np.zeros(0, dtype=bool)
+    floor, loud = np.percentile(energies, [10, 99])
+    threshold = max(floor + 6.0, floor + 0.4 * (loud - floor))
+    speech = energies > threshold
+    # Hangover: keep short pauses between words inside one speech region
+    kernel = np.ones(_HANGOVER_FRAMES, dtype=np.int32)
+    return np.convolve(speech.astype(np.int32), kernel, mode="same") > 0
+
+
+def get_speech_profile(video_path: str, track_index: int | None = None) -> np.ndarray:
+    """Return the speech-activity vector of an audio track, computing it once.
+
+    Raises:
+        RuntimeError: If the audio cannot be decoded
+    """
+
+    def _compute():
+        with cached_audio(video_path, track_index) as wav_path:
+            return detect_speech(frame_energies(iter_pcm(wav_path)))
+
+    key = audio_cache_key(video_path, track_index or 0)
+    return _cached_profile(key, _compute, os.path.basename(video_path))
+
+
+def get_wav_speech_profile(wav_path: str) -> np.ndarray:
+    """Speech-activity vector of a 16 kHz mono WAV.
+
+    WAVs from the shared audio cache use the same profile cache entry as
+    :func:`get_speech_profile` for their track; other files are analysed
+    without caching.
+    """
+
+    def _compute():
+        return detect_speech(frame_energies(iter_pcm(wav_path)))
+
+    key = cached_wav_key(wav_path)
+    if key is None:
+        return _compute()
+    return _cached_profile(key, _compute, os.path.basename(wav_path))
+
+
+def _cached_profile(key: str, compute, label: str) -> np.ndarray:
+    """Stored profile for *key*, or compute() it and store it."""
+    cache_dir = _speech_cache_dir()
+    path = os.path.join(cache_dir, f"{key}.vad")
+
+    with _profile_locks[hash(key) % len(_profile_locks)]:
+        try:
+            return _read_profile(path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Discarding unreadable speech profile %s: %s", path, e)
+
+        speech = compute()
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_profile(path, speech)
+        logger.info(
+            "Speech profile for %s: %.0f%% of %d frames",
+            label,
+            100 * speech.mean() if speech.size else 0,
+            speech.size,
+        )
+        return speech
+
+
+def _write_profile(path: str, speech: np.ndarray):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, int(FRAME_SECONDS * 1000), speech.size))
+        f.write(np.packbits(speech).tobytes())
+    os.replace(tmp_path, path)
+
+
+def _read_profile(path: str) -> np.ndarray:
+    with open(path, "rb") as f:
+        magic, version, frame_ms, frames = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or frame_ms != int(FRAME_SECONDS * 1000):
+            raise ValueError("incompatible speech profile")
+        bits = np.frombuffer(f.read(), dtype=np.uint8)
+    return np.unpackbits(bits, count=frames).astype(bool)
+
+
+def _speech_cache_dir() -> str:
+    from config import get_settings
+
+    return os.path.join(getattr(get_settings(), "config_dir", "/config"), "cache", "speech")
+
+
+# ─── Alignment ───────────────────────────────────────────────────────────────
+
+
+def subtitle_activity(subs, frames: int = 0) -> np.ndarray:
+    """Boolean activity vector (10 ms frames) of a pysubs2 SSAFile's dialogue."""
+    spans = [
+        (event.start, event.end)
+        for event in subs
+        if not event.is_comment and event.end > event.start and event.plaintext.strip()
+    ]
+    if not spans:
+        return np.zeros(frames, dtype=bool)
+    bounds = (np.array(spans, dtype=np.int64).clip(min=0) / (FRAME_SECONDS * 1000)).astype(np.int64)
+    length = max(frames, int(bounds[:, 1].max()) + 1)
+    delta = np.zeros(length + 1, dtype=np.int32)
+    np.add.at(delta, bounds[:, 0], 1)
+    np.add.at(delta, bounds[:, 1], -1)
+    return np.cumsum(delta[:length]) > 0
+
+
+def find_offset(
+    speech: np.ndarray, activity: np.ndarray, max_offset: float = MAX_OFFSET_SECONDS
+) -> tuple[int, float]:
+    """Best shift of *activity* onto *speech* via FFT cross-correlation.
+
+    Returns:
+        (offset_ms, confidence) where confidence is the z-score of the peak
+        among all offsets within ±max_offset
+    """
+    if not speech.any() or not activity.any():
+        raise AlignmentError("No speech or no dialogue to align")
+
+    x = speech.astype(np.float32) * 2 - 1
+    y = activity.astype(np.float32) * 2 - 1
+    size = 1 << int(len(x) + len(y) - 1).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(x, size) * np.conj(np.fft.rfft(y, size)), size)
+
+    limit = min(int(max_offset / FRAME_SECONDS), size // 2 - 1)
+    # corr[k] scores moving the subtitle later by k frames; negative k wrap around
+    window = np.concatenate((corr[size - limit :], corr[: limit + 1]))
+    best = int(np.argmax(window))
+    std = float(window.std())
+    confidence = (float(window[best]) - float(window.mean())) / std if std > 0 else 0.0
+    offset_frames = best - limit
+    return int(round(offset_frames * FRAME_SECONDS * 1000)), confidence
+
+
+def sync_with_speech_profile(
+    subtitle_path: str,
+    video_path: str,
+    track_index: int | None = None,
+    min_confidence: float = MIN_CONFIDENCE,
+) -> dict:
+    """Shift *subtitle_path* in place onto the video's cached speech profile.
+
+    Creates a .bak copy before modifying the subtitle.
+
+    Returns:
+        dict with keys: output_path, shift_ms, engine, backup_path, confidence
+
+    Raises:
+        AlignmentError: The best offset is below *min_confidence*
+        RuntimeError: The audio could not be decoded
+    """
+    import pysubs2
+
+    from services.video_sync import _make_backup
+
+    speech = get_speech_profile(video_path, track_index)
+    subs = pysubs2.load(subtitle_path)
+    shift_ms, confidence = find_offset(speech, subtitle_activity(subs, speech.size))
+    if confidence < min_confidence:
+        raise AlignmentError(
+            f"Low alignment confidence ({confidence:.1f} < {min_confidence:.1f}) for "
+            f"{os.path.basename(subtitle_path)}"
+        )
+
+    backup = _make_backup(subtitle_path)
+    if shift_ms:
+        subs.shift(ms=shift_ms)
+        tmp_path = f"{subtitle_path}.{threading.get_ident()}.tmp"
+        try:
+            ext = os.path.splitext(subtitle_path)[1].lower()
+            subs.save(tmp_path, format_=pysubs2.formats.get_format_identifier(ext))
+            shutil.move(tmp_path, subtitle_path)
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+    logger.info(
+        "native sync: %s shifted %dms (confidence %.1f)",
+        os.path.basename(subtitle_path),
+        shift_ms,
+        confidence,
+    )
+    return {
+        "output_path": subtitle_path,
+        "shift_ms": shift_ms,
+        "engine": "native",
+        "backup_path": backup,
+        "confidence": round(confidence, 2),
+    }
@@ -1,101 +1,308 @@
 """Video player service for browser-based video streaming and subtitle preview.
 
-Uses FFmpeg to transcode videos to HLS format for browser compatibility.
+Serves videos as on-demand HLS: the playlist is built instantly and each
+segment is cut (stream copy for browser-compatible sources) or transcoded by
+FFmpeg when first requested, then cached per file and quality.
 Provides screenshot generation and subtitle embedding capabilities.
 """
 
+import contextlib
+import hashlib
+import json
 import logging
+import math
 import os
 import subprocess
 import tempfile
+import threading
+
+from cache_eviction import evict_lru
+from media_scheduler import DEMUX, PRIORITY_INTERACTIVE, PROBE, TRANSCODE, run_media
 
 logger = logging.getLogger(__name__)
 
 
+# Quality presets: target height and video bitrate for transcoded segments
+QUALITY_PRESETS = {
+    "low": {"height": 720, "bitrate": "1000k"},
+    "medium": {"height": 1080, "bitrate": "2500k"},
+    "high": {"height": 1080, "bitrate": "5000k"},
+}
+
+#: Codecs every HLS-capable browser player decodes natively (stream-copy fast path)
+_COPY_VIDEO_CODECS = {"h264"}
+_COPY_AUDIO_CODECS = {"aac", "mp3"}
+_COPY_PIX_FMTS = {None, "yuv420p", "yuvj420p"}
+
+_segment_locks = [threading.Lock() for _ in range(16)]
+
+
 def generate_hls_playlist(
     video_path: str,
-    output_dir: str,
-    segment_duration: int = 10,
     quality: str = "medium",
+    segment_duration: int = 10,
+    segment_url: str = "segment?index={index}",
 ) -> dict:
-    """Generate HLS playlist and segments from video file.
+    """Build an HLS VOD playlist for on-demand streaming without touching the video.
+
+    Segment boundaries come from the cached duration (transcode mode) or from
+    the video keyframes (stream-copy mode), so the playlist is returned right
+    away; each segment is produced lazily by get_hls_segment() when the player
+    requests it. Segments are cached per (content fingerprint, quality).
 
     Args:
         video_path: Path to video file
-        output_dir: Directory to store HLS segments and playlist
-        segment_duration: Duration of each segment in seconds
-        quality: Quality preset (low, medium, high)
+        quality: Quality preset (low, medium, high) or "original"
+        segment_duration: Target duration of each segment in seconds
+        segment_url: Segment URI template; ``{index}`` is replaced per segment
 
     Returns:
-        Dict with playlist_path and segment_count
+        Dict with playlist (m3u8 text), segment_count, mode ("copy"/"transcode")
+        and cache_dir
 
     Raises:
-        RuntimeError: If FFmpeg fails
+        RuntimeError: If the video cannot be probed
     """
-    if not os.path.exists(video_path):
-        raise RuntimeError(f"Video file not found: {video_path}")
+    plan = _segment_plan(video_path, quality, segment_duration)
+    bounds = plan["segments"]
+    target = max((end - start for start, end in bounds), default=segment_duration)
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{math.ceil(target)}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for index, (start, end) in enumerate(bounds):
+        lines.append(f"#EXTINF:{end - start:.6f},")
+        lines.append(segment_url.format(index=index))
+    lines.append("#EXT-X-ENDLIST")
+
+    return {
+        "playlist": "\n".join(lines) + "\n",
+        "segment_count": len(bounds),
+        "mode": plan["mode"],
+        "cache_dir": plan["cache_dir"],
+    }
 
-    os.makedirs(output_dir, exist_ok=True)
 
-    # Quality presets
-    quality_settings = {
-        "low": {"scale": "1280:720", "bitrate": "1000k"},
-        "medium": {"scale": "1920:1080", "bitrate": "2500k"},
-        "high": {"scale": "-2:1080", "bitrate": "5000k"},
-    }
+def get_hls_segment(
+    video_path: str,
+    index: int,
+    quality: str = "medium",
+    segment_duration: int = 10,
+) -> str:
+    """Return the path of one MPEG-TS segment, producing it on first request.
 
-    settings = quality_settings.get(quality, quality_settings["medium"])
+    Raises:
+        RuntimeError: If the index is out of range or FFmpeg fails
+    """
+    plan = _segment_plan(video_path, quality, segment_duration)
+    if not 0 <= index < len(plan["segments"]):
+        raise RuntimeError(f"Segment {index} out of range")
+
+    cache_dir = plan["cache_dir"]
+    segment_path = os.path.join(cache_dir, f"seg_{index:05d}.ts")
+    with _segment_locks[hash(segment_path) % len(_segment_locks)]:
+        if os.path.exists(segment_path):
+            os.utime(cache_dir)
+            return segment_path
+        start, end = plan["segments"][index]
+        _render_segment(video_path, plan, start, end, segment_path)
+    _evict_video_cache(os.path.dirname(cache_dir), keep=cache_dir)
+    return segment_path
+
+
+def _segment_plan(video_path: str, quality: str, segment_duration: int) -> dict:
+    """Mode, segment boundaries and cache directory for (file, quality).
+
+    The plan is stored in the cache directory so keyframes are scanned once.
+    """
+    if not os.path.exists(video_path):
+        raise RuntimeError(f"Video file not found: {video_path}")
 
-    playlist_path = os.path.join(output_dir, "playlist.m3u8")
-    segment_pattern = os.path.join(output_dir, "segment_%03d.ts")
+    from ass_utils import get_media_metadata
+    from media_fingerprint import get_fingerprint
 
-    # FFmpeg command for HLS generation
+    if quality != "original" and quality not in QUALITY_PRESETS:
+        quality = "medium"
+    identity = get_fingerprint(video_path) or f"{video_path}|{os.path.getmtime(video_path)}"
+    key = hashlib.sha1(f"{identity}|{quality}|{segment_duration}".encode()).hexdigest()[:24]
+    cache_dir = os.path.join(_video_cache_root(), key)
+    plan_path = os.path.join(cache_dir, "plan.json")
+    try:
+        with open(plan_path, encoding="utf-8") as f:
+            plan = json.load(f)
+        plan["cache_dir"] = cache_dir
+        return plan
+    except (OSError, ValueError):
+        pass
+
+    metadata = get_media_metadata(video_path)
+    try:
+        duration = float(metadata.get("format", {}).get("duration") or 0)
+    except ValueError:
+        duration = 0.0
+    if duration <= 0:
+        raise RuntimeError(f"Could not determine duration of {video_path}")
+
+    mode = "copy" if _can_stream_copy(metadata.get("streams", []), quality) else "transcode"
+    segments = None
+    if mode == "copy":
+        keyframes = _probe_keyframes(video_path)
+        segments = _keyframe_segments(keyframes, duration, segment_duration)
+        if segments is None:
+            mode = "transcode"
+    if segments is None:
+        count = max(1, math.ceil(duration / segment_duration))
+        segments = [
+            (i * segment_duration, min((i + 1) * segment_duration, duration)) for i in range(count)
+        ]
+
+    plan = {"mode": mode, "quality": quality, "segments": segments}
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{plan_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f)
+    os.replace(tmp_path, plan_path)
+    plan["cache_dir"] = cache_dir
+    return plan
+
+
+def _can_stream_copy(streams: list, quality: str) -> bool:
+    """True if the first video/audio streams play in browsers without transcoding."""
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is None or (video.get("codec_name") or "").lower() not in _COPY_VIDEO_CODECS:
+        return False
+    if video.get("pix_fmt") not in _COPY_PIX_FMTS:
+        return False
+    if audio is not None and (audio.get("codec_name") or "").lower() not in _COPY_AUDIO_CODECS:
+        return False
+    if quality == "original":
+        return True
+    height = video.get("height") or 0
+    return 0 < height <= QUALITY_PRESETS[quality]["height"]
+
+
+def _probe_keyframes(video_path: str) -> list[float]:
+    """Keyframe timestamps of the first video stream (packet scan, no decoding)."""
     cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags",
+        "-of",
+        "csv=p=0",
         video_path,
-        "-c:v",
-        "libx264",
-        "-c:a",
-        "aac",
-        "-b:v",
-        settings["bitrate"],
-        "-vf",
-        f"scale={settings['scale']}",
-        "-hls_time",
-        str(segment_duration),
-        "-hls_playlist_type",
-        "vod",
-        "-hls_segment_filename",
-        segment_pattern,
-        "-start_number",
-        "0",
-        playlist_path,
     ]
-
     try:
-        result = subprocess.run(
+        result = run_media(
+            PROBE,
             cmd,
+            priority=PRIORITY_INTERACTIVE,
             capture_output=True,
             text=True,
-            timeout=600,  # 10 minutes max
+            timeout=300,
         )
-        if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg HLS generation failed: {result.stderr}")
-
-        # Count segments
-        segment_count = len([f for f in os.listdir(output_dir) if f.endswith(".ts")])
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        logger.debug("Keyframe scan failed for %s: %s", video_path, e)
+        return []
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" not in flags:
+            continue
+        try:
+            keyframes.append(float(pts))
+        except ValueError:
+            continue
+    return sorted(keyframes)
+
+
+def _keyframe_segments(keyframes: list, duration: float, segment_duration: int):
+    """Group keyframes into segments of at least segment_duration seconds.
+
+    Returns None when no usable keyframes were found.
+    """
+    if not keyframes:
+        return None
+    segments = []
+    start = 0.0
+    for keyframe in keyframes:
+        if keyframe - start >= segment_duration and keyframe < duration:
+            segments.append((start, keyframe))
+            start = keyframe
+    segments.append((start, duration))
+    return segments
+
+
+def _render_segment(video_path: str, plan: dict, start: float, end: float, output_path: str):
+    """Cut (copy mode) or transcode one segment into output_path atomically."""
+    cmd = ["ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}"]
+    cmd += ["-map", "0:v:0", "-map", "0:a:0?"]
+    if plan["mode"] == "copy":
+        cmd += ["-c", "copy"]
+        slot = DEMUX
+    else:
+        preset = QUALITY_PRESETS.get(plan["quality"], QUALITY_PRESETS["medium"])
+        cmd += [
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-b:v",
+            preset["bitrate"],
+            "-vf",
+            f"scale=-2:'min({preset['height']},ih)'",
+            "-pix_fmt",
+            "yuv420p",
+            "-force_key_frames",
+            "expr:gte(t,0)",
+            "-c:a",
+            "aac",
+            "-ac",
+            "2",
+        ]
+        slot = TRANSCODE
+    tmp_path = f"{output_path}.{threading.get_ident()}.tmp"
+    cmd += ["-output_ts_offset", f"{start:.6f}", "-muxdelay", "0", "-f", "mpegts", tmp_path]
 
-        return {
-            "playlist_path": playlist_path,
-            "segment_count": segment_count,
-            "output_dir": output_dir,
-        }
+    try:
+        result = run_media(
+            slot,
+            cmd,
+            priority=PRIORITY_INTERACTIVE,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
     except subprocess.TimeoutExpired:
-        raise RuntimeError(f"FFmpeg HLS generation timed out: {video_path}")
+        raise RuntimeError(f"FFmpeg segment generation timed out: {video_path}")
     except FileNotFoundError:
         raise RuntimeError("ffmpeg not found. Install ffmpeg to enable video streaming.")
+    if result.returncode != 0 or not os.path.exists(tmp_path):
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise RuntimeError(f"FFmpeg segment generation failed: {result.stderr[-500:]}")
+    os.replace(tmp_path, output_path)
+
+
+def _video_cache_root() -> str:
+    from config import get_settings
+
+    return os.path.join(getattr(get_settings(), "config_dir", "/config"), "cache", "video")
+
+
+def _evict_video_cache(root: str, keep: str | None = None):
+    """Drop least recently used per-file segment caches until video_cache_max_mb fits."""
+    from config import get_settings
+
+    max_bytes = getattr(get_settings(), "video_cache_max_mb", 0) * 1024 * 1024
+    evict_lru(root, max_bytes, pinned={keep})
 
 
 def generate_screenshot(
@@ -142,8 +349,10 @@ def generate_screenshot(
     ]
 
     try:
-        result = subprocess.run(
+        result = run_media(
+            TRANSCODE,
             cmd,
+            priority=PRIORITY_INTERACTIVE,
             capture_output=True,
             text=True,
             timeout=30,
@@ -192,8 +401,10 @@ def convert_subtitle_to_webvtt(
     ]
 
     try:
-        result = subprocess.run(
+        result = run_media(
+            DEMUX,
             cmd,
+            priority=PRIORITY_INTERACTIVE,
             capture_output=True,
             text=True,
             timeout=30,
@@ -268,7 +479,8 @@ def embed_subtitle_in_video(
     ]
 
     try:
-        result = subprocess.run(
+        result = run_media(
+            DEMUX,
             cmd,
             capture_output=True,
             text=True,
@@ -1,7 +1,13 @@
 """Video subtitle synchronization service.
 
 Wraps ffsubsync and alass CLI tools. Both are optional dependencies —
-SyncUnavailableError is raised when an engine is not installed.
+SyncUnavailableError is raised when an engine is not installed. The
+built-in "native" engine (services.speech_sync) aligns against a cached
+speech profile in-process and falls back to them when it is not confident.
+
+Video references are handed to the engines as the track's 16 kHz mono WAV
+from the shared audio cache, so a file already decoded for Whisper or the
+waveform is not demuxed again.
 """
 
 import contextlib
@@ -14,6 +20,9 @@ import subprocess
 import sys
 import tempfile
 
+from audio_cache import cached_audio
+from media_scheduler import TRANSCODE, run_media
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +38,29 @@ class SyncUnavailableError(Exception):
     """Raised when the requested sync engine is not installed."""
 
 
+_SUBTITLE_EXTENSIONS = {".srt", ".ass", ".ssa", ".vtt", ".sub", ".smi"}
+
+
+@contextlib.contextmanager
+def _audio_reference(reference_path: str):
+    """Yield the cached audio for a video reference, or the path unchanged.
+
+    Subtitle references pass through; if decoding fails the engine gets the
+    original file and decodes it itself.
+    """
+    if os.path.splitext(reference_path)[1].lower() in _SUBTITLE_EXTENSIONS:
+        yield reference_path
+        return
+    with contextlib.ExitStack() as stack:
+        try:
+            reference_path = stack.enter_context(cached_audio(reference_path))
+        except RuntimeError as e:
+            logger.warning(
+                "Audio cache unavailable for %s, using it directly: %s", reference_path, e
+            )
+        yield reference_path
+
+
 def sync_with_ffsubsync(subtitle_path: str, video_path: str) -> dict:
     """Sync subtitle to video using ffsubsync (speech-detection based).
 
@@ -53,9 +85,10 @@ def sync_with_ffsubsync(subtitle_path: str, video_path: str) -> dict:
     fd, out_path = tempfile.mkstemp(suffix=ext)
     os.close(fd)
 
-    cmd = ["ffsubsync", video_path, "-i", subtitle_path, "-o", out_path]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        with _audio_reference(video_path) as reference:
+            cmd = ["ffsubsync", reference, "-i", subtitle_path, "-o", out_path]
+            result = run_media(TRANSCODE, cmd, capture_output=True, text=True, timeout=600)
     except subprocess.TimeoutExpired:
         _safe_remove(out_path)
         raise RuntimeError("ffsubsync timed out after 600s")
@@ -100,9 +133,10 @@ def sync_with_alass(subtitle_path: str, reference_path: str) -> dict:
     fd, out_path = tempfile.mkstemp(suffix=ext)
     os.close(fd)
 
-    cmd = ["alass", reference_path, subtitle_path, out_path]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        with _audio_reference(reference_path) as reference:
+            cmd = ["alass", reference, subtitle_path, out_path]
+            result = run_media(TRANSCODE, cmd, capture_output=True, text=True, timeout=300)
     except subprocess.TimeoutExpired:
         _safe_remove(out_path)
         raise RuntimeError("alass timed out after 300s")
@@ -121,9 +155,44 @@ def sync_with_alass(subtitle_path: str, reference_path: str) -> dict:
     }
 
 
+def auto_sync(subtitle_path: str, video_path: str, engine: str = "native") -> dict:
+    """Sync a subtitle against a video with *engine*.
+
+    "native" tries the cached speech-profile alignment first and falls back
+    to ffsubsync, then alass (with the video's audio as reference), when the
+    alignment is not confident or an engine is not installed.
+
+    Raises:
+        SyncUnavailableError: No engine in the chain could run
+        RuntimeError: An engine failed
+    """
+    if engine == "ffsubsync":
+        return sync_with_ffsubsync(subtitle_path, video_path)
+    if engine == "alass":
+        return sync_with_alass(subtitle_path, video_path)
+    if engine != "native":
+        raise ValueError(f"Unknown engine: {engine!r}")
+
+    from services.speech_sync import AlignmentError, sync_with_speech_profile
+
+    reasons = []
+    try:
+        return sync_with_speech_profile(subtitle_path, video_path)
+    except (AlignmentError, RuntimeError) as e:
+        logger.info("native sync: falling back for %s: %s", subtitle_path, e)
+        reasons.append(f"native: {e}")
+    for fallback in (sync_with_ffsubsync, sync_with_alass):
+        try:
+            return fallback(subtitle_path, video_path)
+        except SyncUnavailableError as e:
+            reasons.append(str(e))
+    raise SyncUnavailableError("; ".join(reasons))
+
+
 def get_available_engines() -> dict:
     """Return which sync engines are currently installed (checked at call time)."""
     return {
+        "native": True,
         "ffsubsync": bool(shutil.which("ffsubsync") or _check_module("ffsubsync")),
         "alass": bool(shutil.which("alass")),
     }
@@ -0,0 +1,280 @@
+"""Waveform peaks engine: multi-resolution min/max/RMS pyramid per audio track.
+
+The 16 kHz mono PCM of the track comes from the shared audio cache (the
+same decode Whisper and subtitle sync use) and is reduced with NumPy into
+buckets of BASE_BUCKET samples (100 buckets per second).
+Each further level merges LEVEL_FACTOR buckets of the level below, so any
+zoom level of the editor maps to a level with roughly one bucket per pixel.
+
+The pyramid is stored as one small binary file per (content fingerprint,
+audio track) under ``<config_dir>/cache/waveform`` (about 1.2 MB for a
+25-minute episode) and evicted LRU-first beyond ``waveform_cache_max_mb``.
+Slices are read straight from the file, so serving a zoomed-in time range
+only touches the rows it returns.
+
+File layout (little-endian)::
+
+    header   "SLPK" u16 version, u16 level count, u32 sample rate,
+             u32 base bucket, u32 level factor, f64 duration
+    counts   u64 row count per level
+    rows     int16 [min, max, rms] per bucket, level 0 first
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import struct
+import threading
+
+import numpy as np
+
+from audio_cache import DEFAULT_SAMPLE_RATE, cached_audio, iter_pcm
+from cache_eviction import evict_lru
+from media_scheduler import PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+#: Rate of the shared cached audio.
+SAMPLE_RATE = DEFAULT_SAMPLE_RATE
+#: Samples per level-0 bucket (16000 / 160 = 100 buckets per second).
+BASE_BUCKET = 160
+#: Buckets of level N merged into one bucket of level N+1.
+LEVEL_FACTOR = 4
+#: Stop adding levels once a level has at most this many buckets.
+MIN_LEVEL_BUCKETS = 256
+
+_MAGIC = b"SLPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIId")
+_ROW_BYTES = 3 * 2
+_READ_CHUNK = BASE_BUCKET * 2 * 4096
+
+_build_locks = [threading.Lock() for _ in range(8)]
+
+
+class PeakPyramid:
+    """Handle on a stored pyramid file; rows are read lazily per slice."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, level_count, sample_rate, base_bucket, factor, duration = (
+                _HEADER.unpack(f.read(_HEADER.size))
+            )
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Not a waveform peaks file: {path}")
+            counts = struct.unpack(f"<{level_count}Q", f.read(8 * level_count))
+        self.path = path
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.counts = list(counts)
+        self.bucket_seconds = [
+            base_bucket * factor**level / sample_rate for level in range(level_count)
+        ]
+        offset = _HEADER.size + 8 * level_count
+        self._offsets = []
+        for count in counts:
+            self._offsets.append(offset)
+            offset += count * _ROW_BYTES
+
+    def choose_level(self, start: float, end: float, points: int) -> int:
+        """Finest level that covers [start, end) in at most *points* buckets."""
+        for level, seconds in enumerate(self.bucket_seconds):
+            if (end - start) / seconds <= points:
+                return level
+        return len(self.counts) - 1
+
+    def read(self, level: int, start: float = 0.0, end: float | None = None) -> np.ndarray:
+        """Rows ``[min, max, rms]`` (int16) of *level* overlapping [start, end)."""
+        seconds = self.bucket_seconds[level]
+        count = self.counts[level]
+        first = min(count, max(0, int(start / seconds)))
+        last = count if end is None else min(count, max(first, int(np.ceil(end / seconds))))
+        rows = np.fromfile(
+            self.path,
+            dtype="<i2",
+            count=(last - first) * 3,
+            offset=self._offsets[level] + first * _ROW_BYTES,
+        )
+        return rows.reshape(-1, 3)
+
+
+def bucket_stats(frames: np.ndarray) -> np.ndarray:
+    """Reduce int16 samples shaped (buckets, samples) to int16 [min, max, rms] rows."""
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return np.column_stack(
+        (frames.min(axis=1), frames.max(axis=1), np.minimum(rms, 32767).astype(np.int16))
+    ).astype(np.int16)
+
+
+def downsample(rows: np.ndarray, factor: int = LEVEL_FACTOR) -> np.ndarray:
+    """Merge every *factor* rows into one; the last group may be shorter."""
+    starts = np.arange(0, len(rows), factor)
+    sizes = np.diff(np.append(starts, len(rows)))
+    squares = np.add.reduceat(np.square(rows[:, 2], dtype=np.float64), starts)
+    return np.column_stack(
+        (
+            np.minimum.reduceat(rows[:, 0], starts),
+            np.maximum.reduceat(rows[:, 1], starts),
+            np.sqrt(squares / sizes),
+        )
+    ).astype(np.int16)
+
+
+def build_levels(pcm_chunks) -> list[np.ndarray]:
+    """Build the pyramid from an iterable of raw s16le mono byte chunks."""
+    pending = b""
+    parts = []
+    bucket_bytes = BASE_BUCKET * 2
+    for chunk in pcm_chunks:
+        pending += chunk
+        usable = len(pending) - len(pending) % bucket_bytes
+        if usable:
+            frames = np.frombuffer(pending[:usable], dtype="<i2").reshape(-1, BASE_BUCKET)
+            parts.append(bucket_stats(frames))
+            pending = pending[usable:]
+    if len(pending) >= 2:
+        tail = np.frombuffer(pending[: len(pending) - len(pending) % 2], dtype="<i2")
+        parts.append(bucket_stats(tail.reshape(1, -1)))
+
+    base = np.concatenate(parts) if parts else np.zeros((0, 3), dtype=np.int16)
+    levels = [base]
+    while len(levels[-1]) > MIN_LEVEL_BUCKETS:
+        levels.append(downsample(levels[-1]))
+    return levels
+
+
+def write_pyramid(path: str, levels: list[np.ndarray], duration: float):
+    """Write *levels* atomically to *path*."""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC, _VERSION, len(levels), SAMPLE_RATE, BASE_BUCKET, LEVEL_FACTOR, duration
+            )
+        )
+        f.write(struct.pack(f"<{len(levels)}Q", *(len(rows) for rows in levels)))
+        for rows in levels:
+            f.write(rows.astype("<i2").tobytes())
+    os.replace(tmp_path, path)
+
+
+def get_peak_pyramid(video_path: str, audio_track_index: int | None = None) -> PeakPyramid:
+    """Return the cached pyramid for one audio track, decoding it on first use.
+
+    Raises:
+        RuntimeError: If the file is missing or the audio cannot be decoded
+    """
+    if not os.path.exists(video_path):
+        raise RuntimeError(f"Video file not found: {video_path}")
+
+    from media_fingerprint import get_fingerprint
+
+    identity = get_fingerprint(video_path) or f"{video_path}|{os.path.getmtime(video_path)}"
+    key = hashlib.sha1(f"{identity}|{audio_track_index or 0}".encode()).hexdigest()[:24]
+    cache_dir = _waveform_cache_dir()
+    path = os.path.join(cache_dir, f"{key}.peaks")
+
+    # Pyramids are written atomically, so a hit needs no lock and never waits
+    # behind another track's decode that happens to share the stripe.
+    pyramid = _open_cached(path)
+    if pyramid is not None:
+        return pyramid
+
+    with _build_locks[hash(key) % len(_build_locks)]:
+        pyramid = _open_cached(path, log_errors=True)
+        if pyramid is not None:
+            return pyramid
+
+        os.makedirs(cache_dir, exist_ok=True)
+        levels = _decode_levels(video_path, audio_track_index)
+        duration = _track_duration(video_path) or len(levels[0]) * BASE_BUCKET / SAMPLE_RATE
+        write_pyramid(path, levels, duration)
+
+    _evict_waveform_cache(cache_dir, keep=path)
+    return PeakPyramid(path)
+
+
+def _open_cached(path: str, log_errors: bool = False) -> PeakPyramid | None:
+    """Open a cached pyramid and mark it recently used; None on a miss."""
+    if not os.path.exists(path):
+        return None
+    with contextlib.suppress(OSError):
+        os.utime(path)
+    try:
+        return PeakPyramid(path)
+    except (OSError, ValueError, struct.error) as e:
+        if log_errors:
+            logger.warning("Discarding unreadable waveform cache %s: %s", path, e)
+        return None
+
+
+def waveform_slice(
+    video_path: str,
+    audio_track_index: int | None = None,
+    start: float = 0.0,
+    end: float | None = None,
+    points: int = 2000,
+    level: int | None = None,
+) -> dict:
+    """Peaks of [start, end) at the requested or best-fitting zoom level.
+
+    Values are normalized to -1.0..1.0 (min/max) and 0.0..1.0 (rms).
+    """
+    pyramid = get_peak_pyramid(video_path, audio_track_index)
+    start = max(0.0, start)
+    end = pyramid.duration if end is None else min(end, pyramid.duration)
+    end = max(start, end)
+    if level is None:
+        level = pyramid.choose_level(start, end, max(1, points))
+    level = min(max(0, level), len(pyramid.counts) - 1)
+
+    rows = pyramid.read(level, start, end)
+    seconds = pyramid.bucket_seconds[level]
+    scaled = np.round(rows / 32768.0, 4)
+    return {
+        "duration": pyramid.duration,
+        "level": level,
+        "levels": [
+            {"level": i, "bucket_seconds": s, "samples": c}
+            for i, (s, c) in enumerate(zip(pyramid.bucket_seconds, pyramid.counts, strict=True))
+        ],
+        "start": int(start / seconds) * seconds,
+        "end": end,
+        "bucket_seconds": seconds,
+        "samples": len(rows),
+        "min": scaled[:, 0].tolist(),
+        "max": scaled[:, 1].tolist(),
+        "rms": scaled[:, 2].tolist(),
+    }
+
+
+def _decode_levels(video_path: str, audio_track_index: int | None) -> list[np.ndarray]:
+    """Reduce the cached PCM of the track with build_levels()."""
+    with cached_audio(
+        video_path, audio_track_index, sample_rate=SAMPLE_RATE, priority=PRIORITY_INTERACTIVE
+    ) as wav_path:
+        return build_levels(iter_pcm(wav_path, _READ_CHUNK))
+
+
+def _track_duration(video_path: str) -> float:
+    from ass_utils import get_media_metadata
+
+    try:
+        return float(get_media_metadata(video_path).get("format", {}).get("duration") or 0)
+    except (RuntimeError, FileNotFoundError, ValueError):
+        return 0.0
+
+
+def _waveform_cache_dir() -> str:
+    from config import get_settings
+
+    return os.path.join(getattr(get_settings(), "config_dir", "/config"), "cache", "waveform")
+
+
+def _evict_waveform_cache(cache_dir: str, keep: str | None = None):
+    """Drop least recently used pyramids until waveform_cache_max_mb fits."""
+    from config import get_settings
+
+    max_bytes = getattr(get_settings(), "waveform_cache_max_mb", 0) * 1024 * 1024
+    evict_lru(cache_dir, max_bytes, pinned={keep}, suffix=".peaks")
@@ -90,7 +90,7 @@ class StandaloneManager:
 
             observer = start_watcher(
                 folder_paths,
-                on_new_file=self._on_new_file,
+                on_new_files=self._on_new_files,
                 debounce_seconds=float(debounce),
             )
             self._watcher_running = observer is not None
@@ -170,36 +170,32 @@ class StandaloneManager:
             if ctx is not None:
                 ctx.pop()
 
-    def _on_new_file(self, path: str) -> None:
-        """Callback for the watcher when a new stable video file is detected.
+    def _on_new_files(self, series_folder: str | None, paths: list[str]) -> None:
+        """Callback for the watcher with a batch of new stable video files.
 
-        Processes the file through the scanner and emits an event.
+        Processes the batch through the scanner in one call and emits an
+        event per file.
         """
         ctx = self._app.app_context() if self._app is not None else None
         try:
             if ctx is not None:
                 ctx.push()
-            result = self._scanner.process_single_file(path)
+            results = self._scanner.process_new_files(paths, series_folder=series_folder)
             try:
                 from events import emit_event
 
-                emit_event(
-                    "standalone_file_detected",
-                    {
-                        "path": path,
-                        **result,
-                    },
-                )
+                for result in results:
+                    emit_event("standalone_file_detected", result)
             except Exception:
                 pass
             logger.info(
-                "Processed new file: %s (type=%s, wanted=%s)",
-                path,
-                result.get("type"),
-                result.get("wanted"),
+                "Processed %d new file(s) in %s (%d wanted)",
+                len(results),
+                series_folder or "watched folder",
+                sum(1 for r in results if r.get("wanted")),
             )
         except Exception as e:
-            logger.error("Error processing new file via watcher: %s", e)
+            logger.error("Error processing new files via watcher: %s", e)
         finally:
             if ctx is not None:
                 ctx.pop()
@@ -0,0 +1,160 @@
+"""Directory index for incremental standalone scans.
+
+Each directory under a watched folder is remembered with a fingerprint (its
+mtime in ns) and its listing: subdirectories and the video files it holds,
+with their size and mtime. Adding, removing or renaming an entry (including
+subtitle and NFO files) changes the directory's mtime, so on a rescan only
+directories whose fingerprint changed are listed again; the rest reuse the
+stored listing and cost a single stat().
+
+The walk runs in a thread pool, one task per top-level subdirectory, and
+follows symlinks with loop protection (like ``os.walk(followlinks=True)``).
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from standalone.parser import is_video_file
+
+logger = logging.getLogger(__name__)
+
+#: Upper bound for walker threads (the walk is I/O bound).
+MAX_WALK_WORKERS = 8
+
+
+@dataclass
+class DirListing:
+    """Stored state of one directory."""
+
+    fingerprint: str
+    subdirs: list[str] = field(default_factory=list)
+    videos: list[tuple[str, int, float]] = field(default_factory=list)  # (path, size, mtime)
+
+    def to_dict(self) -> dict:
+        return {"subdirs": self.subdirs, "videos": [list(v) for v in self.videos]}
+
+    @classmethod
+    def from_dict(cls, fingerprint: str, data: dict) -> "DirListing":
+        return cls(
+            fingerprint=fingerprint,
+            subdirs=list(data.get("subdirs", [])),
+            videos=[tuple(v) for v in data.get("videos", [])],
+        )
+
+
+@dataclass
+class WalkResult:
+    """Listings of every directory found, and the ones that were re-listed."""
+
+    listings: dict[str, DirListing] = field(default_factory=dict)
+    changed: set[str] = field(default_factory=set)
+
+    @property
+    def videos(self) -> dict[str, tuple[int, float]]:
+        """All video files found: {path: (size, mtime)}."""
+        return {
+            path: (size, mtime)
+            for listing in self.listings.values()
+            for path, size, mtime in listing.videos
+        }
+
+    def merge(self, other: "WalkResult"):
+        self.listings.update(other.listings)
+        self.changed |= other.changed
+
+
+def _list_dir(path: str, fingerprint: str) -> DirListing:
+    listing = DirListing(fingerprint=fingerprint)
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    listing.subdirs.append(entry.path)
+                elif entry.is_file() and is_video_file(entry.name):
+                    st = entry.stat()
+                    listing.videos.append((entry.path, st.st_size, st.st_mtime))
+            except OSError as e:
+                logger.debug("Skipping %s: %s", entry.path, e)
+    listing.subdirs.sort()
+    listing.videos.sort()
+    return listing
+
+
+def _visit(path: str, previous: dict[str, DirListing], seen: set):
+    """(listing, changed) for one directory; None if unreadable or already visited."""
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        logger.debug("Cannot stat %s: %s", path, e)
+        return None
+    inode = (st.st_dev, st.st_ino)
+    if inode in seen:  # symlink loop or second link to a visited dir
+        return None
+    seen.add(inode)
+
+    fingerprint = str(st.st_mtime_ns)
+    listing = previous.get(path)
+    if listing is not None and listing.fingerprint == fingerprint:
+        return listing, False
+    try:
+        return _list_dir(path, fingerprint), True
+    except OSError as e:
+        logger.warning("Cannot list %s: %s", path, e)
+        return None
+
+
+def _walk(root: str, previous: dict[str, DirListing], seen: set) -> WalkResult:
+    """Depth-first walk below *root*, reusing unchanged listings."""
+    result = WalkResult()
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        visited = _visit(path, previous, seen)
+        if visited is None:
+            continue
+        listing, changed = visited
+        result.listings[path] = listing
+        if changed:
+            result.changed.add(path)
+        stack.extend(reversed(listing.subdirs))
+    return result
+
+
+def walk_folder(
+    folder_path: str, previous: dict[str, DirListing] | None = None, workers: int | None = None
+) -> WalkResult:
+    """Walk a watched folder, listing only directories that changed.
+
+    Args:
+        folder_path: Root of the watched folder.
+        previous: Listings from the last scan ({} or None = list everything).
+        workers: Walker threads (default: one per top-level subdirectory,
+            at most MAX_WALK_WORKERS).
+
+    Returns:
+        WalkResult covering every directory reachable from the root.
+    """
+    previous = previous or {}
+    # Shared by the walker threads; a check-then-add race only lists a directory twice
+    seen: set = set()
+    result = WalkResult()
+
+    visited = _visit(folder_path, previous, seen)
+    if visited is None:
+        return result
+    root, changed = visited
+    result.listings[folder_path] = root
+    if changed:
+        result.changed.add(folder_path)
+
+    workers = min(workers or MAX_WALK_WORKERS, len(root.subdirs))
+    if workers <= 1:
+        for subdir in root.subdirs:
+            result.merge(_walk(subdir, previous, seen))
+        return result
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="standalone-walk") as pool:
+        for part in pool.map(lambda d: _walk(d, previous, seen), root.subdirs):
+            result.merge(part)
+    return result
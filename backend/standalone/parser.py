@@ -5,6 +5,7 @@ Handles both standard naming (S01E02) and anime naming (absolute episodes,
 parent directories.
 """
 
+import json
 import logging
 import os
 import re
@@ -13,6 +14,12 @@ from guessit import guessit
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever parse_media_file's output changes; invalidates parsed_file_cache.
+PARSER_VERSION = 1
+
+# Below this many cache misses, parsing inline beats starting worker processes.
+POOL_MIN_FILES = 200
+
 # Supported video file extensions (lowercase, with dot)
 VIDEO_EXTENSIONS: set[str] = {
     ".mkv",
@@ -222,7 +229,92 @@ def parse_media_file(file_path: str) -> dict:
     return result
 
 
-def group_files_by_series(file_paths: list[str]) -> dict[str, list[dict]]:
+def parse_media_files(
+    file_paths: list[str],
+    stats: dict[str, tuple[int, float]] | None = None,
+    workers: int | None = None,
+) -> dict[str, dict]:
+    """Parse many media files, each exactly once, reusing cached results.
+
+    Results are cached in the parsed_file_cache table keyed by path and
+    valid while the file's size and mtime are unchanged. Cache misses are
+    parsed in a process pool when there are at least POOL_MIN_FILES of them
+    (guessit is pure-Python and CPU bound), inline otherwise.
+
+    Args:
+        file_paths: Full paths of the files to parse.
+        stats: Optional {path: (size, mtime)} already known from the
+            directory walk; missing entries are stat()ed.
+        workers: Process count for the pool (default: CPU count, max 8).
+
+    Returns:
+        Dict mapping path to parse result. Files that fail to parse (or
+        disappear) are left out.
+    """
+    stats = dict(stats or {})
+    for path in file_paths:
+        if path not in stats:
+            try:
+                st = os.stat(path)
+                stats[path] = (st.st_size, st.st_mtime)
+            except OSError:
+                continue
+    paths = [p for p in dict.fromkeys(file_paths) if p in stats]
+
+    results: dict[str, dict] = {}
+    try:
+        from db.standalone import get_parsed_files
+
+        cached = get_parsed_files(paths, PARSER_VERSION)
+    except Exception as e:
+        logger.debug("Parse cache lookup failed: %s", e)
+        cached = {}
+    for path in paths:
+        row = cached.get(path)
+        if row and row["size"] == stats[path][0] and row["mtime"] == stats[path][1]:
+            results[path] = json.loads(row["parsed_json"])
+
+    misses = [p for p in paths if p not in results]
+    if not misses:
+        return results
+
+    parsed = dict(_parse_in_pool(misses, workers) if len(misses) >= POOL_MIN_FILES else [])
+    for path in misses:
+        if path not in parsed:
+            parsed[path] = _safe_parse(path)[1]
+
+    entries = []
+    for path in misses:
+        if parsed[path] is None:
+            continue
+        results[path] = parsed[path]
+        entries.append(
+            {
+                "file_path": path,
+                "size": stats[path][0],
+                "mtime": stats[path][1],
+                "parsed_json": json.dumps(parsed[path], default=str),
+            }
+        )
+    try:
+        from db.standalone import save_parsed_files
+
+        save_parsed_files(entries, PARSER_VERSION)
+    except Exception as e:
+        logger.debug("Parse cache update failed: %s", e)
+
+    logger.debug(
+        "Parsed %d files (%d cached, %d parsed)",
+        len(results),
+        len(results) - len(entries),
+        len(entries),
+    )
+    return results
+
+
+def group_files_by_series(
+    file_paths: list[str], parsed: dict[str, dict] | None = None
+) -> dict[str, list[dict]]:
     """Group parsed media files by normalized series title.
 
     Parses each file path and groups them by a lowercase, stripped version
@@ -230,6 +322,8 @@ def group_files_by_series(file_paths: list[str]) -> dict[str, list[dict]]:
 
     Args:
         file_paths: List of full file paths to parse and group.
+        parsed: Optional {path: parse result} (from parse_media_files);
+            paths not in it are parsed here.
 
     Returns:
         Dict mapping normalized title to list of parsed file info dicts
@@ -239,15 +333,15 @@ def group_files_by_series(file_paths: list[str]) -> dict[str, list[dict]]:
 
     for path in file_paths:
         try:
-            parsed = parse_media_file(path)
-            if parsed["type"] != "episode":
+            result = parsed[path] if parsed and path in parsed else parse_media_file(path)
+            if result["type"] != "episode":
                 continue
 
-            normalized = parsed["title"].lower().strip()
+            normalized = result["title"].lower().strip()
             if not normalized:
                 continue
 
-            entry = {**parsed, "file_path": path}
+            entry = {**result, "file_path": path}
             groups.setdefault(normalized, []).append(entry)
         except Exception as e:
             logger.warning("Failed to parse %s: %s", path, e)
@@ -260,6 +354,34 @@ def group_files_by_series(file_paths: list[str]) -> dict[str, list[dict]]:
 # ---------------------------------------------------------------------------
 
 
+def _safe_parse(path: str) -> tuple[str, dict | None]:
+    try:
+        return path, parse_media_file(path)
+    except Exception as e:
+        logger.warning("Failed to parse %s: %s", path, e)
+        return path, None
+
+
+def _parse_in_pool(paths: list[str], workers: int | None) -> list[tuple[str, dict | None]]:
+    """Parse *paths* across worker processes; returns [] if the pool fails to start."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or min(8, os.cpu_count() or 1)
+    if workers < 2:
+        return []
+    try:
+        # spawn: forking a threaded server process can deadlock on held locks
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            chunksize = max(1, len(paths) // (workers * 4))
+            return list(pool.map(_safe_parse, paths, chunksize=chunksize))
+    except Exception as e:
+        logger.warning("Parser process pool failed, parsing inline: %s", e)
+        return []
+
+
 def _extract_title(guess: dict, parent_dir: str) -> str:
     """Extract the best title from guessit result with fallback to parent dir."""
     title = guess.get("title", "")
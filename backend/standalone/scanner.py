@@ -3,8 +3,15 @@
 Walks configured directories, parses filenames, resolves metadata,
 creates standalone_series/standalone_movies entries, and populates
 wanted_items for files missing target language subtitles.
+
+Scans are incremental: directory listings are remembered between scans
+(standalone.dir_index), and only series and movies with files in changed
+directories are processed again. ``scan_all_folders(full=True)`` ignores
+the stored state.
 """
 
+import hashlib
+import json
 import logging
 import os
 import threading
@@ -87,11 +94,15 @@ class StandaloneScanner:
                 self._resolver = MetadataResolver()
         return self._resolver
 
-    def scan_all_folders(self) -> dict:
+    def scan_all_folders(self, full: bool = False) -> dict:
         """Scan all enabled watched folders for media files.
 
         Non-blocking: skips if a scan is already in progress.
 
+        Args:
+            full: Re-list every directory and reprocess every title instead
+                of only those in directories that changed since the last scan.
+
         Returns:
             Summary dict with keys: folders_scanned, series_found,
             movies_found, wanted_added, duration_seconds.
@@ -124,7 +135,7 @@ class StandaloneScanner:
 
             for folder in folders:
                 try:
-                    s, m, w = self._scan_folder(folder)
+                    s, m, w = self._scan_folder(folder, full=full)
                     total_series += s
                     total_movies += m
                     total_wanted += w
@@ -165,17 +176,21 @@ class StandaloneScanner:
             self._scanning = False
             self._scan_lock.release()
 
-    def _scan_folder(self, folder: dict) -> tuple:
+    def _scan_folder(self, folder: dict, full: bool = False) -> tuple:
         """Scan a single watched folder.
 
+        Series and movies are only processed again when one of their
+        directories changed since the last scan (or when *full* is set).
+
         Args:
             folder: Dict from DB with path, label, media_type, etc.
+            full: Ignore the stored directory state.
 
         Returns:
             Tuple of (series_count, movie_count, wanted_count).
         """
         from config import get_settings
-        from standalone.parser import group_files_by_series, is_video_file, parse_media_file
+        from standalone.dir_index import walk_folder
 
         folder_path = folder["path"]
         if not os.path.isdir(folder_path):
@@ -183,65 +198,120 @@ class StandaloneScanner:
             return (0, 0, 0)
 
         skip_extras = getattr(get_settings(), "standalone_skip_extras", True)
-
-        # Collect all video files
-        video_files = []
-        for root, _dirs, files in os.walk(folder_path, followlinks=True):
-            for filename in files:
-                full_path = os.path.join(root, filename)
-                if is_video_file(full_path) and (not skip_extras or not _is_extra_file(full_path)):
-                    video_files.append(full_path)
+        scan_key = self._scan_key(skip_extras)
+
+        # Collect all video files, re-listing only changed directories
+        previous = {} if full else self._load_dir_state(folder_path, scan_key)
+        walk = walk_folder(folder_path, previous)
+        stats = {
+            path: stat
+            for path, stat in walk.videos.items()
+            if not skip_extras or not _is_extra_file(path)
+        }
+        video_files = sorted(stats)
+        changed = walk.changed
 
         if not video_files:
             logger.debug("No video files in %s", folder_path)
+            self._save_dir_state(folder_path, scan_key, walk, set())
             return (0, 0, 0)
 
-        logger.info("Found %d video files in %s", len(video_files), folder_path)
+        logger.info(
+            "Found %d video files in %s (%d of %d directories changed)",
+            len(video_files),
+            folder_path,
+            len(changed),
+            len(walk.listings),
+        )
+
+        result = self._process_video_files(
+            video_files, stats, folder, lambda paths, dirs: bool(dirs & changed)
+        )
+        self._save_dir_state(folder_path, scan_key, walk, result["failed_dirs"])
+        return (result["series"], result["movies"], result["wanted"])
+
+    def _process_video_files(
+        self,
+        video_files: list[str],
+        stats: dict[str, tuple[int, float]],
+        folder: dict,
+        affected,
+        wanted_paths: set[str] | None = None,
+    ) -> dict:
+        """Parse, group and process video files.
+
+        Args:
+            video_files: Paths of all video files to consider.
+            stats: {path: (size, mtime)} for the parse cache.
+            folder: The watched folder dict.
+            affected: ``affected(paths, dirs) -> bool``; titles for which it
+                is False are only counted, not processed again.
+            wanted_paths: Optional set collecting files that got wanted items.
+
+        Returns:
+            Dict with series, movies and wanted counts, the parse results
+            ("parsed") and the directories of titles that failed ("failed_dirs").
+        """
+        from standalone.parser import group_files_by_series, parse_media_files
 
         series_count = 0
         movie_count = 0
         wanted_count = 0
+        failed_dirs: set[str] = set()
 
-        # Group episode files by series title
-        series_groups = group_files_by_series(video_files)
+        # Parse every file exactly once (cached by size/mtime), then group
+        parsed_files = parse_media_files(video_files, stats=stats)
+        series_groups = group_files_by_series(
+            [vf for vf in video_files if vf in parsed_files], parsed=parsed_files
+        )
 
         # Collect movie files (not grouped into series)
-        movie_files = []
-        grouped_paths = set()
-        for files_list in series_groups.values():
-            for f in files_list:
-                grouped_paths.add(f["file_path"])
-
-        for vf in video_files:
-            if vf not in grouped_paths:
-                try:
-                    parsed = parse_media_file(vf)
-                    if parsed["type"] == "movie":
-                        movie_files.append((vf, parsed))
-                except Exception as e:
-                    logger.warning("Failed to parse %s: %s", vf, e)
+        movie_files = [
+            (vf, parsed_files[vf])
+            for vf in video_files
+            if vf in parsed_files and parsed_files[vf]["type"] == "movie"
+        ]
 
         # Process series groups
         for title, files in series_groups.items():
+            paths = [f["file_path"] for f in files]
+            dirs = {os.path.dirname(p) for p in paths} | {self._find_common_parent(paths)}
+            if not affected(paths, dirs):
+                series_count += 1
+                continue
             try:
-                w = self._process_series_group(title, files, folder)
+                w = self._process_series_group(title, files, folder, wanted_paths)
                 series_count += 1
                 wanted_count += w
             except Exception as e:
+                failed_dirs |= dirs
                 logger.error("Error processing series '%s': %s", title, e)
 
         # Process movies
         for file_path, parsed in movie_files:
+            movie_dir = os.path.dirname(file_path)
+            if not affected([file_path], {movie_dir}):
+                movie_count += 1
+                continue
             try:
-                w = self._process_movie(parsed, file_path, folder)
+                w = self._process_movie(parsed, file_path, folder, wanted_paths)
                 movie_count += 1
                 wanted_count += w
             except Exception as e:
+                failed_dirs.add(movie_dir)
                 logger.error("Error processing movie '%s': %s", file_path, e)
 
-        return (series_count, movie_count, wanted_count)
-
-    def _process_series_group(self, title: str, files: list[dict], folder: dict) -> int:
+        return {
+            "series": series_count,
+            "movies": movie_count,
+            "wanted": wanted_count,
+            "parsed": parsed_files,
+            "failed_dirs": failed_dirs,
+        }
+
+    def _process_series_group(
+        self, title: str, files: list[dict], folder: dict, wanted_paths: set[str] | None = None
+    ) -> int:
         """Process a group of episode files belonging to one series.
 
         Resolves metadata once for the series, upserts standalone_series,
@@ -253,6 +323,7 @@ class StandaloneScanner:
             title: Normalized series title (lowercase).
             files: List of parsed file dicts (each with file_path key).
             folder: The watched folder dict.
+            wanted_paths: Optional set collecting files that got wanted items.
 
         Returns:
             Number of wanted items added.
@@ -365,10 +436,14 @@ class StandaloneScanner:
                     standalone_series_id=series_id,
                 )
                 wanted_added += 1
+                if wanted_paths is not None:
+                    wanted_paths.add(file_path)
 
         return wanted_added
 
-    def _process_movie(self, parsed: dict, file_path: str, folder: dict) -> int:
+    def _process_movie(
+        self, parsed: dict, file_path: str, folder: dict, wanted_paths: set[str] | None = None
+    ) -> int:
         """Process a single movie file.
 
         Resolves metadata, upserts standalone_movie, checks for missing
@@ -380,6 +455,7 @@ class StandaloneScanner:
             parsed: Parsed file metadata dict.
             file_path: Absolute path to the movie file.
             folder: The watched folder dict.
+            wanted_paths: Optional set collecting files that got wanted items.
 
         Returns:
             1 if a wanted item was added, 0 otherwise.
@@ -460,106 +536,90 @@ class StandaloneScanner:
                 standalone_movie_id=movie_id,
             )
             wanted_added += 1
+            if wanted_paths is not None:
+                wanted_paths.add(file_path)
 
         return wanted_added
 
-    def process_single_file(self, file_path: str) -> dict:
-        """Process a single newly detected file.
-
-        Parses the file, resolves metadata, creates/updates standalone
-        entry, and creates wanted item if subtitles are missing.
+    def process_new_files(self, file_paths: list[str], series_folder: str | None = None) -> list:
+        """Process a batch of newly detected files (the watcher's callback target).
 
-        This is the callback target for the watcher's on_new_file.
+        With a *series_folder*, every video below it is taken into account so
+        series groups are complete (episode count, common folder), but only
+        titles containing one of the new files are processed. Metadata is
+        thus resolved once per series, and the wanted rows of the batch are
+        committed together.
 
         Args:
-            file_path: Absolute path to the media file.
+            file_paths: Absolute paths of the new media files.
+            series_folder: Top-level folder the files were found in, or None
+                for files placed directly in a watched folder.
 
         Returns:
-            Dict with type, title, wanted (bool).
+            List of dicts with path, type, title, wanted (bool) per new file.
         """
-        from standalone.parser import parse_media_file
-
-        try:
-            parsed = parse_media_file(file_path)
-
-            if parsed["type"] == "movie":
-                wanted = self._process_movie(
-                    parsed, file_path, {"path": os.path.dirname(file_path)}
-                )
-                return {
-                    "type": "movie",
-                    "title": parsed.get("title", "Unknown"),
-                    "wanted": wanted > 0,
-                }
-            else:
-                # For a single episode file, create a minimal series group
-                from db.standalone import upsert_standalone_series
-                from db.wanted import upsert_wanted_item
+        from config import get_settings
+        from db.wanted import batch_upsert_context
+        from standalone.dir_index import walk_folder
 
-                title = parsed.get("title", "Unknown")
-                is_anime = parsed.get("is_anime", False)
-                year = parsed.get("year")
+        skip_extras = getattr(get_settings(), "standalone_skip_extras", True)
+        new = {
+            p
+            for p in file_paths
+            if os.path.isfile(p) and (not skip_extras or not _is_extra_file(p))
+        }
+        if not new:
+            return []
+
+        stats = {}
+        if series_folder and os.path.isdir(series_folder):
+            stats = {
+                path: stat
+                for path, stat in walk_folder(series_folder).videos.items()
+                if not skip_extras or not _is_extra_file(path)
+            }
+        for path in new - set(stats):
+            st = os.stat(path)
+            stats[path] = (st.st_size, st.st_mtime)
+
+        folder = {"path": series_folder or self._find_common_parent(sorted(new))}
+        wanted_paths: set[str] = set()
+        with batch_upsert_context():
+            result = self._process_video_files(
+                sorted(stats),
+                stats,
+                folder,
+                lambda paths, dirs: not new.isdisjoint(paths),
+                wanted_paths,
+            )
 
-                resolver = self._get_resolver()
-                meta = resolver.resolve_series(title, year=year, is_anime=is_anime)
-
-                series_folder = os.path.dirname(file_path)
-                series_id = upsert_standalone_series(
-                    title=meta.get("title", title),
-                    folder_path=series_folder,
-                    year=meta.get("year"),
-                    tmdb_id=meta.get("tmdb_id"),
-                    tvdb_id=meta.get("tvdb_id"),
-                    anilist_id=meta.get("anilist_id"),
-                    imdb_id=meta.get("imdb_id", ""),
-                    poster_url=meta.get("poster_url", ""),
-                    is_anime=meta.get("is_anime", is_anime),
-                    metadata_source=meta.get("metadata_source", "filename"),
-                )
+        return [
+            {
+                "path": path,
+                "type": result["parsed"].get(path, {}).get("type", "unknown"),
+                "title": result["parsed"].get(path, {}).get("title", ""),
+                "wanted": path in wanted_paths,
+            }
+            for path in sorted(new)
+        ]
 
-                # Check for missing subtitles
-                wanted = False
-                target_languages = self._get_target_languages()
-                season = parsed.get("season")
-                episode = parsed.get("episode")
-
-                season_episode = ""
-                if season is not None and episode is not None:
-                    season_episode = f"S{season:02d}E{episode:02d}"
-                elif episode is not None:
-                    season_episode = f"E{episode:02d}"
-
-                for target_lang in target_languages:
-                    existing = self._check_existing_subtitle(file_path, target_lang)
-                    if existing == "ass":
-                        continue
-
-                    ep_title = meta.get("title", title)
-                    if season_episode:
-                        ep_title = f"{ep_title} -- {season_episode}"
-
-                    upsert_wanted_item(
-                        item_type="episode",
-                        file_path=file_path,
-                        title=ep_title,
-                        season_episode=season_episode,
-                        existing_sub=existing or "",
-                        missing_languages=[target_lang],
-                        target_language=target_lang,
-                        instance_name="standalone",
-                        standalone_series_id=series_id,
-                    )
-                    wanted = True
+    def process_single_file(self, file_path: str) -> dict:
+        """Process a single newly detected file through the batch path.
 
-                return {
-                    "type": "episode",
-                    "title": meta.get("title", title),
-                    "wanted": wanted,
-                }
+        Args:
+            file_path: Absolute path to the media file.
 
+        Returns:
+            Dict with type, title, wanted (bool).
+        """
+        try:
+            results = self.process_new_files([file_path])
         except Exception as e:
             logger.error("Error processing single file %s: %s", file_path, e)
             return {"type": "unknown", "title": "", "wanted": False, "error": str(e)}
+        if not results:
+            return {"type": "unknown", "title": "", "wanted": False}
+        return {key: results[0][key] for key in ("type", "title", "wanted")}
 
     # -----------------------------------------------------------------------
     # Internal helpers
@@ -611,6 +671,56 @@ class StandaloneScanner:
             logger.debug("Could not check existing subs for %s: %s", file_path, e)
             return None
 
+    def _scan_key(self, skip_extras: bool) -> str:
+        """Key of the settings that decide a scan's outcome.
+
+        Stored directory state is only reused while it matches, so changing
+        the target languages or the extras filter reprocesses everything.
+        """
+        from standalone.parser import PARSER_VERSION
+
+        raw = json.dumps([sorted(self._get_target_languages()), skip_extras, PARSER_VERSION])
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def _load_dir_state(self, folder_path: str, scan_key: str) -> dict:
+        """Directory listings stored by the last scan of *folder_path*."""
+        from standalone.dir_index import DirListing
+
+        try:
+            from db.standalone import get_dir_states
+
+            rows = get_dir_states(folder_path, scan_key)
+        except Exception as e:
+            logger.warning("Could not load scan state for %s: %s", folder_path, e)
+            return {}
+        return {
+            path: DirListing.from_dict(row["fingerprint"], json.loads(row["listing_json"]))
+            for path, row in rows.items()
+        }
+
+    def _save_dir_state(self, folder_path: str, scan_key: str, walk, failed_dirs: set[str]):
+        """Persist changed listings; directories of failed titles stay dirty.
+
+        Parse cache rows of files that were deleted or renamed away are
+        dropped in the same pass.
+        """
+        states = {
+            path: {
+                "fingerprint": walk.listings[path].fingerprint,
+                "listing_json": json.dumps(walk.listings[path].to_dict()),
+            }
+            for path in walk.changed - failed_dirs
+        }
+        try:
+            from db.standalone import prune_parsed_files, save_dir_states
+
+            save_dir_states(folder_path, scan_key, states, set(walk.listings))
+            pruned = prune_parsed_files(folder_path, set(walk.videos))
+            if pruned:
+                logger.debug("Pruned %d parse cache rows under %s", pruned, folder_path)
+        except Exception as e:
+            logger.warning("Could not save scan state for %s: %s", folder_path, e)
+
     def _find_common_parent(self, paths: list[str]) -> str:
         """Find the common parent directory of a list of file paths.
 
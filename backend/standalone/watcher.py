@@ -1,8 +1,11 @@
 """Filesystem watcher for media directories using watchdog.
 
 Monitors configured watched folders for new/moved video files.
-Uses debounce (default 10s) and file stability check to handle
-incomplete copies and rapid filesystem events.
+Events are coalesced by a single worker thread: a batch window closes
+once no new event arrived for the debounce interval (default 10s), files
+whose size is still changing stay pending, and the stable files are
+handed over grouped by series folder -- so a season dropped into a
+watched folder is processed in one call instead of once per episode.
 """
 
 import logging
@@ -37,30 +40,47 @@ VIDEO_PATTERNS = [
     "*.ts",
 ]
 
+# Recheck interval for files that were still growing when a window closed
+STABILITY_SECONDS = 2.0
+# A window closes after at most this many debounce intervals, even while
+# events keep arriving (e.g. a long copy of many files)
+MAX_WINDOW_FACTOR = 6
 
-class MediaFileWatcher(PatternMatchingEventHandler):
-    """Watches media directories for new/moved video files with debounce.
 
-    Uses a per-path threading.Timer to coalesce rapid filesystem events
-    and a file stability check (size comparison after 2s) to avoid
-    processing incomplete copies.
+class MediaFileWatcher(PatternMatchingEventHandler):
+    """Watches media directories for new/moved video files and batches them.
 
     Args:
-        on_new_file: Callback receiving the absolute path of a new stable video file.
-        debounce_seconds: Seconds to wait after the last event for a path before processing.
+        on_new_files: Callback receiving (series_folder, paths) for each group
+            of stable new video files. series_folder is the top-level
+            directory below a watched folder, or None for files placed
+            directly in a watched folder.
+        debounce_seconds: Quiet period after the last event before a batch
+            is processed.
+        roots: Watched folders, used to find each file's series folder.
     """
 
-    def __init__(self, on_new_file: Callable[[str], None], debounce_seconds: float = 10.0):
+    def __init__(
+        self,
+        on_new_files: Callable[[str | None, list[str]], None],
+        debounce_seconds: float = 10.0,
+        roots: list[str] | None = None,
+    ):
         if _WATCHDOG_AVAILABLE:
             super().__init__(
                 patterns=VIDEO_PATTERNS,
                 ignore_directories=True,
                 case_sensitive=False,
             )
-        self.on_new_file = on_new_file
+        self.on_new_files = on_new_files
         self.debounce_seconds = debounce_seconds
-        self._pending: dict[str, threading.Timer] = {}
-        self._lock = threading.Lock()
+        self.roots = sorted((os.path.normpath(r) for r in roots or []), key=len, reverse=True)
+        self._pending: dict[str, int] = {}  # path -> size when last seen
+        self._cond = threading.Condition()
+        self._last_event = 0.0
+        self._window_start = 0.0
+        self._stopped = False
+        self._worker: threading.Thread | None = None
 
     def on_created(self, event) -> None:
         """Handle file creation events."""
@@ -70,59 +90,120 @@ class MediaFileWatcher(PatternMatchingEventHandler):
         """Handle file move/rename events (use destination path)."""
         self._schedule_process(event.dest_path)
 
-    def _schedule_process(self, path: str) -> None:
-        """Schedule debounced processing for a file path.
-
-        Cancels any existing timer for the same path and starts a new one.
-        """
-        with self._lock:
-            existing_timer = self._pending.get(path)
-            if existing_timer is not None:
-                existing_timer.cancel()
-
-            timer = threading.Timer(
-                self.debounce_seconds,
-                self._check_and_process,
-                args=(path,),
-            )
-            timer.daemon = True
-            self._pending[path] = timer
-            timer.start()
-
-    def _check_and_process(self, path: str) -> None:
-        """Check file stability and invoke callback if stable.
-
-        Gets file size, waits 2 seconds, checks again. If sizes differ
-        the file is still being written -- reschedule. If stable and
-        the file exists, invoke the on_new_file callback.
-        """
-        # Remove from pending
-        with self._lock:
-            self._pending.pop(path, None)
+    def stop(self) -> None:
+        """Stop the batch worker; pending files are dropped."""
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify_all()
 
+    def _schedule_process(self, path: str) -> None:
+        """Add a path to the current batch window and push the window's end back."""
         try:
-            if not os.path.exists(path):
+            size = os.path.getsize(path)
+        except OSError:
+            size = -1
+        with self._cond:
+            if self._stopped:
                 return
+            now = time.monotonic()
+            if not self._pending:
+                self._window_start = now
+            self._pending[path] = size
+            self._last_event = now
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, daemon=True, name="standalone-watcher"
+                )
+                self._worker.start()
+            self._cond.notify_all()
+
+    def _window_deadline(self) -> float:
+        return min(
+            self._last_event + self.debounce_seconds,
+            self._window_start + self.debounce_seconds * MAX_WINDOW_FACTOR,
+        )
 
-            size_1 = os.path.getsize(path)
-            time.sleep(2)
-
-            if not os.path.exists(path):
-                return
-
-            size_2 = os.path.getsize(path)
-
-            if size_1 != size_2:
-                # File still being written -- reschedule
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    remaining = self._window_deadline() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+                candidates = dict(self._pending)
+
+            stable, growing = self._check_stable(candidates)
+
+            ready = []
+            with self._cond:
+                now = time.monotonic()
+                for path, size in candidates.items():
+                    if self._pending.get(path) != size:
+                        continue  # new event meanwhile; stays in the next window
+                    if path in growing:
+                        self._pending[path] = growing[path]
+                    else:
+                        self._pending.pop(path)
+                        if path in stable:
+                            ready.append(path)
+                if self._pending:
+                    # Recheck growing files shortly, as a new window
+                    self._window_start = now
+                    self._last_event = max(
+                        self._last_event, now - self.debounce_seconds + STABILITY_SECONDS
+                    )
+
+            if ready:
+                self._dispatch(ready)
+
+    def _check_stable(self, candidates: dict[str, int]) -> tuple[list[str], dict[str, int]]:
+        """Split candidates into stable paths and {path: new size} of growing ones.
+
+        Files that disappeared are in neither.
+        """
+        stable = []
+        growing = {}
+        for path, size in candidates.items():
+            try:
+                current = os.path.getsize(path)
+            except OSError:
+                continue
+            if current == size:
+                stable.append(path)
+            else:
                 logger.debug("File still changing, rescheduling: %s", path)
-                self._schedule_process(path)
-                return
-
-            logger.info("Detected new media file: %s", path)
-            self.on_new_file(path)
-
-        except Exception as e:
-            logger.error("Error processing new file %s: %s", path, e)
+                growing[path] = current
+        return stable, growing
+
+    def _series_folder(self, path: str) -> str | None:
+        """Top-level directory of *path* below its watched folder (None at the root)."""
+        path = os.path.normpath(path)
+        for root in self.roots:
+            if path.startswith(root + os.sep):
+                first = os.path.relpath(path, root).split(os.sep)[0]
+                candidate = os.path.join(root, first)
+                return None if candidate == path else candidate
+        return os.path.dirname(path)
+
+    def _dispatch(self, paths: list[str]) -> None:
+        groups: dict[str | None, list[str]] = {}
+        for path in sorted(paths):
+            groups.setdefault(self._series_folder(path), []).append(path)
+        for series_folder, group in groups.items():
+            logger.info(
+                "Detected %d new media file(s) in %s", len(group), series_folder or "watched folder"
+            )
+            try:
+                self.on_new_files(series_folder, group)
+            except Exception as e:
+                logger.error("Error processing new files in %s: %s", series_folder, e)
 
 
 # ---------------------------------------------------------------------------
@@ -130,10 +211,13 @@ class MediaFileWatcher(PatternMatchingEventHandler):
 # ---------------------------------------------------------------------------
 
 _observer: Optional["Observer"] = None  # type: ignore[assignment]
+_handler: MediaFileWatcher | None = None
 
 
 def start_watcher(
-    folders: list[str], on_new_file: Callable[[str], None], debounce_seconds: float = 10.0
+    folders: list[str],
+    on_new_files: Callable[[str | None, list[str]], None],
+    debounce_seconds: float = 10.0,
 ):
     """Start the filesystem watcher on the given folders.
 
@@ -142,14 +226,15 @@ def start_watcher(
 
     Args:
         folders: List of absolute directory paths to watch.
-        on_new_file: Callback for newly detected stable video files.
+        on_new_files: Callback for each batch of newly detected stable video
+            files, called as (series_folder, paths).
         debounce_seconds: Debounce interval in seconds.
 
     Returns:
         The started Observer instance, or None if watchdog is unavailable
         or no valid folders are provided.
     """
-    global _observer
+    global _observer, _handler
 
     if not _WATCHDOG_AVAILABLE:
         logger.warning(
@@ -162,7 +247,7 @@ def start_watcher(
         logger.info("No folders to watch")
         return None
 
-    handler = MediaFileWatcher(on_new_file, debounce_seconds=debounce_seconds)
+    handler = MediaFileWatcher(on_new_files, debounce_seconds=debounce_seconds, roots=folders)
     observer = Observer()
     observer.daemon = True
 
@@ -181,13 +266,17 @@ def start_watcher(
 
     observer.start()
     _observer = observer
+    _handler = handler
     logger.info("Filesystem watcher started on %d folder(s)", watched_count)
     return observer
 
 
 def stop_watcher() -> None:
-    """Stop the running filesystem observer if any."""
-    global _observer
+    """Stop the running filesystem observer and its batch worker if any."""
+    global _observer, _handler
+    if _handler is not None:
+        _handler.stop()
+        _handler = None
     if _observer is not None:
         try:
             _observer.stop()
@@ -200,7 +289,9 @@ def stop_watcher() -> None:
 
 
 def restart_watcher(
-    folders: list[str], on_new_file: Callable[[str], None], debounce_seconds: float = 10.0
+    folders: list[str],
+    on_new_files: Callable[[str | None, list[str]], None],
+    debounce_seconds: float = 10.0,
 ):
     """Restart the filesystem watcher with new configuration.
 
@@ -208,11 +299,11 @@ def restart_watcher(
 
     Args:
         folders: List of absolute directory paths to watch.
-        on_new_file: Callback for newly detected stable video files.
+        on_new_files: Callback for batches of newly detected stable video files.
         debounce_seconds: Debounce interval in seconds.
 
     Returns:
         The new Observer instance, or None.
     """
     stop_watcher()
-    return start_watcher(folders, on_new_file, debounce_seconds)
+    return start_watcher(folders, on_new_files, debounce_seconds)
@@ -55,3 +55,34 @@ class TestRadarrWebhooks:
         )
         # Should handle gracefully
         assert response.status_code in [200, 400, 422]
+
+
+class TestWebhookPipeline:
+    """Tests for the background webhook pipeline."""
+
+    def test_queued_item_is_not_reported_complete(self, app_ctx):
+        """An item handed to the paced search has not been processed yet."""
+        from unittest.mock import MagicMock, patch
+
+        from routes.webhooks import _webhook_auto_pipeline
+
+        settings = MagicMock(
+            webhook_delay_minutes=0,
+            webhook_auto_scan=False,
+            webhook_auto_search=True,
+            webhook_auto_translate=True,
+        )
+        scanner = MagicMock()
+        scanner.enqueue_search.return_value = True
+        with (
+            patch("config.get_settings", return_value=settings),
+            patch("wanted_scanner.get_scanner", return_value=scanner),
+            patch("db.wanted.get_wanted_item_by_path", return_value={"id": 7}),
+            patch("routes.webhooks.socketio") as socketio,
+            patch("notifier.send_notification") as notify,
+        ):
+            _webhook_auto_pipeline("/tv/show/e01.mkv", "Show")
+
+        scanner.enqueue_search.assert_called_once_with(7)
+        socketio.emit.assert_not_called()
+        notify.assert_not_called()
@@ -46,3 +46,114 @@ def test_fix_line_breaks():
     fixed = fix_line_breaks(text)
     assert "\\N" in fixed
     assert "\\n" not in fixed or fixed.count("\\n") < text.count("\\n")
+
+
+# ── Subtitle extraction ───────────────────────────────────────────────────────
+
+_PROBE = {
+    "streams": [
+        {"codec_type": "video", "codec_name": "hevc"},
+        {"codec_type": "subtitle", "codec_name": "ass"},
+        {"codec_type": "subtitle", "codec_name": "hdmv_pgs_subtitle"},
+        {"codec_type": "subtitle", "codec_name": "subrip"},
+    ]
+}
+
+
+@pytest.fixture()
+def ffmpeg_calls(tmp_path, monkeypatch):
+    """Fake ffmpeg that writes each -map output; returns the list of argv seen."""
+    from types import SimpleNamespace
+
+    import ass_utils
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        for i, arg in enumerate(cmd):
+            if arg == "-map":
+                with open(cmd[i + 4], "w") as f:
+                    f.write(cmd[i + 1])  # "0:s:N" marks which stream landed here
+        return SimpleNamespace(returncode=0, stderr="")
+
+    settings = SimpleNamespace(extract_cache_max_mb=16, config_dir=str(tmp_path), ffmpeg_timeout=5)
+    monkeypatch.setattr(ass_utils.subprocess, "run", fake_run)
+    monkeypatch.setattr(ass_utils, "get_settings", lambda: settings)
+    monkeypatch.setattr(ass_utils, "get_media_streams", lambda path, use_cache=True: _PROBE)
+    return calls
+
+
+def test_extract_streams_single_pass(tmp_path, ffmpeg_calls):
+    """Multiple outputs are mapped in one ffmpeg invocation."""
+    from ass_utils import extract_subtitle_streams
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"")
+    targets = [
+        ({"sub_index": 0}, str(tmp_path / "ep.jpn.ass")),
+        ({"sub_index": 2}, str(tmp_path / "ep.eng.srt")),
+    ]
+    extract_subtitle_streams(str(video), targets)
+
+    assert len(ffmpeg_calls) == 1
+    assert ffmpeg_calls[0].count("-map") == 2
+    assert (tmp_path / "ep.eng.srt").read_text() == "0:s:2"
+
+
+def test_extract_stream_prefills_cache_for_other_tracks(tmp_path, ffmpeg_calls):
+    """The first extraction caches every text track; later tracks need no demux."""
+    from ass_utils import extract_subtitle_stream
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"")
+    extract_subtitle_stream(str(video), {"sub_index": 0}, str(tmp_path / "a.ass"))
+    extract_subtitle_stream(str(video), {"sub_index": 2}, str(tmp_path / "b.srt"))
+    extract_subtitle_stream(str(video), {"sub_index": 0}, str(tmp_path / "c.ass"))
+
+    assert len(ffmpeg_calls) == 1
+    assert "0:s:1" not in ffmpeg_calls[0]  # bitmap tracks are not pre-extracted
+    assert (tmp_path / "b.srt").read_text() == "0:s:2"
+    assert (tmp_path / "c.ass").read_text() == "0:s:0"
+
+
+def test_extract_stream_without_prefill_demuxes_only_that_track(tmp_path, ffmpeg_calls):
+    """Per-track retries after a failed one-pass extract don't re-run the full fill."""
+    from ass_utils import extract_subtitle_stream
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"")
+    for idx, name in ((0, "a.ass"), (2, "b.srt")):
+        extract_subtitle_stream(
+            str(video), {"sub_index": idx}, str(tmp_path / name), prefill_cache=False
+        )
+
+    assert [call.count("-map") for call in ffmpeg_calls] == [1, 1]
+    assert (tmp_path / "b.srt").read_text() == "0:s:2"
+
+
+def test_extract_stream_cache_invalidated_by_content_change(tmp_path, ffmpeg_calls):
+    """A file whose content changed (e.g. remuxed in place) is demuxed again."""
+    from ass_utils import extract_subtitle_stream
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"v1")
+    extract_subtitle_stream(str(video), {"sub_index": 0}, str(tmp_path / "a.ass"))
+    video.write_bytes(b"v2")
+    extract_subtitle_stream(str(video), {"sub_index": 0}, str(tmp_path / "a.ass"))
+
+    assert len(ffmpeg_calls) == 2
+
+
+def test_extract_stream_cache_survives_rename(tmp_path, ffmpeg_calls):
+    """Renamed files share their extracted tracks through the content fingerprint."""
+    from ass_utils import extract_subtitle_stream
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"v1")
+    extract_subtitle_stream(str(video), {"sub_index": 0}, str(tmp_path / "a.ass"))
+    renamed = video.rename(tmp_path / "Show - S01E01.mkv")
+    extract_subtitle_stream(str(renamed), {"sub_index": 0}, str(tmp_path / "b.ass"))
+
+    assert len(ffmpeg_calls) == 1
+    assert (tmp_path / "b.ass").read_text() == "0:s:0"
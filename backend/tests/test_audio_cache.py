@@ -0,0 +1,138 @@
+"""Tests for the shared content-addressed audio cache (audio_cache.py)."""
+
+import os
+import subprocess
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+import audio_cache
+import config
+import media_fingerprint
+
+
+def _write_wav(path, frames=b"\x01\x00\x02\x00\x03\x00"):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(frames)
+
+
+@pytest.fixture()
+def decoder(tmp_path, monkeypatch):
+    """Fake ffmpeg writing a tiny WAV; records every decode command."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        time.sleep(0.05)
+        _write_wav(cmd[-1])
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"", stderr=b"")
+
+    settings = SimpleNamespace(config_dir=str(tmp_path / "config"), audio_cache_max_mb=0)
+    monkeypatch.setattr(audio_cache.subprocess, "run", fake_run)
+    monkeypatch.setattr(config, "get_settings", lambda: settings)
+    monkeypatch.setattr(media_fingerprint, "get_fingerprint", lambda path: "fp-shared")
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"\x00")
+    return SimpleNamespace(path=str(video), calls=calls, settings=settings, tmp=tmp_path)
+
+
+def test_track_decoded_once_and_reused(decoder):
+    first = audio_cache.get_cached_audio(decoder.path, 1)
+    second = audio_cache.get_cached_audio(decoder.path, 1)
+
+    assert first == second and os.path.exists(first)
+    assert len(decoder.calls) == 1
+    cmd = decoder.calls[0]
+    assert cmd[cmd.index("-map") + 1] == "0:a:1"
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+
+
+def test_key_includes_track_and_format(decoder):
+    paths = {
+        audio_cache.get_cached_audio(decoder.path, 0),
+        audio_cache.get_cached_audio(decoder.path, 1),
+        audio_cache.get_cached_audio(decoder.path, 0, sample_rate=8000),
+        audio_cache.get_cached_audio(decoder.path, 0, channels=2),
+    }
+    assert len(paths) == 4
+
+
+def test_same_content_shares_entry_across_paths(decoder):
+    copy = decoder.tmp / "renamed.mkv"
+    copy.write_bytes(b"\x00")
+
+    audio_cache.get_cached_audio(decoder.path)
+    audio_cache.get_cached_audio(str(copy))
+
+    assert len(decoder.calls) == 1
+
+
+def test_concurrent_requests_wait_instead_of_decoding_twice(decoder):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(audio_cache.get_cached_audio(decoder.path)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(results)) == 1
+    assert len(decoder.calls) == 1
+
+
+def test_eviction_skips_pinned_files(decoder):
+    with audio_cache.cached_audio(decoder.path, 0) as pinned:
+        stale = os.path.join(os.path.dirname(pinned), "stale.wav")
+        with open(stale, "wb") as f:
+            f.write(b"\x00" * (2 * 1024 * 1024))
+        os.utime(pinned, (1, 1))  # oldest, but in use
+        os.utime(stale, (2, 2))
+        decoder.settings.audio_cache_max_mb = 1
+
+        audio_cache.get_cached_audio(decoder.path, 1)
+
+        assert os.path.exists(pinned)
+        assert not os.path.exists(stale)
+
+
+def test_decode_failure_raises_and_leaves_no_entry(decoder, monkeypatch):
+    def failing(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 1, stdout=b"", stderr=b"no audio stream")
+
+    monkeypatch.setattr(audio_cache.subprocess, "run", failing)
+    with pytest.raises(RuntimeError, match="no audio stream"):
+        audio_cache.get_cached_audio(decoder.path)
+    assert not os.listdir(os.path.join(decoder.settings.config_dir, "cache", "audio"))
+
+
+def test_iter_pcm_skips_header(tmp_path):
+    path = str(tmp_path / "a.wav")
+    _write_wav(path, b"\x01\x00" * 1000)
+
+    assert b"".join(audio_cache.iter_pcm(path, chunk_bytes=300)) == b"\x01\x00" * 1000
+
+
+def test_load_pcm_returns_normalised_float32(tmp_path):
+    path = str(tmp_path / "a.wav")
+    _write_wav(path, b"\x00\x40" + b"\x00\xc0" + b"\xff\x7f")
+
+    samples = audio_cache.load_pcm(path)
+
+    assert samples.dtype.name == "float32"
+    assert samples.tolist() == [0.5, -0.5, 32767 / 32768]
+
+
+def test_load_pcm_rejects_other_layouts(tmp_path):
+    path = str(tmp_path / "a.wav")
+    _write_wav(path)
+
+    with pytest.raises(RuntimeError, match="Expected mono 16-bit PCM at 8000 Hz"):
+        audio_cache.load_pcm(path, sample_rate=8000)
@@ -0,0 +1,54 @@
+"""Tests for cache_eviction.py — shared size-capped LRU eviction."""
+
+import os
+
+from cache_eviction import evict_lru
+
+
+def _entry(path, size, mtime, is_dir=False):
+    if is_dir:
+        os.makedirs(path)
+        target = os.path.join(path, "data")
+    else:
+        target = path
+    with open(target, "wb") as f:
+        f.write(b"\0" * size)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_file_entries_evicted_oldest_first(tmp_path):
+    old = _entry(tmp_path / "old.wav", 100, 1000)
+    mid = _entry(tmp_path / "mid.wav", 100, 2000)
+    new = _entry(tmp_path / "new.wav", 100, 3000)
+    other = _entry(tmp_path / "notes.txt", 500, 500)
+
+    assert evict_lru(str(tmp_path), 200, suffix=".wav") == 1
+    assert not os.path.exists(old)
+    assert all(os.path.exists(p) for p in (mid, new, other))
+
+
+def test_pinned_entries_are_skipped(tmp_path):
+    old = _entry(tmp_path / "old.peaks", 100, 1000)
+    mid = _entry(tmp_path / "mid.peaks", 100, 2000)
+    _entry(tmp_path / "new.peaks", 100, 3000)
+
+    assert evict_lru(str(tmp_path), 200, pinned={old}, suffix=".peaks") == 1
+    assert os.path.exists(old)
+    assert not os.path.exists(mid)
+
+
+def test_directory_entries_sized_by_their_files(tmp_path):
+    old = _entry(tmp_path / "a", 300, 1000, is_dir=True)
+    new = _entry(tmp_path / "b", 300, 2000, is_dir=True)
+
+    assert evict_lru(str(tmp_path), 400) == 1
+    assert not os.path.exists(old)
+    assert os.path.isdir(new)
+
+
+def test_disabled_or_missing_root_is_a_no_op(tmp_path):
+    kept = _entry(tmp_path / "x.wav", 100, 1000)
+    assert evict_lru(str(tmp_path), 0, suffix=".wav") == 0
+    assert evict_lru(str(tmp_path / "missing"), 10) == 0
+    assert os.path.exists(kept)
@@ -1,20 +1,21 @@
-import json
-from datetime import datetime
 from unittest.mock import patch
 
-from db.models.core import ChapterCache
+import pytest
 
+from db.repositories.cache import probe_lru
 
-class TestChapterCacheModel:
-    def test_tablename(self):
-        assert ChapterCache.__tablename__ == "chapter_cache"
 
-    def test_has_required_columns(self):
-        cols = {c.key for c in ChapterCache.__table__.columns}
-        assert "file_path" in cols
-        assert "mtime" in cols
-        assert "chapters_json" in cols
-        assert "cached_at" in cols
+@pytest.fixture(autouse=True)
+def _clear_probe_lru():
+    probe_lru.invalidate()
+    yield
+    probe_lru.invalidate()
+
+
+_RAW_CHAPTERS = [
+    {"id": 1, "start_time": "90.000", "end_time": "1350.000", "tags": {"title": "Main"}},
+    {"id": 0, "start_time": "0.000", "end_time": "90.000", "tags": {"title": "OP"}},
+]
 
 
 class TestNormalizeChapter:
@@ -52,95 +53,79 @@ class TestNormalizeChapter:
         assert result["end_ms"] == 30000
 
 
-class TestProbeChapters:
-    def test_parses_ffprobe_output(self):
-        from chapters import _probe_chapters
-
-        fake_output = '{"chapters": [{"id": 0, "start_time": "0.000", "end_time": "90.000", "tags": {"title": "OP"}}]}'
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.stdout = fake_output
-            mock_run.return_value.returncode = 0
-            result = _probe_chapters("/fake/video.mkv")
-        assert len(result) == 1
-        assert result[0]["title"] == "OP"
-        assert result[0]["end_ms"] == 90000
-
-    def test_returns_empty_list_when_no_chapters(self):
-        from chapters import _probe_chapters
+class TestCombinedProbe:
+    def test_ffprobe_collects_streams_chapters_and_format(self):
+        from ass_utils import run_ffprobe
 
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value.stdout = '{"chapters": []}'
+            mock_run.return_value.stdout = '{"streams": [], "chapters": [], "format": {}}'
             mock_run.return_value.returncode = 0
-            result = _probe_chapters("/fake/video.mkv")
-        assert result == []
-
-    def test_returns_empty_on_ffprobe_failure(self):
-        from chapters import _probe_chapters
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.stdout = ""
-            mock_run.return_value.returncode = 1
-            result = _probe_chapters("/fake/video.mkv")
-        assert result == []
+            run_ffprobe("/fake/video.mkv", use_cache=False)
+        cmd = mock_run.call_args[0][0]
+        assert {"-show_streams", "-show_chapters", "-show_format"} <= set(cmd)
+        assert mock_run.call_count == 1
 
 
 class TestGetChapters:
-    def test_returns_cached_result(self, app_ctx, tmp_path):
-        """get_chapters returns DB-cached chapters without calling ffprobe."""
+    def test_served_from_unified_record(self, app_ctx, tmp_path):
+        """Chapters, streams and duration come from one cached probe record."""
+        from ass_utils import get_media_streams
         from chapters import get_chapters
-        from extensions import db
+        from services.audio_visualizer import get_audio_duration
 
         video = tmp_path / "ep.mkv"
         video.write_bytes(b"fake")
-        chapters = [{"id": 0, "title": "OP", "start_ms": 0, "end_ms": 90000}]
-
-        row = ChapterCache(
-            file_path=str(video),
-            mtime=video.stat().st_mtime,
-            chapters_json=json.dumps(chapters),
-            cached_at=datetime.utcnow().isoformat(),
-        )
-        db.session.add(row)
-        db.session.commit()
+        record = {"streams": [], "chapters": _RAW_CHAPTERS, "format": {"duration": "1350.0"}}
 
-        with patch("chapters._probe_chapters") as mock_probe:
+        with patch("ass_utils._run_engine", return_value=record) as engine:
+            get_media_streams(str(video))
             result = get_chapters(str(video))
-        mock_probe.assert_not_called()
-        assert result == chapters
+            duration = get_audio_duration(str(video), use_cache=True)
+        engine.assert_called_once()
+
+        assert [c["title"] for c in result] == ["OP", "Main"]
+        assert result[1] == {"id": 1, "title": "Main", "start_ms": 90000, "end_ms": 1350000}
+        assert duration == 1350.0
 
-    def test_probes_when_cache_miss(self, app_ctx, tmp_path):
+    def test_streams_only_record_is_completed_once(self, app_ctx, tmp_path):
+        """Records without chapters (MediaInfo, older entries) get one combined probe."""
         from chapters import get_chapters
 
         video = tmp_path / "ep2.mkv"
         video.write_bytes(b"fake")
-        fake_chapters = [{"id": 0, "title": "A", "start_ms": 0, "end_ms": 5000}]
+        full = {"streams": [], "chapters": _RAW_CHAPTERS[1:], "format": {"duration": "90.0"}}
+
+        with (
+            patch("ass_utils._run_engine", return_value={"streams": []}),
+            patch("ass_utils.run_ffprobe", return_value=full) as ffprobe,
+        ):
+            assert get_chapters(str(video))[0]["title"] == "OP"
+            assert get_chapters(str(video))[0]["title"] == "OP"
+        ffprobe.assert_called_once_with(str(video), use_cache=False)
+
+    def test_failed_completion_probe_is_retried(self, app_ctx, tmp_path):
+        """A failed chapter/format probe is not cached as an empty record."""
+        from chapters import get_chapters
 
-        with patch("chapters._probe_chapters", return_value=fake_chapters) as mock_probe:
-            result = get_chapters(str(video))
-        mock_probe.assert_called_once_with(str(video))
-        assert result == fake_chapters
+        video = tmp_path / "ep4.mkv"
+        video.write_bytes(b"fake")
+        full = {"streams": [], "chapters": _RAW_CHAPTERS[1:], "format": {"duration": "90.0"}}
 
-    def test_probes_when_mtime_changed(self, app_ctx, tmp_path):
+        with (
+            patch("ass_utils._run_engine", return_value={"streams": []}),
+            patch("ass_utils.run_ffprobe", side_effect=[RuntimeError("busy"), full]) as ffprobe,
+        ):
+            assert get_chapters(str(video)) == []
+            assert get_chapters(str(video))[0]["title"] == "OP"
+        assert ffprobe.call_count == 2
+
+    def test_returns_empty_when_probe_fails(self, app_ctx, tmp_path):
         from chapters import get_chapters
-        from extensions import db
 
         video = tmp_path / "ep3.mkv"
         video.write_bytes(b"fake")
-
-        # Cache with stale mtime
-        row = ChapterCache(
-            file_path=str(video),
-            mtime=0.0,  # wrong mtime
-            chapters_json=json.dumps([]),
-            cached_at=datetime.utcnow().isoformat(),
-        )
-        db.session.add(row)
-        db.session.commit()
-
-        fresh = [{"id": 0, "title": "Fresh", "start_ms": 0, "end_ms": 1000}]
-        with patch("chapters._probe_chapters", return_value=fresh):
-            result = get_chapters(str(video))
-        assert result == fresh
+        with patch("ass_utils._run_engine", side_effect=RuntimeError("ffprobe failed")):
+            assert get_chapters(str(video)) == []
 
 
 class TestGetChaptersEndpoint:
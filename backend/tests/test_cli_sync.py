@@ -19,7 +19,7 @@ class TestSyncCommand:
         assert result.exit_code == 0
         client.post.assert_called_once_with(
             "/tools/auto-sync",
-            json={"file_path": str(sub), "video_path": str(vid), "engine": "ffsubsync"},
+            json={"file_path": str(sub), "video_path": str(vid), "engine": "native"},
         )
         assert "done" in result.output
 
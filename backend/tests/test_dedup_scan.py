@@ -0,0 +1,249 @@
+"""Tests for the incremental dedup scan, duplicate groups and near-duplicate clusters."""
+
+import os
+from unittest.mock import patch
+
+import dedup_engine
+from dedup_engine import compute_dialog_simhash, find_near_duplicate_groups, scan_for_duplicates
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\n{}\n"
+
+
+def _write(directory, name, text):
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SRT.format(text))
+    return str(path)
+
+
+def _group_paths(result):
+    return sorted(sorted(f["path"] for f in g["files"]) for g in result["changed_groups"])
+
+
+class TestIncrementalScan:
+    def test_rescan_skips_unchanged_files(self, app_ctx, tmp_path):
+        a = _write(tmp_path, "Show/a.en.srt", "Hello")
+        b = _write(tmp_path, "Show/b.en.srt", "Hello")
+        _write(tmp_path, "Show/c.en.srt", "Other")
+
+        first = scan_for_duplicates(str(tmp_path))
+        assert first["total_scanned"] == 3 and first["hashed"] == 3
+        assert _group_paths(first) == [[a, b]]
+
+        with patch.object(
+            dedup_engine, "compute_subtitle_hash", wraps=dedup_engine.compute_subtitle_hash
+        ) as compute:
+            second = scan_for_duplicates(str(tmp_path))
+
+        compute.assert_not_called()
+        assert second["total_scanned"] == 3 and second["hashed"] == 0
+        assert second["changed_groups"] == []
+        assert second["duplicates_found"] == 2 and second["duplicate_groups"] == 1
+
+    def test_modified_and_removed_files_update_groups(self, app_ctx, tmp_path):
+        from db.repositories.cleanup import CleanupRepository
+
+        a = _write(tmp_path, "a.srt", "Hello")
+        b = _write(tmp_path, "b.srt", "Hello")
+        c = _write(tmp_path, "c.srt", "Other")
+        scan_for_duplicates(str(tmp_path))
+
+        _write(tmp_path, "c.srt", "Hello")
+        os.utime(c, (1_000_000, 1_000_000))
+        os.remove(b)
+        with patch.object(
+            dedup_engine, "compute_subtitle_hash", wraps=dedup_engine.compute_subtitle_hash
+        ) as compute:
+            result = scan_for_duplicates(str(tmp_path))
+
+        compute.assert_called_once_with(c)
+        assert result["removed"] == 1
+        assert _group_paths(result) == [[a, c]]
+        assert CleanupRepository().get_hash_by_path(b) is None
+
+    def test_crlf_copy_is_still_a_duplicate(self, app_ctx, tmp_path):
+        a = _write(tmp_path, "a.srt", "Hello")
+        crlf = tmp_path / "b.srt"
+        crlf.write_bytes(SRT.format("Hello").replace("\n", "\r\n").encode())
+
+        result = scan_for_duplicates(str(tmp_path))
+
+        assert _group_paths(result) == [[a, str(crlf)]]
+
+
+def test_duplicate_groups_filtered_by_hash(app_ctx):
+    from db.repositories.cleanup import CleanupRepository
+
+    repo = CleanupRepository()
+    repo.upsert_hashes(
+        [
+            {"file_path": f"/m/{name}.srt", "content_hash": h, "file_size": 10, "format": "srt"}
+            for name, h in [("a", "h1"), ("b", "h1"), ("c", "h2"), ("d", "h2"), ("e", "h3")]
+        ]
+    )
+
+    assert [g["hash"] for g in repo.get_duplicate_groups(["h2", "h3"])] == ["h2"]
+    assert sorted(g["hash"] for g in repo.get_duplicate_groups()) == ["h1", "h2"]
+    assert repo.get_duplicate_groups(["h1"])[0]["files"][1]["path"] == "/m/b.srt"
+
+
+def test_delete_hashes_by_paths_chunks_large_batches(app_ctx, monkeypatch):
+    from db.repositories import cleanup
+    from db.repositories.cleanup import CleanupRepository
+
+    monkeypatch.setattr(cleanup, "_IN_CHUNK", 2)
+    repo = CleanupRepository()
+    repo.upsert_hashes(
+        [
+            {"file_path": f"/m/{i}.srt", "content_hash": f"h{i}", "file_size": 10, "format": "srt"}
+            for i in range(5)
+        ]
+    )
+
+    assert repo.delete_hashes_by_paths([f"/m/{i}.srt" for i in range(4)] + ["/m/gone.srt"]) == 4
+    assert repo.get_hash_stats()["total_files"] == 1
+
+
+LINES = [
+    "Where were you last night?",
+    "I told you, I was at the station until midnight.",
+    "Nobody at the station remembers seeing you.",
+    "Then they were not paying attention.",
+    "We found your car parked outside the harbour.",
+    "Lots of people park down by the harbour.",
+    "At three in the morning, with the engine still warm?",
+    "I want to talk to my lawyer now.",
+]
+
+
+def _srt(lines, offset=0.0):
+    blocks = []
+    for i, line in enumerate(lines):
+        start = offset + i * 3
+        stamp = [
+            f"00:{int(t // 60):02d}:{int(t % 60):02d},{int(t % 1 * 1000):03d}"
+            for t in (start, start + 2)
+        ]
+        blocks.append(f"{i + 1}\n{stamp[0]} --> {stamp[1]}\n{line}\n")
+    return "\n".join(blocks)
+
+
+def _ass(lines):
+    events = "\n".join(
+        f"Dialogue: 0,0:00:{i * 3:02d}.00,0:00:{i * 3 + 2:02d}.00,Main,,0,0,0,,{{\\i1}}{line}"
+        for i, line in enumerate(lines)
+    )
+    return (
+        "[Script Info]\nScriptType: v4.00+\n\n[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize\nStyle: Main,Arial,48\n\n[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        f"{events}\n"
+    )
+
+
+def _distance(a, b):
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class TestDialogSimhash:
+    def test_timing_and_styling_are_ignored(self):
+        base = compute_dialog_simhash(_srt(LINES))
+
+        assert compute_dialog_simhash(_srt(LINES, offset=1.5)) == base
+        assert compute_dialog_simhash(_ass(LINES)) == base
+
+    def test_small_edit_stays_close_and_other_text_is_far(self):
+        base = compute_dialog_simhash(_srt(LINES))
+        edited = compute_dialog_simhash(_srt([*LINES[:-1], "I want to talk to my lawyer."]))
+        other = compute_dialog_simhash(_srt([line[::-1] for line in LINES]))
+
+        assert _distance(base, edited) < _distance(base, other)
+        assert _distance(base, other) > 16
+
+    def test_no_dialog_has_no_signature(self):
+        assert compute_dialog_simhash("") is None
+        assert compute_dialog_simhash("not a subtitle") is None
+
+
+class TestNearDuplicates:
+    def test_retimed_and_restyled_copies_cluster(self, app_ctx, tmp_path):
+        (tmp_path / "a.en.srt").write_text(_srt(LINES))
+        (tmp_path / "b.en.srt").write_text(_srt(LINES, offset=0.5))
+        (tmp_path / "b.en.ass").write_text(_ass(LINES))
+        (tmp_path / "c.en.srt").write_text(_srt(LINES[:4]))
+        scan_for_duplicates(str(tmp_path))
+
+        groups = find_near_duplicate_groups()
+
+        assert len(groups) == 1
+        assert groups[0]["count"] == 3
+        assert [f["path"] for f in groups[0]["files"]] == [
+            str(tmp_path / "a.en.srt"),
+            str(tmp_path / "b.en.ass"),
+            str(tmp_path / "b.en.srt"),
+        ]
+        assert groups[0]["similarity"] == 1.0
+
+    def test_exact_copies_only_are_not_reported(self, app_ctx, tmp_path):
+        (tmp_path / "a.srt").write_text(_srt(LINES))
+        (tmp_path / "b.srt").write_text(_srt(LINES))
+        scan_for_duplicates(str(tmp_path))
+
+        assert find_near_duplicate_groups() == []
+
+    def test_clusters_cached_until_hashes_change(self, app_ctx, tmp_path):
+        (tmp_path / "a.srt").write_text(_srt(LINES))
+        (tmp_path / "b.srt").write_text(_srt(LINES, offset=2))
+        scan_for_duplicates(str(tmp_path))
+
+        with patch.object(
+            dedup_engine, "_cluster_near_duplicates", wraps=dedup_engine._cluster_near_duplicates
+        ) as cluster:
+            first = find_near_duplicate_groups()
+            assert find_near_duplicate_groups() is first
+            assert cluster.call_count == 1
+
+            (tmp_path / "c.srt").write_text(_srt(LINES, offset=4))
+            scan_for_duplicates(str(tmp_path))
+            assert find_near_duplicate_groups()[0]["count"] == 3
+            assert cluster.call_count == 2
+
+    def test_threshold_links_by_hamming_distance(self, app_ctx):
+        from db.repositories.cleanup import CleanupRepository
+
+        signatures = {"a": "0" * 16, "b": "0" * 15 + "7", "c": "0" * 14 + "ff", "d": "f" * 16}
+        CleanupRepository().upsert_hashes(
+            [
+                {
+                    "file_path": f"/m/{name}.srt",
+                    "content_hash": name,
+                    "file_size": 10,
+                    "format": "srt",
+                    "dialog_simhash": sig,
+                }
+                for name, sig in signatures.items()
+            ]
+        )
+
+        # b is 3 bits from a, c is 8 bits from a and 5 from b
+        strict = find_near_duplicate_groups(0.95)
+        loose = find_near_duplicate_groups(0.9)
+
+        assert [[f["path"] for f in g["files"]] for g in strict] == [["/m/a.srt", "/m/b.srt"]]
+        assert strict[0]["similarity"] == round(1 - 3 / 64, 3)
+        assert [f["path"] for f in loose[0]["files"]] == ["/m/a.srt", "/m/b.srt", "/m/c.srt"]
+
+
+def test_duplicates_endpoint_near_mode(client, tmp_path):
+    (tmp_path / "a.srt").write_text(_srt(LINES))
+    (tmp_path / "b.srt").write_text(_srt(LINES, offset=2))
+    with client.application.app_context():
+        scan_for_duplicates(str(tmp_path))
+
+    exact = client.get("/api/v1/cleanup/duplicates").get_json()
+    near = client.get("/api/v1/cleanup/duplicates?mode=near&threshold=0.9").get_json()
+
+    assert exact["total"] == 0
+    assert near["mode"] == "near" and near["total"] == 1
+    assert client.get("/api/v1/cleanup/duplicates?mode=near&threshold=2").status_code == 400
+    assert client.get("/api/v1/cleanup/duplicates?mode=fuzzy").status_code == 400
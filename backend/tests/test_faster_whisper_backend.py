@@ -0,0 +1,108 @@
+"""Tests for the faster-whisper backend (whisper/faster_whisper_backend.py)."""
+
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from whisper.faster_whisper_backend import FasterWhisperBackend
+
+
+class FakeModel:
+    """Stands in for faster_whisper.WhisperModel; records the audio it gets."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def transcribe(self, audio, **kwargs):
+        self.inputs.append(audio)
+        segments = [SimpleNamespace(start=0.5, end=1.25, text=" Hello ")]
+        info = SimpleNamespace(duration=2.0, language="ja", language_probability=0.9)
+        return iter(segments), info
+
+
+def _backend(monkeypatch):
+    backend = FasterWhisperBackend()
+    model = FakeModel()
+    monkeypatch.setattr(backend, "_get_or_load_model", lambda: model)
+    return backend, model
+
+
+def test_cached_wav_passed_as_float_array(tmp_path, monkeypatch):
+    path = str(tmp_path / "track.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.full(32000, 16384, dtype="<i2").tobytes())
+    backend, model = _backend(monkeypatch)
+
+    result = backend.transcribe(path, "ja")
+
+    assert result.success
+    assert result.srt_content.startswith("1\n00:00:00,500 --> 00:00:01,250\nHello")
+    (audio,) = model.inputs
+    assert isinstance(audio, np.ndarray) and audio.dtype == np.float32
+    assert audio.shape == (32000,) and audio[0] == 0.5
+
+
+def test_other_inputs_left_to_faster_whisper(tmp_path, monkeypatch):
+    path = str(tmp_path / "track.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes(b"\x00\x00" * 8)
+    backend, model = _backend(monkeypatch)
+
+    backend.transcribe(path)
+    backend.transcribe("/media/track.flac")
+
+    assert model.inputs == [path, "/media/track.flac"]
+
+
+class ChunkModel:
+    """Fake model returning one segment per call at 1-2 s into the slice."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, language=None, **kwargs):
+        self.calls.append((audio.size / 16000, language))
+        segments = iter([SimpleNamespace(start=1.0, end=2.0, text=f"line {len(self.calls)}")])
+        return segments, SimpleNamespace(duration=0, language="ja", language_probability=0.8)
+
+
+def test_segmented_mode_transcribes_only_speech_chunks(tmp_path, monkeypatch):
+    rate = 16000
+    t = np.arange(120 * rate) / rate
+    signal = np.random.default_rng(1).normal(0, 20, t.size)
+    for start, end in [(5, 20), (50, 95), (110, 112)]:
+        mask = (t >= start) & (t < end)
+        signal[mask] += 8000 * np.sin(2 * np.pi * 800 * t[mask])
+    path = str(tmp_path / "track.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(signal.astype("<i2").tobytes())
+
+    backend = FasterWhisperBackend(device="cpu", parallel_workers="3")
+    model = ChunkModel()
+    monkeypatch.setattr(backend, "_get_or_load_model", lambda: model)
+    progress = []
+
+    result = backend.transcribe(path, "", progress_callback=progress.append)
+
+    assert result.success and result.detected_language == "ja"
+    assert result.duration_seconds == pytest.approx(120)
+    # Language detected on the first chunk, then pinned
+    assert model.calls[0][1] is None
+    assert {language for _, language in model.calls[1:]} == {"ja"}
+    # Silence is never sent to the model
+    assert sum(seconds for seconds, _ in model.calls) < 80
+    assert result.segment_count == len(model.calls) == 4
+    starts = [line.split(" --> ")[0] for line in result.srt_content.split("\n") if "-->" in line]
+    assert starts == sorted(starts) and starts[0].startswith("00:00:04")
+    assert progress[-1] == 1.0
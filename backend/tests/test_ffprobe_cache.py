@@ -0,0 +1,100 @@
+"""Tests for the in-process LRU and bulk prefetch in front of ffprobe_cache."""
+
+import os
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from db.repositories.cache import ProbeLRU, probe_lru
+
+
+@pytest.fixture(autouse=True)
+def _clear_lru():
+    probe_lru.invalidate()
+    yield
+    probe_lru.invalidate()
+
+
+def _media(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"\x00")
+    return str(path)
+
+
+def _count_selects(app):
+    from extensions import db
+
+    counter = {"selects": 0}
+
+    def _before(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            counter["selects"] += 1
+
+    event.listen(db.engine, "before_cursor_execute", _before)
+    return counter, lambda: event.remove(db.engine, "before_cursor_execute", _before)
+
+
+class TestProbeLRU:
+    def test_evicts_least_recently_used(self):
+        lru = ProbeLRU(maxsize=2)
+        lru.put("/a.mkv", 1.0, {"streams": []})
+        lru.put("/b.mkv", 1.0, {"streams": []})
+        assert lru.get("/a.mkv", 1.0) is not None  # /a becomes most recent
+        lru.put("/c.mkv", 1.0, {"streams": []})
+
+        assert lru.get("/b.mkv", 1.0) is None
+        assert lru.get("/a.mkv", 1.0) is not None
+
+    def test_mtime_mismatch_misses_and_results_are_copies(self):
+        lru = ProbeLRU()
+        lru.put("/a.mkv", 1.0, {"streams": [{"index": 0}]})
+        assert lru.get("/a.mkv", 2.0) is None
+
+        result = lru.get("/a.mkv", 1.0)
+        result["streams"].append({"index": 1})
+        assert lru.get("/a.mkv", 1.0) == {"streams": [{"index": 0}]}
+
+
+class TestFfprobeCacheRepository:
+    def test_hit_served_without_db_or_app_context(self, app_ctx, tmp_path):
+        from db.cache import get_ffprobe_cache, set_ffprobe_cache
+
+        path = _media(tmp_path, "e01.mkv")
+        mtime = os.path.getmtime(path)
+        set_ffprobe_cache(path, mtime, {"streams": [{"index": 0}]})
+
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(get_ffprobe_cache(path, mtime)))
+        worker.start()
+        worker.join()
+        assert seen == [{"streams": [{"index": 0}]}]
+
+    def test_prefetch_loads_batch_in_one_query(self, app_ctx, tmp_path):
+        from db.cache import get_ffprobe_cache, prefetch_ffprobe_cache, set_ffprobe_cache
+
+        paths = [_media(tmp_path, f"e{i:02d}.mkv") for i in range(1, 6)]
+        for path in paths[:4]:
+            set_ffprobe_cache(path, os.path.getmtime(path), {"streams": [], "path": path})
+        set_ffprobe_cache(paths[3], 1.0, {"streams": []})  # stale mtime
+        probe_lru.invalidate()
+
+        counter, remove = _count_selects(app_ctx)
+        try:
+            assert prefetch_ffprobe_cache(paths) == 3
+            assert counter["selects"] == 1
+            for path in paths[:3]:
+                assert get_ffprobe_cache(path, os.path.getmtime(path))["path"] == path
+            assert counter["selects"] == 1
+        finally:
+            remove()
+
+    def test_clear_invalidates_lru(self, app_ctx, tmp_path):
+        from db.cache import clear_ffprobe_cache, get_ffprobe_cache, set_ffprobe_cache
+
+        path = _media(tmp_path, "e01.mkv")
+        mtime = os.path.getmtime(path)
+        set_ffprobe_cache(path, mtime, {"streams": []})
+        clear_ffprobe_cache(path)
+
+        assert get_ffprobe_cache(path, mtime) is None
@@ -0,0 +1,98 @@
+"""Tests for media_fingerprint.py and fingerprint-keyed probe/chapter caches."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from db.repositories.cache import probe_lru
+from media_fingerprint import FINGERPRINT_CHUNK, compute_fingerprint, get_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def _clear_lru():
+    probe_lru.invalidate()
+    yield
+    probe_lru.invalidate()
+
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def _mkv_head(segment_uid: bytes) -> bytes:
+    ebml = b"\x1a\x45\xdf\xa3\x8b" + b"\x42\x82\x88matroska"
+    segment = b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff"  # unknown size
+    info = b"\x15\x49\xa9\x66\x93" + b"\x73\xa4\x90" + segment_uid
+    return ebml + segment + info
+
+
+class TestComputeFingerprint:
+    def test_same_content_same_fingerprint(self, tmp_path):
+        data = os.urandom(3 * FINGERPRINT_CHUNK)
+        a = _write(tmp_path / "a.mkv", data)
+        b = _write(tmp_path / "renamed" / "b.mkv", data)
+
+        assert compute_fingerprint(a) == compute_fingerprint(b)
+        assert compute_fingerprint(a).startswith(f"{len(data):x}-")
+
+    def test_tail_change_changes_fingerprint(self, tmp_path):
+        data = bytearray(os.urandom(3 * FINGERPRINT_CHUNK))
+        a = _write(tmp_path / "a.mkv", bytes(data))
+        data[-1] ^= 0xFF
+        b = _write(tmp_path / "b.mkv", bytes(data))
+
+        assert compute_fingerprint(a) != compute_fingerprint(b)
+
+    def test_segment_uid_appended_for_matroska(self, tmp_path):
+        uid = bytes(range(16))
+        path = _write(tmp_path / "ep.mkv", _mkv_head(uid) + b"\x00" * 64)
+
+        assert compute_fingerprint(path).endswith("-" + uid.hex())
+
+    def test_missing_file(self, tmp_path):
+        assert compute_fingerprint(str(tmp_path / "nope.mkv")) is None
+
+
+class TestFingerprintCaches:
+    def test_alias_reused_while_unchanged(self, app_ctx, tmp_path):
+        path = _write(tmp_path / "e01.mkv", b"abc" * 1000)
+        first = get_fingerprint(path)
+
+        with patch("media_fingerprint.compute_fingerprint") as compute:
+            assert get_fingerprint(path) == first
+        compute.assert_not_called()
+
+    def test_renamed_file_reuses_probe_cache(self, app_ctx, tmp_path):
+        from ass_utils import get_media_streams
+
+        original = _write(tmp_path / "Show.S01E01.mkv", b"\x00" * 4096)
+        probe = {"streams": [{"index": 0, "codec_type": "subtitle"}]}
+        with patch("ass_utils._run_engine", return_value=probe):
+            get_media_streams(original)
+
+        renamed = str(tmp_path / "Show - S01E01 - Pilot.mkv")
+        os.rename(original, renamed)
+        with patch("ass_utils._run_engine") as engine:
+            assert get_media_streams(renamed) == probe
+        engine.assert_not_called()
+
+    def test_renamed_file_reuses_chapter_cache(self, app_ctx, tmp_path):
+        from chapters import get_chapters
+
+        original = _write(tmp_path / "movie.mkv", b"\x01" * 4096)
+        record = {
+            "streams": [],
+            "chapters": [{"id": 0, "start_time": "0.0", "end_time": "90.0", "tags": {}}],
+            "format": {"duration": "90.0"},
+        }
+        with patch("ass_utils._run_engine", return_value=record):
+            chapters = get_chapters(original)
+
+        renamed = str(tmp_path / "Movie (2024).mkv")
+        os.rename(original, renamed)
+        with patch("ass_utils._run_engine") as engine:
+            assert get_chapters(renamed) == chapters
+        engine.assert_not_called()
@@ -0,0 +1,149 @@
+"""Tests for media_scheduler.py — global media process budget."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from media_scheduler import (
+    DEMUX,
+    OCR,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PROBE,
+    MediaProcessScheduler,
+    parse_limits,
+    priority_scope,
+)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _acquire_in_thread(scheduler, slot_class, order, label, priority=None, scope=None):
+    def _worker():
+        if scope is None:
+            with scheduler.slot(slot_class, priority):
+                order.append(label)
+            return
+        with priority_scope(scope), scheduler.slot(slot_class):
+            order.append(label)
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    return thread
+
+
+class TestLimits:
+    def test_parse_limits_ignores_unknown_and_invalid(self):
+        assert parse_limits("probe=8, demux=1,bogus=3,ocr=x,transcode") == {
+            "probe": 8,
+            "demux": 1,
+        }
+
+    def test_per_class_limit(self):
+        scheduler = MediaProcessScheduler(budget=8, limits={DEMUX: 1})
+        order = []
+        scheduler.acquire(DEMUX)
+        waiter = _acquire_in_thread(scheduler, DEMUX, order, "second")
+        _wait_for(lambda: scheduler.stats()["classes"][DEMUX]["waiting"] == 1)
+
+        # Other classes still run while demux is saturated
+        with scheduler.slot(PROBE):
+            assert scheduler.stats()["running"] == 2
+        assert order == []
+
+        scheduler.release(DEMUX)
+        waiter.join(timeout=2)
+        assert order == ["second"]
+        assert scheduler.stats()["classes"][DEMUX]["max_waiting"] == 1
+
+    def test_global_budget_caps_all_classes(self):
+        scheduler = MediaProcessScheduler(budget=1)
+        order = []
+        scheduler.acquire(PROBE)
+        waiter = _acquire_in_thread(scheduler, OCR, order, "ocr")
+        _wait_for(lambda: scheduler.stats()["waiting"] == 1)
+        assert order == []
+
+        scheduler.release(PROBE)
+        waiter.join(timeout=2)
+        assert order == ["ocr"]
+
+
+class TestPriorities:
+    def test_interactive_waiters_run_before_background(self):
+        scheduler = MediaProcessScheduler(budget=1)
+        order = []
+        scheduler.acquire(PROBE)
+        background = _acquire_in_thread(
+            scheduler, PROBE, order, "background", scope=PRIORITY_BACKGROUND
+        )
+        _wait_for(lambda: scheduler.stats()["waiting"] == 1)
+        normal = _acquire_in_thread(scheduler, PROBE, order, "normal")
+        _wait_for(lambda: scheduler.stats()["waiting"] == 2)
+        interactive = _acquire_in_thread(
+            scheduler, PROBE, order, "interactive", priority=PRIORITY_INTERACTIVE
+        )
+        _wait_for(lambda: scheduler.stats()["waiting"] == 3)
+
+        scheduler.release(PROBE)
+        for thread in (background, normal, interactive):
+            thread.join(timeout=2)
+        assert order == ["interactive", "normal", "background"]
+
+
+class TestRunMedia:
+    def test_run_holds_slot_around_subprocess(self):
+        from media_scheduler import run_media
+
+        scheduler = MediaProcessScheduler(budget=2)
+        seen = []
+
+        def fake_run(cmd, **kwargs):
+            seen.append((cmd, kwargs, scheduler.stats()["classes"][PROBE]["running"]))
+
+        with (
+            patch("media_scheduler.get_media_scheduler", return_value=scheduler),
+            patch("media_scheduler.subprocess.run", side_effect=fake_run),
+        ):
+            run_media(PROBE, ["ffprobe", "x.mkv"], timeout=30)
+
+        assert seen == [(["ffprobe", "x.mkv"], {"timeout": 30}, 1)]
+        assert scheduler.stats()["classes"][PROBE]["running"] == 0
+
+    def test_ocr_image_holds_ocr_slot(self, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+
+        from services import ocr_extractor
+
+        scheduler = MediaProcessScheduler(budget=2)
+        running = []
+        image = SimpleNamespace(mode="L")
+        tesseract = SimpleNamespace(
+            image_to_string=lambda img, **kw: (
+                running.append(scheduler.stats()["classes"][OCR]["running"]) or " text "
+            )
+        )
+        monkeypatch.setattr(ocr_extractor, "TESSERACT_AVAILABLE", True)
+        monkeypatch.setattr(ocr_extractor, "pytesseract", tesseract, raising=False)
+        monkeypatch.setattr(
+            ocr_extractor, "Image", SimpleNamespace(open=lambda p: image), raising=False
+        )
+        frame = tmp_path / "frame.png"
+        frame.write_bytes(b"")
+
+        with patch("media_scheduler.get_media_scheduler", return_value=scheduler):
+            assert ocr_extractor.ocr_image(str(frame)) == "text"
+
+        assert running == [1]
+        assert scheduler.stats()["classes"][OCR]["running"] == 0
+
+    def test_unknown_class_rejected(self):
+        with pytest.raises(ValueError):
+            MediaProcessScheduler(budget=1).acquire("gpu")
@@ -0,0 +1,218 @@
+"""Tests for native_probe.py — container-header stream reader."""
+
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from native_probe import UnsupportedContainerError, run_native_probe
+
+# ── Minimal container writers ─────────────────────────────────────────────────
+
+
+def _ebml(elem_id: int, payload: bytes) -> bytes:
+    id_bytes = elem_id.to_bytes((elem_id.bit_length() + 7) // 8, "big")
+    return id_bytes + _vsize(len(payload)) + payload
+
+
+def _vsize(n: int) -> bytes:
+    return (0x01 << 56 | n).to_bytes(8, "big")  # 8-byte size vint
+
+
+def _uint(elem_id: int, value: int) -> bytes:
+    return _ebml(elem_id, value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big"))
+
+
+def _str(elem_id: int, value: str) -> bytes:
+    return _ebml(elem_id, value.encode())
+
+
+def _track(number, track_type, codec, language=None, name=None, forced=0, default=1, bcp47=None):
+    body = _uint(0xD7, number) + _uint(0x83, track_type) + _str(0x86, codec)
+    if language:
+        body += _str(0x22B59C, language)
+    if bcp47:
+        body += _str(0x22B59D, bcp47)
+    if name:
+        body += _str(0x536E, name)
+    body += _uint(0x88, default) + _uint(0x55AA, forced)
+    return _ebml(0xAE, body)
+
+
+def _chapter(uid, start_ns, title):
+    display = _ebml(0x80, _str(0x85, title))
+    return _ebml(0xB6, _uint(0x73C4, uid) + _uint(0x91, start_ns) + display)
+
+
+def _mkv(cluster_first=False) -> bytes:
+    header = _ebml(0x1A45DFA3, _str(0x4282, "matroska"))
+    info = _ebml(
+        0x1549A966, _uint(0x2AD7B1, 1_000_000) + _ebml(0x4489, struct.pack(">d", 1420064.0))
+    )
+    tracks = _ebml(
+        0x1654AE6B,
+        _track(1, 1, "V_MPEGH/ISO/HEVC")
+        + _track(2, 2, "A_AAC/MPEG4/LC", language="jpn")
+        + _track(3, 17, "S_TEXT/ASS", language="eng", name="Full Subs")
+        + _track(
+            4, 17, "S_TEXT/UTF8", language="ger", name="Signs", forced=1, default=0, bcp47="de-CH"
+        ),
+    )
+    chapters = _ebml(
+        0x1043A770,
+        _ebml(0x45B9, _chapter(11, 0, "Intro") + _chapter(12, 90_000_000_000, "Part A")),
+    )
+    cluster = _ebml(0x1F43B675, b"\x00" * 32)
+    if not cluster_first:
+        return header + _ebml(0x18538067, info + tracks + chapters + cluster)
+
+    # Tracks/Chapters after the first Cluster: only reachable through the SeekHead
+    def seek(target, position):
+        position_bytes = position.to_bytes(4, "big")  # fixed width keeps offsets stable
+        return _ebml(0x4DBB, _uint(0x53AB, target) + _ebml(0x53AC, position_bytes))
+
+    seek_len = len(_ebml(0x114D9B74, seek(0x1654AE6B, 0) + seek(0x1043A770, 0)))
+    tracks_pos = seek_len + len(info) + len(cluster)
+    chapters_pos = tracks_pos + len(tracks)
+    seek_head = _ebml(0x114D9B74, seek(0x1654AE6B, tracks_pos) + seek(0x1043A770, chapters_pos))
+    return header + _ebml(0x18538067, seek_head + info + cluster + tracks + chapters)
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _mp4_trak(handler: bytes, fourcc: bytes, lang: str, sample_body: bytes) -> bytes:
+    packed = 0
+    for ch in lang:
+        packed = (packed << 5) | (ord(ch) - 0x60)
+    tkhd = _box(b"tkhd", b"\x00\x00\x00\x01" + b"\x00" * 80)
+    mdhd = _box(b"mdhd", b"\x00" * 4 + b"\x00" * 16 + struct.pack(">HH", packed, 0))
+    hdlr = _box(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 12 + b"Handler\x00")
+    entry = _box(fourcc, sample_body)
+    stsd = _box(b"stsd", b"\x00" * 4 + struct.pack(">I", 1) + entry)
+    stbl = _box(b"stbl", stsd + _box(b"stsz", b"\x00" * 64))
+    return _box(b"trak", tkhd + _box(b"mdia", mdhd + hdlr + _box(b"minf", stbl)))
+
+
+def _mp4() -> bytes:
+    video = b"\x00" * 24 + struct.pack(">HH", 1920, 1080) + b"\x00" * 50
+    audio = b"\x00" * 16 + struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16)
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 1420064) + b"\x00" * 80)
+    chpl = _box(
+        b"chpl",
+        b"\x01\x00\x00\x00"
+        + b"\x00" * 4
+        + b"\x02"
+        + struct.pack(">QB", 0, 5)
+        + b"Intro"
+        + struct.pack(">QB", 900_000_000, 6)
+        + b"Part A",
+    )
+    moov = _box(
+        b"moov",
+        mvhd
+        + _mp4_trak(b"vide", b"avc1", "und", video)
+        + _mp4_trak(b"soun", b"mp4a", "jpn", audio)
+        + _mp4_trak(b"sbtl", b"tx3g", "eng", b"\x00" * 16)
+        + _box(b"udta", chpl),
+    )
+    return _box(b"ftyp", b"isom\x00\x00\x02\x00") + _box(b"mdat", b"\x00" * 128) + moov
+
+
+# ── Matroska ──────────────────────────────────────────────────────────────────
+
+
+class TestMatroska:
+    @pytest.mark.parametrize("cluster_first", [False, True])
+    def test_streams_match_ffprobe_shape(self, tmp_path, cluster_first):
+        path = tmp_path / "ep.mkv"
+        path.write_bytes(_mkv(cluster_first=cluster_first))
+
+        streams = run_native_probe(str(path))["streams"]
+
+        assert [s["codec_type"] for s in streams] == ["video", "audio", "subtitle", "subtitle"]
+        assert [s["index"] for s in streams] == [0, 1, 2, 3]
+        assert [s["codec_name"] for s in streams] == ["hevc", "aac", "ass", "subrip"]
+        assert streams[0]["tags"]["language"] == "eng"  # Matroska default language
+        assert streams[2]["tags"] == {"language": "eng", "title": "Full Subs"}
+        assert streams[3]["tags"]["language"] == "de-CH"  # LanguageBCP47 wins over Language
+        assert streams[3]["disposition"]["forced"] == 1
+        assert streams[3]["disposition"]["default"] == 0
+
+    def test_chapters_and_duration(self, tmp_path):
+        path = tmp_path / "ep.mkv"
+        path.write_bytes(_mkv())
+
+        result = run_native_probe(str(path))
+
+        assert result["format"]["duration"] == "1420.064000"
+        assert result["chapters"] == [
+            {
+                "id": 11,
+                "start_time": "0.000000",
+                "end_time": "90.000000",
+                "tags": {"title": "Intro"},
+            },
+            {
+                "id": 12,
+                "start_time": "90.000000",
+                "end_time": "1420.064000",
+                "tags": {"title": "Part A"},
+            },
+        ]
+
+
+# ── MP4 ───────────────────────────────────────────────────────────────────────
+
+
+class TestMp4:
+    def test_streams_and_chapters(self, tmp_path):
+        path = tmp_path / "movie.mp4"
+        path.write_bytes(_mp4())
+
+        result = run_native_probe(str(path))
+        streams = result["streams"]
+
+        assert [(s["codec_type"], s["codec_name"]) for s in streams] == [
+            ("video", "h264"),
+            ("audio", "aac"),
+            ("subtitle", "mov_text"),
+        ]
+        assert (streams[0]["width"], streams[0]["height"]) == (1920, 1080)
+        assert streams[1]["channels"] == 2
+        assert streams[1]["sample_rate"] == "48000"
+        assert streams[1]["tags"]["language"] == "jpn"
+        assert result["format"]["duration"] == "1420.064000"
+        assert [c["tags"]["title"] for c in result["chapters"]] == ["Intro", "Part A"]
+        assert result["chapters"][0]["end_time"] == "90.000000"
+
+
+# ── Engine dispatch ───────────────────────────────────────────────────────────
+
+
+class TestNativeEngine:
+    def test_unsupported_container_raises(self, tmp_path):
+        path = tmp_path / "clip.avi"
+        path.write_bytes(b"RIFF\x00\x00\x00\x00AVI LIST")
+        with pytest.raises(UnsupportedContainerError):
+            run_native_probe(str(path))
+
+    def test_engine_falls_back_to_ffprobe(self, tmp_path):
+        from ass_utils import _run_engine
+
+        path = tmp_path / "clip.avi"
+        path.write_bytes(b"RIFF\x00\x00\x00\x00AVI LIST")
+        with patch("ass_utils.run_ffprobe", return_value={"streams": []}) as ffprobe:
+            assert _run_engine(str(path), "native") == {"streams": []}
+        ffprobe.assert_called_once_with(str(path), use_cache=False)
+
+    def test_engine_uses_native_without_subprocess(self, tmp_path):
+        from ass_utils import _run_engine
+
+        path = tmp_path / "ep.mkv"
+        path.write_bytes(_mkv())
+        with patch("ass_utils.subprocess.run") as run:
+            result = _run_engine(str(path), "native")
+        run.assert_not_called()
+        assert len(result["streams"]) == 4
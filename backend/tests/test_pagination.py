@@ -0,0 +1,179 @@
+"""Tests for keyset pagination and cached counts on wanted/history/blacklist lists."""
+
+import pytest
+
+
+def _add_wanted(n, prefix="/media/ep"):
+    from db.wanted import upsert_wanted_item
+
+    return [
+        upsert_wanted_item(
+            item_type="episode", file_path=f"{prefix}{i:03d}.mkv", target_language="de"
+        )[0]
+        for i in range(n)
+    ]
+
+
+class TestWantedKeyset:
+    def test_cursor_pages_cover_all_rows_once(self, app_ctx):
+        from db.wanted import get_wanted_items
+
+        ids = _add_wanted(7)
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            page = get_wanted_items(per_page=3, sort_by="title", sort_dir="asc", cursor=cursor)
+            seen.extend(item["id"] for item in page["data"])
+            cursor = page["next_cursor"]
+        assert sorted(seen) == sorted(ids)
+        assert len(seen) == len(set(seen))
+
+    def test_cursor_matches_offset_order(self, app_ctx):
+        from db.wanted import get_wanted_items
+
+        _add_wanted(5)
+        first = get_wanted_items(page=1, per_page=2)
+        second_offset = get_wanted_items(page=2, per_page=2)
+        second_keyset = get_wanted_items(per_page=2, cursor=first["next_cursor"])
+        assert [i["id"] for i in second_keyset["data"]] == [i["id"] for i in second_offset["data"]]
+        assert second_keyset["total"] == 5
+
+    def test_nullable_sort_column(self, app_ctx):
+        from db.wanted import get_wanted_items
+
+        ids = _add_wanted(4)
+        first = get_wanted_items(per_page=2, sort_by="last_search_at", cursor="")
+        rest = get_wanted_items(per_page=2, sort_by="last_search_at", cursor=first["next_cursor"])
+        got = [i["id"] for i in first["data"] + rest["data"]]
+        assert sorted(got) == sorted(ids)
+        assert rest["next_cursor"] is None
+
+    def test_invalid_cursor_rejected(self, app_ctx):
+        from db.wanted import get_wanted_items
+
+        with pytest.raises(ValueError):
+            get_wanted_items(cursor="not-a-cursor!!")
+
+    def test_route_returns_400_for_bad_cursor(self, client):
+        resp = client.get("/api/v1/wanted?cursor=%%%")
+        assert resp.status_code == 400
+
+    def test_non_scalar_sort_value_rejected(self, client):
+        import base64
+        import json
+
+        cursor = base64.urlsafe_b64encode(json.dumps([{"a": 1}, 5]).encode()).decode()
+        resp = client.get(f"/api/v1/wanted?cursor={cursor}")
+        assert resp.status_code == 400
+
+
+class TestCachedCounts:
+    def test_count_invalidated_on_insert_and_delete(self, app_ctx):
+        from db.wanted import delete_wanted_item, get_wanted_items
+
+        ids = _add_wanted(3)
+        assert get_wanted_items(status="wanted")["total"] == 3
+        _add_wanted(1, prefix="/media/extra")
+        assert get_wanted_items(status="wanted")["total"] == 4
+        delete_wanted_item(ids[0])
+        assert get_wanted_items(status="wanted")["total"] == 3
+
+    def test_count_invalidated_when_series_changes(self, app_ctx):
+        from db.wanted import get_wanted_items, upsert_wanted_item
+
+        upsert_wanted_item("episode", "/media/ep.mkv", target_language="de", sonarr_series_id=1)
+        assert get_wanted_items(series_id=1)["total"] == 1
+        upsert_wanted_item("episode", "/media/ep.mkv", target_language="de", sonarr_series_id=2)
+        assert get_wanted_items(series_id=1)["total"] == 0
+        assert get_wanted_items(series_id=2)["total"] == 1
+
+    def test_summary_updated_on_status_transition(self, app_ctx):
+        from db.wanted import get_wanted_summary, update_wanted_status
+
+        ids = _add_wanted(3)
+        before = get_wanted_summary()
+        assert before["by_status"] == {"wanted": 3}
+
+        update_wanted_status(ids[0], "ignored")
+        after = get_wanted_summary()
+        assert after["by_status"] == {"wanted": 2, "ignored": 1}
+        assert after["total"] == 3
+
+    def test_summary_matches_full_aggregation(self, app_ctx):
+        from db.repositories.wanted import WantedRepository
+        from db.wanted import (
+            delete_wanted_items_by_ids,
+            get_wanted_summary,
+            update_existing_sub,
+            update_wanted_status,
+        )
+
+        ids = _add_wanted(5)
+        get_wanted_summary()
+        update_wanted_status(ids[1], "found")
+        update_existing_sub(ids[2], "srt")
+        delete_wanted_items_by_ids([ids[3]])
+        _add_wanted(2, prefix="/media/new")
+
+        assert get_wanted_summary() == WantedRepository()._compute_wanted_summary()
+
+    def test_upgrade_requeue_and_standalone_delete_keep_summary_in_sync(self, app_ctx):
+        from db.repositories.wanted import WantedRepository
+        from db.wanted import (
+            delete_wanted_for_standalone,
+            get_wanted_items,
+            get_wanted_summary,
+            update_wanted_status,
+            upsert_wanted_item,
+        )
+
+        ids = _add_wanted(2)
+        standalone_id = upsert_wanted_item(
+            item_type="episode",
+            file_path="/media/standalone.mkv",
+            target_language="de",
+            standalone_series_id=7,
+        )[0]
+        update_wanted_status(ids[0], "found")
+        assert get_wanted_items(status="wanted")["total"] == 2
+        get_wanted_summary()
+
+        WantedRepository().mark_upgrade_candidate(ids[0], current_score=120)
+        assert get_wanted_summary()["upgradeable"] == 1
+        assert get_wanted_items(status="wanted")["total"] == 3
+
+        assert delete_wanted_for_standalone(series_id=7) == 1
+        assert standalone_id not in [i["id"] for i in get_wanted_items()["data"]]
+        assert get_wanted_summary() == WantedRepository()._compute_wanted_summary()
+        assert get_wanted_summary()["total"] == 2
+
+
+class TestBlacklistAndHistoryKeyset:
+    def test_blacklist_cursor_pages(self, app_ctx):
+        from db.blacklist import add_blacklist_entry, get_blacklist_entries
+
+        for i in range(5):
+            add_blacklist_entry("prov", f"sub{i}")
+        first = get_blacklist_entries(per_page=2, cursor="")
+        assert first["total"] == 5
+        ids = [e["id"] for e in first["data"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = get_blacklist_entries(per_page=2, cursor=cursor)
+            ids.extend(e["id"] for e in page["data"])
+            cursor = page["next_cursor"]
+        assert len(ids) == 5 == len(set(ids))
+
+    def test_history_cursor_and_count(self, app_ctx):
+        from db.library import get_download_history
+        from db.providers import record_subtitle_download
+
+        for i in range(3):
+            record_subtitle_download("prov", f"s{i}", "de", "ass", f"/media/{i}.ass", 100 + i)
+        first = get_download_history(per_page=2, sort_by="score", cursor="")
+        assert first["total"] == 3
+        second = get_download_history(per_page=2, sort_by="score", cursor=first["next_cursor"])
+        assert [e["score"] for e in first["data"] + second["data"]] == [102, 101, 100]
+
+        record_subtitle_download("prov", "s9", "de", "ass", "/media/9.ass", 50)
+        assert get_download_history(per_page=2)["total"] == 4
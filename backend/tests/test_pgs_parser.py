@@ -0,0 +1,145 @@
+"""Tests for the native PGS parser and the bitmap-dedup OCR pipeline."""
+
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services import ocr_extractor
+from services.pgs_parser import END, ODS, PCS, PDS, WDS, decode_rle, parse_pgs
+
+
+def _segment(pts: float, seg_type: int, payload: bytes) -> bytes:
+    ticks = int(round(pts * 90000))
+    return struct.pack(">2sIIBH", b"PG", ticks, ticks, seg_type, len(payload)) + payload
+
+
+def _rle(bitmap: np.ndarray) -> bytes:
+    """Encode palette indices with the long forms, so every code path is hit."""
+    out = bytearray()
+    for row in bitmap:
+        x = 0
+        while x < len(row):
+            color = int(row[x])
+            run = 1
+            while x + run < len(row) and row[x + run] == color:
+                run += 1
+            if color and run == 1:
+                out.append(color)
+            elif color:
+                out += bytes((0, 0xC0 | (run >> 8), run & 0xFF, color))
+            else:
+                out += bytes((0, 0x40 | (run >> 8), run & 0xFF))
+            x += run
+        out += b"\x00\x00"
+    return bytes(out)
+
+
+def _display_set(start: float, bitmap: np.ndarray, x: int = 100, y: int = 800) -> bytes:
+    height, width = bitmap.shape
+    rle = _rle(bitmap)
+    pcs = struct.pack(">HHBHBBBB", 1920, 1080, 0x10, 1, 0x80, 0, 0, 1)
+    pcs += struct.pack(">HBBHH", 0, 0, 0, x, y)
+    pds = bytes((0, 0)) + bytes((1, 235, 128, 128, 255)) + bytes((2, 16, 128, 128, 255))
+    # Object split over two ODS fragments
+    half = len(rle) // 2
+    first = struct.pack(">HBB", 0, 0, 0x80) + (len(rle) + 4).to_bytes(3, "big")
+    first += struct.pack(">HH", width, height) + rle[:half]
+    last = struct.pack(">HBB", 0, 0, 0x40) + rle[half:]
+    return b"".join(
+        [
+            _segment(start, PCS, pcs),
+            _segment(start, WDS, b"\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00"),
+            _segment(start, PDS, pds),
+            _segment(start, ODS, first),
+            _segment(start, ODS, last),
+            _segment(start, END, b""),
+        ]
+    )
+
+
+def _clear(at: float) -> bytes:
+    pcs = struct.pack(">HHBHBBBB", 1920, 1080, 0x10, 2, 0x00, 0, 0, 0)
+    return _segment(at, PCS, pcs) + _segment(at, END, b"")
+
+
+def _bitmap(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    bitmap = np.zeros((12, 300), dtype=np.uint8)
+    bitmap[3:9] = rng.choice([0, 1, 1, 2], size=(6, 300))
+    return bitmap
+
+
+class TestParser:
+    def test_rle_roundtrip(self):
+        bitmap = _bitmap(1)
+
+        np.testing.assert_array_equal(decode_rle(_rle(bitmap), 300, 12), bitmap)
+
+    def test_display_sets_decoded_with_timing(self):
+        stream = _display_set(1.0, _bitmap(1)) + _clear(3.5) + _display_set(4.0, _bitmap(2))
+
+        images = parse_pgs(stream)
+
+        assert [(i.start, i.end) for i in images] == [(1.0, 3.5), (4.0, None)]
+        image = images[0].image
+        assert image.shape == (12, 300) and image.dtype == np.uint8
+        # Transparent background is white, bright text becomes dark
+        assert (image[:3] == 255).all()
+        assert image[_bitmap(1) == 1].max() == 20
+
+    def test_rejects_non_pgs_data(self):
+        with pytest.raises(ValueError):
+            parse_pgs(b"1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+
+
+class TestBatchOcr:
+    def test_identical_bitmaps_ocr_once_and_keep_timing(self, monkeypatch):
+        line_a, line_b = _bitmap(1), _bitmap(2)
+        stream = (
+            _display_set(1.0, line_a)
+            + _display_set(2.0, line_a)  # same line re-sent
+            + _clear(3.0)
+            + _display_set(5.0, line_b)
+            + _clear(6.0)
+            + _display_set(8.0, line_a)
+            + _clear(9.5)
+        )
+        texts = {
+            parse_pgs(_display_set(0, line_a))[0].image.tobytes(): "Hello",
+            parse_pgs(_display_set(0, line_b))[0].image.tobytes(): "World",
+        }
+        seen = []
+
+        def image_to_string(img, lang):
+            seen.append(img)
+            return texts[img.tobytes()]
+
+        monkeypatch.setattr(ocr_extractor, "TESSERACT_AVAILABLE", True)
+        monkeypatch.setattr(
+            ocr_extractor,
+            "pytesseract",
+            SimpleNamespace(image_to_string=image_to_string),
+            raising=False,
+        )
+        monkeypatch.setattr(
+            ocr_extractor, "Image", SimpleNamespace(fromarray=lambda a, mode: a), raising=False
+        )
+        monkeypatch.setattr(ocr_extractor, "_stream_codec", lambda path, index: "hdmv_pgs_subtitle")
+        monkeypatch.setattr(
+            ocr_extractor,
+            "run_media",
+            lambda slot, cmd, **kw: SimpleNamespace(returncode=0, stdout=stream, stderr=b""),
+        )
+
+        cues = ocr_extractor.batch_ocr_track("/media/ep.mkv", 3)
+
+        assert len(seen) == 2
+        assert cues == [
+            {"start": 1.0, "end": 3.0, "text": "Hello"},
+            {"start": 5.0, "end": 6.0, "text": "World"},
+            {"start": 8.0, "end": 9.5, "text": "Hello"},
+        ]
+        srt = ocr_extractor.cues_to_srt(cues)
+        assert "00:00:05,000 --> 00:00:06,000\nWorld" in srt
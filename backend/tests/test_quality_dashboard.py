@@ -6,6 +6,7 @@ with correct structure and normalization.
 
 import os
 import sys
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -84,49 +85,49 @@ class TestStatisticsQualityFields:
     """Verify that /statistics endpoint includes quality_trend and series_quality."""
 
     def _setup_mocks(self, mock_db_execute):
-        """Set up mock DB return values for all queries in get_statistics()."""
+        """Set up mock DB return values for the raw queries left in get_statistics().
 
-        call_count = [0]
+        Download aggregates come from the rollup getters (see _patch_rollups).
+        """
 
         def side_effect(query, *args, **kwargs):
-            q = str(query).strip()
             result = MagicMock()
-            call_count[0] += 1
-
-            if "daily_stats" in q:
-                result.fetchall.return_value = []
-            elif (
-                "provider_name, COUNT" in q
-                and "subtitle_downloads" in q
-                and "GROUP_CONCAT" not in q
-            ):
-                # downloads_by_provider
-                result.fetchall.return_value = []
-            elif "translation_backend_stats" in q or "upgrade_history" in q:
-                result.fetchall.return_value = []
-            elif "substr(downloaded_at" in q:
-                # quality_trend query
-                row = MagicMock()
-                row.__getitem__ = lambda self, k: ["2026-01-15", 630.0, 5, 0][k]
-                result.fetchall.return_value = [row]
-            elif "GROUP_CONCAT" in q:
-                # series_quality query
-                row = MagicMock()
-                row.__getitem__ = lambda self, k: [
-                    "Attack on Titan",
-                    720.0,
-                    10,
-                    "2026-01-14T12:00:00",
-                    "ass",
-                ][k]
-                result.fetchall.return_value = [row]
-            else:
-                result.fetchall.return_value = []
-
+            result.fetchall.return_value = []
             return result
 
         mock_db_execute.side_effect = side_effect
 
+    @contextmanager
+    def _patch_rollups(self):
+        """Patch the rollup-backed download aggregates read by get_statistics()."""
+        with (
+            patch("db.providers.get_downloads_by_provider", return_value=[]),
+            patch(
+                "db.providers.get_daily_download_quality",
+                return_value=[
+                    {
+                        "date": "2026-01-15",
+                        "avg_score": 630.0,
+                        "download_count": 5,
+                        "low_score_count": 0,
+                    }
+                ],
+            ),
+            patch(
+                "db.providers.get_series_download_quality",
+                return_value=[
+                    {
+                        "title": "Attack on Titan",
+                        "avg_score": 720.0,
+                        "download_count": 10,
+                        "last_download": "2026-01-14T12:00:00",
+                        "formats": ["ass"],
+                    }
+                ],
+            ),
+        ):
+            yield
+
     def test_quality_trend_in_response(self):
         app = _make_app()
 
@@ -134,6 +135,7 @@ class TestStatisticsQualityFields:
             app.test_request_context("/api/v1/statistics?range=30d"),
             patch("db.get_db") as mock_get_db,
             patch("db.providers.get_provider_stats", return_value={}),
+            self._patch_rollups(),
         ):
             mock_conn = MagicMock()
             mock_get_db.return_value = mock_conn
@@ -146,6 +148,8 @@ class TestStatisticsQualityFields:
 
         assert "quality_trend" in data
         assert isinstance(data["quality_trend"], list)
+        assert data["quality_trend"][0]["avg_score"] == 70.0
+        assert data["quality_trend"][0]["files_checked"] == 5
 
     def test_series_quality_in_response(self):
         app = _make_app()
@@ -154,6 +158,7 @@ class TestStatisticsQualityFields:
             app.test_request_context("/api/v1/statistics?range=30d"),
             patch("db.get_db") as mock_get_db,
             patch("db.providers.get_provider_stats", return_value={}),
+            self._patch_rollups(),
         ):
             mock_conn = MagicMock()
             mock_get_db.return_value = mock_conn
@@ -166,6 +171,8 @@ class TestStatisticsQualityFields:
 
         assert "series_quality" in data
         assert isinstance(data["series_quality"], list)
+        assert data["series_quality"][0]["avg_score_pct"] == 80.0
+        assert data["series_quality"][0]["formats"] == ["ass"]
 
     def test_quality_trend_structure(self):
         """Each quality_trend entry has the expected fields."""
@@ -80,3 +80,59 @@ def test_search_limit_respected(app, search_repo):
         assert len(result["series"]) <= 5
         assert len(result["episodes"]) <= 5
         assert len(result["subtitles"]) <= 5
+
+
+def test_wanted_writes_update_index_without_rebuild(app, search_repo):
+    """Inserts, updates and deletes on wanted_items reach the index via triggers."""
+    from db.repositories.wanted import WantedRepository
+
+    with app.app_context():
+        wanted = WantedRepository()
+        row_id, _ = wanted.upsert_wanted_item(
+            "episode",
+            "/tv/Frieren/S01E01.mkv",
+            title="Frieren",
+            season_episode="S01E01",
+            sonarr_series_id=42,
+        )
+        result = search_repo.search_all("Frieren")
+        assert [e["id"] for e in result["episodes"]] == [row_id]
+        assert result["series"] == [{"id": 42, "title": "Frieren"}]
+
+        wanted.upsert_wanted_item(
+            "episode",
+            "/tv/Frieren/S01E01.mkv",
+            title="Dungeon Meshi",
+            season_episode="S01E01",
+            sonarr_series_id=42,
+        )
+        assert search_repo.search_all("Frieren")["episodes"] == []
+        assert search_repo.search_all("Meshi")["series"] == [{"id": 42, "title": "Dungeon Meshi"}]
+
+        wanted.delete_wanted_item(row_id)
+        result = search_repo.search_all("Meshi")
+        assert result["episodes"] == []
+        assert result["series"] == []
+
+
+def test_subtitle_downloads_update_index_without_rebuild(app, search_repo):
+    """Recorded downloads are searchable immediately."""
+    from db.repositories.providers import ProviderRepository
+
+    with app.app_context():
+        ProviderRepository().record_subtitle_download(
+            "opensubtitles", "abc", "de", "srt", "/tv/Show/Show.S01E01.de.srt", 300
+        )
+        result = search_repo.search_all("Show.S01")
+        assert len(result["subtitles"]) == 1
+        assert result["subtitles"][0]["provider_name"] == "opensubtitles"
+
+
+def test_ensure_index_rebuilds_only_on_version_change(app, search_repo):
+    """ensure_index() is a no-op once the current version has been built."""
+    from db.repositories.search import SEARCH_INDEX_VERSION
+
+    with app.app_context():
+        search_repo.ensure_index()
+        assert search_repo.get_index_version() == SEARCH_INDEX_VERSION
+        assert search_repo.ensure_index() is False
@@ -0,0 +1,179 @@
+"""Tests for the native speech-profile sync engine (services/speech_sync.py)."""
+
+import contextlib
+import wave
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pysubs2
+import pytest
+
+import config
+import media_fingerprint
+from services import speech_sync
+from services.speech_sync import (
+    AlignmentError,
+    detect_speech,
+    find_offset,
+    frame_energies,
+    subtitle_activity,
+)
+
+RATE = 16000
+# (start_s, end_s) of speech in the synthetic track
+SPEECH = [(2.0, 4.5), (6.0, 7.0), (9.5, 13.0), (15.0, 15.8), (18.0, 21.5), (24.0, 26.0)]
+
+
+def _pcm(seconds: float = 30.0) -> bytes:
+    """Low noise with 1 kHz bursts where SPEECH says someone talks."""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * RATE)) / RATE
+    signal = rng.normal(0, 30, t.size)
+    for start, end in SPEECH:
+        mask = (t >= start) & (t < end)
+        signal[mask] += 8000 * np.sin(2 * np.pi * 1000 * t[mask])
+    return signal.astype("<i2").tobytes()
+
+
+def _subs(shift: float = 0.0) -> pysubs2.SSAFile:
+    subs = pysubs2.SSAFile()
+    for start, end in SPEECH:
+        subs.append(
+            pysubs2.SSAEvent(
+                start=int((start + shift) * 1000), end=int((end + shift) * 1000), text="Hi"
+            )
+        )
+    return subs
+
+
+class TestProfile:
+    def test_detect_speech_follows_bursts(self):
+        speech = detect_speech(frame_energies([_pcm()]))
+
+        assert speech.size == 3000
+        assert speech[300:400].all()  # 3.0-4.0 s
+        assert not speech[500:580].any()  # 5.0-5.8 s
+        assert 0.3 < speech.mean() < 0.6
+
+    def test_energies_independent_of_chunking(self):
+        pcm = _pcm(3)
+        chunked = frame_energies(pcm[i : i + 999] for i in range(0, len(pcm), 999))
+
+        np.testing.assert_allclose(chunked, frame_energies([pcm]))
+
+    def test_subtitle_activity_skips_comments_and_empty_lines(self):
+        subs = _subs()
+        subs.append(pysubs2.SSAEvent(start=27000, end=29000, text="", type="Dialogue"))
+        subs.append(pysubs2.SSAEvent(start=27000, end=29000, text="note", type="Comment"))
+
+        activity = subtitle_activity(subs, 3000)
+
+        assert activity.size == 3000
+        assert activity[200:450].all() and not activity[450:600].any()
+        assert not activity[2700:].any()
+
+
+class TestFindOffset:
+    @pytest.mark.parametrize("shift", [2.5, -1.2])
+    def test_recovers_known_shift(self, shift):
+        speech = detect_speech(frame_energies([_pcm()]))
+
+        offset_ms, confidence = find_offset(speech, subtitle_activity(_subs(shift), speech.size))
+
+        assert abs(offset_ms + shift * 1000) <= 100
+        assert confidence >= speech_sync.MIN_CONFIDENCE
+
+    def test_no_dialogue_raises(self):
+        with pytest.raises(AlignmentError):
+            find_offset(np.ones(100, dtype=bool), np.zeros(100, dtype=bool))
+
+
+@pytest.fixture()
+def audio(tmp_path, monkeypatch):
+    """Fake shared audio cache serving the synthetic track; counts decodes."""
+    calls = []
+    wav_path = tmp_path / "track.wav"
+    with wave.open(str(wav_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(_pcm())
+
+    @contextlib.contextmanager
+    def fake_cached_audio(path, track_index=0, **kwargs):
+        calls.append(track_index)
+        yield str(wav_path)
+
+    settings = SimpleNamespace(config_dir=str(tmp_path / "config"))
+    monkeypatch.setattr(speech_sync, "cached_audio", fake_cached_audio)
+    monkeypatch.setattr(config, "get_settings", lambda: settings)
+    monkeypatch.setattr(media_fingerprint, "get_fingerprint", lambda path: "fp-ep")
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"\x00")
+    return SimpleNamespace(path=str(video), calls=calls, tmp=tmp_path)
+
+
+class TestSyncWithSpeechProfile:
+    def test_profile_computed_once_and_persisted(self, audio):
+        first = speech_sync.get_speech_profile(audio.path)
+        second = speech_sync.get_speech_profile(audio.path)
+
+        np.testing.assert_array_equal(first, second)
+        assert audio.calls == [None]
+        assert list((audio.tmp / "config" / "cache" / "speech").glob("*.vad"))
+
+    def test_cached_wav_shares_profile_with_track(self, audio, monkeypatch):
+        import shutil
+
+        from audio_cache import audio_cache_key
+
+        profile = speech_sync.get_speech_profile(audio.path)
+        audio_dir = audio.tmp / "config" / "cache" / "audio"
+        audio_dir.mkdir(parents=True)
+        cached_wav = audio_dir / f"{audio_cache_key(audio.path)}.wav"
+        shutil.copyfile(audio.tmp / "track.wav", cached_wav)
+        monkeypatch.setattr(speech_sync, "frame_energies", None)  # must not recompute
+
+        np.testing.assert_array_equal(speech_sync.get_wav_speech_profile(str(cached_wav)), profile)
+
+    def test_uncached_wav_is_analysed_without_storing(self, audio):
+        profile = speech_sync.get_wav_speech_profile(str(audio.tmp / "track.wav"))
+
+        assert profile.any()
+        assert not (audio.tmp / "config" / "cache" / "speech").exists()
+
+    def test_shifts_subtitle_and_keeps_backup(self, audio):
+        sub_path = audio.tmp / "ep.en.srt"
+        _subs(2.0).save(str(sub_path))
+
+        result = speech_sync.sync_with_speech_profile(str(sub_path), audio.path)
+
+        assert result["engine"] == "native"
+        assert abs(result["shift_ms"] + 2000) <= 100
+        assert pysubs2.load(str(sub_path))[0].start == pytest.approx(2000, abs=100)
+        assert pysubs2.load(result["backup_path"])[0].start == 4000
+
+    def test_low_confidence_leaves_subtitle_untouched(self, audio):
+        sub_path = audio.tmp / "ep.en.srt"
+        _subs(2.0).save(str(sub_path))
+        before = sub_path.read_bytes()
+
+        with pytest.raises(AlignmentError, match="confidence"):
+            speech_sync.sync_with_speech_profile(str(sub_path), audio.path, min_confidence=1e9)
+        assert sub_path.read_bytes() == before
+
+
+def test_auto_sync_falls_back_to_ffsubsync():
+    from services.video_sync import auto_sync
+
+    with (
+        patch("services.speech_sync.sync_with_speech_profile", side_effect=AlignmentError("low")),
+        patch(
+            "services.video_sync.sync_with_ffsubsync", return_value={"engine": "ffsubsync"}
+        ) as ffsubsync,
+    ):
+        result = auto_sync("/media/ep.srt", "/media/ep.mkv")
+
+    assert result["engine"] == "ffsubsync"
+    ffsubsync.assert_called_once_with("/media/ep.srt", "/media/ep.mkv")
@@ -0,0 +1,272 @@
+"""Tests for standalone scanning: cached parsing, incremental scans, batched watcher events."""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from standalone import parser
+from standalone.dir_index import walk_folder
+
+
+def _touch(directory, name):
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x00")
+    return str(path)
+
+
+class TestParseCache:
+    def test_unchanged_files_skip_guessit(self, app_ctx, tmp_path):
+        files = [
+            _touch(tmp_path, "Show/Show.S01E01.1080p.mkv"),
+            _touch(tmp_path, "Show/Show.S01E02.1080p.mkv"),
+            _touch(tmp_path, "Movie (2020)/Movie.2020.1080p.mkv"),
+        ]
+
+        with patch.object(parser, "guessit", wraps=parser.guessit) as guess:
+            first = parser.parse_media_files(files)
+            calls = guess.call_count
+            second = parser.parse_media_files(files)
+
+        assert calls >= 3
+        assert guess.call_count == calls
+        assert second == first
+        assert first[files[0]]["episode"] == 1
+        assert first[files[2]]["type"] == "movie"
+
+    def test_modified_file_is_reparsed(self, app_ctx, tmp_path):
+        path = _touch(tmp_path, "Show/Show.S01E01.mkv")
+        parser.parse_media_files([path])
+        os.utime(path, (1_000_000, 1_000_000))
+
+        with patch.object(parser, "parse_media_file", wraps=parser.parse_media_file) as parse:
+            result = parser.parse_media_files([path])
+
+        parse.assert_called_once_with(path)
+        assert result[path]["season"] == 1
+
+    def test_parser_version_invalidates_cache(self, app_ctx, tmp_path, monkeypatch):
+        path = _touch(tmp_path, "Show/Show.S01E01.mkv")
+        parser.parse_media_files([path])
+        monkeypatch.setattr(parser, "PARSER_VERSION", parser.PARSER_VERSION + 1)
+
+        with patch.object(parser, "parse_media_file", wraps=parser.parse_media_file) as parse:
+            parser.parse_media_files([path])
+
+        assert parse.call_count == 1
+
+
+def test_scan_parses_each_file_once(app_ctx, tmp_path):
+    from standalone.scanner import StandaloneScanner
+
+    files = [
+        _touch(tmp_path, "Show/Show.S01E01.mkv"),
+        _touch(tmp_path, "Show/Show.S01E02.mkv"),
+        _touch(tmp_path, "Movie (2020)/Movie.2020.mkv"),
+    ]
+    scanner = StandaloneScanner(metadata_resolver=object())
+
+    with (
+        patch.object(parser, "parse_media_file", wraps=parser.parse_media_file) as parse,
+        patch.object(scanner, "_process_series_group", return_value=0) as series,
+        patch.object(scanner, "_process_movie", return_value=0) as movie,
+    ):
+        result = scanner._scan_folder({"path": str(tmp_path)})
+
+    assert sorted(call.args[0] for call in parse.call_args_list) == sorted(files)
+    assert result == (1, 1, 0)
+    assert len(series.call_args.args[1]) == 2
+    assert movie.call_args.args[1] == files[2]
+
+
+class TestWalk:
+    def test_unchanged_directories_are_not_relisted(self, tmp_path):
+        _touch(tmp_path, "A/Season 1/A.S01E01.mkv")
+        _touch(tmp_path, "B/B.S01E01.mkv")
+        _touch(tmp_path, "B/notes.txt")
+
+        first = walk_folder(str(tmp_path))
+        assert set(first.videos) == {
+            str(tmp_path / "A/Season 1/A.S01E01.mkv"),
+            str(tmp_path / "B/B.S01E01.mkv"),
+        }
+        assert first.changed == set(first.listings)
+
+        _touch(tmp_path, "B/B.S01E02.mkv")
+        with patch("standalone.dir_index.os.scandir", wraps=os.scandir) as scandir:
+            second = walk_folder(str(tmp_path), first.listings)
+
+        assert second.changed == {str(tmp_path / "B")}
+        assert [call.args[0] for call in scandir.call_args_list] == [str(tmp_path / "B")]
+        assert len(second.videos) == 3
+
+    def test_symlink_loop_visited_once(self, tmp_path):
+        _touch(tmp_path, "A/A.S01E01.mkv")
+        os.symlink(tmp_path, tmp_path / "A" / "loop")
+
+        result = walk_folder(str(tmp_path))
+
+        assert list(result.videos) == [str(tmp_path / "A/A.S01E01.mkv")]
+
+
+@pytest.fixture()
+def library(app_ctx, tmp_path):
+    from standalone.scanner import StandaloneScanner
+
+    _touch(tmp_path, "Show A/Show.A.S01E01.mkv")
+    _touch(tmp_path, "Show B/Show.B.S01E01.mkv")
+    _touch(tmp_path, "Heat (1995)/Heat.1995.mkv")
+    scanner = StandaloneScanner(metadata_resolver=object())
+    processed = []
+
+    def series(title, files, folder, wanted_paths=None):
+        processed.append(title)
+        return 0
+
+    def movie(parsed, file_path, folder, wanted_paths=None):
+        processed.append(parsed["title"])
+        return 0
+
+    with (
+        patch.object(scanner, "_process_series_group", side_effect=series),
+        patch.object(scanner, "_process_movie", side_effect=movie),
+        patch.object(scanner, "_get_target_languages", return_value=["de"]),
+    ):
+        yield scanner, processed, {"path": str(tmp_path)}
+
+
+class TestIncrementalScan:
+    def test_rescan_only_processes_changed_titles(self, library, tmp_path):
+        scanner, processed, folder = library
+
+        assert scanner._scan_folder(folder) == (2, 1, 0)
+        assert sorted(processed) == ["Heat", "show a", "show b"]
+
+        processed.clear()
+        assert scanner._scan_folder(folder) == (2, 1, 0)
+        assert processed == []
+
+        _touch(tmp_path, "Show B/Show.B.S01E01.de.ass")
+        scanner._scan_folder(folder)
+        assert processed == ["show b"]
+
+        processed.clear()
+        scanner._scan_folder(folder, full=True)
+        assert len(processed) == 3
+
+    def test_failed_title_is_retried(self, library, tmp_path):
+        scanner, processed, folder = library
+        scanner._scan_folder(folder)
+        processed.clear()
+        _touch(tmp_path, "Show A/Show.A.S01E02.mkv")
+
+        with patch.object(scanner, "_process_series_group", side_effect=RuntimeError("tmdb")):
+            scanner._scan_folder(folder)
+        scanner._scan_folder(folder)
+
+        assert processed == ["show a"]
+
+    def test_parse_cache_pruned_for_removed_files(self, library, tmp_path):
+        from db.standalone import get_parsed_files
+
+        scanner, _, folder = library
+        kept = str(tmp_path / "Show A/Show.A.S01E01.mkv")
+        gone = str(tmp_path / "Heat (1995)/Heat.1995.mkv")
+        scanner._scan_folder(folder)
+        assert set(get_parsed_files([kept, gone], parser.PARSER_VERSION)) == {kept, gone}
+
+        os.rename(gone, str(tmp_path / "Heat (1995)/Heat.1995.1080p.mkv"))
+        scanner._scan_folder(folder)
+
+        assert set(get_parsed_files([kept, gone], parser.PARSER_VERSION)) == {kept}
+
+    def test_changed_target_languages_force_rescan(self, library):
+        scanner, processed, folder = library
+        scanner._scan_folder(folder)
+        processed.clear()
+
+        with patch.object(scanner, "_get_target_languages", return_value=["de", "en"]):
+            scanner._scan_folder(folder)
+
+        assert len(processed) == 3
+
+
+class TestWatcherBatching:
+    def _watcher(self, tmp_path, debounce=0.2):
+        from standalone.watcher import MediaFileWatcher
+
+        calls = []
+        done = threading.Event()
+
+        def on_new_files(series_folder, paths):
+            calls.append((series_folder, paths))
+            done.set()
+
+        watcher = MediaFileWatcher(on_new_files, debounce_seconds=debounce, roots=[str(tmp_path)])
+        return watcher, calls, done
+
+    def test_season_drop_is_one_call_per_series_folder(self, tmp_path):
+        watcher, calls, _ = self._watcher(tmp_path)
+        threads_before = threading.active_count()
+        season = [_touch(tmp_path, f"Show/Season 1/Show.S01E{i:02d}.mkv") for i in range(1, 27)]
+        movie = _touch(tmp_path, "Heat.1995.mkv")
+        for path in [*season, movie]:
+            watcher.on_created(SimpleNamespace(src_path=path))
+
+        assert threading.active_count() - threads_before == 1
+        deadline = time.time() + 5
+        while len(calls) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        watcher.stop()
+
+        assert sorted(calls, key=lambda c: c[0] or "") == [
+            (None, [movie]),
+            (str(tmp_path / "Show"), sorted(season)),
+        ]
+
+    def test_growing_file_waits_until_stable(self, tmp_path, monkeypatch):
+        from standalone import watcher as watcher_module
+
+        monkeypatch.setattr(watcher_module, "STABILITY_SECONDS", 0.2)
+        watcher, calls, done = self._watcher(tmp_path)
+        path = _touch(tmp_path, "Show/Show.S01E01.mkv")
+        watcher.on_created(SimpleNamespace(src_path=path))
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 10)
+
+        time.sleep(0.3)
+        assert calls == []
+        assert done.wait(2)
+        watcher.stop()
+        assert calls == [(str(tmp_path / "Show"), [path])]
+
+
+def test_new_files_processed_with_their_series(library, tmp_path):
+    scanner, processed, _ = library
+    new = _touch(tmp_path, "Show A/Show.A.S01E02.mkv")
+
+    with patch.object(scanner, "_process_series_group", return_value=1) as series:
+        results = scanner.process_new_files([new], series_folder=str(tmp_path / "Show A"))
+
+    series.assert_called_once()
+    assert [f["file_path"] for f in series.call_args.args[1]] == [
+        str(tmp_path / "Show A/Show.A.S01E01.mkv"),
+        new,
+    ]
+    assert results == [{"path": new, "type": "episode", "title": "Show A", "wanted": False}]
+
+
+def test_single_file_goes_through_batch_path(library, tmp_path):
+    scanner, _, _ = library
+    new = _touch(tmp_path, "Heat.1995.mkv")
+
+    with patch.object(scanner, "_process_movie", return_value=1) as movie:
+        result = scanner.process_single_file(new)
+
+    movie.assert_called_once()
+    assert result["type"] == "movie"
+    assert set(result) == {"type", "title", "wanted"}
@@ -0,0 +1,145 @@
+"""Tests for the daily download rollups backing /statistics."""
+
+import threading
+
+
+def _record(provider, fmt, path, score):
+    from db.providers import record_subtitle_download
+
+    record_subtitle_download(provider, "sub-1", "de", fmt, path, score)
+
+
+class TestDownloadRollups:
+    def test_record_updates_rollup(self, app_ctx):
+        from db.providers import get_daily_download_quality, get_downloads_by_provider
+        from db.wanted import upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 600)
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 50)
+        _record("jimaku", "srt", "/tv/other.mkv", 300)
+
+        by_provider = {r["provider_name"]: r for r in get_downloads_by_provider()}
+        assert by_provider["opensubtitles"]["count"] == 2
+        assert by_provider["opensubtitles"]["avg_score"] == 325.0
+        assert by_provider["jimaku"]["count"] == 1
+
+        [today] = get_daily_download_quality(7)
+        assert today["download_count"] == 3
+        assert today["low_score_count"] == 1
+
+    def test_series_quality_from_rollup(self, app_ctx):
+        from db.providers import get_series_download_quality
+        from db.wanted import upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 700)
+        _record("animetosho", "srt", "/tv/aot/e01.mkv", 500)
+        _record("jimaku", "srt", "/tv/untracked.mkv", 300)
+
+        [series] = get_series_download_quality()
+        assert series["title"] == "Attack on Titan"
+        assert series["download_count"] == 2
+        assert series["avg_score"] == 600.0
+        assert series["formats"] == ["ass", "srt"]
+
+    def test_backfill_matches_incremental(self, app_ctx):
+        from db.providers import (
+            backfill_download_rollups,
+            ensure_download_rollups,
+            get_downloads_by_provider,
+            get_series_download_quality,
+        )
+        from db.wanted import upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 700)
+        _record("jimaku", "srt", "/tv/aot/e01.mkv", 80)
+        incremental = (get_downloads_by_provider(), get_series_download_quality())
+
+        assert ensure_download_rollups() is False  # rollups already populated
+        assert backfill_download_rollups() == 2
+        backfilled = (get_downloads_by_provider(), get_series_download_quality())
+
+        by_name = {r["provider_name"]: r for r in incremental[0]}
+        assert {r["provider_name"]: r for r in backfilled[0]} == by_name
+        assert backfilled[1] == incremental[1]
+
+    def test_delete_downloads_updates_rollup(self, app_ctx):
+        from db.providers import (
+            delete_subtitle_downloads,
+            get_daily_download_quality,
+            get_downloads_by_provider,
+        )
+        from db.wanted import upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 600)
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 50)
+        _record("jimaku", "srt", "/tv/other.mkv", 300)
+
+        assert delete_subtitle_downloads("/tv/aot/e01.mkv") == 2
+        assert delete_subtitle_downloads("/tv/aot/e01.mkv") == 0
+
+        assert [r["provider_name"] for r in get_downloads_by_provider()] == ["jimaku"]
+        [today] = get_daily_download_quality(7)
+        assert today["download_count"] == 1
+        assert today["low_score_count"] == 0
+
+    def test_delete_after_wanted_item_removed(self, app_ctx):
+        from db.providers import delete_subtitle_downloads, get_series_download_quality
+        from db.wanted import delete_wanted_items, upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        _record("opensubtitles", "ass", "/tv/aot/e01.mkv", 600)
+        delete_wanted_items(["/tv/aot/e01.mkv"])
+
+        assert delete_subtitle_downloads("/tv/aot/e01.mkv") == 1
+        assert get_series_download_quality() == []
+
+    def test_delete_rebuilds_missing_rollup_row(self, app_ctx):
+        from db.models.providers import SubtitleDownloadDaily
+        from db.providers import delete_subtitle_downloads, get_downloads_by_provider
+        from extensions import db
+
+        _record("opensubtitles", "ass", "/tv/a.mkv", 600)
+        _record("jimaku", "srt", "/tv/b.mkv", 300)
+        db.session.query(SubtitleDownloadDaily).delete()
+        db.session.commit()
+
+        assert delete_subtitle_downloads("/tv/a.mkv") == 1
+        assert [r["provider_name"] for r in get_downloads_by_provider()] == ["jimaku"]
+
+    def test_concurrent_records_share_one_rollup_row(self, app_ctx):
+        from db.providers import get_downloads_by_provider
+        from db.repositories.providers import ProviderRepository
+        from db.wanted import upsert_wanted_item
+
+        upsert_wanted_item("episode", "/tv/aot/e01.mkv", title="Attack on Titan")
+        threads, per_thread = 4, 5
+        start = threading.Barrier(threads)
+        errors = []
+
+        def _worker():
+            with app_ctx.app_context():
+                start.wait()
+                try:
+                    # The repository directly: only the rollup write is raced
+                    repo = ProviderRepository()
+                    for _ in range(per_thread):
+                        repo.record_subtitle_download(
+                            "opensubtitles", "sub-1", "de", "ass", "/tv/aot/e01.mkv", 600
+                        )
+                except Exception as e:  # surfaced by the assertion below
+                    errors.append(e)
+
+        workers = [threading.Thread(target=_worker) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert errors == []
+        [row] = get_downloads_by_provider()
+        assert row["count"] == threads * per_thread
+        assert row["avg_score"] == 600.0
@@ -0,0 +1,116 @@
+"""Tests for on-demand HLS streaming in services/video_player.py."""
+
+import os
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+import ass_utils
+import config
+import media_fingerprint
+from services import video_player
+
+_H264 = {"codec_type": "video", "codec_name": "h264", "height": 720, "pix_fmt": "yuv420p"}
+_HEVC = {"codec_type": "video", "codec_name": "hevc", "height": 1080, "pix_fmt": "yuv420p10le"}
+_AAC = {"codec_type": "audio", "codec_name": "aac"}
+
+
+@pytest.fixture()
+def media(tmp_path, monkeypatch):
+    """Fake ffmpeg/ffprobe, settings and probe record for a 25 s video."""
+    calls = []
+    state = {"streams": [_HEVC, _AAC], "keyframes": "0.000,K_\n4.000,__\n12.000,K_\n21.000,K_\n"}
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if cmd[0] == "ffprobe":
+            return subprocess.CompletedProcess(cmd, 0, stdout=state["keyframes"], stderr="")
+        with open(cmd[-1], "wb") as f:
+            f.write(b"\x47" * 188)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    settings = SimpleNamespace(config_dir=str(tmp_path / "config"), video_cache_max_mb=0)
+    monkeypatch.setattr(video_player.subprocess, "run", fake_run)
+    monkeypatch.setattr(config, "get_settings", lambda: settings)
+    monkeypatch.setattr(media_fingerprint, "get_fingerprint", lambda path: f"fp-{path}")
+    monkeypatch.setattr(
+        ass_utils,
+        "get_media_metadata",
+        lambda path, use_cache=True: {"streams": state["streams"], "format": {"duration": "25.0"}},
+    )
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"\x00")
+    return SimpleNamespace(path=str(video), calls=calls, state=state, settings=settings)
+
+
+def test_playlist_built_without_transcoding(media):
+    result = video_player.generate_hls_playlist(media.path, segment_url="seg?i={index}")
+
+    assert result["mode"] == "transcode"
+    assert result["segment_count"] == 3
+    assert media.calls == []
+    lines = result["playlist"].splitlines()
+    assert lines[0] == "#EXTM3U"
+    assert "#EXTINF:5.000000," in lines
+    assert lines[-2:] == ["seg?i=2", "#EXT-X-ENDLIST"]
+
+
+def test_segment_transcoded_once_and_cached(media):
+    first = video_player.get_hls_segment(media.path, 1)
+    second = video_player.get_hls_segment(media.path, 1)
+
+    assert first == second and os.path.exists(first)
+    assert len(media.calls) == 1
+    cmd = media.calls[0]
+    assert cmd[cmd.index("-ss") + 1] == "10.000000"
+    assert "libx264" in cmd and cmd[cmd.index("-output_ts_offset") + 1] == "10.000000"
+
+
+def test_compatible_source_uses_keyframe_copy(media):
+    media.state["streams"] = [_H264, _AAC]
+
+    result = video_player.generate_hls_playlist(media.path)
+    assert result["mode"] == "copy"
+    assert "#EXTINF:12.000000," in result["playlist"]  # 0 -> 12 (4 s is not a keyframe)
+    assert result["segment_count"] == 2
+
+    video_player.generate_hls_playlist(media.path)
+    assert sum(1 for c in media.calls if c[0] == "ffprobe") == 1  # keyframes scanned once
+
+    video_player.get_hls_segment(media.path, 1)
+    cmd = media.calls[-1]
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert cmd[cmd.index("-ss") + 1] == "12.000000"
+
+
+def test_quality_and_file_get_separate_caches(media, tmp_path):
+    other = tmp_path / "ep2.mkv"
+    other.write_bytes(b"\x00")
+
+    dirs = {
+        video_player.generate_hls_playlist(media.path, quality="low")["cache_dir"],
+        video_player.generate_hls_playlist(media.path, quality="high")["cache_dir"],
+        video_player.generate_hls_playlist(str(other), quality="low")["cache_dir"],
+    }
+    assert len(dirs) == 3
+
+
+def test_out_of_range_segment_raises(media):
+    with pytest.raises(RuntimeError, match="out of range"):
+        video_player.get_hls_segment(media.path, 3)
+
+
+def test_lru_eviction_keeps_current_file(media, tmp_path):
+    root = os.path.join(media.settings.config_dir, "cache", "video")
+    stale = os.path.join(root, "stale")
+    os.makedirs(stale)
+    with open(os.path.join(stale, "seg_00000.ts"), "wb") as f:
+        f.write(b"\x00" * (2 * 1024 * 1024))
+    os.utime(stale, (1, 1))
+    media.settings.video_cache_max_mb = 1
+
+    segment = video_player.get_hls_segment(media.path, 0)
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(segment)
@@ -56,6 +56,15 @@ def test_start_sync_ffsubsync_missing_video_path(client, tmp_path):
     assert "video_path" in resp.get_json()["error"]
 
 
+def test_start_sync_defaults_to_native_engine(client, tmp_path):
+    """Without an engine the job uses native, like /auto-sync."""
+    sub = tmp_path / "ep.de.srt"
+    sub.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    resp = client.post("/api/v1/tools/video-sync", json={"file_path": str(sub)})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "video_path is required for native"
+
+
 def test_start_sync_alass_missing_reference(client, tmp_path):
     """alass without reference_path or reference_track_index returns 400."""
     sub = tmp_path / "ep.de.srt"
@@ -213,3 +222,53 @@ def test_get_available_engines_returns_bools():
     engines = get_available_engines()
     assert isinstance(engines["ffsubsync"], bool)
     assert isinstance(engines["alass"], bool)
+
+
+def test_ffsubsync_uses_cached_audio_reference(tmp_path):
+    """The video reference is replaced by the shared cached audio track."""
+    from contextlib import nullcontext
+
+    from services.video_sync import sync_with_ffsubsync
+
+    sub = tmp_path / "ep.srt"
+    sub.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    commands = []
+
+    def fake_run(slot, cmd, **kwargs):
+        commands.append(cmd)
+        return MagicMock(returncode=0, stdout="", stderr="offset: 0.5 s")
+
+    with (
+        patch("services.video_sync.shutil.which", return_value="/usr/bin/ffsubsync"),
+        patch("services.video_sync.cached_audio", return_value=nullcontext("/cache/a.wav")),
+        patch("services.video_sync.run_media", side_effect=fake_run),
+        patch("services.video_sync.shutil.move"),
+    ):
+        result = sync_with_ffsubsync(str(sub), "/media/ep.mkv")
+
+    assert commands[0][:2] == ["ffsubsync", "/cache/a.wav"]
+    assert result["shift_ms"] == 500
+
+
+def test_alass_subtitle_reference_passes_through(tmp_path):
+    """Subtitle references are not sent through the audio cache."""
+    from services.video_sync import sync_with_alass
+
+    sub = tmp_path / "ep.srt"
+    sub.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    commands = []
+
+    def fake_run(slot, cmd, **kwargs):
+        commands.append(cmd)
+        return MagicMock(returncode=0, stdout="", stderr="")
+
+    with (
+        patch("services.video_sync.shutil.which", return_value="/usr/bin/alass"),
+        patch("services.video_sync.cached_audio") as cached,
+        patch("services.video_sync.run_media", side_effect=fake_run),
+        patch("services.video_sync.shutil.move"),
+    ):
+        sync_with_alass(str(sub), "/media/ep.en.ass")
+
+    cached.assert_not_called()
+    assert commands[0][1] == "/media/ep.en.ass"
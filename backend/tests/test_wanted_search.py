@@ -346,3 +346,235 @@ class TestProcessWantedItem:
         assert isinstance(result, dict)
         assert result.get("status") == "failed"
         assert result.get("wanted_id") == item_id
+
+
+class TestSearchEligibleItems:
+    """get_search_eligible_items: SQL-side eligibility and priority ordering."""
+
+    def _add(self, tmp_path, name, **fields):
+        from db.wanted import get_wanted_item, upsert_wanted_item
+        from extensions import db
+
+        row_id, _ = upsert_wanted_item(
+            item_type="episode",
+            file_path=str(tmp_path / name),
+            target_language="de",
+            upgrade_candidate=fields.pop("upgrade_candidate", False),
+        )
+        if fields:
+            from db.models.core import WantedItem
+
+            item = db.session.get(WantedItem, row_id)
+            for k, v in fields.items():
+                setattr(item, k, v)
+            db.session.commit()
+        return get_wanted_item(row_id)["id"]
+
+    def test_backed_off_items_do_not_consume_budget(self, app_ctx, tmp_path):
+        """Items with a future retry_after are skipped; eligible ones fill the limit."""
+        from datetime import timedelta
+
+        from db.wanted import get_search_eligible_items
+
+        future = (datetime.now(UTC) + timedelta(hours=5)).isoformat()
+        past = (datetime.now(UTC) - timedelta(hours=5)).isoformat()
+        for i in range(5):
+            self._add(tmp_path, f"backoff{i}.mkv", retry_after=future, search_count=1)
+        due = {
+            self._add(tmp_path, "due1.mkv", retry_after=past, search_count=1),
+            self._add(tmp_path, "due2.mkv"),
+        }
+
+        items = get_search_eligible_items(limit=2, max_attempts=10)
+        assert {i["id"] for i in items} == due
+
+    def test_max_attempts_and_status_filtered(self, app_ctx, tmp_path):
+        from db.wanted import get_search_eligible_items
+
+        self._add(tmp_path, "exhausted.mkv", search_count=10)
+        self._add(tmp_path, "ignored.mkv", status="ignored")
+        ok = self._add(tmp_path, "ok.mkv", search_count=2)
+
+        items = get_search_eligible_items(limit=10, max_attempts=10)
+        assert [i["id"] for i in items] == [ok]
+
+    def test_fixed_cooldown_when_backoff_disabled(self, app_ctx, tmp_path):
+        from datetime import timedelta
+
+        from db.wanted import get_search_eligible_items
+
+        recent = (datetime.now(UTC) - timedelta(minutes=10)).isoformat()
+        old = (datetime.now(UTC) - timedelta(hours=2)).isoformat()
+        self._add(tmp_path, "recent.mkv", last_search_at=recent, search_count=1)
+        old_id = self._add(tmp_path, "old.mkv", last_search_at=old, search_count=1)
+
+        items = get_search_eligible_items(limit=10, max_attempts=10, adaptive_backoff=False)
+        assert [i["id"] for i in items] == [old_id]
+
+    def test_priority_tiers_order_results(self, app_ctx, tmp_path):
+        from datetime import timedelta
+
+        from db.wanted import get_search_eligible_items
+
+        long_ago = (datetime.now(UTC) - timedelta(days=60)).isoformat()
+        searched = self._add(tmp_path, "searched.mkv", added_at=long_ago, search_count=1)
+        never = self._add(tmp_path, "never.mkv", added_at=long_ago)
+        upgrade = self._add(
+            tmp_path, "upgrade.mkv", added_at=long_ago, search_count=1, upgrade_candidate=True
+        )
+        recent = self._add(tmp_path, "recent.mkv", search_count=3)
+
+        items = get_search_eligible_items(limit=10, max_attempts=10)
+        assert [i["id"] for i in items] == [recent, upgrade, never, searched]
+
+        items = get_search_eligible_items(limit=10, max_attempts=10, priority=["never_searched"])
+        assert items[0]["id"] == never
+
+
+class TestPacedSearchScheduler:
+    """PacedSearchScheduler: priority queue, refill budget, cancel."""
+
+    def _make(self, monkeypatch, refill_items, interval=3600, max_items=3):
+        from wanted_search import scheduler as sched_mod
+
+        monkeypatch.setattr(sched_mod, "MIN_SPACING_SECONDS", 0.0)
+        ran = []
+        progress = []
+
+        def run_item(item_id):
+            ran.append(item_id)
+            return {"wanted_id": item_id, "status": "found" if item_id % 2 else "failed"}
+
+        sched = sched_mod.PacedSearchScheduler(
+            run_item=run_item,
+            refill=lambda limit: [{"id": i} for i in refill_items[:limit]],
+            interval_seconds=interval,
+            max_items_per_cycle=max_items,
+            on_progress=progress.append,
+            spacing_fn=lambda: 0.0,
+        )
+        return sched, ran, progress
+
+    def _drain(self, sched, ran, expected):
+        import time
+
+        deadline = time.time() + 5
+        while len(ran) < expected and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_urgent_items_run_before_scheduled(self, monkeypatch):
+        sched, ran, progress = self._make(monkeypatch, [1, 2, 3], max_items=3)
+        sched._scheduled_spacing = lambda: 0.0
+        sched.enqueue(99, urgent=True)
+        sched.start()
+        try:
+            self._drain(sched, ran, 4)
+        finally:
+            sched.stop()
+        assert ran == [99, 1, 2, 3]
+        assert progress[-1]["processed"] == 4
+
+    def test_cycle_budget_limits_scheduled_items(self, monkeypatch):
+        sched, ran, _ = self._make(monkeypatch, [1, 2, 3, 4, 5], interval=3600, max_items=2)
+        sched._scheduled_spacing = lambda: 0.0
+        sched.start()
+        try:
+            self._drain(sched, ran, 2)
+            import time
+
+            time.sleep(0.1)
+        finally:
+            sched.stop()
+        assert ran == [1, 2]
+
+    def test_cancel_clears_queue_until_next_cycle(self, monkeypatch):
+        sched, ran, _ = self._make(monkeypatch, [1, 2, 3])
+        sched.enqueue(7, urgent=False)
+        sched.cancel()
+        status = sched.status
+        assert status["queue_depth"] == 0
+        assert status["cycle_cancelled"] is True
+        sched._refill_queue()
+        assert sched.status["queue_depth"] == 0
+
+    def test_refill_query_runs_outside_lock(self, monkeypatch):
+        import threading
+
+        sched, _, _ = self._make(monkeypatch, [])
+        querying = threading.Event()
+        release = threading.Event()
+
+        def slow_refill(limit):
+            querying.set()
+            release.wait(5)
+            return [{"id": 1}, {"id": 2}]
+
+        sched._refill = slow_refill
+        worker = threading.Thread(target=sched._refill_queue)
+        worker.start()
+        try:
+            assert querying.wait(5)
+            assert sched.status["queue_depth"] == 0  # lock is free during the query
+            sched.cancel()
+        finally:
+            release.set()
+            worker.join(5)
+        assert sched.status["queue_depth"] == 0  # cancelled mid-query: results dropped
+
+    def test_duplicate_enqueue_rejected(self, monkeypatch):
+        sched, _, _ = self._make(monkeypatch, [])
+        assert sched.enqueue(5) is True
+        assert sched.enqueue(5) is False
+
+
+class TestScannerSearchModes:
+    """Burst (search_all) and paced mode share eligibility and extraction."""
+
+    def _run(self, monkeypatch, fn):
+        import wanted_scanner
+
+        monkeypatch.setattr(wanted_scanner, "get_settings", lambda: _make_settings())
+        extract = MagicMock()
+        process = MagicMock(side_effect=lambda item_id: {"wanted_id": item_id, "status": "found"})
+        with (
+            patch("routes.wanted._extract_embedded_sub", extract),
+            patch("wanted_search.process_wanted_item", process),
+        ):
+            fn(wanted_scanner.WantedScanner())
+        return extract, process
+
+    def test_paced_item_with_embedded_sub_is_extracted(self, monkeypatch):
+        item = {"id": 4, "file_path": "/tv/e04.mkv", "status": "wanted"}
+        results = {}
+
+        def run(scanner):
+            with patch("db.wanted.get_wanted_item", lambda _id: {**item, **results["item"]}):
+                results["result"] = scanner._process_single_item(4)
+
+        results["item"] = {"existing_sub": "embedded_ass"}
+        extract, process = self._run(monkeypatch, run)
+        extract.assert_called_once_with(4, "/tv/e04.mkv", auto_translate=True)
+        process.assert_not_called()
+        assert results["result"]["status"] == "found"
+
+        results["item"] = {"existing_sub": ""}
+        extract, process = self._run(monkeypatch, run)
+        extract.assert_not_called()
+        process.assert_called_once_with(4)
+
+    def test_search_all_extracts_embedded_items(self, monkeypatch):
+        eligible = [
+            {"id": 1, "file_path": "/tv/e01.mkv", "existing_sub": "embedded_srt"},
+            {"id": 2, "file_path": "/tv/e02.mkv", "existing_sub": ""},
+        ]
+        summary = {}
+
+        def run(scanner):
+            monkeypatch.setattr(scanner, "_search_eligible", lambda limit: eligible)
+            with patch("events.emit_event"):
+                summary.update(scanner.search_all())
+
+        extract, process = self._run(monkeypatch, run)
+        extract.assert_called_once_with(1, "/tv/e01.mkv", auto_translate=True)
+        process.assert_called_once_with(2)
+        assert summary["found"] == 2
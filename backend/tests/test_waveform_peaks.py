@@ -0,0 +1,132 @@
+"""Tests for the NumPy waveform peaks engine (services/waveform_peaks.py)."""
+
+import contextlib
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import ass_utils
+import config
+import media_fingerprint
+from services import waveform_peaks
+from services.waveform_peaks import BASE_BUCKET, SAMPLE_RATE, build_levels, downsample
+
+
+def _pcm(seconds: float) -> bytes:
+    """Deterministic mono s16le signal: a ramp that repeats every second."""
+    t = np.arange(int(seconds * SAMPLE_RATE))
+    return ((t % SAMPLE_RATE) * 2 - 16000).astype("<i2").tobytes()
+
+
+class TestBuildLevels:
+    def test_bucket_stats_independent_of_chunking(self):
+        pcm = _pcm(3.3)
+        whole = build_levels([pcm])
+        chunked = build_levels(pcm[i : i + 777] for i in range(0, len(pcm), 777))
+
+        assert len(whole[0]) == int(np.ceil(len(pcm) / 2 / BASE_BUCKET))
+        for a, b in zip(whole, chunked, strict=True):
+            np.testing.assert_array_equal(a, b)
+
+    def test_values_match_plain_reduction(self):
+        samples = np.frombuffer(_pcm(1), dtype="<i2")
+        rows = build_levels([samples.tobytes()])[0]
+        bucket = samples[BASE_BUCKET : 2 * BASE_BUCKET].astype(np.float64)
+
+        assert rows[1, 0] == bucket.min()
+        assert rows[1, 1] == bucket.max()
+        assert abs(rows[1, 2] - np.sqrt(np.mean(bucket**2))) <= 1
+
+    def test_downsample_merges_groups_and_short_tail(self):
+        rows = np.array(
+            [[-10, 10, 3], [-20, 5, 4], [-1, 30, 0], [-5, 5, 0], [-7, 8, 5]], dtype=np.int16
+        )
+        merged = downsample(rows, factor=4)
+
+        assert merged.tolist() == [[-20, 30, 2], [-7, 8, 5]]
+
+    def test_pyramid_stops_at_coarse_level(self):
+        levels = build_levels([_pcm(30)])
+
+        assert [len(level) for level in levels] == [3000, 750, 188]
+
+
+@pytest.fixture()
+def audio(tmp_path, monkeypatch):
+    """Fake shared audio cache serving 30 s of PCM; records requested tracks."""
+    calls = []
+    wav_path = tmp_path / "track.wav"
+    with wave.open(str(wav_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(_pcm(30))
+
+    @contextlib.contextmanager
+    def fake_cached_audio(path, track_index=0, sample_rate=16000, priority=None):
+        calls.append(track_index)
+        yield str(wav_path)
+
+    settings = SimpleNamespace(config_dir=str(tmp_path / "config"), waveform_cache_max_mb=0)
+    monkeypatch.setattr(waveform_peaks, "cached_audio", fake_cached_audio)
+    monkeypatch.setattr(config, "get_settings", lambda: settings)
+    monkeypatch.setattr(media_fingerprint, "get_fingerprint", lambda path: f"fp-{path}")
+    monkeypatch.setattr(
+        ass_utils, "get_media_metadata", lambda path, use_cache=True: {"format": {"duration": "30"}}
+    )
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"\x00")
+    return SimpleNamespace(path=str(video), calls=calls)
+
+
+class TestWaveformSlice:
+    def test_decoded_once_then_served_from_cache(self, audio):
+        first = waveform_peaks.waveform_slice(audio.path, points=200)
+        second = waveform_peaks.waveform_slice(audio.path, start=10, end=12, points=400)
+
+        assert audio.calls == [None]
+        assert first["level"] == 2 and first["samples"] == 188
+        assert second["level"] == 0 and second["samples"] == 200
+        assert second["start"] == pytest.approx(10.0)
+        assert second["max"][0] == pytest.approx((-16000 + 159 * 2) / 32768, abs=1e-4)
+
+    def test_cache_hit_does_not_wait_for_build_locks(self, audio):
+        import threading
+
+        waveform_peaks.get_peak_pyramid(audio.path)
+        result = []
+        with contextlib.ExitStack() as stack:
+            for lock in waveform_peaks._build_locks:  # as if every stripe were decoding
+                stack.enter_context(lock)
+            reader = threading.Thread(
+                target=lambda: result.append(waveform_peaks.get_peak_pyramid(audio.path))
+            )
+            reader.start()
+            reader.join(5)
+
+        assert len(result) == 1
+        assert audio.calls == [None]
+
+    def test_audio_tracks_cached_separately(self, audio):
+        waveform_peaks.get_peak_pyramid(audio.path, 0)
+        waveform_peaks.get_peak_pyramid(audio.path, 1)
+
+        assert audio.calls == [0, 1]
+
+    def test_explicit_level_is_clamped(self, audio):
+        result = waveform_peaks.waveform_slice(audio.path, level=9)
+
+        assert result["level"] == len(result["levels"]) - 1
+        assert result["levels"][0]["bucket_seconds"] == pytest.approx(0.01)
+
+    def test_decode_failure_propagates(self, audio, monkeypatch):
+        @contextlib.contextmanager
+        def failing(*args, **kwargs):
+            raise RuntimeError("ffmpeg failed (code 1): no audio")
+            yield
+
+        monkeypatch.setattr(waveform_peaks, "cached_audio", failing)
+        with pytest.raises(RuntimeError, match="no audio"):
+            waveform_peaks.get_peak_pyramid(audio.path)
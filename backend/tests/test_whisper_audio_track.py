@@ -1,6 +1,7 @@
 """Tests for audio_track_index propagation through WhisperQueue and transcribe route."""
 
 import time
+from contextlib import nullcontext
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -60,13 +61,9 @@ class TestWhisperQueueAudioTrack:
         with (
             patch("whisper.queue.get_audio_track_by_index", mock_by_index),
             patch("whisper.queue.select_audio_track", mock_by_lang),
-            patch("whisper.queue.extract_audio_to_wav"),
+            patch("whisper.queue.cached_audio", return_value=nullcontext("/tmp/fake.wav")),
             patch("whisper.queue.create_whisper_job"),
             patch("whisper.queue.update_whisper_job"),
-            patch("tempfile.mkstemp", return_value=(0, "/tmp/fake.wav")),
-            patch("os.close"),
-            patch("os.path.exists", return_value=True),
-            patch("os.remove"),
         ):
             queue.submit(
                 job_id="t1",
@@ -119,13 +116,9 @@ class TestWhisperQueueAudioTrack:
         with (
             patch("whisper.queue.get_audio_track_by_index", mock_by_index),
             patch("whisper.queue.select_audio_track", mock_by_lang),
-            patch("whisper.queue.extract_audio_to_wav"),
+            patch("whisper.queue.cached_audio", return_value=nullcontext("/tmp/fake.wav")),
             patch("whisper.queue.create_whisper_job"),
             patch("whisper.queue.update_whisper_job"),
-            patch("tempfile.mkstemp", return_value=(0, "/tmp/fake.wav")),
-            patch("os.close"),
-            patch("os.path.exists", return_value=True),
-            patch("os.remove"),
         ):
             queue.submit(
                 job_id="t2",
@@ -0,0 +1,50 @@
+"""Tests for speech-aligned chunk planning (whisper/chunking.py)."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from whisper.chunking import Chunk, plan_chunks, speech_regions, stitch
+
+
+def test_speech_regions_from_frames():
+    speech = np.array([0, 1, 1, 0, 0, 1, 1, 1], dtype=bool)
+
+    assert speech_regions(speech, 0.5) == [(0.5, 1.5), (2.5, 4.0)]
+
+
+def test_short_regions_merge_and_long_regions_split():
+    regions = [(10, 15), (20, 35), (60, 140)]
+
+    chunks = plan_chunks(regions, duration=200, chunk_seconds=30, overlap=1, pad=0)
+
+    content = [(c.start + 1, c.end - 1) for c in chunks]
+    assert content == [(10, 35), (60, 90), (90, 120), (120, 140)]
+    # Ownership tiles the whole timeline
+    assert chunks[0].own_start == 0 and chunks[-1].own_end == 200
+    for a, b in zip(chunks, chunks[1:], strict=False):
+        assert a.own_end == b.own_start
+    assert chunks[0].own_end == pytest.approx(47.5)
+    assert chunks[1].own_end == 90
+
+
+def test_padding_clipped_to_media():
+    chunks = plan_chunks([(0.1, 5)], duration=5.1, overlap=1, pad=0.2)
+
+    assert chunks == [Chunk(start=0.0, end=5.1, own_start=0.0, own_end=5.1)]
+
+
+def test_stitch_keeps_overlapping_segment_once():
+    first = Chunk(start=0, end=31, own_start=0, own_end=30)
+    second = Chunk(start=29, end=61, own_start=30, own_end=61)
+    seg = lambda s, e, t: SimpleNamespace(start=s, end=e, text=t)  # noqa: E731
+
+    merged = stitch(
+        [
+            (first, [seg(1, 3, " a "), seg(29.2, 30.6, "b")]),
+            (second, [seg(0.2, 1.6, "b"), seg(5, 7, "c")]),
+        ]
+    )
+
+    assert merged == [(1, 3, "a"), (29.2, 30.6, "b"), (34, 36, "c")]
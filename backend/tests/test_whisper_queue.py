@@ -0,0 +1,220 @@
+"""Tests for the prioritised WhisperQueue worker pool (whisper/queue.py)."""
+
+import contextlib
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from media_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+
+class _Signals:
+    """Thread-safe map of named events the fakes set as the queue makes progress."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: dict[str, threading.Event] = {}
+
+    def __getitem__(self, key) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault(key, threading.Event())
+
+    def wait(self, key, timeout=5.0) -> bool:
+        return self[key].wait(timeout)
+
+
+@pytest.fixture()
+def env():
+    """Patched track selection, audio cache and DB; transcriptions block on a gate.
+
+    Signals: ``("transcribe", path)`` when a transcription starts,
+    ``("pinned", path)`` when audio is pinned, ``("done", job_id)`` when a job
+    is persisted as completed or failed. Queues made with ``env.queue()`` are
+    shut down (and their threads joined) on teardown.
+    """
+    log = []
+    pinned = set()
+    gate = threading.Event()
+    signals = _Signals()
+    queues = []
+
+    @contextlib.contextmanager
+    def fake_cached_audio(path, track_index=0, **kwargs):
+        log.append(("audio", path))
+        pinned.add(path)
+        signals["pinned", path].set()
+        try:
+            yield f"{path}.wav"
+        finally:
+            pinned.discard(path)
+
+    def transcribe(audio_path, language, progress_callback):
+        path = audio_path[: -len(".wav")]
+        log.append(("transcribe", path))
+        signals["transcribe", path].set()
+        gate.wait(5)
+        return MagicMock(
+            success=True,
+            srt_content="",
+            backend_name="fake",
+            detected_language="ja",
+            language_probability=1.0,
+            segment_count=0,
+            duration_seconds=1.0,
+        )
+
+    def update_job(job_id, **kwargs):
+        if kwargs.get("status") in ("completed", "failed"):
+            signals["done", job_id].set()
+
+    def make_queue(**kwargs):
+        from whisper.queue import WhisperQueue
+
+        queue = WhisperQueue(**kwargs)
+        queues.append(queue)
+        return queue
+
+    manager = MagicMock()
+    manager.transcribe.side_effect = transcribe
+    with (
+        patch("whisper.queue.select_audio_track", return_value={"stream_index": 0}),
+        patch("whisper.queue.cached_audio", fake_cached_audio),
+        patch("whisper.queue.create_whisper_job"),
+        patch("whisper.queue.update_whisper_job", side_effect=update_job),
+    ):
+        yield MagicMock(
+            log=log, pinned=pinned, gate=gate, signals=signals, manager=manager, queue=make_queue
+        )
+        gate.set()
+        for queue in queues:
+            assert queue.shutdown(timeout=5)
+
+
+def _submit(queue, env, job_id, priority):
+    queue.submit(
+        job_id=job_id,
+        file_path=f"/media/{job_id}.mkv",
+        language="ja",
+        source_language="ja",
+        whisper_manager=env.manager,
+        priority=priority,
+    )
+
+
+def test_interactive_job_overtakes_backlog_without_extra_threads(env):
+    queue = env.queue(max_concurrent=1, prefetch=0)
+    _submit(queue, env, "b0", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("transcribe", "/media/b0.mkv"))
+    threads = queue.threads
+    for i in range(1, 20):
+        _submit(queue, env, f"b{i}", PRIORITY_BACKGROUND)
+    _submit(queue, env, "user", PRIORITY_INTERACTIVE)
+
+    assert len(threads) == 1
+    assert queue.threads == threads
+    env.gate.set()
+    assert env.signals.wait(("done", "b1"))
+
+    order = [path for kind, path in env.log if kind == "transcribe"]
+    assert order[:3] == ["/media/b0.mkv", "/media/user.mkv", "/media/b1.mkv"]
+
+
+def test_next_job_audio_prefetched_while_transcribing(env):
+    queue = env.queue(max_concurrent=1, prefetch=1)
+    _submit(queue, env, "a", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("transcribe", "/media/a.mkv"))
+    _submit(queue, env, "b", PRIORITY_BACKGROUND)
+    _submit(queue, env, "c", PRIORITY_BACKGROUND)
+
+    # b is decoded and pinned while a still transcribes; c waits for a free prefetch slot
+    assert env.signals.wait(("pinned", "/media/b.mkv"))
+    assert ("audio", "/media/c.mkv") not in env.log
+    assert queue.get_job("b").status == "extracting"
+
+    env.gate.set()
+    assert env.signals.wait(("done", "c"))
+    assert queue.shutdown(timeout=5)
+    assert queue.get_job("c").status == "completed"
+    assert not env.pinned & {"/media/a.mkv", "/media/b.mkv", "/media/c.mkv"}
+
+
+def test_cancelled_prefetched_job_releases_audio(env):
+    queue = env.queue(max_concurrent=1, prefetch=1)
+    _submit(queue, env, "a", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("transcribe", "/media/a.mkv"))
+    _submit(queue, env, "b", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("pinned", "/media/b.mkv"))
+
+    assert queue.cancel_job("b") is True
+    assert "/media/b.mkv" not in env.pinned
+
+    env.gate.set()
+    assert env.signals.wait(("done", "a"))
+    assert queue.shutdown(timeout=5)
+    assert ("transcribe", "/media/b.mkv") not in env.log
+    assert queue.get_job("b").status == "cancelled"
+
+
+def test_prefetch_failure_fails_the_job(env):
+    queue = env.queue(max_concurrent=1, prefetch=1)
+    _submit(queue, env, "a", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("transcribe", "/media/a.mkv"))
+    tried = threading.Event()
+
+    def no_audio(*args, **kwargs):
+        tried.set()
+        raise RuntimeError("no audio")
+
+    with patch("whisper.queue.select_audio_track", side_effect=no_audio):
+        _submit(queue, env, "b", PRIORITY_BACKGROUND)
+        assert tried.wait(5)
+
+    env.gate.set()
+    assert env.signals.wait(("done", "b"))
+    assert queue.shutdown(timeout=5)
+    assert queue.get_job("b").status == "failed"
+    assert queue.get_job("b").error == "no audio"
+
+
+def test_shutdown_joins_threads_and_releases_prefetched_audio(env):
+    queue = env.queue(max_concurrent=1, prefetch=1)
+    _submit(queue, env, "a", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("transcribe", "/media/a.mkv"))
+    _submit(queue, env, "b", PRIORITY_BACKGROUND)
+    assert env.signals.wait(("pinned", "/media/b.mkv"))
+    threads = queue.threads
+
+    env.gate.set()
+    assert queue.shutdown(timeout=5)
+
+    assert queue.threads == []
+    assert not any(thread.is_alive() for thread in threads)
+    assert "/media/b.mkv" not in env.pinned
+    assert queue.get_job("a").status == "completed"
+
+
+def test_interrupted_jobs_requeued_in_priority_order(temp_db):
+    from app import create_app
+    from db.whisper import (
+        create_whisper_job,
+        get_whisper_job,
+        requeue_unfinished_whisper_jobs,
+        update_whisper_job,
+    )
+
+    app = create_app(testing=True)
+    with app.app_context():
+        create_whisper_job("late", "/media/a.mkv", "ja", None, PRIORITY_BACKGROUND)
+        create_whisper_job("running", "/media/b.mkv", "ja", 1, PRIORITY_BACKGROUND)
+        create_whisper_job("user", "/media/c.mkv", "ja", None, PRIORITY_INTERACTIVE)
+        create_whisper_job("done", "/media/d.mkv", "ja", None, PRIORITY_INTERACTIVE)
+        update_whisper_job("running", status="transcribing", progress=0.5)
+        update_whisper_job("done", status="completed")
+
+        rows = requeue_unfinished_whisper_jobs()
+
+        assert [row["id"] for row in rows] == ["user", "late", "running"]
+        assert rows[2]["audio_track_index"] == 1
+        assert get_whisper_job("running")["status"] == "queued"
+        assert get_whisper_job("done")["status"] == "completed"
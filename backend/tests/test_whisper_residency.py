@@ -0,0 +1,149 @@
+"""Tests for Whisper model residency (whisper/residency.py)."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import metrics
+from whisper import faster_whisper_backend
+from whisper.residency import ModelResidency, select_model_size
+
+
+@pytest.fixture()
+def events(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        metrics,
+        "record_whisper_model_event",
+        lambda event, model, duration=None: recorded.append((event, model)),
+    )
+    return recorded
+
+
+def _loader(label, calls):
+    def load():
+        calls.append(label)
+        return object(), label
+
+    return load
+
+
+def test_model_loaded_once_and_replaced_on_key_change(events):
+    residency = ModelResidency("test")
+    calls = []
+
+    first = residency.get(("medium",), _loader("medium", calls))
+    assert residency.get(("medium",), _loader("medium", calls)) is first
+    residency.get(("small",), _loader("small", calls))
+
+    assert calls == ["medium", "small"]
+    assert events == [("load", "medium"), ("unload", "medium"), ("load", "small")]
+
+
+def test_idle_unload_waits_for_timeout_and_running_jobs(events):
+    residency = ModelResidency("test", idle_timeout=60)
+    residency.get("k", _loader("medium", []))
+    now = time.monotonic()
+
+    assert residency.unload_if_idle(now + 30) is False
+    with residency.using():
+        assert residency.unload_if_idle(now + 3600) is False
+        assert residency.unload() is False
+    assert residency.unload_if_idle(time.monotonic() + 61) is True
+    assert not residency.loaded
+    assert events[-1] == ("unload", "medium")
+
+
+def test_prewarm_loads_in_background_once(events):
+    residency = ModelResidency("test")
+    calls = []
+
+    assert residency.prewarm("k", _loader("medium", calls)) is True
+    deadline = time.time() + 5
+    while not residency.loaded and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert residency.prewarm("k", _loader("medium", calls)) is False
+    assert calls == ["medium"]
+    assert ("prewarm", "medium") in events
+
+
+@pytest.mark.parametrize(
+    ("available", "expected"),
+    [(16000, "large-v3"), (4000, "medium"), (1200, "tiny"), (None, "medium")],
+)
+def test_select_model_size_fits_available_memory(available, expected):
+    assert select_model_size(available) == expected
+
+
+def test_backend_auto_size_uses_free_memory(monkeypatch, events):
+    model_cls = MagicMock()
+    monkeypatch.setattr(faster_whisper_backend, "HAS_FASTER_WHISPER", True)
+    monkeypatch.setattr(faster_whisper_backend, "WhisperModel", model_cls, raising=False)
+    monkeypatch.setattr(faster_whisper_backend, "available_memory_mb", lambda: 2500)
+    backend = faster_whisper_backend.FasterWhisperBackend(
+        model_size="auto", device="cpu", cpu_threads="8", parallel_workers="2"
+    )
+
+    backend._get_or_load_model()
+    backend._get_or_load_model()
+
+    model_cls.assert_called_once()
+    args, kwargs = model_cls.call_args
+    assert args == ("small",)
+    assert kwargs["num_workers"] == 2 and kwargs["cpu_threads"] == 4
+    assert events == [("load", "small")]
+
+
+def test_cold_load_does_not_block_other_callers(events):
+    residency = ModelResidency("test")
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def slow_load():
+        calls.append("medium")
+        started.set()
+        assert release.wait(5)
+        return object(), "medium"
+
+    results = []
+    loaders = [
+        threading.Thread(target=lambda: results.append(residency.get("k", slow_load)))
+        for _ in range(2)
+    ]
+    loaders[0].start()
+    assert started.wait(5)
+    loaders[1].start()
+
+    # Lock-taking calls return while the load is still running
+    with residency.using():
+        assert residency.unload() is False
+    assert residency.prewarm("k", slow_load) is False
+
+    release.set()
+    for thread in loaders:
+        thread.join(5)
+    assert calls == ["medium"]
+    assert len(results) == 2 and results[0] is results[1]
+
+
+def test_invalidate_backend_releases_resident_model(monkeypatch, events):
+    from whisper import WhisperManager
+
+    monkeypatch.setattr(faster_whisper_backend, "HAS_FASTER_WHISPER", True)
+    monkeypatch.setattr(faster_whisper_backend, "WhisperModel", MagicMock(), raising=False)
+    backend = faster_whisper_backend.FasterWhisperBackend(model_size="small", device="cpu")
+    backend._get_or_load_model()
+    manager = WhisperManager()
+    manager._backend, manager._backend_name = backend, backend.name
+
+    manager.invalidate_backend()
+
+    assert not backend._residency.loaded
+    assert events == [("load", "small"), ("unload", "small")]
+    # A late pre-warm on the replaced backend does not load a second model
+    backend.prewarm()
+    assert not backend._residency.loaded
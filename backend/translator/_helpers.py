@@ -74,6 +74,7 @@ def _submit_whisper_job(mkv_path: str, arr_context: dict = None):
         import uuid
 
         from extensions import socketio
+        from media_scheduler import PRIORITY_BACKGROUND
         from routes.whisper import _get_queue
         from whisper import get_whisper_manager
 
@@ -96,6 +97,7 @@ def _submit_whisper_job(mkv_path: str, arr_context: dict = None):
             source_language=source_lang,
             whisper_manager=manager,
             socketio=socketio,
+            priority=PRIORITY_BACKGROUND,
         )
 
         logger.info(
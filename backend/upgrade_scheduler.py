@@ -163,11 +163,9 @@ class UpgradeScheduler:
     def _execute_scan(self) -> dict:
         """Core scan logic: find eligible downloads and re-queue wanted items."""
         from sqlalchemy import select
-        from sqlalchemy import update as sa_update
 
         from config import get_settings
         from db import get_db
-        from db.models.core import WantedItem
         from db.models.providers import SubtitleDownload
         from db.repositories.wanted import WantedRepository
 
@@ -228,17 +226,8 @@ class UpgradeScheduler:
                             pass
 
                     # Re-queue as upgrade candidate
-                    db.execute(
-                        sa_update(WantedItem)
-                        .where(WantedItem.id == item["id"])
-                        .values(
-                            status="wanted",
-                            upgrade_candidate=1,
-                            current_score=dl.score or 0,
-                            updated_at=datetime.now(UTC).isoformat(),
-                        )
-                    )
-                    db.commit()
+                    # Through the repository so the wanted summary snapshot stays in sync
+                    wanted_repo.mark_upgrade_candidate(item["id"], dl.score or 0)
                     logger.debug(
                         "Upgrade candidate queued: wanted_id=%d file=%s score=%d format=%s",
                         item["id"],
@@ -20,6 +20,7 @@ from ass_utils import get_media_streams, has_target_language_audio, has_target_l
 from config import get_settings, map_path
 from db.profiles import get_movie_profile, get_series_profile
 from db.wanted import batch_upsert_context, upsert_wanted_item
+from media_scheduler import PRIORITY_BACKGROUND, priority_scope
 from translator import detect_existing_target_for_lang, get_output_path_for_lang
 from upgrade_scorer import score_existing_subtitle
 
@@ -28,6 +29,9 @@ logger = logging.getLogger(__name__)
 # Every Nth scan cycle forces a full scan regardless of incremental mode
 FULL_SCAN_INTERVAL = 6
 
+# existing_sub values whose subtitle is extracted from the container instead of searched
+_EMBEDDED_SUB_TYPES = ("embedded_ass", "embedded_srt")
+
 
 _scanner = None
 _scanner_lock = threading.Lock()
@@ -103,6 +107,12 @@ def _pop_flask_extension(key: str) -> None:
         pass
 
 
+def _probe_in_background(path: str):
+    """Probe for a library scan; yields media process slots to interactive work."""
+    with priority_scope(PRIORITY_BACKGROUND):
+        return get_media_streams(path, True)
+
+
 class WantedScanner:
     """Scans Sonarr/Radarr for episodes/movies missing target language subtitles."""
 
@@ -113,6 +123,7 @@ class WantedScanner:
         self._searching = False
         self._timer = None
         self._search_timer = None
+        self._search_pacer = None  # PacedSearchScheduler when wanted_search_mode="paced"
         self._socketio = None
         self._app = None  # Flask app reference for background thread context
         self._progress = {"current": 0, "total": 0, "phase": "", "added": 0, "updated": 0}
@@ -144,6 +155,13 @@ class WantedScanner:
     def last_search_at(self):
         return self._last_search_at
 
+    @property
+    def search_pacer_status(self):
+        """Status of the paced search scheduler, or None in burst mode."""
+        if self._search_pacer is None:
+            return None
+        return self._search_pacer.status
+
     @property
     def last_summary(self):
         return self._last_summary
@@ -237,7 +255,7 @@ class WantedScanner:
                 from config import get_settings as _get_standalone_settings
 
                 if getattr(_get_standalone_settings(), "standalone_enabled", False):
-                    sa, su, sp = self._scan_standalone()
+                    sa, su, sp = self._scan_standalone(full=not is_incremental)
                     added += sa
                     updated += su
                     scanned_paths.update(sp)
@@ -569,9 +587,19 @@ class WantedScanner:
         from config import get_settings
 
         max_workers = getattr(get_settings(), "scan_metadata_max_workers", 4)
+
+        # Load every cached probe row for the batch in one query; worker
+        # threads then hit the in-process LRU instead of the DB
+        try:
+            from db.cache import prefetch_ffprobe_cache
+
+            prefetch_ffprobe_cache(paths)
+        except Exception as e:
+            logger.debug("probe cache prefetch failed: %s", e)
+
         results = {}
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_path = {executor.submit(get_media_streams, p, True): p for p in paths}
+            future_to_path = {executor.submit(_probe_in_background, p): p for p in paths}
             for future in as_completed(future_to_path):
                 path = future_to_path[future]
                 try:
@@ -818,11 +846,11 @@ class WantedScanner:
 
         return total_added, total_updated, all_paths
 
-    def _scan_standalone(self) -> tuple:
+    def _scan_standalone(self, full: bool = False) -> tuple:
         """Scan standalone watched folders for wanted items.
 
-        Creates a StandaloneScanner, runs a full scan, and collects
-        scanned file paths from standalone entries in the DB.
+        Creates a StandaloneScanner, runs a scan (incremental unless *full*),
+        and collects scanned file paths from standalone entries in the DB.
 
         Returns:
             Tuple of (added, updated, scanned_paths).
@@ -832,7 +860,7 @@ class WantedScanner:
         if not hasattr(self, "_standalone_scanner"):
             self._standalone_scanner = StandaloneScanner()
 
-        summary = self._standalone_scanner.scan_all_folders()
+        summary = self._standalone_scanner.scan_all_folders(full=full)
         added = summary.get("wanted_added", 0)
         updated = 0
 
@@ -904,6 +932,10 @@ class WantedScanner:
     def search_all(self, socketio=None) -> dict:
         """Search providers for all wanted items (respects max_items_per_run).
 
+        Items are selected by get_search_eligible_items(): only rows that are
+        due (retry_after passed, attempts left) are loaded, in the configured
+        priority order, so every run fills its budget with searchable items.
+
         Uses ThreadPoolExecutor for parallel item processing instead of
         sequential processing with sleep delays. Provider-level rate limiting
         and circuit breakers handle concurrency safety.
@@ -920,56 +952,15 @@ class WantedScanner:
 
         try:
             settings = get_settings()
-            max_items = settings.wanted_search_max_items_per_run
-
-            from db.wanted import get_wanted_items
-
-            result = get_wanted_items(page=1, per_page=max_items, status="wanted")
-            items = result.get("data", [])
-
-            # Filter: adaptive backoff (or fixed 1h fallback when disabled)
-            eligible = []
-            now = datetime.now(UTC)
-            adaptive_enabled = getattr(settings, "wanted_adaptive_backoff_enabled", True)
-
-            for item in items:
-                if adaptive_enabled:
-                    # Respect retry_after timestamp (exponential backoff)
-                    retry_after_str = item.get("retry_after")
-                    if retry_after_str:
-                        try:
-                            retry_at = datetime.fromisoformat(retry_after_str)
-                            # Ensure both datetimes are comparable (add UTC if naive)
-                            if retry_at.tzinfo is None:
-                                retry_at = retry_at.replace(tzinfo=UTC)
-                            if now < retry_at:
-                                continue
-                        except (ValueError, TypeError):
-                            pass
-                else:
-                    # Fallback: fixed 1h cooldown when backoff disabled
-                    last_str = item.get("last_search_at")
-                    if last_str:
-                        try:
-                            last = datetime.fromisoformat(last_str)
-                            if last.tzinfo is None:
-                                last = last.replace(tzinfo=UTC)
-                            if (now - last).total_seconds() < 3600:
-                                continue
-                        except (ValueError, TypeError):
-                            pass
-
-                if item["search_count"] < settings.wanted_max_search_attempts:
-                    eligible.append(item)
+            eligible = self._search_eligible(settings.wanted_search_max_items_per_run)
 
             if not eligible:
                 self._last_search_at = datetime.now(UTC).isoformat()
                 return {"total": 0, "processed": 0, "found": 0, "failed": 0, "skipped": 0}
 
             # Split: items with embedded subs go to extraction, not provider search
-            _embedded_types = ("embedded_ass", "embedded_srt")
-            embedded_items = [i for i in eligible if i.get("existing_sub") in _embedded_types]
-            search_items = [i for i in eligible if i.get("existing_sub") not in _embedded_types]
+            embedded_items = [i for i in eligible if i.get("existing_sub") in _EMBEDDED_SUB_TYPES]
+            search_items = [i for i in eligible if i.get("existing_sub") not in _EMBEDDED_SUB_TYPES]
 
             if embedded_items:
                 logger.info(
@@ -977,8 +968,6 @@ class WantedScanner:
                     len(embedded_items),
                 )
 
-            from wanted_search import process_wanted_item
-
             total = len(eligible)
             processed = 0
             found = 0
@@ -986,19 +975,10 @@ class WantedScanner:
             skipped = 0
 
             # Extract embedded-sub items first (no provider calls needed)
-            auto_translate = getattr(settings, "wanted_auto_translate", False)
             for item in embedded_items:
-                try:
-                    from routes.wanted import _extract_embedded_sub
-
-                    _extract_embedded_sub(
-                        item["id"], item["file_path"], auto_translate=auto_translate
-                    )
+                if self._extract_or_search(item)["status"] == "found":
                     found += 1
-                except Exception as exc:
-                    logger.warning(
-                        "[search_all] Extraction failed for item %d: %s", item["id"], exc
-                    )
+                else:
                     failed += 1
                 processed += 1
                 if socketio:
@@ -1019,7 +999,7 @@ class WantedScanner:
             max_workers = min(4, total)
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_item = {
-                    executor.submit(process_wanted_item, item["id"]): item for item in eligible
+                    executor.submit(self._extract_or_search, item): item for item in eligible
                 }
 
                 for future in as_completed(future_to_item):
@@ -1093,9 +1073,67 @@ class WantedScanner:
             self._cancel_event.clear()
             self._search_lock.release()
 
+    def _search_eligible(self, limit):
+        """Due wanted items to search next, in the configured priority order.
+
+        Eligibility (backoff, fixed 1h cooldown, attempt limit) is decided in
+        SQL so backed-off items never eat into the per-run budget.
+        """
+        from db.wanted import get_search_eligible_items
+
+        settings = get_settings()
+        priority = [p.strip() for p in settings.wanted_search_priority.split(",") if p.strip()]
+        return get_search_eligible_items(
+            limit=limit,
+            max_attempts=settings.wanted_max_search_attempts,
+            adaptive_backoff=getattr(settings, "wanted_adaptive_backoff_enabled", True),
+            cooldown_seconds=3600,
+            priority=priority,
+            recent_days=settings.wanted_search_recent_days,
+        )
+
+    def _extract_or_search(self, item):
+        """Extract an item's embedded subtitle, or search providers when it has none.
+
+        Returns the process result dict ({wanted_id, status, ...}).
+        """
+        if item.get("existing_sub") not in _EMBEDDED_SUB_TYPES:
+            from wanted_search import process_wanted_item
+
+            return process_wanted_item(item["id"])
+
+        from routes.wanted import _extract_embedded_sub
+
+        try:
+            _extract_embedded_sub(
+                item["id"],
+                item["file_path"],
+                auto_translate=getattr(get_settings(), "wanted_auto_translate", False),
+            )
+        except Exception as exc:
+            logger.warning("Extraction failed for wanted item %d: %s", item["id"], exc)
+            return {"wanted_id": item["id"], "status": "failed", "error": str(exc)}
+        return {"wanted_id": item["id"], "status": "found"}
+
     def cancel_search(self):
-        """Signal the running search to stop after current item completions."""
+        """Signal the running search to stop after current item completions.
+
+        In paced mode this also drops the pacer queue for the current cycle.
+        """
         self._cancel_event.set()
+        if self._search_pacer is not None:
+            self._search_pacer.cancel()
+
+    def enqueue_search(self, item_id: int) -> bool:
+        """Queue a wanted item for an immediate paced search.
+
+        Returns False when the paced scheduler is not running, so callers can
+        fall back to processing the item themselves.
+        """
+        if self._search_pacer is None or not self._search_pacer.is_running:
+            return False
+        self._search_pacer.enqueue(item_id, urgent=True)
+        return True
 
     # ─── Scheduler ──────────────────────────────────────────────────────────
 
@@ -1118,7 +1156,9 @@ class WantedScanner:
 
         # Search scheduler
         search_interval = settings.wanted_search_interval_hours
-        if search_interval > 0:
+        if search_interval > 0 and settings.wanted_search_mode == "paced":
+            self._start_search_pacer(search_interval)
+        elif search_interval > 0:
             if settings.wanted_search_on_startup:
                 thread = threading.Thread(
                     target=self._run_search_with_context,
@@ -1139,6 +1179,9 @@ class WantedScanner:
         if self._search_timer:
             self._search_timer.cancel()
             self._search_timer = None
+        if self._search_pacer:
+            self._search_pacer.stop()
+            self._search_pacer = None
         logger.info("Wanted schedulers stopped")
 
     def _schedule_next_scan(self, interval_hours):
@@ -1188,3 +1231,49 @@ class WantedScanner:
         logger.info("Wanted scheduled search starting")
         self._run_search_with_context(self._socketio)
         self._schedule_next_search(interval_hours)
+
+    # ─── Paced Search ───────────────────────────────────────────────────────
+
+    def _start_search_pacer(self, interval_hours):
+        """Start the continuous paced search scheduler (replaces hourly bursts)."""
+        from wanted_search.scheduler import PacedSearchScheduler
+
+        settings = get_settings()
+        self._search_pacer = PacedSearchScheduler(
+            run_item=self._run_paced_item,
+            refill=self._refill_paced_queue,
+            interval_seconds=interval_hours * 3600,
+            max_items_per_cycle=settings.wanted_search_max_items_per_run,
+            on_progress=self._emit_paced_progress,
+            is_paused=lambda: self._searching,
+        )
+        self._search_pacer.start(delay_first=not settings.wanted_search_on_startup)
+
+    def _with_app_context(self, fn, *args):
+        if self._app is not None:
+            with self._app.app_context():
+                return fn(*args)
+        return fn(*args)
+
+    def _refill_paced_queue(self, limit):
+        """Load the next batch of due wanted items for the pacer."""
+        return self._with_app_context(self._search_eligible, limit)
+
+    def _run_paced_item(self, item_id):
+        """Search (or extract) a single wanted item for the pacer."""
+        return self._with_app_context(self._process_single_item, item_id)
+
+    def _process_single_item(self, item_id):
+        from db.wanted import get_wanted_item
+
+        item = get_wanted_item(item_id)
+        if not item or item.get("status") != "wanted":
+            return {"wanted_id": item_id, "status": "skipped"}
+
+        result = self._extract_or_search(item)
+        self._last_search_at = datetime.now(UTC).isoformat()
+        return {**result, "title": item.get("title", str(item_id))}
+
+    def _emit_paced_progress(self, progress):
+        if self._socketio:
+            self._socketio.emit("wanted_search_progress", progress)
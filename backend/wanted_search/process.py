@@ -22,22 +22,23 @@ logger = logging.getLogger(__name__)
 def _try_auto_sync(subtitle_path: str, video_path: str, settings) -> None:
     """Enqueue a sync job if auto_sync_after_download is enabled.
 
-    Only ffsubsync is supported for auto-sync (alass requires a reference track).
+    Supports the native speech-profile engine (with ffsubsync/alass fallback)
+    and ffsubsync; alass alone requires a reference track.
     Errors are logged but never propagated — sync is best-effort.
     """
     if not getattr(settings, "auto_sync_after_download", False):
         return
-    engine = getattr(settings, "auto_sync_engine", "ffsubsync")
-    if engine != "ffsubsync":
+    engine = getattr(settings, "auto_sync_engine", "native")
+    if engine not in ("native", "ffsubsync"):
         logger.warning(
             "Auto-sync: alass requires a reference track — skipping auto-sync for %s", subtitle_path
         )
         return
     try:
-        from services.video_sync import SyncUnavailableError, sync_with_ffsubsync
+        from services.video_sync import SyncUnavailableError, auto_sync
 
-        logger.info("Auto-sync: starting ffsubsync for %s against %s", subtitle_path, video_path)
-        sync_with_ffsubsync(subtitle_path, video_path)
+        logger.info("Auto-sync: starting %s for %s against %s", engine, subtitle_path, video_path)
+        auto_sync(subtitle_path, video_path, engine)
         logger.info("Auto-sync: complete for %s", subtitle_path)
     except SyncUnavailableError as e:
         logger.warning("Auto-sync skipped: %s", e)
@@ -0,0 +1,307 @@
+"""Continuous, paced wanted-search scheduler.
+
+Replaces the "search_all() every N hours" burst with a single worker thread
+that draws items from a priority queue one at a time:
+
+- Scheduled items are refilled from get_search_eligible_items() and spread
+  evenly over the search interval (interval / max_items_per_run apart).
+- The spacing never drops below what the provider rate limits allow, so a
+  steady trickle of searches stays inside every provider's token budget
+  instead of tripping rate limits and circuit breakers.
+- Urgent items (e.g. from webhooks) jump the queue and only wait for the
+  provider spacing, so they are picked up right away.
+
+The scheduler is I/O-free by itself: the caller injects ``run_item``,
+``refill`` and ``on_progress`` callables (see WantedScanner).
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Queue priorities (lower runs first)
+PRIORITY_URGENT = 0
+PRIORITY_SCHEDULED = 10
+
+#: Hard floor between two item searches, whatever the provider budgets say.
+MIN_SPACING_SECONDS = 2.0
+
+#: How long to wait before re-checking while a burst search_all() is running.
+PAUSE_POLL_SECONDS = 5.0
+
+
+def compute_provider_spacing() -> float:
+    """Seconds between item searches allowed by the provider token budgets.
+
+    Falls back to MIN_SPACING_SECONDS when the provider manager is unavailable.
+    """
+    try:
+        from providers import get_provider_manager
+
+        return max(MIN_SPACING_SECONDS, get_provider_manager().get_min_search_spacing())
+    except Exception as e:
+        logger.debug("Provider spacing unavailable, using floor: %s", e)
+        return MIN_SPACING_SECONDS
+
+
+class PacedSearchScheduler:
+    """Single-worker wanted-search loop fed by a priority queue."""
+
+    def __init__(
+        self,
+        run_item,
+        refill,
+        interval_seconds: float,
+        max_items_per_cycle: int,
+        on_progress=None,
+        is_paused=None,
+        spacing_fn=compute_provider_spacing,
+    ):
+        """
+        Args:
+            run_item: Callable(item_id) -> result dict with a "status" key.
+            refill: Callable(limit) -> list of wanted item dicts that are due.
+            interval_seconds: Length of one scheduling cycle.
+            max_items_per_cycle: Scheduled item budget per cycle.
+            on_progress: Optional callable(progress_dict) after every item.
+            is_paused: Optional callable() -> bool; True defers scheduled work
+                (e.g. while a manual search_all() burst is running).
+            spacing_fn: Callable() -> provider-derived spacing in seconds.
+        """
+        self._run_item = run_item
+        self._refill = refill
+        self._interval = max(float(interval_seconds), 1.0)
+        self._max_items = max(int(max_items_per_cycle), 1)
+        self._on_progress = on_progress
+        self._is_paused = is_paused or (lambda: False)
+        self._spacing_fn = spacing_fn
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._heap: list = []
+        self._queued: set = set()
+        self._seq = itertools.count()
+
+        self._last_run_at = 0.0
+        self._current_item = None
+        self._reset_cycle()
+
+    # ------------------------------------------------------------------ public
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def status(self) -> dict:
+        """Snapshot of queue depth, pacing and current-cycle counters."""
+        with self._lock:
+            return {
+                "running": self.is_running,
+                "queue_depth": len(self._heap),
+                "current_item": self._current_item,
+                "spacing_seconds": round(self._scheduled_spacing(), 1),
+                "cycle_started_at": self._cycle_started_wall,
+                "cycle_cancelled": self._cycle_cancelled,
+                **self._progress_locked(),
+            }
+
+    def start(self, delay_first: bool = False):
+        """Start the worker thread (no-op if already running).
+
+        Args:
+            delay_first: Wait one scheduled slot before the first search
+                instead of starting immediately.
+        """
+        if self.is_running:
+            return
+        self._stop.clear()
+        if delay_first:
+            self._last_run_at = time.monotonic()
+        self._thread = threading.Thread(target=self._loop, name="wanted-search-pacer", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Paced wanted search started (%d items per %.0fh, >= %.0fs apart)",
+            self._max_items,
+            self._interval / 3600,
+            self._scheduled_spacing(),
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker thread after the current item finishes."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def enqueue(self, item_id: int, urgent: bool = True) -> bool:
+        """Queue a wanted item; urgent items run before scheduled ones.
+
+        Returns False if the item is already queued.
+        """
+        priority = PRIORITY_URGENT if urgent else PRIORITY_SCHEDULED
+        with self._lock:
+            if item_id in self._queued:
+                return False
+            self._push_locked(priority, item_id)
+        self._wake.set()
+        return True
+
+    def cancel(self):
+        """Drop all queued items and skip scheduled refills until the next cycle."""
+        with self._lock:
+            self._heap.clear()
+            self._queued.clear()
+            self._cycle_cancelled = True
+        self._wake.set()
+        logger.info("Paced wanted search: queue cleared, resuming next cycle")
+
+    # ----------------------------------------------------------------- private
+
+    def _reset_cycle(self):
+        self._cycle_started = time.monotonic()
+        self._cycle_started_wall = time.time()
+        self._cycle_cancelled = False
+        self._cycle_seen: set = set()
+        self._cycle_scheduled = 0  # urgent items do not consume the budget
+        self._processed = 0
+        self._found = 0
+        self._failed = 0
+        self._skipped = 0
+
+    def _push_locked(self, priority: int, item_id: int):
+        heapq.heappush(self._heap, (priority, next(self._seq), item_id))
+        self._queued.add(item_id)
+
+    def _progress_locked(self) -> dict:
+        return {
+            "processed": self._processed,
+            "total": self._processed + len(self._heap),
+            "found": self._found,
+            "failed": self._failed,
+            "skipped": self._skipped,
+        }
+
+    def _scheduled_spacing(self) -> float:
+        return max(self._interval / self._max_items, self._provider_spacing())
+
+    def _provider_spacing(self) -> float:
+        try:
+            return max(MIN_SPACING_SECONDS, float(self._spacing_fn()))
+        except Exception:
+            return MIN_SPACING_SECONDS
+
+    def _sleep(self, seconds: float):
+        """Sleep up to *seconds*; returns early on enqueue(), cancel() or stop()."""
+        self._wake.wait(timeout=max(seconds, 0.0))
+        self._wake.clear()
+
+    def _maybe_roll_cycle(self):
+        if time.monotonic() - self._cycle_started >= self._interval:
+            with self._lock:
+                self._reset_cycle()
+
+    def _refill_queue(self):
+        """Top up scheduled items when the queue is empty and budget remains.
+
+        The refill query runs outside the lock so status(), enqueue() and
+        cancel() are not stuck behind a slow database; its results are only
+        queued if the cycle was neither rolled nor cancelled meanwhile.
+        """
+        with self._lock:
+            if self._heap or self._cycle_cancelled:
+                return
+            budget = self._max_items - self._cycle_scheduled
+            if budget <= 0:
+                return
+            cycle = self._cycle_started
+            limit = budget + len(self._cycle_seen)
+        try:
+            items = self._refill(limit)
+        except Exception as e:
+            logger.warning("Paced wanted search: refill failed: %s", e)
+            return
+        with self._lock:
+            if self._cycle_cancelled or self._cycle_started != cycle:
+                return
+            budget = self._max_items - self._cycle_scheduled
+            for item in items:
+                if budget <= 0:
+                    break
+                item_id = item["id"]
+                if item_id in self._cycle_seen or item_id in self._queued:
+                    continue
+                self._push_locked(PRIORITY_SCHEDULED, item_id)
+                budget -= 1
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._maybe_roll_cycle()
+            self._refill_queue()
+            with self._lock:
+                head = self._heap[0] if self._heap else None
+
+            if head is None:
+                # Nothing due: re-check after one scheduled slot (or on enqueue)
+                self._sleep(self._scheduled_spacing())
+                continue
+
+            priority = head[0]
+            spacing = (
+                self._provider_spacing()
+                if priority == PRIORITY_URGENT
+                else self._scheduled_spacing()
+            )
+            delay = self._last_run_at + spacing - time.monotonic()
+            if delay > 0:
+                self._sleep(delay)
+                continue
+            if priority != PRIORITY_URGENT and self._is_paused():
+                self._sleep(PAUSE_POLL_SECONDS)
+                continue
+
+            with self._lock:
+                if not self._heap or self._heap[0] != head:
+                    continue  # queue changed (cancel/enqueue) while we waited
+                heapq.heappop(self._heap)
+                item_id = head[2]
+                self._queued.discard(item_id)
+                self._cycle_seen.add(item_id)
+                if priority != PRIORITY_URGENT:
+                    self._cycle_scheduled += 1
+                self._current_item = item_id
+
+            self._last_run_at = time.monotonic()
+            self._run_one(item_id)
+
+    def _run_one(self, item_id: int):
+        try:
+            result = self._run_item(item_id) or {}
+        except Exception as e:
+            logger.warning("Paced wanted search: error on item %d: %s", item_id, e)
+            result = {"wanted_id": item_id, "status": "failed", "error": str(e)}
+
+        with self._lock:
+            self._processed += 1
+            status = result.get("status")
+            if status == "found":
+                self._found += 1
+            elif status == "failed":
+                self._failed += 1
+            else:
+                self._skipped += 1
+            self._current_item = None
+            progress = self._progress_locked()
+
+        if self._on_progress is not None:
+            try:
+                self._on_progress({**progress, "current_item": result.get("title", item_id)})
+            except Exception as e:
+                logger.debug("Paced wanted search: progress callback failed: %s", e)
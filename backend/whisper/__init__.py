@@ -151,10 +151,30 @@ class WhisperManager:
                 backend_name=self._backend_name or "",
             )
 
+    def prewarm(self) -> None:
+        """Let the active backend prepare for queued work (best-effort)."""
+        backend = self.get_active_backend()
+        if backend is None:
+            return
+        try:
+            backend.prewarm()
+        except Exception as e:
+            logger.debug("Whisper backend %s prewarm failed: %s", self._backend_name, e)
+
     def invalidate_backend(self) -> None:
-        """Clear cached backend instance (for config changes)."""
+        """Clear cached backend instance (for config changes).
+
+        The old instance is closed so a resident model is freed now rather
+        than after its idle timeout.
+        """
+        backend = self._backend
         self._backend = None
         self._backend_name = None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception as e:
+                logger.warning("Failed to close whisper backend %s: %s", backend.name, e)
         logger.info("Invalidated whisper backend instance")
 
     def _load_backend_config(self, name: str) -> dict:
@@ -233,6 +253,8 @@ def get_whisper_manager() -> WhisperManager:
 def invalidate_whisper_manager() -> None:
     """Destroy the singleton instance (for testing or config reload)."""
     global _manager
+    if _manager is not None:
+        _manager.invalidate_backend()
     _manager = None
 
 
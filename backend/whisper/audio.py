@@ -1,7 +1,8 @@
 """Audio extraction utilities for Whisper speech-to-text.
 
-Provides ffprobe-based audio stream selection and ffmpeg-based audio
-extraction to 16kHz mono WAV (optimal for Whisper models).
+Provides ffprobe-based audio stream selection. Decoding the selected track
+to 16kHz mono WAV (optimal for Whisper models) is done by the shared
+audio_cache module.
 """
 
 import json
@@ -9,6 +10,8 @@ import logging
 import os
 import subprocess
 
+from media_scheduler import PROBE, run_media
+
 logger = logging.getLogger(__name__)
 
 # ISO 639 language tag mapping: maps short codes to all known variants.
@@ -65,7 +68,8 @@ def get_audio_streams(file_path: str) -> list[dict]:
     ]
 
     try:
-        proc = subprocess.run(
+        proc = run_media(
+            PROBE,
             cmd,
             capture_output=True,
             timeout=30,
@@ -198,72 +202,3 @@ def get_audio_track_by_index(file_path: str, index: int) -> dict:
         track["channels"],
     )
     return track
-
-
-def extract_audio_to_wav(
-    file_path: str,
-    stream_index: int,
-    output_path: str,
-) -> str:
-    """Extract an audio track to 16kHz mono WAV (optimal for Whisper).
-
-    Args:
-        file_path: Path to the media file
-        stream_index: Audio stream index to extract
-        output_path: Path to write the WAV file
-
-    Returns:
-        The output_path on success
-
-    Raises:
-        RuntimeError: If ffmpeg fails or is not available
-    """
-    cmd = [
-        "ffmpeg",
-        "-i",
-        file_path,
-        "-map",
-        f"0:a:{stream_index}",
-        "-acodec",
-        "pcm_s16le",
-        "-ar",
-        "16000",
-        "-ac",
-        "1",
-        "-y",  # Overwrite output
-        output_path,
-    ]
-
-    logger.info(
-        "Extracting audio track %d from %s to %s",
-        stream_index,
-        os.path.basename(file_path),
-        os.path.basename(output_path),
-    )
-
-    try:
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            timeout=300,  # 5 minutes for long files
-        )
-    except FileNotFoundError:
-        raise RuntimeError("ffmpeg not found. Install ffmpeg to enable audio extraction.")
-    except subprocess.TimeoutExpired:
-        raise RuntimeError(f"ffmpeg audio extraction timed out (300s): {file_path}")
-
-    if proc.returncode != 0:
-        stderr = proc.stderr.decode("utf-8", errors="replace")[:500]
-        raise RuntimeError(f"ffmpeg failed (code {proc.returncode}): {stderr}")
-
-    if not os.path.exists(output_path):
-        raise RuntimeError(f"ffmpeg did not produce output file: {output_path}")
-
-    file_size = os.path.getsize(output_path)
-    logger.info(
-        "Extracted audio: %s (%.1f MB)",
-        os.path.basename(output_path),
-        file_size / (1024 * 1024),
-    )
-
-    return output_path
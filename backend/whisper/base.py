@@ -88,6 +88,18 @@ class WhisperBackend(ABC):
         """
         ...
 
+    def prewarm(self) -> None:
+        """Prepare for an upcoming transcription (e.g. load a local model).
+
+        Called when a job is queued; must return quickly. Default: no-op.
+        """
+
+    def close(self) -> None:
+        """Release resources such as a resident model when the backend is replaced.
+
+        Called by WhisperManager.invalidate_backend(). Default: no-op.
+        """
+
     def get_config_fields(self) -> list[dict]:
         """Return config field definitions for the Settings UI.
 
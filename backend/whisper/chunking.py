@@ -0,0 +1,116 @@
+"""Speech-aligned chunk planning for parallel transcription.
+
+Long media is split at pauses into chunks of about CHUNK_SECONDS that
+cover only detected speech, so non-speech audio (music, silence) is never
+sent to the model. Each chunk's audio slice extends OVERLAP_SECONDS past
+its content on both sides; the ``own_start``/``own_end`` intervals of all
+chunks tile the whole timeline, and a transcribed segment is kept by the
+one chunk that owns its midpoint. That removes the duplicates the overlap
+produces at split points without losing segments that drift into a gap.
+
+Speech detection reuses the cached speech profile of the native sync
+engine (services.speech_sync), so a track that was synced before is not
+analysed again.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+#: Target chunk length.
+CHUNK_SECONDS = 30.0
+#: Extra audio decoded on each side of a chunk's content.
+OVERLAP_SECONDS = 1.0
+#: Padding around each detected speech region.
+PAD_SECONDS = 0.2
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One unit of work: audio slice [start, end) owning segments in [own_start, own_end)."""
+
+    start: float
+    end: float
+    own_start: float
+    own_end: float
+
+
+def speech_regions(speech: np.ndarray, frame_seconds: float) -> list[tuple[float, float]]:
+    """Contiguous runs of True frames as (start, end) seconds."""
+    if speech.size == 0:
+        return []
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [(s * frame_seconds, e * frame_seconds) for s, e in zip(starts, ends, strict=True)]
+
+
+def plan_chunks(
+    regions: list[tuple[float, float]],
+    duration: float,
+    chunk_seconds: float = CHUNK_SECONDS,
+    overlap: float = OVERLAP_SECONDS,
+    pad: float = PAD_SECONDS,
+) -> list[Chunk]:
+    """Group speech regions into chunks of at most *chunk_seconds* of content.
+
+    Consecutive regions are merged while they fit; a region longer than a
+    chunk is split into back-to-back pieces.
+    """
+    content: list[tuple[float, float]] = []
+    current: list[float] | None = None
+    for start, end in regions:
+        start, end = max(0.0, start - pad), min(duration, end + pad)
+        if end <= start:
+            continue
+        if current is not None and end - current[0] <= chunk_seconds:
+            current[1] = max(current[1], end)
+            continue
+        if current is not None:
+            content.append((current[0], current[1]))
+            current = None
+        while end - start > chunk_seconds:
+            content.append((start, start + chunk_seconds))
+            start += chunk_seconds
+        current = [start, end]
+    if current is not None:
+        content.append((current[0], current[1]))
+
+    chunks = []
+    for i, (start, end) in enumerate(content):
+        own_start = 0.0 if i == 0 else (content[i - 1][1] + start) / 2
+        own_end = duration if i == len(content) - 1 else (end + content[i + 1][0]) / 2
+        chunks.append(
+            Chunk(
+                start=max(0.0, start - overlap),
+                end=min(duration, end + overlap),
+                own_start=own_start,
+                own_end=own_end,
+            )
+        )
+    return chunks
+
+
+def plan_from_wav(wav_path: str, duration: float, **kwargs) -> list[Chunk]:
+    """Plan chunks over the (cached) speech profile of a 16 kHz mono WAV."""
+    from services.speech_sync import FRAME_SECONDS, get_wav_speech_profile
+
+    speech = get_wav_speech_profile(wav_path)
+    return plan_chunks(speech_regions(speech, FRAME_SECONDS), duration, **kwargs)
+
+
+def stitch(chunk_segments: list[tuple[Chunk, list]]) -> list[tuple[float, float, str]]:
+    """Merge per-chunk segments (chunk-relative times) into one timeline.
+
+    Returns:
+        Sorted (start, end, text) tuples in absolute seconds
+    """
+    merged = []
+    for chunk, segments in chunk_segments:
+        for segment in segments:
+            start = min(chunk.end, chunk.start + segment.start)
+            end = min(chunk.end, chunk.start + segment.end)
+            if chunk.own_start <= (start + end) / 2 < chunk.own_end:
+                merged.append((start, end, segment.text.strip()))
+    merged.sort(key=lambda s: s[0])
+    return merged
@@ -4,18 +4,42 @@ Uses the faster-whisper library (CTranslate2) for efficient local
 speech-to-text transcription. Supports GPU acceleration with CUDA,
 VAD filtering for better accuracy, and various model sizes.
 
+Audio from the shared audio cache (16 kHz mono s16le WAV) is handed to
+the model as a float32 array read straight from the PCM payload, skipping
+faster-whisper's own container decode and resample of the file.
+
+On CPU hosts, ``parallel_workers`` > 1 enables segmented mode for long
+media: speech is detected first, split at pauses into ~30 s chunks
+(whisper.chunking) and the chunks are transcribed concurrently on one
+model with that many CTranslate2 workers, each limited to its share of
+``cpu_threads``. Non-speech audio is skipped entirely.
+
 The faster-whisper package is optional. If not installed, this backend
 simply won't be registered (ImportError caught in whisper/__init__.py).
 """
 
 import logging
+import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from whisper.base import TranscriptionResult, WhisperBackend
+from whisper.chunking import CHUNK_SECONDS, plan_from_wav, stitch
+from whisper.residency import (
+    MODEL_MEMORY_MB,
+    ModelResidency,
+    available_memory_mb,
+    select_model_size,
+)
 
 logger = logging.getLogger(__name__)
 
+#: Sample rate faster-whisper expects for array input.
+MODEL_SAMPLE_RATE = 16000
+
 # Guard import: faster-whisper is optional
 try:
     from faster_whisper import WhisperModel
@@ -34,12 +58,26 @@ def _format_srt_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
+def _load_audio(audio_path: str):
+    """Cached 16 kHz mono WAV -> float32 array; any other input stays a path."""
+    if not audio_path.lower().endswith(".wav"):
+        return audio_path
+    from audio_cache import load_pcm
+
+    try:
+        return load_pcm(audio_path, MODEL_SAMPLE_RATE)
+    except (OSError, RuntimeError) as e:
+        logger.debug("Decoding %s through faster-whisper instead: %s", audio_path, e)
+        return audio_path
+
+
 class FasterWhisperBackend(WhisperBackend):
     """Local faster-whisper transcription backend.
 
     Uses CTranslate2 for efficient inference with support for GPU (CUDA)
-    and CPU modes. Lazy-loads the model on first transcription to avoid
-    holding GPU memory when idle.
+    and CPU modes. The model is loaded on first use (or pre-warmed when a
+    job is queued) and unloaded after ``idle_unload_minutes`` without
+    work, so it does not hold memory between bursts.
     """
 
     name = "faster_whisper"
@@ -53,7 +91,8 @@ class FasterWhisperBackend(WhisperBackend):
             "type": "text",
             "required": True,
             "default": "medium",
-            "help": "Model: tiny, base, small, medium, large-v2, large-v3, distil-large-v3",
+            "help": "Model: tiny, base, small, medium, large-v2, large-v3, distil-large-v3, "
+            "or auto (largest that fits the free memory)",
         },
         {
             "key": "device",
@@ -79,6 +118,15 @@ class FasterWhisperBackend(WhisperBackend):
             "default": "4",
             "help": "Number of CPU threads (CPU mode only)",
         },
+        {
+            "key": "parallel_workers",
+            "label": "Parallel Workers (CPU)",
+            "type": "number",
+            "required": False,
+            "default": "1",
+            "help": "CPU only: split long media at speech pauses and transcribe N chunks "
+            "at once, sharing CPU Threads between them (1 = off)",
+        },
         {
             "key": "beam_size",
             "label": "Beam Size",
@@ -95,6 +143,14 @@ class FasterWhisperBackend(WhisperBackend):
             "default": "true",
             "help": "Enable Silero VAD for better accuracy (recommended for anime)",
         },
+        {
+            "key": "idle_unload_minutes",
+            "label": "Unload When Idle (min)",
+            "type": "number",
+            "required": False,
+            "default": "30",
+            "help": "Free the model's memory after this many idle minutes (0 = keep loaded)",
+        },
         {
             "key": "model_path",
             "label": "Model Storage Path",
@@ -107,64 +163,101 @@ class FasterWhisperBackend(WhisperBackend):
 
     def __init__(self, **config):
         super().__init__(**config)
-        self._model = None
-        self._loaded_model_size = None
-        self._loaded_device = None
-        self._loaded_compute_type = None
+        idle_minutes = float(self.config.get("idle_unload_minutes", "30") or 0)
+        self._residency = ModelResidency(self.name, idle_timeout=idle_minutes * 60)
+
+    def _resolve_device(self) -> str:
+        """Configured device with "auto" resolved to cuda or cpu."""
+        device = self.config.get("device", "auto")
+        if device != "auto":
+            return device
+        try:
+            import ctranslate2
+
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except Exception:
+            return "cpu"
+
+    def _parallel_workers(self) -> int:
+        """Configured segmented-mode workers; 1 unless the model runs on CPU."""
+        workers = max(1, int(self.config.get("parallel_workers", "1") or 1))
+        if workers == 1:
+            return 1
+        return workers if self._resolve_device() == "cpu" else 1
+
+    def _model_key(self) -> tuple:
+        return (
+            self.config.get("model_size", "medium"),
+            self.config.get("device", "auto"),
+            self.config.get("compute_type", "auto"),
+            int(self.config.get("cpu_threads", "4")),
+            self._parallel_workers(),
+        )
 
     def _get_or_load_model(self):
-        """Lazy-load the WhisperModel, caching until config changes.
+        """Return the resident WhisperModel, loading it on first use.
 
-        Only reloads if model_size, device, or compute_type changed since
-        last load. Logs model loading time.
+        Only reloads if model_size, device, compute_type or the worker
+        layout changed since the last load; an idle model is unloaded by
+        the residency manager and transparently reloaded here.
         """
         if not HAS_FASTER_WHISPER:
             raise RuntimeError("faster-whisper package not installed")
+        return self._residency.get(self._model_key(), self._load_model)
+
+    def prewarm(self) -> None:
+        """Start loading the model in the background if it is not resident."""
+        if HAS_FASTER_WHISPER:
+            self._residency.prewarm(self._model_key(), self._load_model)
+
+    def close(self) -> None:
+        """Unload the resident model so a replacement backend does not double RAM use."""
+        self._residency.close("backend replaced")
 
+    def _select_model_size(self, device: str) -> str:
+        """Configured model size; "auto" picks the largest that fits free memory."""
         model_size = self.config.get("model_size", "medium")
+        if device != "cpu":
+            return "large-v3" if model_size == "auto" else model_size
+
+        free_mb = available_memory_mb()
+        if model_size == "auto":
+            model_size = select_model_size(free_mb)
+            logger.info("Whisper model auto-selected: %s (%s MB available)", model_size, free_mb)
+        elif free_mb is not None and MODEL_MEMORY_MB.get(model_size, 0) > free_mb:
+            logger.warning(
+                "Whisper model '%s' needs ~%d MB but only %d MB are available",
+                model_size,
+                MODEL_MEMORY_MB[model_size],
+                free_mb,
+            )
+        return model_size
+
+    def _load_model(self):
+        _, _, compute_type, cpu_threads, workers = self._model_key()
         device = self.config.get("device", "auto")
-        compute_type = self.config.get("compute_type", "auto")
-        cpu_threads = int(self.config.get("cpu_threads", "4"))
+        model_size = self._select_model_size(self._resolve_device())
         model_path = self.config.get("model_path", "/config/whisper-models")
 
-        # Check if we need to reload
-        if (
-            self._model is not None
-            and self._loaded_model_size == model_size
-            and self._loaded_device == device
-            and self._loaded_compute_type == compute_type
-        ):
-            return self._model
-
-        # Release old model
-        if self._model is not None:
-            del self._model
-            self._model = None
-
+        # CTranslate2 gives each worker its own thread pool
+        threads_per_worker = max(1, cpu_threads // workers)
         logger.info(
-            "Loading Whisper model '%s' (device=%s, compute_type=%s, threads=%d)",
+            "Loading Whisper model '%s' (device=%s, compute_type=%s, workers=%d x %d threads)",
             model_size,
             device,
             compute_type,
-            cpu_threads,
+            workers,
+            threads_per_worker,
         )
-
-        start = time.time()
-        self._model = WhisperModel(
+        model = WhisperModel(
             model_size,
             device=device,
             compute_type=compute_type,
-            cpu_threads=cpu_threads,
+            cpu_threads=threads_per_worker,
+            num_workers=workers,
             download_root=model_path,
         )
-        elapsed = time.time() - start
-
-        self._loaded_model_size = model_size
-        self._loaded_device = device
-        self._loaded_compute_type = compute_type
-
-        logger.info("Whisper model '%s' loaded in %.1fs", model_size, elapsed)
-        return self._model
+        return model, model_size
 
     def transcribe(
         self,
@@ -184,6 +277,17 @@ class FasterWhisperBackend(WhisperBackend):
         Returns:
             TranscriptionResult with SRT content and metadata
         """
+        # Keeps the idle watcher from unloading the model mid-transcription
+        with self._residency.using():
+            return self._transcribe_resident(audio_path, language, task, progress_callback)
+
+    def _transcribe_resident(
+        self,
+        audio_path: str,
+        language: str,
+        task: str,
+        progress_callback: Callable[[float], None] | None,
+    ) -> TranscriptionResult:
         try:
             model = self._get_or_load_model()
         except Exception as e:
@@ -197,21 +301,32 @@ class FasterWhisperBackend(WhisperBackend):
         vad_filter_str = self.config.get("vad_filter", "true")
         vad_filter = vad_filter_str.lower() in ("true", "1", "yes")
 
+        options = {
+            "task": task,
+            "beam_size": beam_size,
+            "vad_filter": vad_filter,
+            "vad_parameters": {
+                "min_silence_duration_ms": 500,
+                "speech_pad_ms": 400,
+            },
+            "word_timestamps": False,
+        }
+
         start_time = time.time()
 
         try:
-            segments_gen, info = model.transcribe(
-                audio_path,
-                language=language or None,
-                task=task,
-                beam_size=beam_size,
-                vad_filter=vad_filter,
-                vad_parameters={
-                    "min_silence_duration_ms": 500,
-                    "speech_pad_ms": 400,
-                },
-                word_timestamps=False,
-            )
+            audio = _load_audio(audio_path)
+            workers = self._parallel_workers()
+            if (
+                workers > 1
+                and isinstance(audio, np.ndarray)
+                and audio.size > 2 * CHUNK_SECONDS * MODEL_SAMPLE_RATE
+            ):
+                return self._transcribe_segmented(
+                    model, audio, audio_path, language, options, workers, progress_callback
+                )
+
+            segments_gen, info = model.transcribe(audio, language=language or None, **options)
 
             # Build SRT content from segments
             srt_lines = []
@@ -266,6 +381,80 @@ class FasterWhisperBackend(WhisperBackend):
                 processing_time_ms=elapsed_ms,
             )
 
+    def _transcribe_segmented(
+        self,
+        model,
+        audio: np.ndarray,
+        audio_path: str,
+        language: str,
+        options: dict,
+        workers: int,
+        progress_callback: Callable[[float], None] | None,
+    ) -> TranscriptionResult:
+        """Transcribe speech chunks concurrently and stitch them into one SRT."""
+        start_time = time.time()
+        duration = audio.size / MODEL_SAMPLE_RATE
+        chunks = plan_from_wav(audio_path, duration)
+        if not chunks:
+            return TranscriptionResult(
+                srt_content="",
+                detected_language=language,
+                duration_seconds=duration,
+                backend_name=self.name,
+                processing_time_ms=(time.time() - start_time) * 1000,
+            )
+
+        done = 0
+        done_lock = threading.Lock()
+
+        def run(chunk, chunk_language):
+            nonlocal done
+            a, b = int(chunk.start * MODEL_SAMPLE_RATE), int(chunk.end * MODEL_SAMPLE_RATE)
+            segments, info = model.transcribe(audio[a:b], language=chunk_language, **options)
+            segments = list(segments)  # decoding happens while iterating
+            with done_lock:
+                done += 1
+                if progress_callback:
+                    progress_callback(done / len(chunks))
+            return segments, info
+
+        # Detect the language once on the first chunk, then pin it for the rest
+        first_segments, info = run(chunks[0], language or None)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-chunk") as pool:
+            rest = list(pool.map(lambda c: run(c, info.language)[0], chunks[1:]))
+        segments = stitch(list(zip(chunks, [first_segments, *rest], strict=True)))
+
+        srt_lines = []
+        for index, (start, end, text) in enumerate(segments, 1):
+            srt_lines += [
+                str(index),
+                f"{_format_srt_timestamp(start)} --> {_format_srt_timestamp(end)}",
+                text,
+                "",
+            ]
+        elapsed_ms = (time.time() - start_time) * 1000
+        speech_seconds = sum(c.end - c.start for c in chunks)
+        logger.info(
+            "Segmented transcription complete: %d segments from %d chunks "
+            "(%.0fs of %.0fs audio, %d workers), detected=%s, %.0fms",
+            len(segments),
+            len(chunks),
+            speech_seconds,
+            duration,
+            workers,
+            info.language,
+            elapsed_ms,
+        )
+        return TranscriptionResult(
+            srt_content="\n".join(srt_lines),
+            detected_language=info.language,
+            language_probability=info.language_probability,
+            duration_seconds=duration,
+            segment_count=len(segments),
+            backend_name=self.name,
+            processing_time_ms=elapsed_ms,
+        )
+
     def health_check(self) -> tuple[bool, str]:
         """Check if faster-whisper is installed and model can be loaded.
 
@@ -1,21 +1,31 @@
-"""Whisper transcription queue with concurrency control.
-
-Manages transcription jobs with a Semaphore-based concurrency limiter,
-progress tracking via WebSocket, and persistent state in the whisper_jobs
-DB table.
+"""Whisper transcription queue with a bounded, prioritised worker pool.
+
+Jobs are picked lowest ``priority`` first (media_scheduler priorities:
+user requests before the background backlog), FIFO within a priority, by
+a fixed pool of ``max_concurrent`` worker threads. A separate prefetch
+thread selects the audio track and decodes the next jobs' audio into the
+shared audio cache while the current job transcribes, so the model does
+not sit idle during extraction.
+
+Progress is tracked via WebSocket and persisted in the whisper_jobs DB
+table; queued or interrupted jobs are resumed from there after a restart
+(see :meth:`WhisperQueue.resume_pending`).
 """
 
+import contextlib
+import heapq
+import itertools
 import logging
-import os
-import tempfile
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from audio_cache import cached_audio
 from db.whisper import create_whisper_job, update_whisper_job
-from whisper.audio import extract_audio_to_wav, get_audio_track_by_index, select_audio_track
+from media_scheduler import PRIORITY_NORMAL
+from whisper.audio import get_audio_track_by_index, select_audio_track
 from whisper.base import TranscriptionResult
 
 if TYPE_CHECKING:
@@ -23,6 +33,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+#: Jobs whose audio is prepared ahead of a free worker.
+DEFAULT_PREFETCH = 2
+
 
 @dataclass
 class WhisperJob:
@@ -32,6 +45,7 @@ class WhisperJob:
     file_path: str
     language: str = ""
     audio_track_index: int | None = None  # Explicit track index; None = auto-select by language
+    priority: int = PRIORITY_NORMAL  # Lower runs first
     status: str = "queued"  # queued/extracting/transcribing/saving/completed/failed/cancelled
     progress: float = 0.0
     phase: str = ""
@@ -41,19 +55,83 @@ class WhisperJob:
     started_at: str | None = None
     completed_at: str | None = None
 
+    # Execution context (not persisted)
+    source_language: str = field(default="", repr=False)
+    whisper_manager: "WhisperManager | None" = field(default=None, repr=False)
+    socketio: object = field(default=None, repr=False)
+    audio_path: str | None = field(default=None, repr=False)
+    audio: contextlib.ExitStack | None = field(default=None, repr=False)
+    prepare_error: Exception | None = field(default=None, repr=False)
 
-class WhisperQueue:
-    """Queue for managing Whisper transcription jobs with concurrency control.
 
-    Uses a threading.Semaphore to limit concurrent transcriptions (typically 1
-    for GPU workloads). Jobs are tracked in-memory and persisted to the DB.
+class WhisperQueue:
+    """Prioritised queue for Whisper transcription jobs.
+
+    ``max_concurrent`` worker threads (typically 1 for GPU workloads) are
+    started on first use and live until :meth:`shutdown`; submitting a job
+    never creates a thread. Jobs wait in a heap ordered by (priority, submit
+    order). Up to ``prefetch`` waiting jobs have their audio decoded and
+    pinned ahead of time; a worker always takes the best job overall, and
+    prepares its audio inline if the prefetcher has not reached it yet.
     """
 
-    def __init__(self, max_concurrent: int = 1):
-        self._semaphore = threading.Semaphore(max_concurrent)
+    def __init__(self, max_concurrent: int = 1, prefetch: int = DEFAULT_PREFETCH, app=None):
+        self._max_concurrent = max(1, max_concurrent)
+        self._prefetch = max(0, prefetch)
+        self._app = app  # Flask app for DB access from worker threads
         self._jobs: dict[str, WhisperJob] = {}
         self._lock = threading.Lock()
-        self._max_concurrent = max_concurrent
+        self._cond = threading.Condition(self._lock)
+        self._pending: list[tuple[int, int, str]] = []  # audio not prepared yet
+        self._ready: list[tuple[int, int, str]] = []  # audio prepared and pinned
+        self._preparing = 0
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()  # stop signal of the current pool
+
+    @property
+    def threads(self) -> list[threading.Thread]:
+        """Worker and prefetch threads of the running pool."""
+        with self._lock:
+            return list(self._threads)
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """Stop the worker pool and wait for its threads to exit.
+
+        A transcription that is already running is finished first. Waiting
+        jobs stay queued, with their prefetched audio released; the next
+        submit() starts a new pool for them.
+
+        Args:
+            timeout: Max seconds to wait for the threads (None = no limit)
+
+        Returns:
+            True if every thread exited in time
+        """
+        with self._cond:
+            threads, self._threads = self._threads, []
+            self._stop.set()
+            self._stop = threading.Event()
+            self._cond.notify_all()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+        released = []
+        with self._cond:
+            while self._ready:
+                entry = heapq.heappop(self._ready)
+                job = self._jobs.get(entry[2])
+                if job is not None and job.audio is not None:
+                    released.append(job.audio)
+                    job.audio = None
+                    job.audio_path = None
+                heapq.heappush(self._pending, entry)
+        for audio in released:
+            audio.close()
+        return not any(thread.is_alive() for thread in threads)
 
     def submit(
         self,
@@ -64,11 +142,12 @@ class WhisperQueue:
         whisper_manager: "WhisperManager",
         socketio=None,
         audio_track_index: int | None = None,
+        priority: int = PRIORITY_NORMAL,
     ) -> str:
         """Submit a new transcription job.
 
-        Creates the job in-memory and in the DB, then starts a daemon thread
-        for execution.
+        Creates the job in-memory and in the DB, then queues it for the
+        worker pool.
 
         Args:
             job_id: Unique job identifier
@@ -78,49 +157,78 @@ class WhisperQueue:
             whisper_manager: WhisperManager instance for transcription
             socketio: Optional Socket.IO instance for progress events
             audio_track_index: Explicit 0-based audio track index; None = auto-select by language
+            priority: media_scheduler priority; lower values are picked first
 
         Returns:
             The job_id
         """
-        now = datetime.utcnow().isoformat()
         job = WhisperJob(
             job_id=job_id,
             file_path=file_path,
             language=language,
             audio_track_index=audio_track_index,
+            priority=priority,
             status="queued",
-            created_at=now,
+            created_at=datetime.utcnow().isoformat(),
+            source_language=source_language,
+            whisper_manager=whisper_manager,
+            socketio=socketio,
         )
 
-        with self._lock:
-            self._jobs[job_id] = job
-
-        # Persist to DB
+        # Persist first so the job survives a restart while it waits
         try:
-            create_whisper_job(job_id, file_path, language, audio_track_index)
+            create_whisper_job(job_id, file_path, language, audio_track_index, priority)
         except Exception as e:
             logger.error("Failed to persist whisper job %s to DB: %s", job_id, e)
 
-        # Start worker thread
-        thread = threading.Thread(
-            target=self._run_job,
-            args=(
-                job_id,
-                file_path,
-                language,
-                source_language,
-                audio_track_index,
-                whisper_manager,
-                socketio,
-            ),
-            daemon=True,
-            name=f"whisper-job-{job_id}",
+        self._enqueue(job)
+        logger.info(
+            "Submitted whisper job %s for %s (language: %s, priority: %d)",
+            job_id,
+            file_path,
+            language,
+            priority,
         )
-        thread.start()
-
-        logger.info("Submitted whisper job %s for %s (language: %s)", job_id, file_path, language)
         return job_id
 
+    def resume_pending(self, whisper_manager: "WhisperManager | None" = None, socketio=None) -> int:
+        """Re-queue jobs persisted as queued or interrupted by a restart.
+
+        Returns:
+            Number of jobs resumed
+        """
+        from db.whisper import requeue_unfinished_whisper_jobs
+
+        rows = requeue_unfinished_whisper_jobs()
+        if not rows:
+            return 0
+        if whisper_manager is None:
+            from whisper import get_whisper_manager
+
+            whisper_manager = get_whisper_manager()
+
+        resumed = 0
+        for row in rows:
+            with self._lock:
+                if row["id"] in self._jobs:
+                    continue
+            self._enqueue(
+                WhisperJob(
+                    job_id=row["id"],
+                    file_path=row["file_path"],
+                    language=row["language"] or "",
+                    audio_track_index=row.get("audio_track_index"),
+                    priority=row.get("priority", PRIORITY_NORMAL),
+                    created_at=row["created_at"],
+                    source_language=row["language"] or "",
+                    whisper_manager=whisper_manager,
+                    socketio=socketio,
+                )
+            )
+            resumed += 1
+        logger.info("Resumed %d queued whisper job(s)", resumed)
+        return resumed
+
     def get_job(self, job_id: str) -> WhisperJob | None:
         """Get a job by ID."""
         with self._lock:
@@ -134,6 +242,8 @@ class WhisperQueue:
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job (best-effort, cannot interrupt active transcription).
 
+        Prefetched audio of a waiting job is released immediately.
+
         Args:
             job_id: Job to cancel
 
@@ -147,6 +257,11 @@ class WhisperQueue:
             if job.status in ("completed", "failed", "cancelled"):
                 return False
             job.status = "cancelled"
+            audio = None
+            if any(entry[2] == job_id for entry in self._ready):
+                audio, job.audio = job.audio, None
+        if audio is not None:
+            audio.close()
 
         # Update DB
         try:
@@ -157,169 +272,271 @@ class WhisperQueue:
         logger.info("Cancelled whisper job %s", job_id)
         return True
 
-    def _run_job(
-        self,
-        job_id: str,
-        file_path: str,
-        language: str,
-        source_language: str,
-        audio_track_index: int | None,
-        whisper_manager: "WhisperManager",
-        socketio,
-    ):
-        """Execute a transcription job within the semaphore.
+    # ─── Scheduling ─────────────────────────────────────────────────────────
 
-        Phases:
-        1. extracting (0-10%): Select audio track + extract to temp WAV
-        2. transcribing (10-95%): Run Whisper transcription
-        3. saving (95-100%): Store result
-        4. completed (100%): Done
-        """
-        temp_audio_path = None
+    def _enqueue(self, job: WhisperJob):
+        with self._cond:
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._pending, (job.priority, next(self._seq), job.job_id))
+            self._start_threads_locked()
+            self._cond.notify_all()
+        # Queue depth > 0: start loading the model while the audio is prepared
+        if job.whisper_manager is not None:
+            try:
+                job.whisper_manager.prewarm()
+            except Exception as e:
+                logger.debug("Whisper prewarm failed: %s", e)
 
-        try:
-            # Acquire semaphore (blocks if max_concurrent jobs running)
-            with self._semaphore:
-                # Check if cancelled while waiting
-                with self._lock:
-                    job = self._jobs.get(job_id)
-                    if not job or job.status == "cancelled":
-                        return
-
-                now = datetime.utcnow().isoformat()
-                self._update_job(
-                    job_id, status="extracting", progress=0.0, phase="extracting", started_at=now
+    def _start_threads_locked(self):
+        if self._threads:
+            return
+        stop = self._stop
+        for i in range(self._max_concurrent):
+            self._threads.append(
+                threading.Thread(
+                    target=self._worker_loop, args=(stop,), daemon=True, name=f"whisper-worker-{i}"
                 )
-                self._emit_progress(socketio, job_id, "extracting", 0.0, "Selecting audio track...")
-
-                # Phase 1: Audio extraction (0-10%)
-                if audio_track_index is not None:
-                    track = get_audio_track_by_index(file_path, audio_track_index)
-                else:
-                    track = select_audio_track(
-                        file_path, preferred_language=source_language or language or "ja"
-                    )
-                self._update_job(job_id, progress=0.05)
-                self._emit_progress(
-                    socketio,
-                    job_id,
-                    "extracting",
-                    0.05,
-                    f"Extracting audio track {track['stream_index']}...",
+            )
+        if self._prefetch:
+            self._threads.append(
+                threading.Thread(
+                    target=self._prefetch_loop, args=(stop,), daemon=True, name="whisper-prefetch"
                 )
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def _pop_locked(self, heap: list) -> WhisperJob | None:
+        """Pop the head of *heap*; cancelled jobs are dropped (returned as None)."""
+        job = self._jobs.get(heapq.heappop(heap)[2])
+        if job is None:
+            return None
+        if job.status == "cancelled":
+            if job.audio is not None:
+                job.audio.close()
+                job.audio = None
+            return None
+        return job
+
+    def _worker_loop(self, stop: threading.Event):
+        while True:
+            with self._cond:
+                while not stop.is_set() and not self._ready and not self._pending:
+                    self._cond.wait()
+                if stop.is_set():
+                    return
+                # Best job overall, whether or not its audio is prepared yet
+                if self._ready and (not self._pending or self._ready[0] < self._pending[0]):
+                    job = self._pop_locked(self._ready)
+                else:
+                    job = self._pop_locked(self._pending)
+                self._cond.notify_all()
+            if job is not None:
+                with self._app_context():
+                    self._run_job(job)
+
+    def _prefetch_loop(self, stop: threading.Event):
+        while True:
+            with self._cond:
+                while not stop.is_set() and (
+                    not self._pending or len(self._ready) + self._preparing >= self._prefetch
+                ):
+                    self._cond.wait()
+                if stop.is_set():
+                    return
+                job = self._pop_locked(self._pending)
+                if job is None:
+                    continue
+                self._preparing += 1
+            try:
+                with self._app_context():
+                    self._prepare_audio(job)
+            except Exception as e:
+                # Reported by the worker that picks the job up
+                job.prepare_error = e
+            finally:
+                with self._cond:
+                    self._preparing -= 1
+                    heapq.heappush(self._ready, (job.priority, next(self._seq), job.job_id))
+                    self._cond.notify_all()
+
+    def _app_context(self):
+        return self._app.app_context() if self._app is not None else contextlib.nullcontext()
+
+    # ─── Execution ──────────────────────────────────────────────────────────
+
+    def _prepare_audio(self, job: WhisperJob):
+        """Phase 1 (0-10%): select the audio track and pin it in the shared audio cache."""
+        job_id = job.job_id
+        self._update_job(
+            job_id,
+            status="extracting",
+            progress=0.0,
+            phase="extracting",
+            started_at=datetime.utcnow().isoformat(),
+        )
+        self._emit_progress(job.socketio, job_id, "extracting", 0.0, "Selecting audio track...")
 
-                # Create temp file for extracted audio
-                temp_fd, temp_audio_path = tempfile.mkstemp(suffix=".wav", prefix="whisper_")
-                os.close(temp_fd)
-
-                extract_audio_to_wav(file_path, track["stream_index"], temp_audio_path)
-                self._update_job(job_id, progress=0.10)
-                self._emit_progress(socketio, job_id, "extracting", 0.10, "Audio extracted")
-
-                # Phase 2: Transcription (10-95%)
-                self._update_job(job_id, status="transcribing", phase="transcribing")
-                self._emit_progress(
-                    socketio, job_id, "transcribing", 0.10, "Starting transcription..."
-                )
+        if job.audio_track_index is not None:
+            track = get_audio_track_by_index(job.file_path, job.audio_track_index)
+        else:
+            track = select_audio_track(
+                job.file_path, preferred_language=job.source_language or job.language or "ja"
+            )
+        self._update_job(job_id, progress=0.05)
+        self._emit_progress(
+            job.socketio,
+            job_id,
+            "extracting",
+            0.05,
+            f"Extracting audio track {track['stream_index']}...",
+        )
 
-                def progress_callback(ratio: float):
-                    """Map Whisper progress (0-1) to our 10-95% range."""
-                    mapped = 0.10 + (ratio * 0.85)
-                    self._update_job(job_id, progress=mapped)
-                    self._emit_progress(socketio, job_id, "transcribing", mapped, "Transcribing...")
+        # Decoded once per track and shared with waveform/sync; pinned until done
+        audio = contextlib.ExitStack()
+        try:
+            job.audio_path = audio.enter_context(
+                cached_audio(job.file_path, track["stream_index"], priority=job.priority)
+            )
+        except BaseException:
+            audio.close()
+            raise
+        job.audio = audio
+        self._update_job(job_id, progress=0.10)
+        self._emit_progress(job.socketio, job_id, "extracting", 0.10, "Audio extracted")
 
-                start_time = time.time()
-                result = whisper_manager.transcribe(temp_audio_path, language, progress_callback)
-                elapsed_ms = (time.time() - start_time) * 1000
+    def _release_audio(self, job: WhisperJob):
+        audio, job.audio = job.audio, None
+        if audio is not None:
+            audio.close()
 
-                if not result.success:
-                    raise RuntimeError(result.error or "Transcription failed")
+    def _run_job(self, job: WhisperJob):
+        """Execute a transcription job on a worker thread.
 
-                # Phase 3: Saving (95-100%)
-                self._update_job(job_id, status="saving", progress=0.95, phase="saving")
-                self._emit_progress(socketio, job_id, "saving", 0.95, "Saving result...")
+        Phases:
+        1. extracting (0-10%): Select audio track + fetch it from the shared audio cache
+           (usually done ahead of time by the prefetch thread)
+        2. transcribing (10-95%): Run Whisper transcription
+        3. saving (95-100%): Store result
+        4. completed (100%): Done
+        """
+        job_id = job.job_id
+        file_path = job.file_path
+        language = job.language
+        socketio = job.socketio
 
-                # Store result
-                with self._lock:
-                    job = self._jobs.get(job_id)
-                    if job:
-                        job.result = result
+        try:
+            if job.prepare_error is not None:
+                raise job.prepare_error
+            if job.audio is None:
+                self._prepare_audio(job)
+            audio_path = job.audio_path
 
-                # Persist to DB
-                try:
-                    update_whisper_job(
-                        job_id,
-                        status="completed",
-                        progress=1.0,
-                        phase="completed",
-                        backend_name=result.backend_name,
-                        detected_language=result.detected_language,
-                        language_probability=result.language_probability,
-                        srt_content=result.srt_content,
-                        segment_count=result.segment_count,
-                        duration_seconds=result.duration_seconds,
-                        processing_time_ms=elapsed_ms,
-                        completed_at=datetime.utcnow().isoformat(),
-                    )
-                except Exception as e:
-                    logger.error("Failed to persist completed job %s: %s", job_id, e)
-
-                # Record Whisper-generated subtitle in download history
-                if result.srt_content:
-                    try:
-                        import os as _os
-
-                        from db.providers import record_subtitle_download
-
-                        srt_path = _os.path.splitext(file_path)[0] + "." + language + ".srt"
-                        record_subtitle_download(
-                            provider_name="whisper",
-                            subtitle_id=job_id,
-                            language=language,
-                            fmt="srt",
-                            file_path=srt_path,
-                            score=0,
-                            source="whisper",
-                        )
-                        logger.debug("Whisper job %s: recorded download for %s", job_id, srt_path)
-                    except Exception as rec_err:
-                        logger.warning(
-                            "Whisper job %s: failed to record download: %s", job_id, rec_err
-                        )
-
-                # Phase 4: Complete
-                self._update_job(
+            try:
+                update_whisper_job(job_id, status="transcribing", started_at=job.started_at)
+            except Exception as e:
+                logger.debug("Failed to persist whisper job %s start: %s", job_id, e)
+
+            # Phase 2: Transcription (10-95%)
+            self._update_job(job_id, status="transcribing", phase="transcribing")
+            self._emit_progress(socketio, job_id, "transcribing", 0.10, "Starting transcription...")
+
+            def progress_callback(ratio: float):
+                """Map Whisper progress (0-1) to our 10-95% range."""
+                mapped = 0.10 + (ratio * 0.85)
+                self._update_job(job_id, progress=mapped)
+                self._emit_progress(socketio, job_id, "transcribing", mapped, "Transcribing...")
+
+            start_time = time.time()
+            result = job.whisper_manager.transcribe(audio_path, language, progress_callback)
+            elapsed_ms = (time.time() - start_time) * 1000
+
+            if not result.success:
+                raise RuntimeError(result.error or "Transcription failed")
+
+            # Phase 3: Saving (95-100%)
+            self._update_job(job_id, status="saving", progress=0.95, phase="saving")
+            self._emit_progress(socketio, job_id, "saving", 0.95, "Saving result...")
+
+            # Store result
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job:
+                    job.result = result
+
+            # Persist to DB
+            try:
+                update_whisper_job(
                     job_id,
                     status="completed",
                     progress=1.0,
                     phase="completed",
+                    backend_name=result.backend_name,
+                    detected_language=result.detected_language,
+                    language_probability=result.language_probability,
+                    srt_content=result.srt_content,
+                    segment_count=result.segment_count,
+                    duration_seconds=result.duration_seconds,
+                    processing_time_ms=elapsed_ms,
                     completed_at=datetime.utcnow().isoformat(),
                 )
-                self._emit_progress(socketio, job_id, "completed", 1.0, "Transcription complete")
+            except Exception as e:
+                logger.error("Failed to persist completed job %s: %s", job_id, e)
 
+            # Record Whisper-generated subtitle in download history
+            if result.srt_content:
                 try:
-                    from events import emit_event
-
-                    emit_event(
-                        "whisper_complete",
-                        {
-                            "job_id": job_id,
-                            "segment_count": result.segment_count,
-                            "detected_language": result.detected_language,
-                            "duration_seconds": result.duration_seconds,
-                            "processing_time_ms": elapsed_ms,
-                        },
+                    import os as _os
+
+                    from db.providers import record_subtitle_download
+
+                    srt_path = _os.path.splitext(file_path)[0] + "." + language + ".srt"
+                    record_subtitle_download(
+                        provider_name="whisper",
+                        subtitle_id=job_id,
+                        language=language,
+                        fmt="srt",
+                        file_path=srt_path,
+                        score=0,
+                        source="whisper",
                     )
-                except Exception:
-                    pass
+                    logger.debug("Whisper job %s: recorded download for %s", job_id, srt_path)
+                except Exception as rec_err:
+                    logger.warning("Whisper job %s: failed to record download: %s", job_id, rec_err)
 
-                logger.info(
-                    "Whisper job %s completed: %d segments, %.1fs duration, %.0fms processing",
-                    job_id,
-                    result.segment_count,
-                    result.duration_seconds,
-                    elapsed_ms,
+            # Phase 4: Complete
+            self._update_job(
+                job_id,
+                status="completed",
+                progress=1.0,
+                phase="completed",
+                completed_at=datetime.utcnow().isoformat(),
+            )
+            self._emit_progress(socketio, job_id, "completed", 1.0, "Transcription complete")
+
+            try:
+                from events import emit_event
+
+                emit_event(
+                    "whisper_complete",
+                    {
+                        "job_id": job_id,
+                        "segment_count": result.segment_count,
+                        "detected_language": result.detected_language,
+                        "duration_seconds": result.duration_seconds,
+                        "processing_time_ms": elapsed_ms,
+                    },
                 )
+            except Exception:
+                pass
+
+            logger.info(
+                "Whisper job %s completed: %d segments, %.1fs duration, %.0fms processing",
+                job_id,
+                result.segment_count,
+                result.duration_seconds,
+                elapsed_ms,
+            )
 
         except Exception as e:
             error_msg = str(e)
@@ -357,13 +574,7 @@ class WhisperQueue:
                 pass
 
         finally:
-            # Clean up temp audio file
-            if temp_audio_path and os.path.exists(temp_audio_path):
-                try:
-                    os.remove(temp_audio_path)
-                    logger.debug("Cleaned up temp audio: %s", temp_audio_path)
-                except OSError as e:
-                    logger.warning("Failed to clean up temp audio %s: %s", temp_audio_path, e)
+            self._release_audio(job)
 
     def _update_job(self, job_id: str, **kwargs):
         """Update in-memory job state."""
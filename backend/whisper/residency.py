@@ -0,0 +1,240 @@
+"""Whisper model residency: idle unload, pre-warming and memory-aware sizing.
+
+A local Whisper model holds several GB of RAM (or VRAM). ModelResidency
+keeps one model resident while it is useful and no longer:
+
+- ``get(key, loader)`` returns the resident model, (re)loading it when the
+  key (model size, device, ...) changed.
+- ``using()`` marks a transcription in progress; a model in use is never
+  unloaded.
+- A watcher thread unloads the model once it has been idle for
+  ``idle_timeout`` seconds (0 = keep it loaded).
+- ``prewarm(key, loader)`` loads the model in the background, so the first
+  job of a burst does not wait for it (WhisperQueue calls this when a job
+  is queued).
+- ``close()`` releases the model and stops the watcher when the owning
+  backend is replaced (e.g. after a config change).
+
+Loading runs outside the lock: callers asking for the model meanwhile wait
+for that one load instead of blocking every residency call.
+
+Load, unload and pre-warm events are exported as Prometheus metrics.
+"""
+
+import contextlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+#: Approximate resident memory per model on CPU (int8/float32 mix), in MB.
+MODEL_MEMORY_MB = {
+    "large-v3": 5000,
+    "large-v2": 5000,
+    "distil-large-v3": 2500,
+    "medium": 2600,
+    "small": 1000,
+    "base": 500,
+    "tiny": 300,
+}
+#: "auto" candidates, best first (distil models are English-only and skipped).
+AUTO_MODEL_ORDER = ("large-v3", "medium", "small", "base", "tiny")
+#: Memory left free for the rest of the process and the OS when sizing.
+MEMORY_HEADROOM_MB = 1024
+
+
+def available_memory_mb() -> int | None:
+    """Currently available system memory in MB, or None if unknown."""
+    try:
+        import psutil
+
+        return psutil.virtual_memory().available // (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def select_model_size(available_mb: int | None, headroom_mb: int = MEMORY_HEADROOM_MB) -> str:
+    """Largest "auto" candidate that fits *available_mb* (smallest if none does)."""
+    if available_mb is None:
+        return "medium"
+    for size in AUTO_MODEL_ORDER:
+        if MODEL_MEMORY_MB[size] + headroom_mb <= available_mb:
+            return size
+    return AUTO_MODEL_ORDER[-1]
+
+
+class ModelResidency:
+    """Holds at most one loaded model and unloads it when idle."""
+
+    def __init__(self, name: str, idle_timeout: float = 0.0):
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._model = None
+        self._key = None
+        self._label = ""
+        self._in_use = 0
+        self._last_used = 0.0
+        self._warming = False
+        self._loading: threading.Event | None = None  # set when the running load ends
+        self._closed = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self, key, loader):
+        """Return the resident model for *key*, loading it if needed.
+
+        Args:
+            key: Hashable load parameters; a different key replaces the model
+            loader: ``loader() -> (model, label)``; label names the model in
+                logs and metrics (e.g. the resolved model size)
+        """
+        while True:
+            with self._lock:
+                self._last_used = time.monotonic()
+                if self._model is not None and self._key == key:
+                    return self._model
+                loading = self._loading
+                if loading is None:
+                    if self._model is not None:
+                        self._unload_locked("config changed")
+                    loading = self._loading = threading.Event()
+                    break
+            # Another caller is loading; use its model if the key matches
+            loading.wait()
+
+        try:
+            start = time.monotonic()
+            model, label = loader()
+            elapsed = time.monotonic() - start
+            with self._lock:
+                if self._closed.is_set():
+                    # Owner was replaced meanwhile: serve this call, keep nothing resident
+                    return model
+                self._model, self._key, self._label = model, key, label
+                self._last_used = time.monotonic()
+                self._start_watcher_locked()
+            _record("load", label, elapsed)
+            logger.info("Whisper model '%s' resident (loaded in %.1fs)", label, elapsed)
+            return model
+        finally:
+            with self._lock:
+                self._loading = None
+            loading.set()
+
+    @contextlib.contextmanager
+    def using(self):
+        """Keep the model resident for the duration of the block."""
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def prewarm(self, key, loader) -> bool:
+        """Load the model for *key* in the background unless already resident.
+
+        Returns:
+            True if a background load was started
+        """
+        with self._lock:
+            if (
+                self._warming
+                or self._loading is not None
+                or self._closed.is_set()
+                or (self._model is not None and self._key == key)
+            ):
+                return False
+            self._warming = True
+
+        def warm():
+            try:
+                self.get(key, loader)
+                _record("prewarm", self._label)
+            except Exception as e:
+                logger.warning("Whisper model pre-warm failed: %s", e)
+            finally:
+                with self._lock:
+                    self._warming = False
+
+        threading.Thread(target=warm, daemon=True, name=f"{self.name}-prewarm").start()
+        return True
+
+    def unload(self, reason: str = "requested") -> bool:
+        """Drop the resident model unless a transcription is using it."""
+        with self._lock:
+            if self._model is None or self._in_use:
+                return False
+            self._unload_locked(reason)
+            return True
+
+    def close(self, reason: str = "closed") -> None:
+        """Release the model and stop the idle watcher; the residency keeps nothing after this.
+
+        A transcription still running keeps its own reference until it ends.
+        """
+        with self._lock:
+            self._closed.set()
+            if self._model is not None:
+                self._unload_locked(reason)
+
+    def unload_if_idle(self, now: float | None = None) -> bool:
+        """Unload the model if it has not been used for ``idle_timeout`` seconds."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if (
+                self._model is None
+                or self._in_use
+                or self.idle_timeout <= 0
+                or now - self._last_used < self.idle_timeout
+            ):
+                return False
+            self._unload_locked(f"idle for {now - self._last_used:.0f}s")
+            return True
+
+    def _unload_locked(self, reason: str):
+        label = self._label
+        self._model = None
+        self._key = None
+        self._label = ""
+        _record("unload", label)
+        logger.info("Whisper model '%s' unloaded (%s)", label, reason)
+
+    def _start_watcher_locked(self):
+        if self.idle_timeout <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, daemon=True, name=f"{self.name}-residency"
+        )
+        self._watcher.start()
+
+    def _watch(self):
+        interval = max(1.0, min(60.0, self.idle_timeout / 4))
+        while not self._closed.wait(interval):
+            self.unload_if_idle()
+            if self._model is None:
+                return
+
+
+def _record(event: str, label: str, seconds: float | None = None):
+    try:
+        from metrics import record_whisper_model_event
+
+        record_whisper_model_event(event, label, seconds)
+    except Exception as e:
+        logger.debug("Failed to record whisper model metric: %s", e)
@@ -1261,21 +1261,41 @@ export async function deleteCleanupRule(id: number): Promise<void> {
 
 // ─── Audio ──────────────────────────────────────────────────────────────────
 
+export interface WaveformLevel {
+  level: number
+  bucket_seconds: number
+  samples: number
+}
+
+/** Peaks of one time range at one zoom level; values are normalized to -1..1 (rms 0..1). */
 export interface WaveformData {
   duration: number
-  sample_rate: number
+  level: number
+  levels: WaveformLevel[]
+  start: number
+  end: number
+  bucket_seconds: number
   samples: number
-  data: Array<{ time: number; amplitude: number }>
+  min: number[]
+  max: number[]
+  rms: number[]
+}
+
+export interface WaveformRange {
+  start?: number
+  end?: number
+  width?: number
 }
 
 export async function getWaveform(
   filePath: string,
   audioTrackIndex?: number,
-  width = 2000,
-  sampleRate = 100,
+  range: WaveformRange = {},
 ): Promise<WaveformData> {
-  const params: Record<string, unknown> = { file_path: filePath, width, sample_rate: sampleRate }
+  const params: Record<string, unknown> = { file_path: filePath, width: range.width ?? 2000 }
   if (audioTrackIndex !== undefined) params.audio_track_index = audioTrackIndex
+  if (range.start !== undefined) params.start = range.start
+  if (range.end !== undefined) params.end = range.end
   const { data } = await api.get('/audio/waveform', { params })
   return data
 }
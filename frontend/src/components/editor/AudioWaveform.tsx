@@ -22,7 +22,7 @@ export function AudioWaveform({
   videoPath,
   audioTrackIndex,
   currentTime = 0,
-  duration: _duration,
+  duration: durationProp,
   onTimeSelect,
   className = '',
 }: AudioWaveformProps) {
@@ -32,13 +32,30 @@ export function AudioWaveform({
   const [pan, setPan] = useState(0)
   const [isFullscreen, setIsFullscreen] = useState(false)
 
+  // Fetch peaks only for the visible range once zoomed in; the backend picks
+  // the pyramid level with about one bucket per pixel.
+  const [knownDuration, setKnownDuration] = useState(durationProp ?? 0)
+  const visibleRange =
+    zoom > 1 && knownDuration > 0
+      ? (() => {
+          const visible = knownDuration / zoom
+          const start = Math.max(0, Math.min(pan, knownDuration - visible))
+          return { start, end: start + visible, width: 2000 }
+        })()
+      : { width: 2000 }
+
   const { data: waveformData, isLoading, error } = useWaveform(
     null,
     videoPath,
     audioTrackIndex,
     !!videoPath,
+    visibleRange,
   )
 
+  useEffect(() => {
+    if (waveformData?.duration) setKnownDuration(waveformData.duration)
+  }, [waveformData?.duration])
+
   // Draw waveform on canvas
   useEffect(() => {
     if (!waveformData || !canvasRef.current) return
@@ -59,7 +76,7 @@ export function AudioWaveform({
     ctx.fillStyle = '#1a1a1a' // Dark background
     ctx.fillRect(0, 0, width, height)
 
-    if (waveformData.data.length === 0) return
+    if (waveformData.samples === 0) return
 
     // Calculate visible range based on zoom and pan
     const totalDuration = waveformData.duration
@@ -67,35 +84,31 @@ export function AudioWaveform({
     const startTime = Math.max(0, Math.min(pan, totalDuration - visibleDuration))
     const endTime = startTime + visibleDuration
 
-    // Draw waveform
-    ctx.strokeStyle = '#1DB8D4' // Sublarr teal
-    ctx.lineWidth = 2
-    ctx.beginPath()
-
     const centerY = height / 2
+    const scale = height * 0.45
     const timeToX = (time: number) => {
       const ratio = (time - startTime) / visibleDuration
       return ratio * width
     }
 
-    let pathStarted = false
-    for (const point of waveformData.data) {
-      if (point.time < startTime || point.time > endTime) continue
+    // Draw min/max envelope with the RMS band on top, one bar per bucket
+    const bucket = waveformData.bucket_seconds
+    const barWidth = Math.max(1, (bucket / visibleDuration) * width)
+    for (let i = 0; i < waveformData.samples; i++) {
+      const time = waveformData.start + i * bucket
+      if (time + bucket < startTime || time > endTime) continue
 
-      const x = timeToX(point.time)
-      const amplitude = point.amplitude
-      const y = centerY - (amplitude - 0.5) * height * 0.8
-
-      if (!pathStarted) {
-        ctx.moveTo(x, y)
-        pathStarted = true
-      } else {
-        ctx.lineTo(x, y)
-      }
+      const x = timeToX(time)
+      const top = centerY - waveformData.max[i] * scale
+      const bottom = centerY - waveformData.min[i] * scale
+      ctx.fillStyle = '#1DB8D4' // Sublarr teal
+      ctx.fillRect(x, top, barWidth, Math.max(1, bottom - top))
+
+      const rms = waveformData.rms[i] * scale
+      ctx.fillStyle = '#7FE0F0'
+      ctx.fillRect(x, centerY - rms, barWidth, Math.max(1, rms * 2))
     }
 
-    ctx.stroke()
-
     // Draw center line
     ctx.strokeStyle = '#666'
     ctx.lineWidth = 1
@@ -283,8 +296,8 @@ export function AudioWaveform({
 
       {/* Info */}
       <div className="p-2 text-xs text-gray-500 border-t border-gray-700">
-        Duration: {formatTime(waveformData.duration)} | Samples: {waveformData.samples} |{' '}
-        {waveformData.sample_rate} Hz
+        Duration: {formatTime(waveformData.duration)} | Buckets: {waveformData.samples} |{' '}
+        {Math.round(waveformData.bucket_seconds * 1000)} ms/bucket
       </div>
     </div>
   )
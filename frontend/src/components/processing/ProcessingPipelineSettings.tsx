@@ -101,6 +101,7 @@ export function ProcessingPipelineSettings({ config, onSave }: Props) {
                 onChange={e => onSave({ auto_sync_engine: e.target.value })}
                 className="bg-zinc-800 border border-zinc-700 rounded px-2 py-0.5"
               >
+                <option value="native">native</option>
                 <option value="alass">alass</option>
                 <option value="ffsubsync">ffsubsync</option>
               </select>
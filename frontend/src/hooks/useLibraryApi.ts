@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useQuery, useMutation, useQueryClient, keepPreviousData } from '@tanstack/react-query'
 import {
   getLibrary, getSeriesDetail,
   getSeriesAudioPref, setSeriesAudioPref,
@@ -15,6 +15,7 @@ import {
   updateSeriesSettings,
 } from '@/api/client'
 import type { BatchAction } from '@/lib/types'
+import type { WaveformRange } from '@/api/client'
 
 // ─── Library ─────────────────────────────────────────────────────────────────
 
@@ -146,15 +147,17 @@ export function useWaveform(
   videoPath: string | null,
   audioTrackIndex?: number,
   enabled = true,
+  range: WaveformRange = {},
 ) {
   return useQuery({
-    queryKey: ['waveform', filePath, videoPath, audioTrackIndex],
+    queryKey: ['waveform', filePath, videoPath, audioTrackIndex, range.start, range.end, range.width],
     queryFn: () => {
       if (!videoPath) throw new Error('Video path required')
-      return getWaveform(videoPath, audioTrackIndex)
+      return getWaveform(videoPath, audioTrackIndex, range)
     },
     enabled: enabled && !!videoPath,
     staleTime: 5 * 60 * 1000, // 5 minutes
+    placeholderData: keepPreviousData,
   })
 }
 
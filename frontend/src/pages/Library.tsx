@@ -118,7 +118,7 @@ function BulkSyncPanel({
 }) {
   const [scope, setScope] = useState<'series' | 'library'>('library')
   const [selectedSeriesId, setSelectedSeriesId] = useState<number | ''>('')
-  const [engine, setEngine] = useState<'' | 'alass' | 'ffsubsync'>('')
+  const [engine, setEngine] = useState<'' | 'native' | 'alass' | 'ffsubsync'>('')
   const [loading, setLoading] = useState(false)
   const [syncState, setSyncState] = useState<SyncState>(INITIAL_SYNC_STATE)
 
@@ -225,7 +225,7 @@ function BulkSyncPanel({
           {/* Engine override */}
           <select
             value={engine}
-            onChange={(e) => setEngine(e.target.value as '' | 'alass' | 'ffsubsync')}
+            onChange={(e) => setEngine(e.target.value as '' | 'native' | 'alass' | 'ffsubsync')}
             className="text-xs px-2 py-1.5 rounded cursor-pointer"
             style={{
               backgroundColor: 'var(--bg-primary)',
@@ -234,6 +234,7 @@ function BulkSyncPanel({
             }}
           >
             <option value="">Default engine</option>
+            <option value="native">native</option>
             <option value="alass">alass</option>
             <option value="ffsubsync">ffsubsync</option>
           </select>
@@ -480,7 +480,7 @@ export function AutoSyncSection() {
   const updateConfig = useUpdateConfig()
 
   const enabled = config ? config['auto_sync_after_download'] === 'true' || config['auto_sync_after_download'] === true : false
-  const currentEngine = config ? ((config['auto_sync_engine'] as string | undefined) ?? 'ffsubsync') : 'ffsubsync'
+  const currentEngine = config ? ((config['auto_sync_engine'] as string | undefined) ?? 'native') : 'native'
 
   const handleToggle = (value: boolean) => {
     updateConfig.mutate(
@@ -506,7 +506,7 @@ export function AutoSyncSection() {
     <>
       <SettingRow
         label="Auto-Sync nach Download"
-        helpText="Synchronisiert heruntergeladene Untertitel automatisch gegen die Videodatei (nur ffsubsync)."
+        helpText="Synchronisiert heruntergeladene Untertitel automatisch gegen die Videodatei."
       >
         <Toggle
           checked={!!enabled}
@@ -517,7 +517,7 @@ export function AutoSyncSection() {
       {enabled && (
         <SettingRow
           label="Auto-Sync Engine"
-          helpText="Engine für automatische Synchronisierung. alass wird bei Auto-Sync übersprungen (erfordert Referenz-Track)."
+          helpText="Engine für automatische Synchronisierung. native nutzt das zwischengespeicherte Sprachprofil und fällt auf ffsubsync zurück. alass wird bei Auto-Sync übersprungen (erfordert Referenz-Track)."
         >
           <select
             value={currentEngine}
@@ -531,6 +531,7 @@ export function AutoSyncSection() {
               fontSize: '13px',
             }}
           >
+            <option value="native">native (Sprachprofil)</option>
             <option value="ffsubsync">ffsubsync (Spracherkennung)</option>
           </select>
         </SettingRow>